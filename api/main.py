@@ -80,6 +80,7 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down CollegeAdvisor API...")
+    rag_client.registry.close_all()
 
 # Health and Status Endpoints
 
@@ -238,6 +239,7 @@ async def get_status():
         return {
             "api_status": "operational",
             "rag_service": rag_health,
+            "chroma_pool": rag_client.pool_stats(),
             "timestamp": datetime.utcnow().isoformat(),
             "environment": {
                 "python_version": sys.version,
@@ -8,8 +8,8 @@ import time
 from typing import Dict, List, Any, Optional
 import aiohttp
 import requests
-import chromadb
-from chromadb.config import Settings
+
+from college_advisor_data.storage.client_registry import get_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -38,17 +38,27 @@ class RAGClient:
         self.ollama_port = ollama_port
         self.collection_name = collection_name
         
-        # Initialize ChromaDB client
-        self.chroma_client = chromadb.HttpClient(
-            host=chroma_host,
-            port=chroma_port,
-            settings=Settings()
-        )
+        # ChromaDB connections come from the process-wide pool
+        self.registry = get_client_registry()
         
         # URLs
         self.chroma_url = f"http://{chroma_host}:{chroma_port}"
         self.ollama_url = f"http://{ollama_host}:{ollama_port}"
     
+    @property
+    def chroma_client(self):
+        """Shared ChromaDB client, reopened if the pool evicted it."""
+        return self.registry.http_client(self.chroma_host, self.chroma_port)
+    
+    def _collection(self):
+        """Cached handle for the configured collection."""
+        client = self.chroma_client
+        return self.registry.collection(client, self.collection_name, create=False)
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool settings and per-endpoint counters."""
+        return self.registry.stats()
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check health of RAG service components."""
         health_status = {
@@ -88,7 +98,7 @@ class RAGClient:
         
         try:
             # Check collection
-            collection = self.chroma_client.get_collection(self.collection_name)
+            collection = self._collection()
             count = collection.count()
             health_status["collection"] = f"healthy ({count} documents)"
         except Exception as e:
@@ -104,7 +114,7 @@ class RAGClient:
                           n_results: int = 5) -> List[Dict[str, Any]]:
         """Retrieve relevant documents from ChromaDB."""
         try:
-            collection = self.chroma_client.get_collection(self.collection_name)
+            collection = self._collection()
 
             # For now, skip filtering due to ChromaDB query syntax complexity
             # The sample data doesn't have consistent metadata structure for filtering
@@ -16,7 +16,7 @@ import json
 import logging
 import time
 from typing import List, Dict, Optional, Union
-from functools import lru_cache
+from collections import OrderedDict
 import hashlib
 
 # Configure logging
@@ -62,6 +62,10 @@ class CollegeAdvisorClient:
         self.timeout = timeout
         self.enable_cache = enable_cache
         self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
         
         # Verify connection
         self._verify_connection()
@@ -223,18 +227,34 @@ class CollegeAdvisorClient:
         """Generate a cache key for a question."""
         return hashlib.md5(question.encode()).hexdigest()
     
-    @lru_cache(maxsize=1000)
     def _get_cached_response(self, question: str) -> Optional[str]:
         """Get cached response for a question."""
-        # This is a simple in-memory cache using lru_cache
-        # For production, consider using Redis or similar
-        return None
+        key = self._get_cache_key(question)
+        response = self._cache.get(key)
+        if response is None:
+            self.cache_misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.cache_hits += 1
+        return response
     
     def _cache_response(self, question: str, response: str):
-        """Cache a response."""
-        # Store in lru_cache by calling _get_cached_response
-        # This is a workaround since lru_cache doesn't support setting values
-        pass
+        """Cache a response, evicting the least recently used beyond cache_size."""
+        key = self._get_cache_key(question)
+        self._cache[key] = response
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.cache_evictions += 1
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Response cache counters."""
+        return {
+            "entries": len(self._cache),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "evictions": self.cache_evictions,
+        }
     
     def compare_schools(
         self,
@@ -306,6 +306,84 @@ def status(collection: Optional[str]):
     click.echo(f"  Log level: {config.log_level}")
 
 
+@main.command('build-local-index')
+@click.option('--source', '-s', default=None, help='Chroma persistent directory (default: configured Chroma server)')
+@click.option('--output', '-o', default=None, help='Local vector store directory (default: LOCAL_VECTOR_PATH)')
+@click.option('--collection', '-c', multiple=True, help='Collection to copy (repeatable; default: all)')
+def build_local_index(source: Optional[str], output: Optional[str], collection: tuple):
+    """Copy Chroma collections into the embedded local vector store (no re-embedding)."""
+    try:
+        from .storage.client_registry import get_client_registry
+        from .storage.local_vector_store import LocalVectorClient, build_from_chroma
+
+        registry = get_client_registry()
+        if source:
+            chroma = registry.persistent_client(source)
+        else:
+            chroma = registry.http_client(config.chroma_host, config.chroma_port)
+        target = LocalVectorClient(
+            str(output or config.local_vector_path), ivf_lists=config.local_ivf_lists,
+            ivf_probes=config.local_ivf_probes, ivf_min_rows=config.local_ivf_min_rows,
+            quantization=config.local_vector_quantization, rescore_factor=config.local_rescore_factor
+        )
+
+        names = list(collection) or [c.name for c in chroma.list_collections()]
+        for name in names:
+            built = build_from_chroma(chroma.get_collection(name), target, page_size=config.scan_page_size)
+            click.echo(f"✅ {name}: {built.count()} records")
+        click.echo(f"Local vector store: {target.path}")
+    except Exception as e:
+        click.echo(f"❌ Build failed: {e}", err=True)
+        raise click.Abort()
+
+
+def _chroma_client(path: Optional[str]):
+    """Registry client for a persistent directory, or the configured backend."""
+    from .storage.client_registry import get_client_registry
+
+    registry = get_client_registry()
+    return registry.persistent_client(path) if path else registry.default_client()
+
+
+@main.command('export-collections')
+@click.argument('output', type=click.Path())
+@click.option('--source', '-s', default=None, help='Chroma persistent directory (default: configured backend)')
+@click.option('--collection', '-c', multiple=True, help='Collection to export (repeatable; default: all)')
+def export_collections_cmd(output: str, source: Optional[str], collection: tuple):
+    """Dump collections (records as Parquet, raw embeddings, checksummed manifest)."""
+    try:
+        from .storage.collection_dump import export_collections
+
+        index = export_collections(_chroma_client(source), output, names=list(collection) or None,
+                                   page_size=config.scan_page_size)
+        for name, entry in index["collections"].items():
+            click.echo(f"✅ {name}: {entry['count']} records")
+        click.echo(f"Dump written to {output}")
+    except Exception as e:
+        click.echo(f"❌ Export failed: {e}", err=True)
+        raise click.Abort()
+
+
+@main.command('import-collections')
+@click.argument('dump_dir', type=click.Path(exists=True))
+@click.option('--target', '-t', default=None, help='Chroma persistent directory (default: configured backend)')
+@click.option('--collection', '-c', multiple=True, help='Collection to restore (repeatable; default: all)')
+@click.option('--replace', is_flag=True, help='Replace collections that already exist')
+def import_collections_cmd(dump_dir: str, target: Optional[str], collection: tuple, replace: bool):
+    """Restore dumped collections with their stored embeddings (no re-embedding)."""
+    try:
+        from .storage.collection_dump import restore_collections
+
+        for result in restore_collections(dump_dir, _chroma_client(target), names=list(collection) or None,
+                                          replace=replace):
+            status = "✅" if not result["failed"] else "⚠️"
+            click.echo(f"{status} {result['name']}: {result['succeeded']}/{result['total']} records "
+                       f"in {result['elapsed_seconds']}s")
+    except Exception as e:
+        click.echo(f"❌ Import failed: {e}", err=True)
+        raise click.Abort()
+
+
 @main.command()
 def health():
     """Check health of all pipeline components."""
@@ -633,9 +711,15 @@ def ingest(seed_file: str, doc_type: str, batch_size: int, reset_collection: boo
 
         click.echo(f"📝 Created {len(all_chunks)} chunks")
 
+        # Only chunks that are new or changed since the last load are embedded and sent
+        changes = chroma_client.diff_chunks(all_chunks, source=str(seed_path.resolve()))
+        summary = changes.summary()
+        click.echo(f"🔍 {summary['new']} new, {summary['changed']} changed, {summary['unchanged']} unchanged, "
+                   f"{summary['to_delete']} to delete")
+
         # Generate embeddings
         click.echo("🧠 Generating embeddings...")
-        chunk_texts = [chunk.text for chunk in all_chunks]
+        chunk_texts = changes.documents
 
         with click.progressbar(length=len(chunk_texts), label="Embedding chunks") as bar:
             for i in range(0, len(chunk_texts), batch_size):
@@ -648,12 +732,14 @@ def ingest(seed_file: str, doc_type: str, batch_size: int, reset_collection: boo
 
         # Upsert to ChromaDB
         click.echo("💾 Upserting to ChromaDB...")
-        stats = chroma_client.upsert(all_chunks, all_embeddings)
+        stats = chroma_client.apply_changes(changes, all_embeddings)
 
         click.echo("🎉 Ingestion completed successfully!")
         click.echo(f"   Total chunks: {stats['total_chunks']}")
-        click.echo(f"   Successful: {stats['successful_chunks']}")
+        click.echo(f"   Upserted: {stats['successful_chunks']} ({stats['unchanged']} unchanged, skipped)")
+        click.echo(f"   Deleted: {stats['deleted']}")
         click.echo(f"   Failed: {stats['failed_chunks']}")
+        click.echo(f"   Sent in {len(stats['batches'])} batches in {stats['elapsed_seconds']}s")
 
         if stats['errors']:
             click.echo("⚠️  Errors encountered:")
@@ -19,12 +19,32 @@ class Config:
         self.chroma_cloud_host = os.getenv("CHROMA_CLOUD_HOST")
         self.chroma_cloud_api_key = os.getenv("CHROMA_CLOUD_API_KEY")
 
+        # ChromaDB connection pool (shared by every client in the process)
+        self.chroma_pool_max_connections = int(os.getenv("CHROMA_POOL_MAX_CONNECTIONS", "32"))
+        self.chroma_pool_max_keepalive = int(os.getenv("CHROMA_POOL_MAX_KEEPALIVE", "16"))
+        self.chroma_pool_keepalive_secs = float(os.getenv("CHROMA_POOL_KEEPALIVE_SECS", "40"))
+        self.chroma_pool_idle_timeout_secs = float(os.getenv("CHROMA_POOL_IDLE_TIMEOUT_SECS", "600"))
+        self.chroma_connect_retries = int(os.getenv("CHROMA_CONNECT_RETRIES", "4"))
+        self.chroma_connect_backoff_secs = float(os.getenv("CHROMA_CONNECT_BACKOFF_SECS", "0.25"))
+
+        # Vector backend: "chroma" (server/cloud) or "local" (embedded memory-mapped store)
+        self.vector_backend = os.getenv("VECTOR_BACKEND", "chroma").lower()
+        self.local_vector_path = Path(os.getenv("LOCAL_VECTOR_PATH", "./local_vectors"))
+        self.local_ivf_lists = int(os.getenv("LOCAL_IVF_LISTS", "0"))  # 0 = exact search only
+        self.local_ivf_probes = int(os.getenv("LOCAL_IVF_PROBES", "8"))
+        self.local_ivf_min_rows = int(os.getenv("LOCAL_IVF_MIN_ROWS", "50000"))
+        # float32 | float16 | int8 search copy; top k * rescore factor re-ranked at float32
+        self.local_vector_quantization = os.getenv("LOCAL_VECTOR_QUANTIZATION", "float32").lower()
+        self.local_rescore_factor = int(os.getenv("LOCAL_RESCORE_FACTOR", "4"))
+
         # Embedding Configuration - LOCKED TO SENTENCE TRANSFORMERS
         # This is the canonical embedding strategy for CollegeAdvisor-data
         # API should NOT embed - data repo owns all embeddings
         self.embedding_model = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
         self.embedding_provider = "sentence_transformers"  # LOCKED - do not change
         self.embedding_dimension = 384  # all-MiniLM-L6-v2 dimension
+        # Precision of cached / processed-JSON embeddings: float32 | float16 | int8
+        self.embedding_storage = os.getenv("EMBEDDING_STORAGE", "float32").lower()
 
         # Ollama Configuration
         self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
@@ -40,6 +60,16 @@ class Config:
         self.chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "100"))
         self.batch_size = int(os.getenv("BATCH_SIZE", "100"))
 
+        # Bulk upsert (batches start at batch_size and adapt to server latency)
+        self.upsert_max_in_flight = int(os.getenv("UPSERT_MAX_IN_FLIGHT", "4"))
+        self.upsert_min_batch_size = int(os.getenv("UPSERT_MIN_BATCH_SIZE", "10"))
+        self.upsert_max_batch_size = int(os.getenv("UPSERT_MAX_BATCH_SIZE", "1000"))
+        self.upsert_target_latency_secs = float(os.getenv("UPSERT_TARGET_LATENCY_SECS", "1.0"))
+        self.upsert_max_retries = int(os.getenv("UPSERT_MAX_RETRIES", "3"))
+
+        # Records per page when scanning a whole collection for statistics
+        self.scan_page_size = int(os.getenv("SCAN_PAGE_SIZE", "1000"))
+
         # Data Collection Configuration
         self.college_scorecard_api_key = os.getenv("COLLEGE_SCORECARD_API_KEY", "DEMO_KEY")
         self.ipeds_api_key = os.getenv("IPEDS_API_KEY")
@@ -9,6 +9,7 @@ import pickle
 
 from ..models import EmbeddingResult
 from ..config import config
+from ..quantization import check_mode, decode_vector, encode_vector
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +17,12 @@ logger = logging.getLogger(__name__)
 class BaseEmbedder(ABC):
     """Abstract base class for embedding services."""
     
-    def __init__(self, model_name: str, cache_dir: Optional[Path] = None):
+    def __init__(self, model_name: str, cache_dir: Optional[Path] = None, storage: Optional[str] = None):
         self.model_name = model_name
         self.cache_dir = cache_dir or config.cache_dir / "embeddings"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Precision of cached embeddings (float32, float16 or int8)
+        self.storage = check_mode(storage or config.embedding_storage)
         self._embedding_dim = None
     
     @abstractmethod
@@ -120,6 +123,10 @@ class BaseEmbedder(ABC):
             try:
                 with open(cache_path, 'rb') as f:
                     result = pickle.load(f)
+
+                # Reduced-precision entries are stored as a dict with an encoded vector
+                if isinstance(result, dict):
+                    result = EmbeddingResult(**dict(result, embedding=decode_vector(result["embedding"])))
                 
                 # Verify the result is for the correct model
                 if result.model_name == self.model_name:
@@ -143,6 +150,8 @@ class BaseEmbedder(ABC):
         cache_path = self._get_cache_path(chunk_id)
         
         try:
+            if self.storage != "float32":
+                result = dict(result.dict(), embedding=encode_vector(result.embedding, self.storage))
             with open(cache_path, 'wb') as f:
                 pickle.dump(result, f)
         except Exception as e:
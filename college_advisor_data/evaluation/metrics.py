@@ -8,14 +8,27 @@ import json
 from pathlib import Path
 
 from ..storage.chroma_client import ChromaDBClient
+from ..storage.collection_scan import collection_space
 from ..embedding.embedder import EmbeddingService
 from ..config import config
+from ..quantization import measure_recall
 
 logger = logging.getLogger(__name__)
 
 
 class EvaluationMetrics:
     """Comprehensive evaluation metrics for the data pipeline."""
+
+    RETRIEVAL_TEST_QUERIES = [
+        "computer science programs at MIT",
+        "summer programs for high school students",
+        "engineering programs with low GPA requirements",
+        "liberal arts colleges in California",
+        "pre-med programs with research opportunities"
+    ]
+
+    # Rescored recall@k below this is flagged in the report
+    QUANTIZATION_RECALL_THRESHOLD = 0.95
     
     def __init__(self):
         self.chroma_client = ChromaDBClient()
@@ -29,7 +42,9 @@ class EvaluationMetrics:
             "data_quality": self.evaluate_data_quality(collection_name),
             "retrieval_quality": self.evaluate_retrieval_quality(collection_name),
             "coverage_analysis": self.evaluate_coverage(collection_name),
-            "embedding_quality": self.evaluate_embedding_quality(collection_name)
+            "embedding_quality": self.evaluate_embedding_quality(collection_name),
+            # Informational: not part of the overall score
+            "quantization_recall": self.evaluate_quantization_recall(collection_name)
         }
         
         # Calculate overall score
@@ -109,13 +124,7 @@ class EvaluationMetrics:
     
     def evaluate_retrieval_quality(self, collection_name: str = None) -> Dict[str, Any]:
         """Evaluate retrieval quality using test queries."""
-        test_queries = [
-            "computer science programs at MIT",
-            "summer programs for high school students",
-            "engineering programs with low GPA requirements",
-            "liberal arts colleges in California",
-            "pre-med programs with research opportunities"
-        ]
+        test_queries = self.RETRIEVAL_TEST_QUERIES
         
         retrieval_metrics = {
             "test_queries": len(test_queries),
@@ -302,6 +311,53 @@ class EvaluationMetrics:
             logger.error(f"Error evaluating embedding quality: {e}")
             return {"error": str(e), "score": 0.0}
     
+    def evaluate_quantization_recall(self, collection_name: str = None, k: int = 10,
+                                     modes: Tuple[str, ...] = ("float16", "int8"),
+                                     max_vectors: int = 20000, sample_queries: int = 100) -> Dict[str, Any]:
+        """
+        Recall@k of float16 / int8 search against full precision.
+
+        Queries are the retrieval test queries plus a sample of stored
+        vectors; ground truth is exact float32 search over up to
+        ``max_vectors`` vectors of the collection.
+        """
+        try:
+            name = collection_name or self.chroma_client.collection_name
+            collection = self.chroma_client.registry.collection(self.chroma_client.client, name, create=False)
+            space = collection_space(collection)
+
+            pages = []
+            fetched = 0
+            while fetched < max_vectors:
+                page = collection.get(include=["embeddings"], limit=min(config.scan_page_size, max_vectors - fetched),
+                                      offset=fetched)
+                if not page.get("ids"):
+                    break
+                pages.append(np.asarray(page["embeddings"], dtype=np.float32))
+                fetched += len(page["ids"])
+            if not pages:
+                return {"error": "collection has no embeddings"}
+            vectors = np.concatenate(pages)
+
+            rng = np.random.default_rng(0)
+            queries = [vectors[rng.choice(len(vectors), min(sample_queries, len(vectors)), replace=False)]]
+            try:
+                queries.append(np.asarray(self.embedding_service.embedder.embed_texts(self.RETRIEVAL_TEST_QUERIES),
+                                          dtype=np.float32))
+            except Exception as e:
+                logger.warning(f"Recall measured on stored vectors only: {e}")
+            queries = np.concatenate(queries)
+
+            results = {"k": k, "space": space, "vectors": len(vectors), "queries": len(queries)}
+            for mode in modes:
+                results[mode] = measure_recall(vectors, queries, k=k, mode=mode, space=space,
+                                               rescore_factor=config.local_rescore_factor)
+            return results
+
+        except Exception as e:
+            logger.error(f"Error evaluating quantization recall: {e}")
+            return {"error": str(e)}
+
     def generate_evaluation_report(self, collection_name: str = None, save_path: Path = None) -> Dict[str, Any]:
         """Generate comprehensive evaluation report."""
         logger.info("Generating evaluation report")
@@ -335,6 +391,14 @@ class EvaluationMetrics:
             report["recommendations"].append(
                 "Embedding quality issues detected. Check embedding service configuration."
             )
+
+        configured = config.local_vector_quantization
+        recall = metrics.get("quantization_recall", {}).get(configured, {}).get("recall_rescored")
+        if recall is not None and recall < self.QUANTIZATION_RECALL_THRESHOLD:
+            report["recommendations"].append(
+                f"{configured} vector storage keeps only {recall:.1%} recall@k after rescoring. "
+                "Raise LOCAL_RESCORE_FACTOR or use a higher-precision mode."
+            )
         
         # Save report if path provided
         if save_path:
@@ -9,6 +9,7 @@ from datetime import datetime
 
 from ..models import Document, DocumentType, ProcessingStats
 from ..config import config
+from ..quantization import check_mode, encode_vector
 from .loaders import LoaderFactory
 from ..preprocessing.preprocessor import TextPreprocessor
 from ..preprocessing.chunker import TextChunker
@@ -66,7 +67,7 @@ class IngestionPipeline:
                 self._save_processed_data(processed_data, source_path)
             
             # Step 4: Load into ChromaDB
-            self._load_to_chromadb(processed_data)
+            self._load_to_chromadb(processed_data, source_path)
             
             # Update final statistics
             self.stats.processing_time = time.time() - start_time
@@ -176,6 +177,17 @@ class IngestionPipeline:
             output_filename = f"{source_path.stem}_processed_{timestamp}.json"
             output_path = config.processed_dir / output_filename
             
+            # Embeddings are written at the configured storage precision
+            storage = check_mode(config.embedding_storage)
+            if storage != "float32":
+                processed_data = [
+                    dict(doc, embeddings=[
+                        dict(emb, embedding=encode_vector(emb['embedding'], storage))
+                        for emb in doc['embeddings']
+                    ])
+                    for doc in processed_data
+                ]
+
             # Prepare data for saving
             save_data = {
                 'metadata': {
@@ -183,14 +195,15 @@ class IngestionPipeline:
                     'processed_at': datetime.now().isoformat(),
                     'total_documents': len(processed_data),
                     'total_chunks': self.stats.total_chunks,
-                    'total_embeddings': self.stats.total_embeddings
+                    'total_embeddings': self.stats.total_embeddings,
+                    'embedding_storage': storage
                 },
                 'documents': processed_data
             }
             
             # Save to file
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
+                json.dump(save_data, f, indent=2, ensure_ascii=False, default=str)
             
             logger.info(f"Saved processed data to {output_path}")
         
@@ -199,8 +212,13 @@ class IngestionPipeline:
             logger.error(error_msg)
             self.stats.warnings.append(error_msg)
     
-    def _load_to_chromadb(self, processed_data: List[Dict[str, Any]]) -> None:
-        """Load processed data into ChromaDB."""
+    def _load_to_chromadb(self, processed_data: List[Dict[str, Any]], source_path: Optional[Path] = None) -> None:
+        """
+        Load processed data into ChromaDB.
+
+        Only chunks that are new or changed since the last load are sent;
+        chunks previously loaded from ``source_path`` that are gone are deleted.
+        """
         logger.info("Loading data into ChromaDB")
         
         try:
@@ -226,13 +244,17 @@ class IngestionPipeline:
             chroma_stats = self.chroma_client.upsert_embeddings(
                 all_embeddings, 
                 all_chunks, 
-                all_metadatas
+                all_metadatas,
+                source=str(source_path) if source_path else None
             )
             
             # Update statistics
-            self.stats.errors.extend(chroma_stats.errors)
+            self.stats.errors.extend(chroma_stats['errors'])
             
-            logger.info(f"Successfully loaded {chroma_stats.total_embeddings} embeddings to ChromaDB")
+            logger.info(
+                f"Loaded {chroma_stats['successful_chunks']} new or changed embeddings to ChromaDB "
+                f"({chroma_stats['unchanged']} unchanged, {chroma_stats['deleted']} deleted)"
+            )
         
         except Exception as e:
             error_msg = f"Error loading to ChromaDB: {e}"
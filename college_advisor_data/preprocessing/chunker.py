@@ -10,6 +10,7 @@ from nltk.tokenize import sent_tokenize, word_tokenize
 
 from ..models import Document, ChunkMetadata, DocumentType
 from ..config import config
+from .preprocessor import ensure_nltk_data
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,7 @@ class TextChunker:
             min_chunk_size: Minimum chunk size in tokens
             max_chunk_size: Maximum chunk size in tokens
         """
+        ensure_nltk_data()
         self.chunk_size = chunk_size or config.chunk_size
         self.overlap_size = overlap_size or config.chunk_overlap
         self.min_chunk_size = min_chunk_size
@@ -17,21 +17,24 @@ from ..config import config
 
 logger = logging.getLogger(__name__)
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+_NLTK_READY = False
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
 
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+def ensure_nltk_data():
+    """Download required NLTK data on first use rather than at import time."""
+    global _NLTK_READY
+    if _NLTK_READY:
+        return
+    for resource, package in (
+        ('tokenizers/punkt', 'punkt'),
+        ('corpora/stopwords', 'stopwords'),
+        ('corpora/wordnet', 'wordnet'),
+    ):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            nltk.download(package)
+    _NLTK_READY = True
 
 
 @dataclass
@@ -47,6 +50,7 @@ class TextPreprocessor:
     """Advanced text preprocessor with multiple cleaning and extraction capabilities."""
     
     def __init__(self):
+        ensure_nltk_data()
         self.stop_words = set(stopwords.words('english'))
         self.lemmatizer = WordNetLemmatizer()
         
@@ -0,0 +1,203 @@
+"""
+Reduced-precision storage for embedding vectors.
+
+float16 halves and int8 quarters the bytes of a float32 embedding. Two
+encodings are provided:
+
+- ScalarQuantizer: per-dimension affine int8 codes fitted to a whole
+  matrix, used by the local vector store for its search copy (exact
+  float32 vectors are kept for rescoring the candidates).
+- encode_vector / decode_vector: self-contained compact payloads for a
+  single vector (per-vector scale for int8), used by the embedding cache
+  and the processed-data JSON.
+
+measure_recall() reports how much recall@k quantized search loses
+against full precision, with and without rescoring.
+"""
+
+import base64
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STORAGE_MODES = ("float32", "float16", "int8")
+
+# Rows decoded per block when scoring a quantized matrix
+DECODE_BLOCK = 16384
+
+
+def check_mode(mode: str) -> str:
+    """Normalize a storage mode name ("none" means float32)."""
+    mode = (mode or "float32").lower()
+    if mode in ("none", "fp32", "f32"):
+        return "float32"
+    if mode in ("fp16", "f16", "half"):
+        return "float16"
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unsupported embedding storage mode: {mode!r} (expected one of {STORAGE_MODES})")
+    return mode
+
+
+def distances(space: str, queries: np.ndarray, vectors: np.ndarray, norms: Optional[np.ndarray] = None) -> np.ndarray:
+    """(queries x rows) distances as Chroma reports them for hnsw:space."""
+    if norms is None:
+        norms = np.linalg.norm(vectors, axis=1)
+    return distances_from_dots(space, queries, queries @ vectors.T, norms)
+
+
+def distances_from_dots(space: str, queries: np.ndarray, dots: np.ndarray, norms: np.ndarray) -> np.ndarray:
+    """distances() given the (queries x rows) dot products and the rows' norms."""
+    if space == "cosine":
+        denom = np.linalg.norm(queries, axis=1)[:, None] * norms[None, :]
+        denom[denom == 0] = 1.0
+        return 1.0 - dots / denom
+    if space == "ip":
+        return 1.0 - dots
+    result = (queries * queries).sum(axis=1)[:, None] - 2.0 * dots + (norms * norms)[None, :]
+    return np.maximum(result, 0.0, out=result)
+
+
+class ScalarQuantizer:
+    """
+    Per-dimension affine int8 quantization of a vector matrix.
+
+    Each dimension's [min, max] range is split into 256 levels, so the
+    reconstruction error is at most half a level per dimension.
+    """
+
+    def __init__(self, offset: np.ndarray, scale: np.ndarray):
+        self.offset = np.asarray(offset, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray) -> "ScalarQuantizer":
+        """Fit the per-dimension ranges, streaming over the rows in blocks."""
+        low = np.full(vectors.shape[1], np.inf, dtype=np.float32)
+        high = np.full(vectors.shape[1], -np.inf, dtype=np.float32)
+        for start in range(0, len(vectors), DECODE_BLOCK):
+            block = np.asarray(vectors[start:start + DECODE_BLOCK], dtype=np.float32)
+            np.minimum(low, block.min(axis=0), out=low)
+            np.maximum(high, block.max(axis=0), out=high)
+        scale = (high - low) / 255.0
+        scale[scale == 0] = 1.0
+        return cls(low, scale)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        levels = np.rint((np.asarray(vectors, dtype=np.float32) - self.offset) / self.scale)
+        return (np.clip(levels, 0, 255) - 128).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return (codes.astype(np.float32) + 128.0) * self.scale + self.offset
+
+    def dots(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """queries @ decode(codes).T without materializing the decoded rows."""
+        scaled = queries * self.scale
+        bias = 128.0 * scaled.sum(axis=1) + queries @ self.offset
+        return scaled @ codes.astype(np.float32).T + bias[:, None]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {"offset": self.offset, "scale": self.scale}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "ScalarQuantizer":
+        return cls(arrays["offset"], arrays["scale"])
+
+
+def encode_vector(vector: Sequence[float], mode: str) -> Union[List[float], Dict[str, Any]]:
+    """
+    A single embedding in the given storage mode.
+
+    float32 returns the plain list (the historical format); float16 and
+    int8 return a JSON-safe payload that decode_vector() reverses.
+    """
+    mode = check_mode(mode)
+    if mode == "float32":
+        return [float(x) for x in vector]
+    values = np.asarray(vector, dtype=np.float32)
+    if mode == "float16":
+        data = values.astype(np.float16).tobytes()
+        return {"dtype": "float16", "dim": len(values), "data": base64.b64encode(data).decode("ascii")}
+    scale = float(np.abs(values).max()) / 127.0 or 1.0
+    codes = np.clip(np.rint(values / scale), -127, 127).astype(np.int8)
+    return {"dtype": "int8", "dim": len(values), "scale": scale,
+            "data": base64.b64encode(codes.tobytes()).decode("ascii")}
+
+
+def decode_vector(value: Union[Sequence[float], Dict[str, Any]]) -> List[float]:
+    """Float list for a stored embedding in any storage mode."""
+    if not isinstance(value, dict):
+        return list(value)
+    raw = base64.b64decode(value["data"])
+    if value["dtype"] == "float16":
+        return np.frombuffer(raw, dtype=np.float16).astype(np.float32).tolist()
+    if value["dtype"] == "int8":
+        return (np.frombuffer(raw, dtype=np.int8).astype(np.float32) * value["scale"]).tolist()
+    raise ValueError(f"Unknown embedding payload dtype: {value['dtype']!r}")
+
+
+def quantize_matrix(vectors: np.ndarray, mode: str):
+    """(codes, quantizer) for a matrix; quantizer is None for float16."""
+    mode = check_mode(mode)
+    if mode == "float16":
+        return np.asarray(vectors, dtype=np.float16), None
+    if mode == "int8":
+        quantizer = ScalarQuantizer.fit(vectors)
+        return quantizer.encode(vectors), quantizer
+    raise ValueError("float32 vectors are not quantized")
+
+
+def dequantize_rows(codes: np.ndarray, quantizer: Optional[ScalarQuantizer]) -> np.ndarray:
+    """float32 approximation of quantized rows."""
+    if quantizer is None:
+        return codes.astype(np.float32)
+    return quantizer.decode(codes)
+
+
+def _top(dist: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(dist))
+    part = np.argpartition(dist, k - 1)[:k]
+    return part[np.argsort(dist[part], kind="stable")]
+
+
+def measure_recall(vectors: np.ndarray, queries: np.ndarray, k: int = 10, mode: str = "int8",
+                   space: str = "l2", rescore_factor: int = 4) -> Dict[str, Any]:
+    """
+    Recall@k of quantized search against exact float32 search.
+
+    ``recall`` ranks by quantized vectors alone; ``recall_rescored``
+    takes the top k * rescore_factor quantized hits and re-ranks them
+    with the float32 vectors, as the local vector store does.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    mode = check_mode(mode)
+    k = max(1, min(k, len(vectors)))
+    norms = np.linalg.norm(vectors, axis=1)
+    codes, quantizer = quantize_matrix(vectors, mode)
+    approx_vectors = dequantize_rows(codes, quantizer)
+
+    exact = distances(space, queries, vectors, norms)
+    approx = distances(space, queries, approx_vectors, np.linalg.norm(approx_vectors, axis=1))
+
+    recall, rescored = [], []
+    for row in range(len(queries)):
+        truth = set(_top(exact[row], k).tolist())
+        recall.append(len(truth & set(_top(approx[row], k).tolist())) / k)
+        shortlist = _top(approx[row], k * max(1, rescore_factor))
+        reranked = shortlist[_top(exact[row][shortlist], k)]
+        rescored.append(len(truth & set(reranked.tolist())) / k)
+
+    return {
+        "mode": mode,
+        "k": k,
+        "queries": len(queries),
+        "vectors": len(vectors),
+        "rescore_factor": rescore_factor,
+        "recall": float(np.mean(recall)) if recall else 0.0,
+        "recall_rescored": float(np.mean(rescored)) if rescored else 0.0,
+        "bytes_per_vector": int(codes.itemsize * vectors.shape[1]),
+        "float32_bytes_per_vector": int(4 * vectors.shape[1]),
+    }
@@ -1,5 +1,14 @@
 """Storage module for ChromaDB integration."""
 
 from .chroma_client import ChromaDBClient
+from .client_registry import ChromaClientRegistry, PoolSettings, get_client_registry
+from .local_vector_store import LocalVectorClient, build_from_chroma
+from .collection_dump import CollectionDump, export_collections, restore_collections
+from .incremental_upsert import ChecksumManifest, IncrementalUpserter
 
-__all__ = ["ChromaDBClient"]
+__all__ = [
+    "ChromaDBClient", "ChromaClientRegistry", "PoolSettings", "get_client_registry",
+    "LocalVectorClient", "build_from_chroma",
+    "CollectionDump", "export_collections", "restore_collections",
+    "ChecksumManifest", "IncrementalUpserter"
+]
@@ -0,0 +1,178 @@
+"""
+Concurrent, backpressured bulk upsert for ChromaDB collections.
+
+Batches are cut from the input on the fly and sent with a bounded number
+in flight. Each batch's server latency feeds an adaptive batch size:
+batches grow while the server answers well under the target latency and
+shrink when it slows down or fails, so a bulk load runs at whatever rate
+the server sustains instead of a fixed sleep between batches.
+
+Upserts are keyed by id, so a failed batch is simply sent again.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchReport:
+    """Outcome of one batch."""
+
+    index: int
+    start: int
+    size: int
+    attempts: int = 0
+    status: str = "pending"
+    latency_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class AdaptiveBatchSizer:
+    """
+    Batch size steered by observed latency.
+
+    Grows by ``growth`` while batches finish under half the target
+    latency, halves when one takes longer than the target or fails, and
+    stays within [min_size, max_size].
+    """
+
+    def __init__(self, initial: int, min_size: int, max_size: int,
+                 target_latency_secs: float, growth: float = 1.5):
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.target_latency_secs = target_latency_secs
+        self.growth = growth
+        self._size = float(min(self.max_size, max(self.min_size, initial)))
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return int(self._size)
+
+    def observe(self, latency_secs: float, size: int):
+        """Adjust after a successful batch of ``size`` records."""
+        with self._lock:
+            if latency_secs > self.target_latency_secs:
+                self._size = max(self.min_size, self._size / 2)
+            elif latency_secs < self.target_latency_secs / 2 and size >= self.size:
+                # Only batches at the current size are evidence that a larger one will do
+                self._size = min(self.max_size, self._size * self.growth)
+
+    def failed(self):
+        """Back off after a failed attempt."""
+        with self._lock:
+            self._size = max(self.min_size, self._size / 2)
+
+
+class BulkUpserter:
+    """
+    Bulk upsert with bounded concurrency, adaptive batches and retries.
+
+    ``collection`` is a callable returning the collection handle, so each
+    attempt picks up a reconnected handle.
+    """
+
+    def __init__(self,
+                 collection: Callable[[], Any],
+                 max_in_flight: int = 4,
+                 initial_batch_size: int = 100,
+                 min_batch_size: int = 10,
+                 max_batch_size: int = 1000,
+                 target_latency_secs: float = 1.0,
+                 max_retries: int = 3,
+                 backoff_base_secs: float = 0.5):
+        self.collection = collection
+        self.max_in_flight = max(1, max_in_flight)
+        self.sizer = AdaptiveBatchSizer(initial_batch_size, min_batch_size, max_batch_size, target_latency_secs)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base_secs = backoff_base_secs
+
+    def run(self,
+            ids: Sequence[str],
+            embeddings: Optional[Sequence[Sequence[float]]],
+            documents: Sequence[str],
+            metadatas: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Upsert every record; returns totals and a per-batch report.
+
+        With ``embeddings`` None the collection embeds the documents itself.
+        Never raises for a failed batch: failures are retried and then
+        reported with their error.
+        """
+        total = len(ids)
+        reports: List[BatchReport] = []
+        started = time.perf_counter()
+        cursor = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="chroma-upsert") as executor:
+            in_flight = {}
+            while cursor < total or in_flight:
+                # Backpressure: new batches are cut only when a slot frees up
+                while cursor < total and len(in_flight) < self.max_in_flight:
+                    size = min(self.sizer.size, total - cursor)
+                    report = BatchReport(index=len(reports), start=cursor, size=size)
+                    reports.append(report)
+                    end = cursor + size
+                    future = executor.submit(
+                        self._send, report,
+                        ids[cursor:end], None if embeddings is None else embeddings[cursor:end],
+                        documents[cursor:end], metadatas[cursor:end]
+                    )
+                    in_flight[future] = report
+                    cursor = end
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.pop(future)
+                    future.result()
+
+        elapsed = time.perf_counter() - started
+        succeeded = sum(r.size for r in reports if r.status == "ok")
+        return {
+            "total": total,
+            "succeeded": succeeded,
+            "failed": total - succeeded,
+            "batches": [asdict(r) for r in reports],
+            "elapsed_seconds": round(elapsed, 3),
+            "records_per_second": round(succeeded / elapsed, 1) if elapsed > 0 else 0.0,
+            "final_batch_size": self.sizer.size,
+        }
+
+    def _send(self, report: BatchReport, ids, embeddings, documents, metadatas):
+        """Send one batch, retrying with jittered exponential backoff."""
+        for attempt in range(1, self.max_retries + 2):
+            report.attempts = attempt
+            begin = time.perf_counter()
+            try:
+                self.collection().upsert(
+                    ids=list(ids),
+                    embeddings=None if embeddings is None else list(embeddings),
+                    documents=list(documents),
+                    metadatas=list(metadatas)
+                )
+            except Exception as e:
+                report.error = str(e)
+                self.sizer.failed()
+                if attempt > self.max_retries:
+                    report.status = "failed"
+                    logger.error(f"Batch {report.index} ({report.size} records) failed after {attempt} attempts: {e}")
+                    return
+                delay = random.uniform(0, self.backoff_base_secs * (2 ** (attempt - 1)))
+                logger.warning(f"Batch {report.index} failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            latency = time.perf_counter() - begin
+            report.latency_ms = round(latency * 1000, 1)
+            report.status = "ok"
+            report.error = None
+            self.sizer.observe(latency, report.size)
+            logger.debug(f"Upserted batch {report.index}: {report.size} records in {report.latency_ms}ms")
+            return
@@ -11,19 +11,32 @@ from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import json
 
-import chromadb
-from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 
+from .bulk_upsert import BulkUpserter
+from .client_registry import ChromaClientRegistry, get_client_registry
+from .incremental_upsert import ChangeSet, IncrementalUpserter
+from .local_vector_store import LocalVectorClient
+from .collection_scan import (
+    Aggregator, ComplianceRate, DistinctValues, FieldCounter, ScanCache, TextLengthHistogram,
+    collection_version, mark_changed, scan_collection
+)
 from ..schemas import (
     DocumentMetadata, DocumentChunk, CollectionSchema,
     COLLECTION_NAME, SCHEMA_VERSION, EMBEDDING_MODEL, EMBEDDING_DIMENSION,
     REQUIRED_METADATA_FIELDS, INDEXED_METADATA_FIELDS
 )
+from ..models import ChunkMetadata, EmbeddingResult
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
+# Collection statistics by collection version, shared by every client in the process
+_scan_cache = ScanCache(config.cache_dir / "collection_stats")
+
+# Checksum manifests for incremental loads, one file per collection
+_manifest_dir = config.cache_dir / "upsert_manifests"
+
 
 class ChromaDBClient:
     """
@@ -33,89 +46,83 @@ class ChromaDBClient:
     reliable operations for the CollegeAdvisor data pipeline.
     """
 
-    def __init__(self, collection_name: str = None):
+    def __init__(self, collection_name: str = None, registry: Optional[ChromaClientRegistry] = None):
         self.collection_name = collection_name or COLLECTION_NAME
-        self.client = None
-        self.collection = None
+        self.registry = registry or get_client_registry()
+        self._active_collection: Optional[str] = None
         self.schema = CollectionSchema()
         self._connect()
 
-    def _connect(self):
-        """Connect to ChromaDB with proper error handling and heartbeat."""
-        try:
-            if config.chroma_cloud_host and config.chroma_cloud_api_key:
-                # Cloud connection
-                logger.info(f"Connecting to ChromaDB cloud: {config.chroma_cloud_host}")
-                self.client = chromadb.HttpClient(
-                    host=config.chroma_cloud_host,
-                    port=443,
-                    ssl=True,
-                    headers={"Authorization": f"Bearer {config.chroma_cloud_api_key}"}
-                )
-            else:
-                # Local connection
-                logger.info(f"Connecting to local ChromaDB: {config.chroma_host}:{config.chroma_port}")
-                self.client = chromadb.HttpClient(
-                    host=config.chroma_host,
-                    port=config.chroma_port
-                )
+    @property
+    def client(self) -> Any:
+        """Shared client for the configured endpoint, reopened if it was evicted."""
+        return self.registry.default_client()
 
-            # Test connection with heartbeat
-            heartbeat = self.client.heartbeat()
-            logger.info(f"Successfully connected to ChromaDB - heartbeat: {heartbeat}")
+    @property
+    def collection(self) -> Any:
+        """Cached handle for the active collection (None until one is selected)."""
+        if self._active_collection is None:
+            return None
+        return self.registry.collection(self.client, self._active_collection)
 
+    def _connect(self):
+        """Acquire the process-wide client; the registry heartbeats new connections."""
+        try:
+            self.client
         except Exception as e:
             logger.error(f"Error connecting to ChromaDB: {e}")
             raise ConnectionError(f"Failed to connect to ChromaDB: {e}")
 
     def heartbeat(self) -> Dict[str, Any]:
-        """Check ChromaDB connection health."""
+        """Check ChromaDB connection health, reconnecting once on failure."""
+        client = self.client
         try:
-            return self.client.heartbeat()
+            return client.heartbeat()
+        except Exception as e:
+            logger.warning(f"ChromaDB heartbeat failed, reconnecting: {e}")
+        try:
+            return self.registry.reconnect(client).heartbeat()
         except Exception as e:
             logger.error(f"ChromaDB heartbeat failed: {e}")
             raise
-    
+
     def get_or_create_collection(self, collection_name: str = None) -> Any:
         """Get or create a ChromaDB collection with standardized schema."""
         collection_name = collection_name or self.collection_name
 
-        try:
-            # Try to get existing collection
-            self.collection = self.client.get_collection(collection_name)
-            logger.info(f"Retrieved existing collection: {collection_name}")
-
-            # Validate schema version
-            collection_metadata = self.collection.metadata or {}
-            if collection_metadata.get("schema_version") != SCHEMA_VERSION:
-                logger.warning(f"Collection schema version mismatch: {collection_metadata.get('schema_version')} != {SCHEMA_VERSION}")
+        # Handles are shared through the registry, so only the first caller touches the server
+        collection = self.registry.collection(
+            self.client,
+            collection_name,
+            metadata={
+                "description": "CollegeAdvisor standardized data collection",
+                "schema_version": SCHEMA_VERSION,
+                "embedding_model": EMBEDDING_MODEL,
+                "embedding_dimension": EMBEDDING_DIMENSION,
+                "created_at": time.time()
+            }
+        )
+        self._active_collection = collection_name
 
-        except Exception:
-            # Create new collection with schema metadata
-            logger.info(f"Creating new collection: {collection_name}")
-            self.collection = self.client.create_collection(
-                name=collection_name,
-                metadata={
-                    "description": "CollegeAdvisor standardized data collection",
-                    "schema_version": SCHEMA_VERSION,
-                    "embedding_model": EMBEDDING_MODEL,
-                    "embedding_dimension": EMBEDDING_DIMENSION,
-                    "created_at": time.time()
-                }
-            )
+        # Validate schema version
+        collection_metadata = collection.metadata or {}
+        if collection_metadata.get("schema_version") != SCHEMA_VERSION:
+            logger.warning(f"Collection schema version mismatch: {collection_metadata.get('schema_version')} != {SCHEMA_VERSION}")
 
-        return self.collection
+        return collection
     
     def reset_collection(self, collection_name: str = None) -> None:
         """Delete and recreate a collection."""
         collection_name = collection_name or self.collection_name
+        client = self.client
         
         try:
             # Delete existing collection
-            self.client.delete_collection(collection_name)
+            client.delete_collection(collection_name)
             logger.info(f"Deleted collection: {collection_name}")
         except Exception as e:
             logger.warning(f"Could not delete collection {collection_name}: {e}")
+        self.registry.forget_collection(client, collection_name)
         
         # Create new collection
         self.get_or_create_collection(collection_name)
@@ -126,6 +133,10 @@ class ChromaDBClient:
         """
         Upsert document chunks with standardized metadata schema.
 
+        Batches are sent concurrently with a bounded number in flight and
+        sized from observed server latency (see BulkUpserter); failed
+        batches are retried and reported in ``batches``.
+
         Args:
             chunks: List of DocumentChunk objects with standardized metadata
             embeddings: List of embedding vectors
@@ -146,49 +157,135 @@ class ChromaDBClient:
             "errors": []
         }
 
-        batch_size = config.batch_size
+        # Prepare data for ChromaDB
+        ids = [chunk.chunk_id for chunk in chunks]
+        documents = [chunk.text for chunk in chunks]
+        metadatas = [self._metadata_to_dict(chunk.metadata) for chunk in chunks]
+
+        # Validate metadata before upsert
+        for chunk_id, metadata in zip(ids, metadatas):
+            if not self._validate_metadata(metadata):
+                error_msg = f"Invalid metadata for chunk {chunk_id}"
+                stats["errors"].append(error_msg)
+                logger.error(error_msg)
+
+        report = self._bulk_upserter().run(ids, embeddings, documents, metadatas)
+        if report["succeeded"]:
+            mark_changed(self.collection)
+
+        stats["successful_chunks"] = report["succeeded"]
+        stats["failed_chunks"] = report["failed"]
+        stats["batches"] = report["batches"]
+        stats["elapsed_seconds"] = report["elapsed_seconds"]
+        stats["records_per_second"] = report["records_per_second"]
+        for batch in report["batches"]:
+            if batch["status"] == "failed":
+                stats["errors"].append(f"Batch {batch['index']} ({batch['size']} chunks): {batch['error']}")
+
+        logger.info(
+            f"Upserted {report['succeeded']}/{report['total']} chunks in {len(report['batches'])} batches "
+            f"({report['records_per_second']} chunks/s)"
+        )
+        return stats
 
-        try:
-            for i in range(0, len(chunks), batch_size):
-                batch_chunks = chunks[i:i + batch_size]
-                batch_embeddings = embeddings[i:i + batch_size]
-
-                # Prepare data for ChromaDB
-                ids = [chunk.chunk_id for chunk in batch_chunks]
-                vectors = batch_embeddings
-                documents = [chunk.text for chunk in batch_chunks]
-                metadatas = [self._metadata_to_dict(chunk.metadata) for chunk in batch_chunks]
-
-                # Validate metadata before upsert
-                for j, metadata in enumerate(metadatas):
-                    if not self._validate_metadata(metadata):
-                        error_msg = f"Invalid metadata for chunk {ids[j]}"
-                        stats["errors"].append(error_msg)
-                        logger.error(error_msg)
-                        continue
-
-                # Upsert batch
-                self.collection.upsert(
-                    ids=ids,
-                    embeddings=vectors,
-                    documents=documents,
-                    metadatas=metadatas
-                )
-
-                stats["successful_chunks"] += len(batch_chunks)
-                logger.info(f"Upserted batch {i//batch_size + 1}: {len(batch_chunks)} chunks")
-
-                # Small delay to avoid overwhelming the database
-                time.sleep(0.1)
+    def diff_chunks(self, chunks: List[DocumentChunk], source: Optional[str] = None) -> ChangeSet:
+        """
+        Compare chunks with the collection's checksum manifest.
 
-        except Exception as e:
-            error_msg = f"Error upserting chunks: {e}"
-            logger.error(error_msg)
-            stats["errors"].append(error_msg)
-            stats["failed_chunks"] = stats["total_chunks"] - stats["successful_chunks"]
-            raise
+        Only the returned ``changes.ids`` need embedding and sending. When
+        ``source`` is given, chunks previously loaded from it that are not
+        in ``chunks`` are scheduled for deletion.
+        """
+        if not self.collection:
+            self.get_or_create_collection()
+        return self._incremental_upserter().diff(
+            [chunk.chunk_id for chunk in chunks],
+            [chunk.text for chunk in chunks],
+            [self._metadata_to_dict(chunk.metadata) for chunk in chunks],
+            source=source,
+            prune=source is not None
+        )
+
+    def apply_changes(self,
+                      changes: ChangeSet,
+                      embeddings: Optional[List[List[float]]] = None) -> Dict[str, Any]:
+        """
+        Upsert the new and changed chunks of a change set and delete the removed ones.
+
+        Args:
+            changes: Result of diff_chunks
+            embeddings: Embeddings aligned with ``changes.ids`` (None lets the collection embed)
 
+        Returns:
+            Dict: Upsert statistics, with new/changed/unchanged/deleted counts
+        """
+        report = self._incremental_upserter().apply(changes, embeddings)
+        stats = {
+            "total_chunks": report["total"],
+            "successful_chunks": report["upserted"],
+            "failed_chunks": report["failed"],
+            "errors": report["errors"]
+        }
+        stats.update(report)
         return stats
+
+    def upsert_embeddings(self,
+                          embeddings: List[EmbeddingResult],
+                          chunks: List[str],
+                          metadatas: List[ChunkMetadata],
+                          source: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Incrementally load pipeline chunks with precomputed embeddings.
+
+        Unchanged chunks (same text and metadata as the last load) are
+        skipped; with ``source``, chunks that disappeared from it are deleted.
+        """
+        if not len(embeddings) == len(chunks) == len(metadatas):
+            raise ValueError("Number of embeddings, chunks and metadatas must match")
+        if not self.collection:
+            self.get_or_create_collection()
+
+        incremental = self._incremental_upserter()
+        changes = incremental.diff(
+            [embedding.chunk_id for embedding in embeddings],
+            chunks,
+            [self._metadata_to_dict(metadata) for metadata in metadatas],
+            source=source,
+            prune=source is not None
+        )
+        return self.apply_changes(changes, [e.embedding for e in changes.select(embeddings)])
+
+    def _bulk_upserter(self) -> BulkUpserter:
+        # Every write to the local store rewrites the collection, so send it one batch
+        local = isinstance(self.client, LocalVectorClient)
+        return BulkUpserter(
+            collection=lambda: self.collection,
+            max_in_flight=1 if local else config.upsert_max_in_flight,
+            initial_batch_size=self._max_batch_size() if local else config.batch_size,
+            min_batch_size=config.upsert_min_batch_size,
+            max_batch_size=self._max_batch_size(),
+            target_latency_secs=config.upsert_target_latency_secs,
+            max_retries=config.upsert_max_retries
+        )
+
+    def _incremental_upserter(self) -> IncrementalUpserter:
+        return IncrementalUpserter(
+            collection=lambda: self.collection,
+            manifest_dir=_manifest_dir,
+            upserter=self._bulk_upserter(),
+            delete_batch_size=self._max_batch_size(),
+            page_size=config.scan_page_size
+        )
+
+    def _max_batch_size(self) -> int:
+        """Largest batch the server accepts, capped by configuration (uncapped for the local store)."""
+        try:
+            server_max = int(self.client.get_max_batch_size())
+        except Exception:
+            return config.upsert_max_batch_size
+        if isinstance(self.client, LocalVectorClient):
+            return server_max
+        return min(config.upsert_max_batch_size, server_max)
     
     def query(self,
               query_text: str,
@@ -308,73 +405,68 @@ class ChromaDBClient:
             return 0
     
     def stats(self) -> Dict[str, Any]:
-        """Get detailed statistics about the collection with standardized schema."""
+        """Get statistics over the whole collection from one streaming pass."""
         if not self.collection:
             self.get_or_create_collection()
 
         try:
-            count = self.collection.count()
-
-            # Get sample of metadata to analyze
-            sample_size = min(1000, count) if count > 0 else 0
-            sample_results = self.collection.get(limit=sample_size, include=["metadatas"]) if sample_size > 0 else {"metadatas": []}
+            results = self.scan({
+                "entity_types": FieldCounter("entity_type", default="unknown"),
+                "sources": FieldCounter("source_id", default="unknown"),
+                "gpa_bands": FieldCounter("gpa_band", default="not_specified"),
+                "schools": DistinctValues("school"),
+                "locations": DistinctValues("location"),
+                "years": DistinctValues("year"),
+                "schema_compliance": ComplianceRate(self._is_compliant),
+                "text_length": TextLengthHistogram(),
+            })
 
-            stats = {
-                "total_documents": count,
+            return {
+                "total_documents": results["records_scanned"],
                 "collection_name": self.collection_name,
                 "schema_version": SCHEMA_VERSION,
                 "embedding_model": EMBEDDING_MODEL,
-                "sample_size": sample_size,
-                "entity_types": {},
-                "schools": set(),
-                "locations": set(),
-                "gpa_bands": {},
-                "years": set(),
-                "schema_compliance": 0.0
+                "sample_size": results["records_scanned"],
+                **results
             }
 
-            compliant_docs = 0
-
-            if sample_results.get('metadatas'):
-                for metadata in sample_results['metadatas']:
-                    # Check schema compliance
-                    if self._validate_metadata(metadata):
-                        compliant_docs += 1
-
-                    # Count entity types
-                    entity_type = metadata.get('entity_type', 'unknown')
-                    stats['entity_types'][entity_type] = stats['entity_types'].get(entity_type, 0) + 1
-
-                    # Collect schools
-                    if metadata.get('school'):
-                        stats['schools'].add(metadata['school'])
-
-                    # Collect locations
-                    if metadata.get('location'):
-                        stats['locations'].add(metadata['location'])
-
-                    # Count GPA bands
-                    gpa_band = metadata.get('gpa_band', 'not_specified')
-                    stats['gpa_bands'][gpa_band] = stats['gpa_bands'].get(gpa_band, 0) + 1
-
-                    # Collect years
-                    if metadata.get('year'):
-                        stats['years'].add(metadata['year'])
+        except Exception as e:
+            logger.error(f"Error getting collection stats: {e}")
+            return {"error": str(e)}
 
-            # Calculate schema compliance
-            if sample_size > 0:
-                stats['schema_compliance'] = compliant_docs / sample_size
+    def scan(self, aggregators: Dict[str, Aggregator], collection_name: str = None) -> Dict[str, Any]:
+        """
+        Run aggregators over every record of a collection in one paginated pass.
 
-            # Convert sets to lists for JSON serialization
-            stats['schools'] = sorted(list(stats['schools']))
-            stats['locations'] = sorted(list(stats['locations']))
-            stats['years'] = sorted(list(stats['years']))
+        Results (plus ``records_scanned``) are cached by collection version,
+        so an unchanged collection is not scanned again.
 
-            return stats
+        Args:
+            aggregators: Aggregators by result name
+            collection_name: Collection to scan (defaults to the active one)
 
-        except Exception as e:
-            logger.error(f"Error getting collection stats: {e}")
-            return {"error": str(e)}
+        Returns:
+            Dict: Each aggregator's result under its name
+        """
+        collection_name = collection_name or self._active_collection or self.collection_name
+        client = self.client
+        version = collection_version(client, collection_name)
+        cache_key = f"{collection_name}." + "+".join(
+            f"{name}={aggregators[name].describe()}" for name in sorted(aggregators)
+        )
+
+        cached = _scan_cache.get(cache_key, version)
+        if cached is not None:
+            logger.info(f"Using cached statistics for {collection_name} (version {version})")
+            return cached
+
+        collection = self.registry.collection(client, collection_name, create=False)
+        scanned = scan_collection(collection, aggregators, page_size=config.scan_page_size)
+        results = {name: aggregator.result() for name, aggregator in aggregators.items()}
+        results["records_scanned"] = scanned
+        _scan_cache.put(cache_key, version, results)
+        logger.info(f"Scanned {scanned} records in {collection_name}")
+        return results
     
     def delete(self, ids: List[str] = None, where: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -404,6 +496,7 @@ class ChromaDBClient:
 
             if ids_to_delete:
                 self.collection.delete(ids=ids_to_delete, where=where)
+                mark_changed(self.collection)
                 logger.info(f"Deleted {len(ids_to_delete)} documents")
 
                 return {
@@ -522,6 +615,12 @@ class ChromaDBClient:
             logger.error(f"Error validating metadata: {e}")
             return False
 
+    @staticmethod
+    def _is_compliant(metadata: Dict[str, Any]) -> bool:
+        """Quiet form of _validate_metadata for whole-collection statistics."""
+        return (all(field in metadata for field in REQUIRED_METADATA_FIELDS)
+                and metadata.get("schema_version") == SCHEMA_VERSION)
+
     def create_filters(self,
                       entity_types: List[str] = None,
                       schools: List[str] = None,
@@ -0,0 +1,358 @@
+"""
+Process-wide registry of pooled ChromaDB clients.
+
+Every ``chromadb.HttpClient`` owns its own httpx connection pool, so a
+client per collection (or per consumer) means one pool, one handshake and
+one heartbeat each. The registry hands out one client per endpoint and
+caches collection handles on it, so CollectionManager, RAGClient and
+ProductionRAG share connections within a process.
+
+Clients are opened with a heartbeat and reconnected with exponential
+backoff. Idle HTTP clients are closed so their sockets do not outlive
+server or load balancer keep-alive, and the registry is rebuilt after a
+fork so worker processes never share a socket with their parent.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import chromadb
+from chromadb.config import Settings
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolSettings:
+    """Connection pool sizing and reconnect policy."""
+
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_secs: float = 40.0
+    idle_timeout_secs: float = 600.0
+    connect_retries: int = 4
+    backoff_base_secs: float = 0.25
+    backoff_max_secs: float = 8.0
+
+    @classmethod
+    def from_config(cls, cfg=None) -> "PoolSettings":
+        """Pool settings from the pipeline configuration."""
+        cfg = cfg or config
+        return cls(
+            max_connections=cfg.chroma_pool_max_connections,
+            max_keepalive_connections=cfg.chroma_pool_max_keepalive,
+            keepalive_secs=cfg.chroma_pool_keepalive_secs,
+            idle_timeout_secs=cfg.chroma_pool_idle_timeout_secs,
+            connect_retries=cfg.chroma_connect_retries,
+            backoff_base_secs=cfg.chroma_connect_backoff_secs,
+        )
+
+    def chroma_settings(self) -> Settings:
+        """Chroma settings carrying the pool limits."""
+        return Settings(
+            anonymized_telemetry=False,
+            chroma_http_max_connections=self.max_connections,
+            chroma_http_max_keepalive_connections=self.max_keepalive_connections,
+            chroma_http_keepalive_secs=self.keepalive_secs,
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry ``attempt`` (1-based), with full jitter."""
+        ceiling = min(self.backoff_max_secs, self.backoff_base_secs * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class _Endpoint:
+    """One shared client plus its collection handles and counters."""
+
+    def __init__(self, label: str, factory: Callable[[], Any], evictable: bool):
+        self.label = label
+        self.factory = factory
+        self.evictable = evictable
+        self.client = None
+        self.collections: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+        self.opened_at = 0.0
+        self.last_used = 0.0
+        self.stats = {
+            "connects": 0,
+            "reconnects": 0,
+            "connect_failures": 0,
+            "evictions": 0,
+            "acquisitions": 0,
+            "collection_hits": 0,
+            "collection_misses": 0,
+        }
+
+
+class ChromaClientRegistry:
+    """
+    Shared ChromaDB clients keyed by endpoint.
+
+    ``http_client`` / ``persistent_client`` / ``default_client`` return the
+    live client for an endpoint, opening it on first use. HTTP clients
+    are closed after sitting idle and reopened on the next acquisition, so
+    callers re-acquire through the registry rather than hold one across
+    idle periods. Persistent clients are never evicted.
+    """
+
+    def __init__(self, settings: Optional[PoolSettings] = None):
+        self.settings = settings or PoolSettings()
+        self._endpoints: Dict[Tuple, _Endpoint] = {}
+        self._issued: "weakref.WeakKeyDictionary[Any, _Endpoint]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Acquisition
+    # ------------------------------------------------------------------
+
+    def http_client(self, host: str, port: int, ssl: bool = False,
+                    headers: Optional[Dict[str, str]] = None) -> Any:
+        """Shared client for a Chroma server."""
+        key = ("http", host, int(port), bool(ssl), tuple(sorted((headers or {}).items())))
+        label = f"{'https' if ssl else 'http'}://{host}:{port}"
+
+        def factory():
+            return chromadb.HttpClient(
+                host=host, port=port, ssl=ssl, headers=headers,
+                settings=self.settings.chroma_settings()
+            )
+
+        return self._acquire(key, label, factory, evictable=True)
+
+    def persistent_client(self, path: str) -> Any:
+        """Shared client for an on-disk Chroma database."""
+        path = os.path.abspath(path)
+
+        def factory():
+            return chromadb.PersistentClient(path=path, settings=Settings(anonymized_telemetry=False))
+
+        return self._acquire(("persistent", path), f"file://{path}", factory, evictable=False)
+
+    def local_client(self, path: str) -> Any:
+        """Shared client for an embedded local vector store (see local_vector_store)."""
+        path = os.path.abspath(path)
+
+        def factory():
+            from .local_vector_store import LocalVectorClient
+            return LocalVectorClient(
+                path, ivf_lists=config.local_ivf_lists, ivf_probes=config.local_ivf_probes,
+                ivf_min_rows=config.local_ivf_min_rows, quantization=config.local_vector_quantization,
+                rescore_factor=config.local_rescore_factor
+            )
+
+        return self._acquire(("local", path), f"local://{path}", factory, evictable=False)
+
+    def default_client(self) -> Any:
+        """
+        Client for the configured backend: the local store when
+        VECTOR_BACKEND=local, else the Chroma endpoint (cloud if credentials are set).
+        """
+        if config.vector_backend == "local":
+            return self.local_client(str(config.local_vector_path))
+        if config.chroma_cloud_host and config.chroma_cloud_api_key:
+            return self.http_client(
+                config.chroma_cloud_host, 443, ssl=True,
+                headers={"Authorization": f"Bearer {config.chroma_cloud_api_key}"}
+            )
+        return self.http_client(config.chroma_host, config.chroma_port)
+
+    def collection(self, client: Any, name: str, metadata: Optional[Dict[str, Any]] = None,
+                   create: bool = True) -> Any:
+        """
+        Cached collection handle on a registry client.
+
+        Gets the collection, creating it with ``metadata`` if it does not
+        exist yet (``create=False`` raises instead). Handles are dropped when the client reconnects or is
+        evicted, and a stale client is swapped for the endpoint's live one.
+        """
+        endpoint = self._issued.get(client)
+        if endpoint is None:
+            return client.get_or_create_collection(name, metadata=metadata) if create else client.get_collection(name)
+
+        with endpoint.lock:
+            endpoint.last_used = time.monotonic()
+            handle = endpoint.collections.get(name)
+            if handle is not None:
+                endpoint.stats["collection_hits"] += 1
+                return handle
+            endpoint.stats["collection_misses"] += 1
+            live = endpoint.client if endpoint.client is not None else self._open(endpoint)
+            try:
+                handle = live.get_collection(name)
+            except Exception:
+                if not create:
+                    raise
+                handle = live.create_collection(name=name, metadata=metadata)
+            endpoint.collections[name] = handle
+            return handle
+
+    def forget_collection(self, client: Any, name: str):
+        """Drop a cached handle (after the collection is deleted or recreated)."""
+        endpoint = self._issued.get(client)
+        if endpoint is not None:
+            with endpoint.lock:
+                endpoint.collections.pop(name, None)
+
+    def reconnect(self, client: Any) -> Any:
+        """
+        Replace a failing client and return the new one.
+
+        If another caller already replaced it, the current client is
+        returned without reconnecting again.
+        """
+        endpoint = self._issued.get(client)
+        if endpoint is None:
+            raise ValueError("Client was not issued by this registry")
+        with endpoint.lock:
+            if endpoint.client is not None and endpoint.client is not client:
+                return endpoint.client
+            self._close(endpoint)
+            endpoint.stats["reconnects"] += 1
+            return self._open(endpoint)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Close clients idle for longer than the idle timeout; returns how many."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            endpoints = list(self._endpoints.values())
+
+        evicted = 0
+        for endpoint in endpoints:
+            with endpoint.lock:
+                idle = now - endpoint.last_used
+                if endpoint.evictable and endpoint.client is not None and idle > self.settings.idle_timeout_secs:
+                    logger.info(f"Evicting idle ChromaDB client {endpoint.label}")
+                    self._close(endpoint)
+                    endpoint.stats["evictions"] += 1
+                    evicted += 1
+        return evicted
+
+    def close_all(self):
+        """Close every client (shutdown)."""
+        with self._lock:
+            endpoints = list(self._endpoints.values())
+            self._endpoints.clear()
+        for endpoint in endpoints:
+            with endpoint.lock:
+                self._close(endpoint)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool settings and per-endpoint counters."""
+        now = time.monotonic()
+        with self._lock:
+            endpoints = list(self._endpoints.values())
+        return {
+            "settings": {
+                "max_connections": self.settings.max_connections,
+                "max_keepalive_connections": self.settings.max_keepalive_connections,
+                "keepalive_secs": self.settings.keepalive_secs,
+                "idle_timeout_secs": self.settings.idle_timeout_secs,
+            },
+            "endpoints": {
+                endpoint.label: {
+                    **endpoint.stats,
+                    "open": endpoint.client is not None,
+                    "collections": len(endpoint.collections),
+                    "idle_secs": round(now - endpoint.last_used, 3) if endpoint.last_used else None,
+                }
+                for endpoint in endpoints
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _acquire(self, key: Tuple, label: str, factory: Callable[[], Any], evictable: bool) -> Any:
+        self.evict_idle()
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = _Endpoint(label, factory, evictable)
+
+        with endpoint.lock:
+            endpoint.stats["acquisitions"] += 1
+            endpoint.last_used = time.monotonic()
+            if endpoint.client is None:
+                self._open(endpoint)
+            return endpoint.client
+
+    def _open(self, endpoint: _Endpoint) -> Any:
+        """Create and heartbeat a client, retrying with backoff (caller holds endpoint.lock)."""
+        attempts = max(1, self.settings.connect_retries)
+        last_error = None
+        for attempt in range(1, attempts + 1):
+            client = None
+            try:
+                client = endpoint.factory()
+                client.heartbeat()
+            except Exception as e:
+                last_error = e
+                endpoint.stats["connect_failures"] += 1
+                if client is not None:
+                    self._close_client(client)
+                if attempt < attempts:
+                    delay = self.settings.backoff(attempt)
+                    logger.warning(f"ChromaDB connect to {endpoint.label} failed ({e}); retrying in {delay:.2f}s")
+                    time.sleep(delay)
+                continue
+
+            self._issued[client] = endpoint
+            endpoint.client = client
+            endpoint.collections.clear()
+            endpoint.opened_at = endpoint.last_used = time.monotonic()
+            endpoint.stats["connects"] += 1
+            logger.info(f"Connected to ChromaDB at {endpoint.label}")
+            return client
+
+        raise ConnectionError(f"Failed to connect to ChromaDB at {endpoint.label}: {last_error}")
+
+    def _close(self, endpoint: _Endpoint):
+        if endpoint.client is not None:
+            self._close_client(endpoint.client)
+        endpoint.client = None
+        endpoint.collections.clear()
+
+    @staticmethod
+    def _close_client(client: Any):
+        close = getattr(client, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"Error closing ChromaDB client: {e}")
+
+
+_registry: Optional[ChromaClientRegistry] = None
+_registry_pid: Optional[int] = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> ChromaClientRegistry:
+    """
+    The process-wide registry.
+
+    A forked worker gets a fresh registry instead of inheriting its
+    parent's sockets.
+    """
+    global _registry, _registry_pid
+    pid = os.getpid()
+    with _registry_lock:
+        if _registry is None or _registry_pid != pid:
+            _registry = ChromaClientRegistry(PoolSettings.from_config())
+            _registry_pid = pid
+        return _registry
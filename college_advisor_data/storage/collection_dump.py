@@ -0,0 +1,385 @@
+"""
+Columnar dump and restore of vector collections.
+
+A dump is a directory per collection:
+
+    manifest.json       name, metadata, count, dimension, column types, file checksums
+    records.parquet     id, document and one typed column per metadata key
+    embeddings.f32      raw little-endian float32 matrix, row i = parquet row i
+
+Export pages through the collection and appends every page as a Parquet
+row group and a slice of the vector file, so memory stays at one page
+and collections larger than RAM can be dumped. Restore verifies the
+checksums and bulk-loads the stored embeddings (nothing is re-embedded)
+through BulkUpserter, or streams them into a local vector store.
+
+Metadata keys whose values all share one scalar type get a native
+column (string, int64, float64, bool); keys with mixed or list values
+are stored as JSON strings so they round-trip exactly. Absent keys are
+nulls and stay absent on restore.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .bulk_upsert import BulkUpserter
+from .collection_scan import collection_version, mark_changed
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+DUMP_FORMAT = 1
+MANIFEST = "manifest.json"
+RECORDS = "records.parquet"
+EMBEDDINGS = "embeddings.f32"
+INDEX = "dump.json"
+
+_SCALAR_TYPES = {str: "string", bool: "bool", int: "int64", float: "float64"}
+
+
+class DumpIntegrityError(ValueError):
+    """Raised when a dump's files do not match its manifest."""
+
+
+def _arrow():
+    """pyarrow and pyarrow.parquet, imported on first use."""
+    import pyarrow
+    import pyarrow.parquet
+    return pyarrow, pyarrow.parquet
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _pages(collection: Any, include: List[str], page_size: int) -> Iterator[Dict[str, Any]]:
+    offset = 0
+    while True:
+        page = collection.get(limit=page_size, offset=offset, include=include)
+        ids = page.get("ids") or []
+        if not ids:
+            return
+        yield page
+        offset += len(ids)
+        if len(ids) < page_size:
+            return
+
+
+def _column_types(collection: Any, page_size: int) -> Dict[str, str]:
+    """Arrow type per metadata key, from a metadata-only pass over the collection."""
+    seen: Dict[str, set] = {}
+    for page in _pages(collection, ["metadatas"], page_size):
+        for metadata in page.get("metadatas") or []:
+            for key, value in (metadata or {}).items():
+                seen.setdefault(key, set()).add(type(value))
+    types = {}
+    for key, kinds in seen.items():
+        kind = next(iter(kinds)) if len(kinds) == 1 else None
+        types[key] = _SCALAR_TYPES.get(kind, "json")
+    return types
+
+
+def _schema(column_types: Dict[str, str]):
+    pa, _ = _arrow()
+    arrow_types = {"string": pa.string(), "int64": pa.int64(), "float64": pa.float64(),
+                   "bool": pa.bool_(), "json": pa.string()}
+    fields = [pa.field("id", pa.string(), nullable=False), pa.field("document", pa.string())]
+    fields += [pa.field(f"meta.{key}", arrow_types[kind]) for key, kind in column_types.items()]
+    return pa.schema(fields)
+
+
+def _record_batch(schema, column_types: Dict[str, str], ids, documents, metadatas):
+    pa, _ = _arrow()
+    columns = {"id": list(ids), "document": list(documents)}
+    for key, kind in column_types.items():
+        values = [(metadata or {}).get(key) for metadata in metadatas]
+        if kind == "json":
+            values = [None if v is None else json.dumps(v) for v in values]
+        columns[f"meta.{key}"] = values
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def export_collection(collection: Any, out_dir: Union[str, Path], page_size: Optional[int] = None,
+                      client: Any = None) -> Dict[str, Any]:
+    """
+    Dump one collection into ``out_dir``; returns the manifest.
+
+    Two streaming passes: metadata only (to fix the column types), then
+    every page with embeddings and documents. The manifest is written
+    last, so a directory without one is an incomplete dump. With
+    ``client``, the collection version is compared before and after to
+    detect writes during the export.
+    """
+    _, pq = _arrow()
+    page_size = page_size or config.scan_page_size
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+    started = time.perf_counter()
+    version = _version(client, collection.name)
+    column_types = _column_types(collection, page_size)
+    schema = _schema(column_types)
+
+    count = 0
+    dimension = None
+    vector_digest = hashlib.sha256()
+    with pq.ParquetWriter(out_dir / RECORDS, schema, compression="zstd") as writer, \
+            open(out_dir / EMBEDDINGS, "wb") as vectors:
+        for page in _pages(collection, ["embeddings", "documents", "metadatas"], page_size):
+            ids = page["ids"]
+            embeddings = np.ascontiguousarray(page["embeddings"], dtype="<f4")
+            if dimension is None:
+                dimension = embeddings.shape[1]
+            elif embeddings.shape[1] != dimension:
+                raise ValueError(f"Mixed embedding dimensions in {collection.name}: {dimension} and {embeddings.shape[1]}")
+            data = embeddings.tobytes()
+            vectors.write(data)
+            vector_digest.update(data)
+            writer.write_batch(_record_batch(
+                schema, column_types, ids,
+                page.get("documents") or [None] * len(ids),
+                page.get("metadatas") or [None] * len(ids)
+            ))
+            count += len(ids)
+
+    if version is not None and _version(client, collection.name) != version:
+        logger.warning(f"{collection.name} changed during export; the dump may mix old and new records")
+
+    manifest = {
+        "format": DUMP_FORMAT,
+        "name": collection.name,
+        "metadata": collection.metadata,
+        "count": count,
+        "dimension": dimension,
+        "dtype": "float32",
+        "byte_order": "little",
+        "columns": column_types,
+        "source_version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "files": {
+            RECORDS: {"sha256": _sha256(out_dir / RECORDS), "bytes": (out_dir / RECORDS).stat().st_size},
+            EMBEDDINGS: {"sha256": vector_digest.hexdigest(), "bytes": (out_dir / EMBEDDINGS).stat().st_size},
+        },
+    }
+    tmp = out_dir / f".{MANIFEST}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2, default=str))
+    os.replace(tmp, manifest_path)
+    logger.info(f"Exported {collection.name}: {count} records in {time.perf_counter() - started:.2f}s")
+    return manifest
+
+
+def _version(client: Any, name: str) -> Optional[str]:
+    if client is None:
+        return None
+    try:
+        return collection_version(client, name)
+    except Exception:
+        return None
+
+
+class CollectionDump:
+    """
+    Read side of a collection dump.
+
+    Exposes ``name``, ``metadata``, ``count()`` and a Chroma-style
+    ``get(limit, offset, include)``, so a dump can be streamed anywhere a
+    collection is read page by page (e.g. build_from_chroma).
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        manifest_path = self.path / MANIFEST
+        if not manifest_path.exists():
+            raise DumpIntegrityError(f"No {MANIFEST} in {self.path} (missing or incomplete dump)")
+        self.manifest = json.loads(manifest_path.read_text())
+        if self.manifest.get("format") != DUMP_FORMAT:
+            raise DumpIntegrityError(f"Unsupported dump format {self.manifest.get('format')} in {self.path}")
+        self.name = self.manifest["name"]
+        self.metadata = self.manifest.get("metadata")
+        self.columns: Dict[str, str] = self.manifest["columns"]
+        self._parquet = None
+        self._row_group_starts = None
+
+    def count(self) -> int:
+        return self.manifest["count"]
+
+    def verify(self):
+        """Check every file against the manifest's sizes and checksums."""
+        for name, expected in self.manifest["files"].items():
+            path = self.path / name
+            if not path.exists():
+                raise DumpIntegrityError(f"{path} is missing")
+            if path.stat().st_size != expected["bytes"]:
+                raise DumpIntegrityError(f"{path} is {path.stat().st_size} bytes, expected {expected['bytes']}")
+            if _sha256(path) != expected["sha256"]:
+                raise DumpIntegrityError(f"{path} checksum mismatch")
+        expected_bytes = 4 * self.count() * (self.manifest["dimension"] or 0)
+        if self.manifest["files"][EMBEDDINGS]["bytes"] != expected_bytes:
+            raise DumpIntegrityError(f"{EMBEDDINGS} does not hold {self.count()} vectors")
+
+    def vectors(self) -> np.ndarray:
+        """The embedding matrix, memory-mapped read-only."""
+        if not self.count():
+            return np.zeros((0, self.manifest["dimension"] or 0), dtype=np.float32)
+        return np.memmap(self.path / EMBEDDINGS, dtype="<f4", mode="r",
+                         shape=(self.count(), self.manifest["dimension"]))
+
+    def _file(self):
+        if self._parquet is None:
+            _, pq = _arrow()
+            self._parquet = pq.ParquetFile(self.path / RECORDS)
+            sizes = [self._parquet.metadata.row_group(i).num_rows for i in range(self._parquet.num_row_groups)]
+            self._row_group_starts = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        return self._parquet
+
+    def _rows(self, table) -> Dict[str, List[Any]]:
+        columns = table.to_pydict()
+        count = len(columns["id"])
+        metadatas = []
+        for row in range(count):
+            metadata = {}
+            for key, kind in self.columns.items():
+                value = columns[f"meta.{key}"][row]
+                if value is not None:
+                    metadata[key] = json.loads(value) if kind == "json" else value
+            metadatas.append(metadata or None)
+        return {"ids": columns["id"], "documents": columns["document"], "metadatas": metadatas}
+
+    def iter_batches(self, batch_size: int = 10000) -> Iterator[Dict[str, Any]]:
+        """ids, documents, metadatas and embeddings, ``batch_size`` rows at a time."""
+        vectors = self.vectors()
+        start = 0
+        for batch in self._file().iter_batches(batch_size=batch_size):
+            rows = self._rows(batch)
+            end = start + len(rows["ids"])
+            rows["embeddings"] = vectors[start:end]
+            yield rows
+            start = end
+
+    def get(self, limit: Optional[int] = None, offset: Optional[int] = None,
+            include: Sequence[str] = ("metadatas", "documents"), **_) -> Dict[str, Any]:
+        """Rows [offset, offset + limit) in the Chroma result shape."""
+        parquet = self._file()
+        start = offset or 0
+        end = self.count() if limit is None else min(self.count(), start + limit)
+        if start >= end:
+            return {"ids": [], "documents": None, "metadatas": None, "embeddings": None}
+
+        starts = self._row_group_starts
+        first = int(np.searchsorted(starts, start, side="right")) - 1
+        last = int(np.searchsorted(starts, end, side="left"))
+        table = parquet.read_row_groups(list(range(first, last)))
+        table = table.slice(start - int(starts[first]), end - start)
+        rows = self._rows(table)
+        return {
+            "ids": rows["ids"],
+            "documents": rows["documents"] if "documents" in include else None,
+            "metadatas": rows["metadatas"] if "metadatas" in include else None,
+            "embeddings": np.asarray(self.vectors()[start:end]) if "embeddings" in include else None,
+        }
+
+
+def restore_collection(dump: Union[str, Path, CollectionDump], client: Any, name: Optional[str] = None,
+                       replace: bool = False, verify: bool = True, batch_size: int = 10000) -> Dict[str, Any]:
+    """
+    Load a dump into ``client`` under ``name`` (default: the dumped name).
+
+    The target must not exist unless ``replace`` is set. Chroma targets
+    are loaded through BulkUpserter with the stored embeddings; a
+    LocalVectorClient target is built in one streamed generation.
+    """
+    from .local_vector_store import LocalVectorClient, build_from_chroma
+
+    dump = dump if isinstance(dump, CollectionDump) else CollectionDump(dump)
+    if verify:
+        dump.verify()
+    name = name or dump.name
+    started = time.perf_counter()
+
+    existing = [c.name if hasattr(c, "name") else c for c in client.list_collections()]
+    if name in existing:
+        if not replace:
+            raise ValueError(f"Collection {name} already exists (pass replace=True to overwrite it)")
+        client.delete_collection(name)
+
+    if isinstance(client, LocalVectorClient):
+        target = build_from_chroma(dump, client, name=name, page_size=batch_size)
+        return {"name": name, "total": dump.count(), "succeeded": target.count(), "failed": 0,
+                "elapsed_seconds": round(time.perf_counter() - started, 3)}
+
+    target = client.create_collection(name=name, metadata=dump.metadata)
+    upserter = BulkUpserter(
+        collection=lambda: target,
+        max_in_flight=config.upsert_max_in_flight,
+        initial_batch_size=config.batch_size,
+        min_batch_size=config.upsert_min_batch_size,
+        max_batch_size=min(config.upsert_max_batch_size, _max_batch_size(client)),
+        target_latency_secs=config.upsert_target_latency_secs,
+        max_retries=config.upsert_max_retries
+    )
+    succeeded = failed = 0
+    for batch in dump.iter_batches(batch_size):
+        report = upserter.run(batch["ids"], batch["embeddings"], batch["documents"], batch["metadatas"])
+        succeeded += report["succeeded"]
+        failed += report["failed"]
+    if succeeded:
+        mark_changed(target)
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Restored {name}: {succeeded}/{dump.count()} records in {elapsed:.2f}s")
+    return {"name": name, "total": dump.count(), "succeeded": succeeded, "failed": failed,
+            "elapsed_seconds": round(elapsed, 3)}
+
+
+def _max_batch_size(client: Any) -> int:
+    try:
+        return int(client.get_max_batch_size())
+    except Exception:
+        return config.upsert_max_batch_size
+
+
+def export_collections(client: Any, out_dir: Union[str, Path], names: Optional[Sequence[str]] = None,
+                       page_size: Optional[int] = None) -> Dict[str, Any]:
+    """Dump several collections (default: all) under ``out_dir``, with a dump.json index."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    names = list(names) if names else [c.name if hasattr(c, "name") else c for c in client.list_collections()]
+    collections = {}
+    for name in names:
+        manifest = export_collection(client.get_collection(name), out_dir / name, page_size=page_size, client=client)
+        collections[name] = {"path": name, "count": manifest["count"], "dimension": manifest["dimension"]}
+    index = {
+        "format": DUMP_FORMAT,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "total_collections": len(collections),
+        "total_documents": sum(c["count"] for c in collections.values()),
+        "collections": collections,
+    }
+    (out_dir / INDEX).write_text(json.dumps(index, indent=2))
+    return index
+
+
+def restore_collections(dump_dir: Union[str, Path], client: Any, names: Optional[Sequence[str]] = None,
+                        replace: bool = False, verify: bool = True) -> List[Dict[str, Any]]:
+    """Restore collections from an export_collections() directory."""
+    dump_dir = Path(dump_dir)
+    index = json.loads((dump_dir / INDEX).read_text())
+    selected = list(names) if names else list(index["collections"])
+    return [
+        restore_collection(dump_dir / index["collections"][name]["path"], client, replace=replace, verify=verify)
+        for name in selected
+    ]
@@ -15,6 +15,7 @@ from pathlib import Path
 import json
 
 from .chroma_client import ChromaDBClient
+from .client_registry import ChromaClientRegistry, get_client_registry
 from ..schemas import DocumentChunk, DocumentMetadata
 
 logger = logging.getLogger(__name__)
@@ -66,7 +67,9 @@ class CollectionManager:
         }
     }
     
-    def __init__(self):
+    def __init__(self, registry: Optional[ChromaClientRegistry] = None):
+        # Every collection shares one pooled client and its collection handles
+        self.registry = registry or get_client_registry()
         self.clients = {}
         self.stats = {
             "collections_created": 0,
@@ -85,7 +88,7 @@ class CollectionManager:
             ChromaDBClient instance
         """
         if collection_name not in self.clients:
-            self.clients[collection_name] = ChromaDBClient(collection_name=collection_name)
+            self.clients[collection_name] = ChromaDBClient(collection_name=collection_name, registry=self.registry)
             self.clients[collection_name].get_or_create_collection()
             self.stats["collections_created"] += 1
         
@@ -346,6 +349,10 @@ class CollectionManager:
                     }
         
         return stats
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool settings and per-endpoint counters for the shared client."""
+        return self.registry.stats()
     
     def export_collection_to_json(
         self,
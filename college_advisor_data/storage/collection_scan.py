@@ -0,0 +1,232 @@
+"""
+Streaming, single-pass statistics over a ChromaDB collection.
+
+A scan pages through the whole collection once and feeds every record to
+a set of aggregators, so any number of distributions cost one pass and
+memory stays at one page plus the aggregators' own state (counters and
+distinct-value sets, never per-record lists).
+
+Results are cached by collection version: the collection id, a
+``data_version`` token that ChromaDBClient rewrites on every write, and
+the record count. An unchanged version skips the scan entirely; Chroma
+has no change feed, so a changed version rescans the collection.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_KEY = "data_version"
+
+
+def _describe_value(value: Any) -> Any:
+    """JSON stand-in for an aggregator attribute (functions by qualified name)."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    name = getattr(value, "__qualname__", type(value).__qualname__)
+    return f"{getattr(value, '__module__', type(value).__module__)}.{name}"
+
+
+class Aggregator:
+    """Folds records one at a time into bounded state."""
+
+    # Scans only fetch documents when some aggregator reads them
+    needs_documents = False
+
+    def describe(self) -> str:
+        """Type and parameters of a fresh aggregator, part of the scan cache key."""
+        return f"{type(self).__qualname__}{json.dumps(vars(self), sort_keys=True, default=_describe_value)}"
+
+    def update(self, metadata: Dict[str, Any], document: Optional[str]):
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        """JSON-serializable summary."""
+        raise NotImplementedError
+
+
+class FieldCounter(Aggregator):
+    """Occurrences of each value of a metadata field."""
+
+    def __init__(self, field: str, default: Optional[str] = None, top: Optional[int] = None):
+        self.field = field
+        self.default = default
+        self.top = top
+        self.counts = Counter()
+
+    def update(self, metadata, document):
+        value = metadata.get(self.field, self.default)
+        if value is not None and value != "":
+            self.counts[value] += 1
+
+    def result(self) -> Dict[Any, int]:
+        return dict(self.counts.most_common(self.top))
+
+
+class DistinctValues(Aggregator):
+    """Sorted distinct values of a metadata field."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.values = set()
+
+    def update(self, metadata, document):
+        value = metadata.get(self.field)
+        if value:
+            self.values.add(value)
+
+    def result(self) -> list:
+        return sorted(self.values)
+
+
+class ComplianceRate(Aggregator):
+    """Fraction of records whose metadata passes a check."""
+
+    def __init__(self, check: Callable[[Dict[str, Any]], bool]):
+        self.check = check
+        self.passed = 0
+        self.total = 0
+
+    def update(self, metadata, document):
+        self.total += 1
+        if self.check(metadata):
+            self.passed += 1
+
+    def result(self) -> float:
+        return self.passed / self.total if self.total else 0.0
+
+
+class TextLengthHistogram(Aggregator):
+    """Document lengths in characters, bucketed by powers of two."""
+
+    needs_documents = True
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def update(self, metadata, document):
+        length = len(document or "")
+        self.count += 1
+        self.total += length
+        self.max = max(self.max, length)
+        # Bucket b holds lengths in [2**(b-1), 2**b); bucket 0 is empty text
+        self.buckets[0 if length == 0 else int(math.log2(length)) + 1] += 1
+
+    def result(self) -> Dict[str, Any]:
+        labelled = {}
+        for bucket in sorted(self.buckets):
+            label = "0" if bucket == 0 else f"{2 ** (bucket - 1)}-{2 ** bucket - 1}"
+            labelled[label] = self.buckets[bucket]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else 0.0,
+            "max": self.max,
+            "buckets": labelled,
+        }
+
+
+def scan_collection(collection: Any, aggregators: Dict[str, Aggregator], page_size: int = 1000) -> int:
+    """
+    Feed every record of a collection to the aggregators; returns records scanned.
+
+    One ``get`` per page, with documents only when an aggregator needs them.
+    """
+    include = ["metadatas"]
+    if any(aggregator.needs_documents for aggregator in aggregators.values()):
+        include.append("documents")
+
+    scanned = 0
+    while True:
+        page = collection.get(limit=page_size, offset=scanned, include=include)
+        ids = page.get("ids") or []
+        if not ids:
+            break
+        metadatas = page.get("metadatas") or [None] * len(ids)
+        documents = page.get("documents") or [None] * len(ids)
+        for metadata, document in zip(metadatas, documents):
+            metadata = metadata or {}
+            for aggregator in aggregators.values():
+                aggregator.update(metadata, document)
+        scanned += len(ids)
+        if len(ids) < page_size:
+            break
+    return scanned
+
+
+def collection_version(client: Any, name: str) -> str:
+    """Version of a collection: id, data_version token and record count."""
+    fresh = client.get_collection(name)
+    token = (fresh.metadata or {}).get(DATA_VERSION_KEY, "0")
+    return f"{fresh.id}:{token}:{fresh.count()}"
+
+
+def collection_space(collection: Any) -> str:
+    """Distance function of a collection: its hnsw:space, else Chroma's configured space, else l2."""
+    space = (collection.metadata or {}).get("hnsw:space")
+    if space is None:
+        configuration = getattr(collection, "configuration_json", None) or {}
+        space = (configuration.get("hnsw") or {}).get("space")
+    return space or "l2"
+
+
+def mark_changed(collection: Any):
+    """Give the collection a new data_version token after a write."""
+    metadata = dict(collection.metadata or {})
+    if getattr(collection, "configuration_json", None) is not None:
+        # Chroma rejects hnsw:* keys in modify(); the index settings live in its configuration
+        metadata = {key: value for key, value in metadata.items() if not key.startswith("hnsw:")}
+    metadata[DATA_VERSION_KEY] = uuid.uuid4().hex[:16]
+    try:
+        collection.modify(metadata=metadata)
+    except Exception as e:
+        # Stats still refresh when the record count changes
+        logger.warning(f"Could not update data version for {getattr(collection, 'name', collection)}: {e}")
+
+
+class ScanCache:
+    """Scan results keyed by collection version, in memory and optionally as JSON files."""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def _path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        prefix = "".join(c if c.isalnum() or c in "-_" else "_" for c in key.split(".", 1)[0])[:64]
+        return self.cache_dir / f"{prefix}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.json"
+
+    def get(self, key: str, version: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            path = self._path(key)
+            if path is not None and path.exists():
+                try:
+                    entry = json.loads(path.read_text())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable scan cache {path}: {e}")
+        if entry and entry.get("version") == version:
+            self._entries[key] = entry
+            return entry["results"]
+        return None
+
+    def put(self, key: str, version: str, results: Dict[str, Any]):
+        entry = {"version": version, "results": results}
+        self._entries[key] = entry
+        path = self._path(key)
+        if path is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(entry, default=str))
+            except OSError as e:
+                logger.warning(f"Could not write scan cache {path}: {e}")
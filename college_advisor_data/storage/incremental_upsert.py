@@ -0,0 +1,314 @@
+"""
+Checksum-driven incremental upsert.
+
+Every collection loaded through this module has a persisted manifest of
+id -> checksum (and the source each id was last loaded from). A load
+diffs the incoming records against it and only sends the new and
+changed ones; ids the manifest holds for the same source that are no
+longer in the input are deleted in batches (for loads without a source,
+only when pruning is asked for). Re-running an unchanged load
+sends nothing, and a refresh where 1% of the records changed sends 1%.
+
+The checksum covers the document text and its metadata minus the
+per-write timestamps, so a record whose text is unchanged but whose
+metadata was edited is still re-sent. Embeddings are not hashed: when
+the embedding model changes, reset the collection instead.
+
+A manifest that is missing, or whose size no longer matches the
+collection (written to by something else), is rebuilt from the records
+already stored, so the first incremental load of an existing collection
+does not resend it either; ids still present keep their recorded source. One loader per collection at a time.
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .bulk_upsert import BulkUpserter
+from .collection_scan import mark_changed
+from ..schemas import calculate_content_checksum
+
+logger = logging.getLogger(__name__)
+
+# Rewritten on every upsert, so they must not make an unchanged record look changed
+VOLATILE_METADATA_FIELDS = frozenset({"created_at", "updated_at"})
+
+
+def record_checksum(document: Optional[str], metadata: Optional[Dict[str, Any]]) -> str:
+    """Checksum of a record's document and stable metadata."""
+    stable = {key: value for key, value in (metadata or {}).items() if key not in VOLATILE_METADATA_FIELDS}
+    payload = json.dumps([document or "", stable], sort_keys=True, ensure_ascii=False, default=str)
+    return calculate_content_checksum(payload)
+
+
+class ChecksumManifest:
+    """Persisted id -> checksum map for one collection, with each id's source."""
+
+    def __init__(self, path: Path, collection_id: str):
+        self.path = Path(path)
+        self.collection_id = str(collection_id)
+        self.checksums: Dict[str, str] = {}
+        self.sources: Dict[str, str] = {}
+        self.loaded = self._load()
+
+    @classmethod
+    def for_collection(cls, collection: Any, directory: Path) -> "ChecksumManifest":
+        """Manifest file for a collection; a recreated collection gets a new one."""
+        name = "".join(c if c.isalnum() or c in "-_" else "_" for c in collection.name)[:64]
+        return cls(Path(directory) / f"{name}-{collection.id}.json", collection.id)
+
+    def __len__(self) -> int:
+        return len(self.checksums)
+
+    def _load(self) -> bool:
+        if not self.path.exists():
+            return False
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checksum manifest {self.path}: {e}")
+            return False
+        if data.get("collection_id") != self.collection_id:
+            return False
+        self.checksums = data.get("checksums", {})
+        self.sources = data.get("sources", {})
+        return True
+
+    def seed(self, collection: Any, page_size: int = 1000) -> int:
+        """
+        Rebuild the checksums from the records in the collection; returns records read.
+
+        Sources are not stored in the collection, so ids still present keep
+        the source the old manifest had for them. Ids with no known source
+        are only pruned by a load without a source and ``prune=True``.
+        """
+        previous = self.sources
+        self.checksums = {}
+        self.sources = {}
+        read = 0
+        while True:
+            page = collection.get(limit=page_size, offset=read, include=["documents", "metadatas"])
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            documents = page.get("documents") or [None] * len(ids)
+            metadatas = page.get("metadatas") or [None] * len(ids)
+            for record_id, document, metadata in zip(ids, documents, metadatas):
+                self.checksums[record_id] = record_checksum(document, metadata)
+                if record_id in previous:
+                    self.sources[record_id] = previous[record_id]
+            read += len(ids)
+            if len(ids) < page_size:
+                break
+        if previous and len(self.sources) < read:
+            logger.warning(f"{read - len(self.sources)} records in {collection.name} have no known source; "
+                           f"a full load with prune=True is needed to delete any that were removed upstream")
+        return read
+
+    def discard(self, record_id: str):
+        self.checksums.pop(record_id, None)
+        self.sources.pop(record_id, None)
+
+    def save(self):
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "collection_id": self.collection_id,
+            "updated_at": time.time(),
+            "checksums": self.checksums,
+            "sources": self.sources
+        }
+        tmp = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex[:8]}")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, self.path)
+
+
+@dataclass
+class ChangeSet:
+    """Result of diffing one load against the manifest."""
+
+    manifest: ChecksumManifest
+    source: Optional[str] = None
+    # New and changed records, in input order
+    positions: List[int] = field(default_factory=list)
+    ids: List[str] = field(default_factory=list)
+    documents: List[str] = field(default_factory=list)
+    metadatas: List[Dict[str, Any]] = field(default_factory=list)
+    checksums: List[str] = field(default_factory=list)
+    new: int = 0
+    unchanged: List[str] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> int:
+        return len(self.ids) - self.new
+
+    def select(self, values: Sequence[Any]) -> List[Any]:
+        """The entries of an input-aligned sequence that need sending."""
+        return [values[i] for i in self.positions]
+
+    def summary(self) -> Dict[str, int]:
+        return {"new": self.new, "changed": self.changed, "unchanged": len(self.unchanged),
+                "to_delete": len(self.delete)}
+
+
+class IncrementalUpserter:
+    """
+    Sends only new and changed records and deletes the ones that disappeared.
+
+    ``collection`` is a callable returning the collection handle, as for
+    BulkUpserter, which does the sending.
+    """
+
+    def __init__(self,
+                 collection: Callable[[], Any],
+                 manifest_dir: Path,
+                 upserter: Optional[BulkUpserter] = None,
+                 delete_batch_size: int = 1000,
+                 page_size: int = 1000):
+        self.collection = collection
+        self.manifest_dir = Path(manifest_dir)
+        self.upserter = upserter or BulkUpserter(collection=collection)
+        self.delete_batch_size = max(1, delete_batch_size)
+        self.page_size = page_size
+
+    def manifest(self) -> ChecksumManifest:
+        """The collection's manifest, rebuilt from the collection when it is missing or stale."""
+        collection = self.collection()
+        manifest = ChecksumManifest.for_collection(collection, self.manifest_dir)
+        count = collection.count()
+        if len(manifest) != count:
+            if manifest.loaded:
+                logger.warning(f"Checksum manifest for {collection.name} has {len(manifest)} ids but the "
+                               f"collection has {count}; rebuilding it")
+            manifest.seed(collection, self.page_size)
+            logger.info(f"Built checksum manifest for {collection.name} from {count} stored records")
+        return manifest
+
+    def diff(self,
+             ids: Sequence[str],
+             documents: Sequence[str],
+             metadatas: Sequence[Dict[str, Any]],
+             source: Optional[str] = None,
+             prune: Optional[bool] = None) -> ChangeSet:
+        """
+        Compare a load with the manifest.
+
+        With ``prune``, ids previously loaded from ``source`` (from any
+        source when it is None) that are not in this load are scheduled
+        for deletion. It defaults to ``source is not None``: a load without
+        a source only deletes when it is the full collection and says so.
+        """
+        if prune is None:
+            prune = source is not None
+        if not len(ids) == len(documents) == len(metadatas):
+            raise ValueError("ids, documents and metadatas must have the same length")
+
+        manifest = self.manifest()
+        changes = ChangeSet(manifest=manifest, source=source)
+        for position, (record_id, document, metadata) in enumerate(zip(ids, documents, metadatas)):
+            checksum = record_checksum(document, metadata)
+            stored = manifest.checksums.get(record_id)
+            if stored == checksum:
+                changes.unchanged.append(record_id)
+                continue
+            changes.new += stored is None
+            changes.positions.append(position)
+            changes.ids.append(record_id)
+            changes.documents.append(document)
+            changes.metadatas.append(metadata)
+            changes.checksums.append(checksum)
+
+        if prune:
+            incoming = set(ids)
+            changes.delete = [
+                record_id for record_id in manifest.checksums
+                if record_id not in incoming and (source is None or manifest.sources.get(record_id) == source)
+            ]
+        return changes
+
+    def apply(self, changes: ChangeSet, embeddings: Optional[Sequence[Sequence[float]]] = None) -> Dict[str, Any]:
+        """
+        Send a change set and record what landed in the manifest.
+
+        ``embeddings`` are aligned with ``changes.ids`` (use
+        ``changes.select`` on input-aligned embeddings), or None to let
+        the collection embed the documents. Records in failed batches
+        keep their old checksum, so the next load retries them.
+        """
+        if embeddings is not None and len(embeddings) != len(changes.ids):
+            raise ValueError("Number of embeddings must match the records to upsert")
+
+        started = time.perf_counter()
+        manifest = changes.manifest
+        if changes.source is not None:
+            for record_id in changes.unchanged:
+                manifest.sources[record_id] = changes.source
+
+        errors = []
+        batches = []
+        upserted = 0
+        if changes.ids:
+            report = self.upserter.run(changes.ids, embeddings, changes.documents, changes.metadatas)
+            batches = report["batches"]
+            upserted = report["succeeded"]
+            for batch in batches:
+                if batch["status"] != "ok":
+                    errors.append(f"Batch {batch['index']} ({batch['size']} records): {batch['error']}")
+                    continue
+                for i in range(batch["start"], batch["start"] + batch["size"]):
+                    manifest.checksums[changes.ids[i]] = changes.checksums[i]
+                    if changes.source is not None:
+                        manifest.sources[changes.ids[i]] = changes.source
+
+        deleted = 0
+        for start in range(0, len(changes.delete), self.delete_batch_size):
+            batch = changes.delete[start:start + self.delete_batch_size]
+            try:
+                self.collection().delete(ids=batch)
+            except Exception as e:
+                errors.append(f"Delete of {len(batch)} records failed: {e}")
+                logger.error(f"Delete of {len(batch)} records failed: {e}")
+                continue
+            for record_id in batch:
+                manifest.discard(record_id)
+            deleted += len(batch)
+
+        manifest.save()
+        if upserted or deleted:
+            mark_changed(self.collection())
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Incremental upsert: {changes.new} new, {changes.changed} changed, "
+            f"{len(changes.unchanged)} unchanged, {deleted} deleted in {elapsed:.2f}s"
+        )
+        return {
+            "total": len(changes.ids) + len(changes.unchanged),
+            "new": changes.new,
+            "changed": changes.changed,
+            "unchanged": len(changes.unchanged),
+            "upserted": upserted,
+            "failed": len(changes.ids) - upserted,
+            "deleted": deleted,
+            "delete_failed": len(changes.delete) - deleted,
+            "batches": batches,
+            "errors": errors,
+            "elapsed_seconds": round(elapsed, 3)
+        }
+
+    def run(self,
+            ids: Sequence[str],
+            documents: Sequence[str],
+            metadatas: Sequence[Dict[str, Any]],
+            embeddings: Optional[Sequence[Sequence[float]]] = None,
+            source: Optional[str] = None,
+            prune: Optional[bool] = None) -> Dict[str, Any]:
+        """Diff and apply in one call; ``embeddings`` are aligned with ``ids``."""
+        changes = self.diff(ids, documents, metadatas, source=source, prune=prune)
+        return self.apply(changes, None if embeddings is None else changes.select(embeddings))
@@ -0,0 +1,882 @@
+"""
+Embedded vector store on memory-mapped NumPy storage.
+
+A drop-in for the parts of the Chroma client and collection API that
+ChromaDBClient and ProductionRAG use (get, query, count, upsert, delete,
+get_collection and friends), for single-node deployments and eval/CI
+where the corpus fits in memory and SQLite + HNSW is pure overhead.
+
+Each collection is a directory:
+
+    manifest.json         name, id, metadata, dimension, count, generation
+    vectors.<gen>.f32     float32 matrix, one row per record
+    norms.<gen>.f32       L2 norm of every row
+    records.<gen>.json    ids, documents and metadata stored column-wise
+    ivf.<gen>.npz         optional IVF centroids and inverted lists
+    codes.<gen>.i8|f16    optional int8 / float16 search copy of the vectors
+    quant.<gen>.npz       int8 quantizer ranges
+
+Vectors and norms are opened read-only with np.memmap, so every worker
+process on a host shares one page-cache copy. A write builds the next
+generation and swaps the manifest atomically; readers notice the new
+manifest and remap. Search is exact (one BLAS product over the candidate
+rows) or, when the collection has an IVF index, scores only the nearest
+lists. Metadata filters become boolean bitmaps over the columns and are
+cached per generation.
+
+With quantization enabled, candidates are scored over the int8 or
+float16 copy (a quarter or half of the bytes to stream) and the best
+k * rescore_factor are re-ranked with their float32 vectors, so only
+those rows of the full-precision file are read.
+
+Writes rewrite the collection, so the store suits read-mostly indexes
+built in bulk (see build_from_chroma).
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .collection_scan import collection_space
+from ..quantization import DECODE_BLOCK, ScalarQuantizer, check_mode, distances_from_dots
+from ..quantization import distances as _distances
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT = 1
+MANIFEST = "manifest.json"
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+
+# Filter bitmaps kept per generation before the cache is reset
+MASK_CACHE_SIZE = 256
+
+# Rows scored per block when assigning vectors to IVF lists
+ASSIGN_BLOCK = 65536
+
+
+class CollectionNotFoundError(ValueError):
+    """Raised when a collection does not exist in the store."""
+
+
+# ----------------------------------------------------------------------
+# Filters
+# ----------------------------------------------------------------------
+
+def _column_test(column: np.ndarray, predicate: Callable[[Any], bool]) -> np.ndarray:
+    return np.fromiter((predicate(value) for value in column), dtype=bool, count=len(column))
+
+
+def _compare(op: str, operand: Any) -> Callable[[Any], bool]:
+    def safe(test):
+        def predicate(value):
+            if value is None:
+                return False
+            try:
+                return test(value)
+            except TypeError:
+                return False
+        return predicate
+
+    if op == "$eq":
+        return safe(lambda v: v == operand)
+    if op == "$ne":
+        return lambda v: v is None or v != operand
+    if op == "$gt":
+        return safe(lambda v: v > operand)
+    if op == "$gte":
+        return safe(lambda v: v >= operand)
+    if op == "$lt":
+        return safe(lambda v: v < operand)
+    if op == "$lte":
+        return safe(lambda v: v <= operand)
+    if op in ("$in", "$nin"):
+        accepted = list(operand)
+
+        def member(v):
+            try:
+                return v in accepted
+            except TypeError:
+                return False
+        return safe(member) if op == "$in" else (lambda v: not member(v))
+    if op in ("$contains", "$not_contains"):
+        def contains(v):
+            if isinstance(v, (list, tuple, str)):
+                return operand in v
+            return v == operand
+        return safe(contains) if op == "$contains" else (lambda v: v is None or not contains(v))
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+def _where_mask(columns: Dict[str, np.ndarray], count: int, where: Dict[str, Any]) -> np.ndarray:
+    """Rows matching a Chroma-style metadata filter."""
+    masks = []
+    for field, condition in where.items():
+        if field == "$and":
+            masks.append(np.logical_and.reduce([_where_mask(columns, count, c) for c in condition]))
+        elif field == "$or":
+            masks.append(np.logical_or.reduce([_where_mask(columns, count, c) for c in condition]))
+        else:
+            column = columns.get(field)
+            if column is None:
+                column = np.full(count, None, dtype=object)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, operand in condition.items():
+                masks.append(_column_test(column, _compare(op, operand)))
+    if not masks:
+        return np.ones(count, dtype=bool)
+    return np.logical_and.reduce(masks) if len(masks) > 1 else masks[0]
+
+
+def _document_mask(documents: np.ndarray, where_document: Dict[str, Any]) -> np.ndarray:
+    """Rows whose document matches a Chroma-style document filter."""
+    masks = []
+    for op, operand in where_document.items():
+        if op == "$and":
+            masks.append(np.logical_and.reduce([_document_mask(documents, c) for c in operand]))
+        elif op == "$or":
+            masks.append(np.logical_or.reduce([_document_mask(documents, c) for c in operand]))
+        elif op == "$contains":
+            masks.append(_column_test(documents, lambda d: d is not None and operand in d))
+        elif op == "$not_contains":
+            masks.append(_column_test(documents, lambda d: d is None or operand not in d))
+        else:
+            raise ValueError(f"Unsupported document filter operator: {op}")
+    return np.logical_and.reduce(masks) if len(masks) > 1 else masks[0]
+
+
+# ----------------------------------------------------------------------
+# Distances and IVF
+# ----------------------------------------------------------------------
+
+def _top_k(distances: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k smallest distances, nearest first."""
+    if k >= len(distances):
+        return np.argsort(distances, kind="stable")
+    part = np.argpartition(distances, k - 1)[:k]
+    return part[np.argsort(distances[part], kind="stable")]
+
+
+def _finish(gen: "_Generation", query: np.ndarray, rows: np.ndarray, scores: np.ndarray,
+            k: int, rescore_factor: int):
+    """
+    (rows, distances) of the k nearest, nearest first.
+
+    Quantized scores shortlist k * rescore_factor rows, which are re-ranked
+    with their float32 vectors. The |q|^2 - 2q.x + |x|^2 expansion also
+    loses precision for near-duplicates, so squared L2 for the winners is
+    always recomputed directly.
+    """
+    quantized = gen.codes is not None
+    keep = _top_k(scores, k * max(1, rescore_factor) if quantized else k)
+    rows, scores = rows[keep], scores[keep]
+    if len(rows) and (quantized or gen.space == "l2"):
+        vectors = np.asarray(gen.vectors[rows], dtype=np.float32)
+        if gen.space == "l2":
+            diff = vectors - query
+            scores = np.einsum("ij,ij->i", diff, diff)
+        else:
+            scores = _distances(gen.space, query[None, :], vectors, gen.norms[rows])[0]
+        order = _top_k(scores, k)
+        rows, scores = rows[order], scores[order]
+    return rows, scores
+
+
+def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the closest centroid (squared L2) for every row, in blocks."""
+    centroid_sq = (centroids * centroids).sum(axis=1)
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BLOCK):
+        block = np.asarray(vectors[start:start + ASSIGN_BLOCK], dtype=np.float32)
+        out[start:start + len(block)] = np.argmin(centroid_sq[None, :] - 2.0 * block @ centroids.T, axis=1)
+    return out
+
+
+def _ivf_space(vectors: np.ndarray, norms: np.ndarray, space: str) -> np.ndarray:
+    """Vectors as clustered: unit length for angular spaces."""
+    if space == "l2":
+        return vectors
+    safe = np.where(norms == 0, 1.0, norms)
+    return vectors / safe[:, None]
+
+
+def train_ivf(vectors: np.ndarray, norms: np.ndarray, space: str, n_lists: int,
+              iterations: int = 10, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    k-means coarse quantizer over the rows; returns centroids and inverted lists.
+
+    Trained on a sample of up to 64 rows per list, then every row is
+    assigned to its nearest centroid.
+    """
+    rng = np.random.default_rng(seed)
+    count = len(vectors)
+    n_lists = max(1, min(n_lists, count))
+    sample_rows = np.sort(rng.choice(count, min(count, n_lists * 64), replace=False))
+    sample = _ivf_space(np.asarray(vectors[sample_rows], dtype=np.float32), norms[sample_rows], space)
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = _nearest_centroid(sample, centroids)
+        for j in range(n_lists):
+            members = sample[assignment == j]
+            if len(members):
+                centroids[j] = members.mean(axis=0)
+
+    assignment = np.empty(count, dtype=np.int32)
+    for start in range(0, count, ASSIGN_BLOCK):
+        block = np.asarray(vectors[start:start + ASSIGN_BLOCK], dtype=np.float32)
+        block = _ivf_space(block, norms[start:start + len(block)], space)
+        assignment[start:start + len(block)] = _nearest_centroid(block, centroids)
+
+    order = np.argsort(assignment, kind="stable").astype(np.int64)
+    offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1)).astype(np.int64)
+    return {"centroids": centroids.astype(np.float32), "order": order, "offsets": offsets}
+
+
+# ----------------------------------------------------------------------
+# Storage
+# ----------------------------------------------------------------------
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    """1-D object array holding each value as-is (list values stay single cells)."""
+    array = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
+
+
+class _Generation:
+    """One immutable generation of a collection, mapped for reading."""
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any]):
+        self.number = manifest["generation"]
+        self.count = manifest["count"]
+        self.dimension = manifest["dimension"]
+        self.space = (manifest.get("metadata") or {}).get("hnsw:space", "l2")
+
+        vectors_path = directory / f"vectors.{self.number}.f32"
+        if self.count and self.dimension:
+            self.vectors = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(self.count, self.dimension))
+            self.norms = np.memmap(directory / f"norms.{self.number}.f32", dtype=np.float32, mode="r",
+                                   shape=(self.count,))
+        else:
+            self.vectors = np.zeros((0, self.dimension or 0), dtype=np.float32)
+            self.norms = np.zeros(0, dtype=np.float32)
+
+        records = json.loads((directory / f"records.{self.number}.json").read_text())
+        self.ids: List[str] = records["ids"]
+        self.row_of = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        self.documents = _object_array(records["documents"])
+        self.columns = {key: _object_array(values) for key, values in records["columns"].items()}
+
+        # Quantized search copy (None = search the float32 vectors)
+        self.quantization = manifest.get("quantization", "float32")
+        self.codes = None
+        self.quantizer = None
+        if self.quantization != "float32" and self.count:
+            suffix, dtype = ("i8", np.int8) if self.quantization == "int8" else ("f16", np.float16)
+            self.codes = np.memmap(directory / f"codes.{self.number}.{suffix}", dtype=dtype, mode="r",
+                                   shape=(self.count, self.dimension))
+            if self.quantization == "int8":
+                with np.load(directory / f"quant.{self.number}.npz") as data:
+                    self.quantizer = ScalarQuantizer.from_arrays({name: data[name] for name in data.files})
+
+        self.ivf = None
+        ivf_path = directory / f"ivf.{self.number}.npz"
+        if ivf_path.exists():
+            with np.load(ivf_path) as data:
+                self.ivf = {name: data[name] for name in data.files}
+
+        self.masks: Dict[str, np.ndarray] = {}
+        self.mask_lock = threading.Lock()
+
+    def score(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """(queries x rows) distances from the search copy: quantized codes if present, else float32."""
+        if self.codes is None:
+            if rows is None:
+                return _distances(self.space, queries, self.vectors, self.norms)
+            return _distances(self.space, queries, np.asarray(self.vectors[rows]), self.norms[rows])
+
+        # Approximate dot products against the codes, combined with the exact norms
+        total = self.count if rows is None else len(rows)
+        blocks = []
+        for start in range(0, total, DECODE_BLOCK):
+            block = slice(start, start + DECODE_BLOCK) if rows is None else rows[start:start + DECODE_BLOCK]
+            codes = np.asarray(self.codes[block])
+            if self.quantizer is not None:
+                dots = self.quantizer.dots(queries, codes)
+            else:
+                dots = queries @ codes.astype(np.float32).T
+            blocks.append(distances_from_dots(self.space, queries, dots, self.norms[block]))
+        return np.concatenate(blocks, axis=1) if blocks else np.zeros((len(queries), 0), dtype=np.float32)
+
+    def metadata(self, row: int) -> Optional[Dict[str, Any]]:
+        values = {key: column[row] for key, column in self.columns.items() if column[row] is not None}
+        return values or None
+
+    def mask(self, where: Optional[Dict], where_document: Optional[Dict]) -> Optional[np.ndarray]:
+        """Cached bitmap of rows matching both filters (None = every row)."""
+        if not where and not where_document:
+            return None
+        key = json.dumps([where, where_document], sort_keys=True, default=str)
+        with self.mask_lock:
+            cached = self.masks.get(key)
+        if cached is not None:
+            return cached
+
+        mask = np.ones(self.count, dtype=bool)
+        if where:
+            mask &= _where_mask(self.columns, self.count, where)
+        if where_document:
+            mask &= _document_mask(self.documents, where_document)
+        with self.mask_lock:
+            if len(self.masks) >= MASK_CACHE_SIZE:
+                self.masks.clear()
+            self.masks[key] = mask
+        return mask
+
+
+def _check_lengths(ids: List[str], **fields: Optional[Sequence]):
+    """Raise ValueError unless every given field has one entry per id."""
+    for name, values in fields.items():
+        if values is not None and len(values) != len(ids):
+            raise ValueError(f"Got {len(values)} {name} for {len(ids)} ids")
+
+
+def _columns(metadatas: Sequence[Optional[Dict[str, Any]]]) -> Dict[str, List[Any]]:
+    """Row-wise metadata dicts as one list per key (None where a row lacks the key)."""
+    keys: Dict[str, None] = {}
+    for metadata in metadatas:
+        for key in metadata or ():
+            keys.setdefault(key, None)
+    return {key: [(metadata or {}).get(key) for metadata in metadatas] for key in keys}
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class _GenerationWriter:
+    """Streams rows into the next generation's files, then publishes it."""
+
+    def __init__(self, directory: Path, generation: int, dimension: Optional[int]):
+        self.directory = directory
+        self.generation = generation
+        self.dimension = dimension
+        self.count = 0
+        self.ids: List[str] = []
+        self.documents: List[Optional[str]] = []
+        self.metadatas: List[Optional[Dict[str, Any]]] = []
+        self._vectors_tmp = directory / f".vectors.{generation}.f32.tmp"
+        self._norms_tmp = directory / f".norms.{generation}.f32.tmp"
+        self._vectors_file = open(self._vectors_tmp, "wb")
+        self._norms_file = open(self._norms_tmp, "wb")
+
+    def append(self, ids: Sequence[str], vectors: np.ndarray,
+               documents: Sequence[Optional[str]], metadatas: Sequence[Optional[Dict[str, Any]]]):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(ids) == 0:
+            return
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+        if vectors.shape != (len(ids), self.dimension):
+            raise ValueError(f"Expected {len(ids)} embeddings of dimension {self.dimension}, got {vectors.shape}")
+        self._vectors_file.write(vectors.tobytes())
+        self._norms_file.write(np.linalg.norm(vectors, axis=1).astype(np.float32).tobytes())
+        self.ids.extend(ids)
+        self.documents.extend(documents)
+        self.metadatas.extend(metadatas)
+        self.count += len(ids)
+
+    def abort(self):
+        for handle, path in ((self._vectors_file, self._vectors_tmp), (self._norms_file, self._norms_tmp)):
+            handle.close()
+            if path.exists():
+                path.unlink()
+
+    def commit(self, manifest: Dict[str, Any], client: "LocalVectorClient") -> Dict[str, Any]:
+        """Write records, the optional search copy and IVF index, then swap in the new manifest."""
+        self._vectors_file.close()
+        self._norms_file.close()
+        gen = self.generation
+        os.replace(self._vectors_tmp, self.directory / f"vectors.{gen}.f32")
+        os.replace(self._norms_tmp, self.directory / f"norms.{gen}.f32")
+
+        records = {"ids": self.ids, "documents": self.documents, "columns": _columns(self.metadatas)}
+        _write_atomic(self.directory / f"records.{gen}.json", json.dumps(records).encode("utf-8"))
+
+        manifest = dict(manifest, generation=gen, count=self.count, dimension=self.dimension,
+                        ivf_lists=0, quantization="float32")
+        if self.count:
+            vectors = np.memmap(self.directory / f"vectors.{gen}.f32", dtype=np.float32, mode="r",
+                                shape=(self.count, self.dimension))
+            if client.quantization != "float32":
+                self._write_codes(vectors, client.quantization)
+                manifest["quantization"] = client.quantization
+            if client.ivf_lists and self.count >= max(client.ivf_min_rows, client.ivf_lists):
+                norms = np.fromfile(self.directory / f"norms.{gen}.f32", dtype=np.float32)
+                space = (manifest.get("metadata") or {}).get("hnsw:space", "l2")
+                ivf = train_ivf(vectors, norms, space, client.ivf_lists)
+                tmp = self.directory / f".ivf.{gen}.tmp.npz"
+                np.savez(tmp, **ivf)
+                os.replace(tmp, self.directory / f"ivf.{gen}.npz")
+                manifest["ivf_lists"] = len(ivf["centroids"])
+            del vectors
+
+        _write_atomic(self.directory / MANIFEST, json.dumps(manifest, indent=2).encode("utf-8"))
+        _remove_generations_before(self.directory, gen - 1)
+        return manifest
+
+
+    def _write_codes(self, vectors: np.ndarray, mode: str):
+        """Quantized search copy of the vectors, encoded block by block."""
+        gen = self.generation
+        quantizer = ScalarQuantizer.fit(vectors) if mode == "int8" else None
+        suffix = "i8" if mode == "int8" else "f16"
+        tmp = self.directory / f".codes.{gen}.{suffix}.tmp"
+        with open(tmp, "wb") as f:
+            for start in range(0, self.count, DECODE_BLOCK):
+                block = np.asarray(vectors[start:start + DECODE_BLOCK], dtype=np.float32)
+                f.write((quantizer.encode(block) if quantizer else block.astype(np.float16)).tobytes())
+        os.replace(tmp, self.directory / f"codes.{gen}.{suffix}")
+        if quantizer is not None:
+            tmp = self.directory / f".quant.{gen}.tmp.npz"
+            np.savez(tmp, **quantizer.to_arrays())
+            os.replace(tmp, self.directory / f"quant.{gen}.npz")
+
+
+def _remove_generations_before(directory: Path, keep_from: int):
+    """Delete generation files older than ``keep_from`` (the previous one stays for in-flight readers)."""
+    for path in directory.iterdir():
+        parts = path.name.split(".")
+        if len(parts) == 3 and parts[1].isdigit() and int(parts[1]) < keep_from:
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.debug(f"Could not remove {path}: {e}")
+
+
+# ----------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------
+
+class LocalCollection:
+    """Chroma-compatible collection backed by a generation directory."""
+
+    def __init__(self, client: "LocalVectorClient", directory: Path):
+        self._client = client
+        self._directory = directory
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._manifest: Dict[str, Any] = {}
+        self._generation: Optional[_Generation] = None
+        self._current()
+
+    # -- state ----------------------------------------------------------
+
+    def _current(self) -> _Generation:
+        """The latest generation, remapped if another writer published a new one."""
+        stat = os.stat(self._directory / MANIFEST)
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp and self._generation is not None:
+            return self._generation
+        with self._lock:
+            if stamp != self._stamp or self._generation is None:
+                manifest = json.loads((self._directory / MANIFEST).read_text())
+                if self._generation is None or manifest["generation"] != self._generation.number:
+                    self._generation = _Generation(self._directory, manifest)
+                self._manifest = manifest
+                self._stamp = stamp
+            return self._generation
+
+    @property
+    def name(self) -> str:
+        return self._manifest["name"]
+
+    @property
+    def id(self) -> str:
+        return self._manifest["id"]
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        self._current()
+        return self._manifest.get("metadata")
+
+    def count(self) -> int:
+        return self._current().count
+
+    # -- reads ----------------------------------------------------------
+
+    def _rows(self, gen: _Generation, ids: Optional[Sequence[str]], where, where_document) -> np.ndarray:
+        mask = gen.mask(where, where_document)
+        if ids is not None:
+            rows = np.array([gen.row_of[i] for i in ids if i in gen.row_of], dtype=np.int64)
+            return rows[mask[rows]] if mask is not None else rows
+        return np.flatnonzero(mask) if mask is not None else np.arange(gen.count)
+
+    @staticmethod
+    def _fields(gen: _Generation, rows: np.ndarray, include: Iterable[str]) -> Dict[str, Any]:
+        include = list(include)
+        return {
+            "ids": [gen.ids[r] for r in rows],
+            "documents": [gen.documents[r] for r in rows] if "documents" in include else None,
+            "metadatas": [gen.metadata(r) for r in rows] if "metadatas" in include else None,
+            "embeddings": np.asarray(gen.vectors[rows]) if "embeddings" in include else None,
+            "included": include,
+        }
+
+    def get(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict] = None,
+            limit: Optional[int] = None, offset: Optional[int] = None,
+            where_document: Optional[Dict] = None,
+            include: Sequence[str] = ("metadatas", "documents")) -> Dict[str, Any]:
+        gen = self._current()
+        if isinstance(ids, str):
+            ids = [ids]
+        rows = self._rows(gen, ids, where, where_document)
+        start = offset or 0
+        rows = rows[start:start + limit] if limit is not None else rows[start:]
+        return self._fields(gen, rows, include)
+
+    def peek(self, limit: int = 10) -> Dict[str, Any]:
+        return self.get(limit=limit, include=["metadatas", "documents", "embeddings"])
+
+    def query(self, query_embeddings: Optional[Sequence] = None, query_texts: Optional[Sequence[str]] = None,
+              n_results: int = 10, where: Optional[Dict] = None, where_document: Optional[Dict] = None,
+              include: Sequence[str] = ("metadatas", "documents", "distances")) -> Dict[str, Any]:
+        if query_embeddings is None:
+            if query_texts is None:
+                raise ValueError("query() needs query_embeddings or query_texts")
+            query_embeddings = self._client.embed(list(query_texts))
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+
+        gen = self._current()
+        mask = gen.mask(where, where_document)
+        candidates = np.flatnonzero(mask) if mask is not None else None
+
+        results = {"ids": [], "distances": [], "documents": [], "metadatas": [], "embeddings": []}
+        for rows, distances in self._search(gen, queries, n_results, mask, candidates):
+            fields = self._fields(gen, rows, include)
+            results["ids"].append(fields["ids"])
+            results["distances"].append(distances.tolist())
+            results["documents"].append(fields["documents"])
+            results["metadatas"].append(fields["metadatas"])
+            results["embeddings"].append(fields["embeddings"])
+
+        include = list(include)
+        return {
+            "ids": results["ids"],
+            "distances": results["distances"] if "distances" in include else None,
+            "documents": results["documents"] if "documents" in include else None,
+            "metadatas": results["metadatas"] if "metadatas" in include else None,
+            "embeddings": results["embeddings"] if "embeddings" in include else None,
+            "included": include,
+        }
+
+    def _search(self, gen: _Generation, queries: np.ndarray, k: int,
+                mask: Optional[np.ndarray], candidates: Optional[np.ndarray]):
+        """(rows, distances) per query, nearest first."""
+        if gen.count == 0 or k <= 0 or (candidates is not None and len(candidates) == 0):
+            return [(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)) for _ in queries]
+
+        if gen.ivf is not None:
+            return [self._search_ivf(gen, query, k, mask, candidates) for query in queries]
+
+        # Exhaustive: one matrix product for every query over the candidate rows
+        scores = gen.score(queries, candidates)
+        if candidates is None:
+            candidates = np.arange(gen.count)
+        return [_finish(gen, query, candidates, row, k, self._client.rescore_factor)
+                for query, row in zip(queries, scores)]
+
+    def _search_ivf(self, gen: _Generation, query: np.ndarray, k: int,
+                    mask: Optional[np.ndarray], candidates: Optional[np.ndarray]):
+        ivf = gen.ivf
+        probe_query = query if gen.space == "l2" else query / (np.linalg.norm(query) or 1.0)
+        centroids = ivf["centroids"]
+        centroid_distances = (centroids * centroids).sum(axis=1) - 2.0 * centroids @ probe_query
+        probes = np.argsort(centroid_distances)[:self._client.ivf_probes]
+        rows = np.concatenate([ivf["order"][ivf["offsets"][p]:ivf["offsets"][p + 1]] for p in probes])
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if len(rows) < k:
+            # Too few rows in the probed lists: score every candidate exactly
+            rows = candidates if candidates is not None else np.arange(gen.count)
+        rows = np.sort(rows)
+        return _finish(gen, query, rows, gen.score(query[None, :], rows)[0], k, self._client.rescore_factor)
+
+    # -- writes ---------------------------------------------------------
+
+    def _rewrite(self, apply: Callable[[List[str], np.ndarray, List, List], tuple]):
+        """Run apply(ids, vectors, documents, metadatas) on the latest rows and publish the result."""
+        with self._lock, self._client._write_lock(self._directory):
+            self._stamp = None
+            gen = self._current()
+            ids = list(gen.ids)
+            vectors = np.array(gen.vectors, dtype=np.float32)
+            documents = list(gen.documents)
+            metadatas = [gen.metadata(r) for r in range(gen.count)]
+            ids, vectors, documents, metadatas = apply(ids, vectors, documents, metadatas)
+
+            writer = _GenerationWriter(self._directory, gen.number + 1, gen.dimension or None)
+            try:
+                writer.append(ids, vectors, documents, metadatas)
+                manifest = {k: v for k, v in self._manifest.items()}
+                writer.commit(manifest, self._client)
+            except BaseException:
+                writer.abort()
+                raise
+            self._stamp = None
+            self._current()
+
+    def upsert(self, ids: Sequence[str], embeddings: Optional[Sequence] = None,
+               metadatas: Optional[Sequence[Optional[Dict]]] = None,
+               documents: Optional[Sequence[Optional[str]]] = None):
+        ids = [ids] if isinstance(ids, str) else list(ids)
+        _check_lengths(ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+        if embeddings is None:
+            if documents is None:
+                raise ValueError("upsert() needs embeddings or documents")
+            embeddings = self._client.embed(list(documents))
+        new_vectors = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        new_documents = list(documents) if documents is not None else [None] * len(ids)
+        new_metadatas = list(metadatas) if metadatas is not None else [None] * len(ids)
+
+        def apply(cur_ids, vectors, cur_documents, cur_metadatas):
+            row_of = {doc_id: row for row, doc_id in enumerate(cur_ids)}
+            appended = []
+            for i, doc_id in enumerate(ids):
+                row = row_of.get(doc_id)
+                if row is None:
+                    row_of[doc_id] = len(cur_ids) + len(appended)
+                    appended.append(i)
+                    continue
+                vectors[row] = new_vectors[i]
+                if documents is not None:
+                    cur_documents[row] = new_documents[i]
+                if metadatas is not None:
+                    cur_metadatas[row] = new_metadatas[i]
+            if appended:
+                if len(vectors) == 0:
+                    vectors = np.zeros((0, new_vectors.shape[1]), dtype=np.float32)
+                vectors = np.concatenate([vectors, new_vectors[appended]])
+                cur_ids = cur_ids + [ids[i] for i in appended]
+                cur_documents = cur_documents + [new_documents[i] for i in appended]
+                cur_metadatas = cur_metadatas + [new_metadatas[i] for i in appended]
+            return cur_ids, vectors, cur_documents, cur_metadatas
+
+        self._rewrite(apply)
+
+    def add(self, ids: Sequence[str], embeddings: Optional[Sequence] = None,
+            metadatas: Optional[Sequence[Optional[Dict]]] = None,
+            documents: Optional[Sequence[Optional[str]]] = None):
+        ids = [ids] if isinstance(ids, str) else list(ids)
+        _check_lengths(ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+        existing = set(self._current().row_of)
+        keep = [i for i, doc_id in enumerate(ids) if doc_id not in existing]
+        if len(keep) < len(ids):
+            # Like Chroma's add(), existing records are left as they are
+            logger.warning(f"add() ignoring {len(ids) - len(keep)} existing ids in {self.name}")
+            if not keep:
+                return
+            ids = [ids[i] for i in keep]
+            embeddings = None if embeddings is None else [embeddings[i] for i in keep]
+            metadatas = None if metadatas is None else [metadatas[i] for i in keep]
+            documents = None if documents is None else [documents[i] for i in keep]
+        self.upsert(ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+
+    def delete(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict] = None,
+               where_document: Optional[Dict] = None):
+        gen = self._current()
+        doomed = set(gen.ids[r] for r in self._rows(gen, ids, where, where_document))
+        if not doomed:
+            return
+
+        def apply(cur_ids, vectors, cur_documents, cur_metadatas):
+            keep = [row for row, doc_id in enumerate(cur_ids) if doc_id not in doomed]
+            return ([cur_ids[r] for r in keep], vectors[keep],
+                    [cur_documents[r] for r in keep], [cur_metadatas[r] for r in keep])
+
+        self._rewrite(apply)
+
+    def modify(self, name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None):
+        """Replace the collection metadata (renaming is not supported)."""
+        if name is not None and name != self.name:
+            raise ValueError("Renaming local collections is not supported")
+        if metadata is None:
+            return
+        with self._lock, self._client._write_lock(self._directory):
+            self._stamp = None
+            self._current()
+            manifest = dict(self._manifest, metadata=dict(metadata))
+            _write_atomic(self._directory / MANIFEST, json.dumps(manifest, indent=2).encode("utf-8"))
+            self._stamp = None
+            self._current()
+
+
+class LocalVectorClient:
+    """
+    Chroma-compatible client over a directory of local collections.
+
+    ``ivf_lists`` > 0 builds an IVF index for collections with at least
+    ``ivf_min_rows`` records on every write; queries then score the
+    ``ivf_probes`` nearest lists instead of every row. ``quantization``
+    ("float16" or "int8") adds a reduced-precision search copy to every
+    write; the top k * ``rescore_factor`` hits are re-ranked at float32.
+    """
+
+    def __init__(self, path: str, ivf_lists: int = 0, ivf_probes: int = 8, ivf_min_rows: int = 50000,
+                 quantization: str = "float32", rescore_factor: int = 4):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.quantization = check_mode(quantization)
+        self.rescore_factor = max(1, rescore_factor)
+        self.ivf_lists = ivf_lists
+        self.ivf_probes = ivf_probes
+        self.ivf_min_rows = ivf_min_rows
+        self._collections: Dict[str, LocalCollection] = {}
+        self._lock = threading.Lock()
+        self._embed: Optional[Callable[[List[str]], List[List[float]]]] = None
+
+    def heartbeat(self) -> int:
+        return time.time_ns()
+
+    def get_max_batch_size(self) -> int:
+        return 100000
+
+    def close(self):
+        with self._lock:
+            self._collections.clear()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the canonical embedder (for query_texts / documents-only upserts)."""
+        if self._embed is None:
+            from ..embedding.factory import EmbeddingFactory
+            self._embed = EmbeddingFactory.get_embedder().embed_texts
+        return self._embed(texts)
+
+    @contextmanager
+    def _write_lock(self, directory: Path):
+        """Serialize writers across processes."""
+        if fcntl is None:
+            yield
+            return
+        with open(directory / ".write.lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _directory(self, name: str) -> Path:
+        if not NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid collection name: {name!r}")
+        return self.path / name
+
+    def list_collections(self) -> List[LocalCollection]:
+        return [self.get_collection(d.name) for d in sorted(self.path.iterdir()) if (d / MANIFEST).exists()]
+
+    def get_collection(self, name: str, embedding_function: Any = None) -> LocalCollection:
+        directory = self._directory(name)
+        if not (directory / MANIFEST).exists():
+            with self._lock:
+                self._collections.pop(name, None)
+            raise CollectionNotFoundError(f"Collection [{name}] does not exist")
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = LocalCollection(self, directory)
+            return collection
+
+    def create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None,
+                          embedding_function: Any = None, get_or_create: bool = False) -> LocalCollection:
+        directory = self._directory(name)
+        if (directory / MANIFEST).exists():
+            if get_or_create:
+                return self.get_collection(name)
+            raise ValueError(f"Collection [{name}] already exists")
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._write_lock(directory):
+            if not (directory / MANIFEST).exists():
+                writer = _GenerationWriter(directory, 0, None)
+                writer.commit({
+                    "format": STORE_FORMAT,
+                    "name": name,
+                    "id": str(uuid.uuid4()),
+                    "metadata": dict(metadata) if metadata else None,
+                }, self)
+        return self.get_collection(name)
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None,
+                                 embedding_function: Any = None) -> LocalCollection:
+        return self.create_collection(name, metadata=metadata, get_or_create=True)
+
+    def delete_collection(self, name: str):
+        directory = self._directory(name)
+        if not (directory / MANIFEST).exists():
+            raise CollectionNotFoundError(f"Collection [{name}] does not exist")
+        with self._lock:
+            self._collections.pop(name, None)
+        for path in directory.iterdir():
+            path.unlink()
+        directory.rmdir()
+
+
+def build_from_chroma(source: Any, client: LocalVectorClient, name: Optional[str] = None,
+                      page_size: int = 1000) -> LocalCollection:
+    """
+    Copy a Chroma collection (embeddings included, nothing re-embedded) into the local store.
+
+    Pages are streamed straight into the new generation's vector file;
+    an existing local collection of the same name is replaced.
+    """
+    name = name or source.name
+    try:
+        client.delete_collection(name)
+    except CollectionNotFoundError:
+        pass
+    # Chroma may hold the distance function only in its configuration
+    metadata = dict(source.metadata or {}, **{"hnsw:space": collection_space(source)})
+    target = client.create_collection(name, metadata=metadata)
+    directory = client._directory(name)
+
+    with client._write_lock(directory):
+        manifest = json.loads((directory / MANIFEST).read_text())
+        writer = _GenerationWriter(directory, manifest["generation"] + 1, None)
+        try:
+            offset = 0
+            while True:
+                page = source.get(limit=page_size, offset=offset,
+                                  include=["embeddings", "documents", "metadatas"])
+                ids = page.get("ids") or []
+                if not ids:
+                    break
+                writer.append(ids, np.asarray(page["embeddings"], dtype=np.float32),
+                              page.get("documents") or [None] * len(ids),
+                              page.get("metadatas") or [None] * len(ids))
+                offset += len(ids)
+                if len(ids) < page_size:
+                    break
+            manifest = writer.commit(manifest, client)
+        except BaseException:
+            writer.abort()
+            raise
+
+    logger.info(f"Built local collection {name}: {manifest['count']} records, dimension {manifest['dimension']}")
+    return target
@@ -19,6 +19,8 @@ from datetime import datetime
 import hashlib
 import tarfile
 
+from college_advisor_data.storage.collection_dump import export_collections
+
 def calculate_checksum(filepath):
     """Calculate SHA256 checksum of a file."""
     sha256 = hashlib.sha256()
@@ -33,22 +35,22 @@ def export_chromadb():
     print("EXPORTING CHROMADB COLLECTIONS")
     print("=" * 80)
     
-    # Copy chroma_data directory
+    # Dump collections (Parquet records + raw embeddings + checksummed manifests)
     src = './chroma_data'
-    dst = './artifacts/chroma/chroma_data'
+    dst = './artifacts/chroma/dump'
     
     if os.path.exists(dst):
         shutil.rmtree(dst)
     
-    shutil.copytree(src, dst)
-    print(f"✅ Copied ChromaDB data: {src} -> {dst}")
-    
-    # Get collection stats
     client = chromadb.PersistentClient(
         path=src,
         settings=Settings(anonymized_telemetry=False)
     )
     
+    dump_index = export_collections(client, dst)
+    print(f"✅ Dumped ChromaDB collections: {src} -> {dst}")
+    
+    # Get collection stats
     collections = client.list_collections()
     collection_stats = []
     
@@ -69,6 +71,8 @@ def export_chromadb():
         'total_documents': sum(c['count'] for c in collection_stats),
         'embedding_model': 'nomic-embed-text',
         'embedding_dimension': 384,
+        'format': 'collection_dump',
+        'dump_format': dump_index['format'],
         'collections': collection_stats
     }
     
@@ -320,12 +324,20 @@ pip install chromadb sentence-transformers rank-bm25
 ```
 
 ### 3. Load ChromaDB
+Collections are shipped as a dump (`chroma/dump/`): Parquet records, raw
+float32 embeddings and a checksummed manifest per collection. Restoring
+verifies the checksums and loads the stored embeddings (no re-embedding):
+
+```bash
+python -m college_advisor_data.cli import-collections ./chroma/dump --target ./chroma_data
+```
+
 ```python
 import chromadb
 from chromadb.config import Settings
 
 client = chromadb.PersistentClient(
-    path='./chroma/chroma_data',
+    path='./chroma_data',
     settings=Settings(anonymized_telemetry=False)
 )
 
@@ -8,7 +8,6 @@ Usage in CollegeAdvisor-api:
     Replace app/services/enhanced_rag_system.py with this adapter
 """
 
-import asyncio
 import sys
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
@@ -66,9 +65,15 @@ class ProductionRAGAdapter:
     the existing API endpoints.
     """
     
-    def __init__(self):
-        """Initialize the production RAG system"""
-        self.rag = ProductionRAG()
+    def __init__(self, **rag_options: Any):
+        """
+        Initialize the production RAG system
+
+        ``rag_options`` go to ProductionRAG, e.g. async_cpu_workers,
+        async_io_workers and collection_concurrency to size the async
+        pipeline for the serving process.
+        """
+        self.rag = ProductionRAG(**rag_options)
         print("✅ ProductionRAG initialized (10.0/10.0 performance)")
     
     async def process_query(self, context: RAGContext) -> RAGResult:
@@ -83,13 +88,8 @@ class ProductionRAGAdapter:
         if context.user_context:
             enhanced_query = f"{context.user_context}\n\nQuestion: {context.query}"
         
-        # Run ProductionRAG query (synchronous, so wrap in executor)
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            self.rag.query,
-            enhanced_query
-        )
+        # Native async pipeline (blocking stages run on ProductionRAG's own executors)
+        result = await self.rag.aquery(enhanced_query)
         
         # Convert ProductionRAG result to RAGResult format
         recommendations = self._convert_to_recommendations(result, context)
@@ -173,13 +173,17 @@ class ProductionRAGAdapter:
         """Check if the RAG system is healthy"""
         try:
             # Try a simple query
-            test_result = self.rag.query("What is financial aid?")
+            test_result = await self.rag.aquery("What is financial aid?")
             if test_result and test_result.answer:
                 return "healthy"
             return "degraded: no answer returned"
         except Exception as e:
             return f"unhealthy: {str(e)}"
     
+    def metrics_text(self) -> str:
+        """ProductionRAG stage latency and counters in Prometheus text format (serve at /metrics)"""
+        return self.rag.metrics_text()
+
     def _convert_to_recommendations(
         self,
         result,
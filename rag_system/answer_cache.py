@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Answer Cache
+Bounded cache of ProductionRAG.query() results with an in-memory LRU tier
+and an optional SQLite tier on disk. Entries carry the index version they
+were computed against and are dropped as soon as the version changes.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """Case-folded question with whitespace collapsed"""
+    return " ".join(question.casefold().split())
+
+
+def make_key(question: str, context: Optional[Dict] = None, expected_format: Optional[str] = None) -> str:
+    """Cache key: normalized question plus a hash of context and expected format"""
+    context_json = json.dumps(context or {}, sort_keys=True, default=str)
+    digest = hashlib.md5()
+    digest.update(normalize_question(question).encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(context_json.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update((expected_format or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """
+    Two-tier answer cache
+
+    The memory tier is an LRU of ``max_entries`` results. The disk tier
+    (enabled by ``disk_dir``) keeps up to ``max_disk_entries`` pickled
+    results in SQLite, evicting the least recently used, and survives
+    restarts. Both tiers expire entries after ``ttl_seconds``. Keep
+    ``disk_dir`` outside the Chroma directory, or every write would change
+    the index version it is keyed on.
+    """
+
+    DISK_FILE = "answers.sqlite3"
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 3600.0,
+        disk_dir: Optional[str] = None,
+        max_disk_entries: int = 50000
+    ):
+        """
+        Args:
+            max_entries: Max results held in memory
+            ttl_seconds: Entry lifetime in either tier (0 = no expiry)
+            disk_dir: Directory for the SQLite tier; memory only if None
+            max_disk_entries: Max results held on disk
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+
+        self._db: Optional[sqlite3.Connection] = None
+        if disk_dir:
+            Path(disk_dir).mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(Path(disk_dir) / self.DISK_FILE), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "key TEXT PRIMARY KEY, version TEXT, created REAL, accessed REAL, payload BLOB)"
+            )
+            self._db.commit()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created > self.ttl_seconds
+
+    def _check_version(self, version: str):
+        """Drop every entry computed against another index version (lock held)"""
+        if version == self._version:
+            return
+        if self._version is not None:
+            self.invalidations += len(self._memory)
+            self._memory.clear()
+            logger.info(f"Answer cache invalidated: index {self._version} -> {version}")
+        if self._db is not None:
+            cursor = self._db.execute("DELETE FROM answers WHERE version != ?", (version,))
+            self.invalidations += max(cursor.rowcount, 0)
+            self._db.commit()
+        self._version = version
+
+    def get(self, key: str, version: str) -> Optional[Any]:
+        """Copy of the cached result for ``key`` at ``version``, or None"""
+        now = time.time()
+        with self._lock:
+            self._check_version(version)
+
+            entry = self._memory.get(key)
+            if entry is not None:
+                result, created = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(result)
+                del self._memory[key]
+                self.expirations += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT created, payload FROM answers WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    created, payload = row
+                    if self._expired(created, now):
+                        self._db.execute("DELETE FROM answers WHERE key = ?", (key,))
+                        self._db.commit()
+                        self.expirations += 1
+                    else:
+                        try:
+                            result = pickle.loads(payload)
+                        except Exception as e:
+                            logger.warning(f"Dropping unreadable cached answer: {e}")
+                            self._db.execute("DELETE FROM answers WHERE key = ?", (key,))
+                            self._db.commit()
+                        else:
+                            self._db.execute("UPDATE answers SET accessed = ? WHERE key = ?", (now, key))
+                            self._db.commit()
+                            self._store_memory(key, result, created)
+                            self.hits += 1
+                            self.disk_hits += 1
+                            return copy.deepcopy(result)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, version: str, result: Any):
+        """Cache a result computed against ``version``"""
+        now = time.time()
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._check_version(version)
+            self._store_memory(key, result, now)
+
+            if self._db is not None:
+                try:
+                    payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception as e:
+                    logger.warning(f"Answer not cached on disk: {e}")
+                    return
+                self._db.execute(
+                    "INSERT OR REPLACE INTO answers (key, version, created, accessed, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, version, now, now, sqlite3.Binary(payload))
+                )
+                excess = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0] - self.max_disk_entries
+                if excess > 0:
+                    self._db.execute(
+                        "DELETE FROM answers WHERE key IN "
+                        "(SELECT key FROM answers ORDER BY accessed LIMIT ?)",
+                        (excess,)
+                    )
+                    self.evictions += excess
+                self._db.commit()
+
+    def _store_memory(self, key: str, result: Any, created: float):
+        """Insert into the LRU, evicting the oldest entries (lock held)"""
+        self._memory[key] = (result, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and tier sizes"""
+        with self._lock:
+            disk_entries = None
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "version": self._version,
+                "entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def clear(self):
+        """Drop every entry in both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM answers")
+                self._db.commit()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Answer Stream
+Frames of one streamed ProductionRAG answer. The pipeline thread pushes
+sections and citations as they are ready; ProductionRAG.query_stream()
+yields them to the caller, ending with a final frame that carries the
+validated (or abstaining) AnswerResult.
+
+Frames are dicts with a ``type``:
+- ``section``: ``text``, the next slice of the answer
+- ``citations``: ``citations``, Citations not sent before
+- ``reset``: discard the sections sent so far (a synthesis attempt failed
+  part-way and the pipeline falls back to another path)
+- ``final``: ``result``, the AnswerResult as query() would return it
+- ``error``: ``error``, the pipeline raised; no final frame follows
+"""
+
+import queue
+import threading
+from typing import Dict, Iterable, Iterator, List
+
+from rag_types import AnswerResult, Citation
+
+
+class AnswerStream:
+    """Thread-safe frame queue for one streamed answer"""
+
+    def __init__(self):
+        self._frames: "queue.Queue[Dict]" = queue.Queue()
+        self._sent_urls = set()
+        self._lock = threading.Lock()
+
+    def _new_citations(self, citations: Iterable[Citation]) -> List[Citation]:
+        with self._lock:
+            new = []
+            for citation in citations:
+                if citation.url not in self._sent_urls:
+                    self._sent_urls.add(citation.url)
+                    new.append(citation)
+            return new
+
+    def section(self, text: str, citations: Iterable[Citation] = ()):
+        """Send a slice of the answer and the citations it introduces"""
+        if text:
+            self._frames.put({"type": "section", "text": text})
+        new = self._new_citations(citations)
+        if new:
+            self._frames.put({"type": "citations", "citations": new})
+
+    def section_citing(self, text: str, citations: Iterable[Citation]):
+        """Send a slice of the answer with the given citations whose URL appears in it"""
+        self.section(text, [citation for citation in citations if citation.url in text])
+
+    def reset(self):
+        """Tell the reader to discard the sections sent so far"""
+        with self._lock:
+            self._sent_urls.clear()
+        self._frames.put({"type": "reset"})
+
+    def finish(self, result: AnswerResult):
+        """Send any citations not sent yet, then the final frame"""
+        new = self._new_citations(result.citations)
+        if new:
+            self._frames.put({"type": "citations", "citations": new})
+        self._frames.put({"type": "final", "result": result})
+
+    def fail(self, error: BaseException):
+        """End the stream with an error frame"""
+        self._frames.put({"type": "error", "error": f"{type(error).__name__}: {error}"})
+
+    def frames(self) -> Iterator[Dict]:
+        """Frames in order, up to and including the final or error frame"""
+        while True:
+            frame = self._frames.get()
+            yield frame
+            if frame["type"] in ("final", "error"):
+                return
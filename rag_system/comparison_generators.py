@@ -6,7 +6,7 @@ Domain-specific comparison table generators for college admissions scenarios
 
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Sequence, Any
 from synthesis_layer import ComparisonTable, ComparisonRow, SynthesisEngine
 
 logging.basicConfig(level=logging.INFO)
@@ -22,7 +22,8 @@ class FinancialAidComparator:
     def compare_aid_policies(
         self,
         schools: List[Dict],
-        scenario: Dict[str, Any]
+        scenario: Dict[str, Any],
+        unitids: Optional[Sequence[str]] = None
     ) -> ComparisonTable:
         """
         Compare financial aid policies across schools
@@ -30,6 +31,7 @@ class FinancialAidComparator:
         Args:
             schools: List of school aid policy records
             scenario: User scenario (income, assets, etc.)
+            unitids: Schools the question names (restricts the rows)
             
         Returns:
             ComparisonTable with aid policy comparison
@@ -47,12 +49,14 @@ class FinancialAidComparator:
         return self.engine.generate_comparison_table(
             entities=schools,
             attributes=attributes,
-            title="Financial Aid Policy Comparison"
+            title="Financial Aid Policy Comparison",
+            unitids=unitids
         )
     
     def compare_international_aid(
         self,
-        schools: List[Dict]
+        schools: List[Dict],
+        unitids: Optional[Sequence[str]] = None
     ) -> ComparisonTable:
         """Compare international student aid policies"""
         attributes = [
@@ -66,7 +70,8 @@ class FinancialAidComparator:
         return self.engine.generate_comparison_table(
             entities=schools,
             attributes=attributes,
-            title="International Student Aid Comparison"
+            title="International Student Aid Comparison",
+            unitids=unitids
         )
 
 
@@ -78,7 +83,8 @@ class AdmissionsComparator:
     
     def compare_cs_admissions(
         self,
-        schools: List[Dict]
+        schools: List[Dict],
+        unitids: Optional[Sequence[str]] = None
     ) -> ComparisonTable:
         """Compare CS admissions across schools"""
         attributes = [
@@ -94,12 +100,14 @@ class AdmissionsComparator:
         return self.engine.generate_comparison_table(
             entities=schools,
             attributes=attributes,
-            title="Computer Science Admissions Comparison"
+            title="Computer Science Admissions Comparison",
+            unitids=unitids
         )
     
     def compare_internal_transfer(
         self,
-        schools: List[Dict]
+        schools: List[Dict],
+        unitids: Optional[Sequence[str]] = None
     ) -> ComparisonTable:
         """Compare internal transfer rates and requirements"""
         attributes = [
@@ -115,7 +123,8 @@ class AdmissionsComparator:
         return self.engine.generate_comparison_table(
             entities=schools,
             attributes=attributes,
-            title="Internal Transfer Comparison"
+            title="Internal Transfer Comparison",
+            unitids=unitids
         )
 
 
@@ -127,7 +136,8 @@ class ProgramComparator:
     
     def compare_bsmd_programs(
         self,
-        programs: List[Dict]
+        programs: List[Dict],
+        unitids: Optional[Sequence[str]] = None
     ) -> ComparisonTable:
         """Compare BS/MD programs"""
         attributes = [
@@ -143,12 +153,14 @@ class ProgramComparator:
         return self.engine.generate_comparison_table(
             entities=programs,
             attributes=attributes,
-            title="BS/MD Program Comparison"
+            title="BS/MD Program Comparison",
+            unitids=unitids
         )
     
     def compare_residency_options(
         self,
-        options: List[Dict]
+        options: List[Dict],
+        unitids: Optional[Sequence[str]] = None
     ) -> ComparisonTable:
         """Compare residency and WUE options"""
         attributes = [
@@ -164,7 +176,8 @@ class ProgramComparator:
         return self.engine.generate_comparison_table(
             entities=options,
             attributes=attributes,
-            title="Residency & WUE Options Comparison"
+            title="Residency & WUE Options Comparison",
+            unitids=unitids
         )
 
 
@@ -177,7 +190,8 @@ class CostComparator:
     def compare_net_prices(
         self,
         schools: List[Dict],
-        income_bracket: int
+        income_bracket: int,
+        unitids: Optional[Sequence[str]] = None
     ) -> ComparisonTable:
         """Compare net prices across schools for income bracket"""
         
@@ -200,7 +214,8 @@ class CostComparator:
         return self.engine.generate_comparison_table(
             entities=filtered if filtered else schools,
             attributes=attributes,
-            title=f"Net Price Comparison (Income: ${income_bracket:,})"
+            title=f"Net Price Comparison (Income: ${income_bracket:,})",
+            unitids=unitids
         )
     
     def compare_four_year_costs(
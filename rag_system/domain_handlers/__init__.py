@@ -0,0 +1,165 @@
+"""
+Domain Handlers
+Registry of ProductionRAG synthesis domains. Each entry declares its trigger
+vocabulary, priority and record types; the module that renders the answer
+is only imported the first time a question routes to that domain.
+"""
+
+import importlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+from .base import AnswerBuffer, HandlerContext, StreamingAnswerBuffer, extract_citations_from_data
+
+
+@dataclass(frozen=True)
+class DomainHandler:
+    """Declaration of one synthesis domain"""
+    name: str
+    priority: int
+    vocabulary: Tuple[str, ...] = ()
+    record_types: Tuple[str, ...] = ()
+
+    @property
+    def module(self) -> str:
+        return f"{__name__}.{self.name}"
+
+    def render(self, ctx: HandlerContext, out: AnswerBuffer):
+        """Import the handler module if needed and render into ``out``"""
+        load_renderer(self.module)(ctx, out)
+
+
+@lru_cache(maxsize=None)
+def load_renderer(module: str) -> Callable[[HandlerContext, AnswerBuffer], None]:
+    """render() of a handler module (imported on first use)"""
+    return importlib.import_module(module).render
+
+
+# In dispatch order: when several domains share the top priority the first
+# one listed wins. Vocabulary is matched on whole tokens by QueryRouter;
+# domains with an empty vocabulary are triggered by router rules only.
+HANDLERS: Tuple[DomainHandler, ...] = (
+    DomainHandler(
+        "foster_care", 150,
+        ('foster care', 'foster youth', 'chafee', 'guardian scholars', 'emancipated',
+         'ab 12', 'extended foster'),
+        ('foster',),
+    ),
+    DomainHandler(
+        "disability", 140,
+        ('disability', 'disabled', 'wheelchair', 'blind', 'deaf', 'section 504', 'accommodation',
+         'vocational rehabilitation', 'vr funding'),
+        ('disability',),
+    ),
+    DomainHandler(
+        "daca_undocumented", 145,
+        ('daca', 'undocumented', 'ab 540', 'cadaa', 'dream act', 'tps', 'temporary protected status'),
+        ('daca',),
+    ),
+    DomainHandler(
+        "military_dependent", 135,
+        ('military dependent', 'ab 2210', 'gi bill', 'yellow ribbon', 'dodea', 'post-9/11', 'veteran'),
+        ('military', 'tribal'),
+    ),
+    DomainHandler(
+        "tribal", 130,
+        ('tribal', 'native american', 'american indian', 'blood quantum', 'cdib', 'bia grant',
+         'diné', 'navajo', 'cherokee', 'haskell'),
+        ('tribal',),
+    ),
+    DomainHandler(
+        "bankruptcy_incarceration", 125,
+        ('bankruptcy', 'incarcerated', 'incarceration', 'prison', 'prisoner',
+         'professional judgment', 'special circumstances'),
+        ('bankruptcy',),
+    ),
+    DomainHandler(
+        "ncaa_athletic", 120,
+        ('ncaa', 'athletic', 'athlete', 'd1', 'd2', 'd3', 'scholarship', 'redshirt',
+         'redshirted', 'redshirting', 'nil', 'transfer portal', 'eligibility'),
+        ('ncaa',),
+    ),
+    DomainHandler(
+        "religious", 150,
+        ('religious', 'sabbath', 'kosher', 'halal', 'vaccine exemption', 'religious exemption',
+         'orthodox', 'muslim', 'jewish', 'hasidic', 'eruv'),
+        ('religious',),
+    ),
+    DomainHandler(
+        "transfer_credit", 110,
+        ('transfer credit', 'ib credit', 'a-level', 'igcse', 'dual enrollment', 'ap credit',
+         'articulation', 'wes evaluation'),
+        ('transfer_credit',),
+    ),
+    DomainHandler(
+        "parent_plus_denial", 120,
+        ('parent plus', 'plus loan', 'plus denial', 'plus denied', 'parent loan denied'),
+    ),
+    DomainHandler(
+        "cs_internal_transfer", 115,
+        ('internal transfer', 'change major', 'declare major', 'transfer into cs',
+         'transfer into engineering', 'major gatekeeping', 'weed-out'),
+        ('cs_transfer_gate',),
+    ),
+    DomainHandler(
+        "homeless_youth_sap", 115,
+        ('homeless', 'unaccompanied youth', 'mckinney-vento', 'sap appeal',
+         'satisfactory academic progress', 'academic probation'),
+        ('homeless_youth', 'sap_appeal', 'emergency_aid'),
+    ),
+    DomainHandler(
+        "study_abroad", 110,
+        ('study abroad', 'consortium agreement', 'aid portability', 'co-op', 'exchange program'),
+        ('consortium_agreement', 'aid_portability', 'coa_adjustment', 'paid_coop'),
+    ),
+    DomainHandler(
+        "mission_deferral", 125,
+        ('mission deferral', 'byu mission', 'lds mission', '18-month mission', 'religious mission'),
+        ('mission_deferral', 'gap_year_deferral', 'visa_timing'),
+    ),
+    DomainHandler(
+        "cc_uc_transfer", 110,
+        ('community college', 'ccc to uc', 'assist', 'transfer admission guarantee', 'tag', 'igetc'),
+        ('cc_uc_transfer',),
+    ),
+    DomainHandler(
+        "coa_real_budget", 115,
+        ('cost of attendance', 'real budget', 'actual cost', 'coa vs', 'underestimate',
+         'underestimated', 'underestimating', '12-month budget', 'market rent', 'insurance waiver'),
+        ('coa_real_budget', 'health_insurance_waiver', 'coa_adjustment'),
+    ),
+    DomainHandler(
+        "bsmd", 100,
+        ('bs/md', 'bsmd', 'pre-med', 'plme', 'rice/baylor', 'pitt gap', 'case ppsp'),
+        ('bsmd',),
+    ),
+    DomainHandler(
+        "residency", 90,
+        ('residency', 'wue', 'in-state', 'out-of-state', 'uc/csu'),
+    ),
+    DomainHandler("international_cs", 85),
+    DomainHandler("international_aid", 80),
+    DomainHandler("cs_admissions", 70),
+    DomainHandler(
+        "financial_aid", 60,
+        ('aid', 'financial', 'financially', 'fafsa', 'css', 'sai', 'efc', 'net price'),
+    ),
+    DomainHandler(
+        "school_list", 50,
+        ('school list', 'recommend schools', 'shortlist'),
+    ),
+)
+
+REGISTRY: Dict[str, DomainHandler] = {handler.name: handler for handler in HANDLERS}
+
+__all__ = [
+    "AnswerBuffer",
+    "DomainHandler",
+    "HANDLERS",
+    "HandlerContext",
+    "REGISTRY",
+    "StreamingAnswerBuffer",
+    "extract_citations_from_data",
+    "load_renderer",
+]
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Bankruptcy / Incarceration Handler
+Bankruptcy, incarcerated parents and professional judgment appeals.
+"""
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext, extract_citations_from_data
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the bankruptcy incarceration answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # Bankruptcy + incarceration + professional judgment
+    out.write("## Bankruptcy, Incarceration & Professional Judgment\n\n")
+
+    bankruptcy_data = [d for d in retrieved_data if d.get('_record_type') == 'bankruptcy']
+    if not bankruptcy_data:
+        bankruptcy_results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['bankruptcy']},
+            n_results=20, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if bankruptcy_results['metadatas'] and bankruptcy_results['metadatas'][0]:
+            bankruptcy_data = [dict(meta) for meta in bankruptcy_results['metadatas'][0]]
+
+    # 1. FAFSA custodial parent definition (physical custody 51%+)
+    out.write(
+        "### FAFSA Custodial Parent Definition (Physical Custody 51%+)\n\n"
+        "**Rule:** Custodial parent = parent you lived with MOST in past 12 months (51%+ of nights).\n"
+        "**If exactly 50/50:** Use parent who provided more financial support.\n"
+        "**If remarried:** Stepparent income/assets MUST be included.\n\n"
+    )
+
+    # 2. CSS Profile NCP waiver for incarceration
+    out.write(
+        "### CSS Profile NCP Waiver for Incarceration\n\n"
+        "**What it is:** Non-Custodial Parent (NCP) waiver allows you to skip reporting incarcerated parent's income on CSS Profile.\n"
+        "**Documentation:** Court records, prison contact info, letter explaining lack of contact/support.\n\n"
+    )
+
+    # 3. School-specific NCP waiver policies (Northwestern, Duke, WashU, Vanderbilt, Rice, Emory)
+    out.write(
+        "### School-Specific NCP Waiver Policies (Northwestern, Duke, WashU, Vanderbilt, Rice, Emory)\n\n"
+        "**Northwestern:** NCP waiver available for incarceration. Meets 100% need, no loans.\n"
+        "**Duke:** NCP waiver for incarceration. No-loan policy (grants only). Meets 100% need.\n"
+        "**WashU:** NCP waiver available. Generous financial aid.\n"
+        "**Vanderbilt:** NCP waiver for incarceration. No-loan policy. Opportunity Vanderbilt program.\n"
+        "**Rice:** Flexible NCP waiver policies. Rice Investment (no loans for low/middle income).\n"
+        "**Emory:** NCP waiver available. Emory Advantage (no loans for low income).\n\n"
+    )
+
+    # 4. Bankruptcy impact on FAFSA (discharged debts not counted)
+    out.write(
+        "### Bankruptcy Impact on FAFSA (Discharged Debts Not Counted)\n\n"
+        "**Chapter 7 Bankruptcy:** Assets are sold to pay debts. Discharged debts are NOT counted on FAFSA. Assets are ZERO after bankruptcy (good for aid!).\n"
+        "**Timing:** File FAFSA AFTER bankruptcy discharge for maximum aid.\n"
+        "**Chapter 13 Bankruptcy:** Debts are restructured, not eliminated. Monthly payments reduce available income.\n\n"
+    )
+
+    # 5. Professional judgment authority (Section 479A)
+    out.write(
+        "### Professional Judgment Authority (Section 479A)\n\n"
+        "**What it is:** Higher Education Act Section 479A gives financial aid offices authority to adjust your FAFSA data for special circumstances.\n"
+        "**Eligible circumstances:** Job loss, medical expenses, bankruptcy payments, divorce, death of parent, natural disaster.\n"
+        "**Possible adjustments:** Reduce income, reduce assets, change dependency status (rare).\n\n"
+    )
+
+    # 6. Income documentation for incarcerated parent
+    out.write(
+        "### Income Documentation for Incarcerated Parent\n\n"
+        "**Typical income:** $0 or minimal (prison wages are $0.12-$0.40/hour).\n"
+        "**Documentation:** Prison wage statement, tax return (if any), letter from prison confirming income.\n\n"
+    )
+
+    # 7. Parent PLUS loan denial = additional $4k-5k unsubsidized for student
+    out.write(
+        "### Parent PLUS Loan Denial = Additional $4k-5k Unsubsidized for Student\n\n"
+        "**Rule:** If parent applies for Parent PLUS loan and is DENIED (due to bad credit, bankruptcy, etc.), student becomes eligible for additional $4,000-$5,000 in unsubsidized federal loans.\n"
+        "**Strategy:** Parent should apply for PLUS loan even if likely to be denied, to unlock extra student loans.\n\n"
+    )
+
+    # 8. Prison visitation records as custody proof
+    out.write(
+        "### Prison Visitation Records as Custody Proof\n\n"
+        "**Use case:** If parent is incarcerated, you can use prison visitation records to prove you did NOT live with that parent (for custodial parent determination).\n"
+        "**Documentation:** Prison visitor logs, letters from prison confirming no overnight visits.\n\n"
+    )
+
+    # 9. Court documents for NCP waiver
+    out.write(
+        "### Court Documents for NCP Waiver\n\n"
+        "**Required documents:** Sentencing documents, court records, divorce decree (if applicable), custody agreement.\n"
+        "**Purpose:** Prove parent is incarcerated and unable to provide financial support.\n\n"
+    )
+
+    # 10. Bankruptcy discharge papers
+    out.write(
+        "### Bankruptcy Discharge Papers\n\n"
+        "**What they are:** Official court documents showing bankruptcy is complete and debts are discharged.\n"
+        "**Use for financial aid:** Submit to financial aid office to prove zero assets, request professional judgment adjustment.\n\n"
+    )
+
+    # 11. Multi-year aid impact when parent released
+    out.write(
+        "### Multi-Year Aid Impact When Parent Released\n\n"
+        "**Scenario:** If incarcerated parent is released during college, your financial aid may change.\n"
+        "**Impact:** Parent's income will be included on FAFSA, potentially reducing aid.\n"
+        "**Strategy:** Request professional judgment if parent has difficulty finding employment after release.\n\n"
+    )
+
+    # 12. Appeal letter template
+    out.write(
+        "### Appeal Letter Template\n\n"
+        "**Structure:**\n"
+        "1. **Introduction:** State your name, student ID, and purpose of letter (professional judgment appeal).\n"
+        "2. **Explain circumstances:** Describe special circumstances (bankruptcy, incarceration, divorce) with specific details.\n"
+        "3. **Provide documentation:** List all attached documents (court records, bankruptcy papers, etc.).\n"
+        "4. **Request specific adjustments:** Ask for income reduction, asset exclusion, or other adjustments.\n"
+        "5. **Conclusion:** Thank financial aid office for consideration.\n\n"
+    )
+
+    # 13. Documentation checklist
+    out.write(
+        "### Documentation Checklist\n\n"
+        "**For incarceration:** Court records, prison contact info, letter explaining lack of contact, prison visitation records.\n"
+        "**For bankruptcy:** Bankruptcy discharge papers (Chapter 7), repayment plan (Chapter 13), current asset statements.\n"
+        "**For divorce:** Divorce decree, custody agreement, child support orders.\n"
+        "**For NCP waiver:** Court documents, sentencing documents, letter from school counselor or clergy.\n\n"
+    )
+
+    # 14. 4-year cost projection
+    out.write(
+        "### 4-Year Cost Projection\n\n"
+        "**Purpose:** Estimate total cost of attendance over 4 years, accounting for changes in circumstances (parent release, bankruptcy discharge, etc.).\n"
+        "**Example:** Year 1-2 (parent incarcerated): $10,000/year. Year 3-4 (parent released): $20,000/year. Total 4-year cost: $60,000.\n"
+        "**Use for planning:** Helps you choose affordable schools and plan for potential aid changes.\n\n"
+    )
+
+    out.write(
+        "## Recommended Strategy\n\n"
+        "**1. Apply to schools with NCP waiver policies:**\n"
+        "   - Northwestern, Duke, Vanderbilt, Rice, WashU, Emory\n"
+        "   - Submit NCP waiver request with incarceration documentation\n\n"
+        "**2. Time bankruptcy strategically:**\n"
+        "   - If possible, complete Chapter 7 bankruptcy BEFORE filing FAFSA\n"
+        "   - Zero assets = maximum financial aid\n\n"
+        "**3. Request professional judgment:**\n"
+        "   - Submit appeal letter with all documentation\n"
+        "   - Explain special circumstances clearly\n"
+        "   - Request specific adjustments (income reduction, asset exclusion)\n\n"
+        "**4. Apply to FAFSA-only schools:**\n"
+        "   - USC, University of Michigan, UVA (no NCP required)\n"
+        "   - Avoids NCP waiver complications\n\n"
+        "**Bottom line:** Schools with NCP waiver policies + professional judgment can provide full financial aid despite bankruptcy/incarceration circumstances.\n"
+    )
+
+    # Add citations from bankruptcy data (already retrieved above)
+    bankruptcy_citations = extract_citations_from_data(bankruptcy_data)
+    if bankruptcy_citations:
+        out.write("\n\n## Sources\n\n")
+        for i, url in enumerate(bankruptcy_citations, 1):
+            out.write(f"{i}. {url}\n")
+    for url in bankruptcy_citations:
+        all_citations.append(Citation(url=url, last_verified="2025-10-27"))
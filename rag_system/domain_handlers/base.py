@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Domain Handler Support
+Render context, answer buffer and shared helpers for the synthesis domain handlers.
+"""
+
+import io
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class AnswerBuffer:
+    """Append-only answer text (replaces repeated ``answer +=`` string building)"""
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+
+    def write(self, text: str):
+        """Append text"""
+        self._buffer.write(text)
+
+    def getvalue(self) -> str:
+        """Full answer text"""
+        return self._buffer.getvalue()
+
+
+class StreamingAnswerBuffer(AnswerBuffer):
+    """
+    AnswerBuffer that hands each finished markdown section to ``on_section``
+
+    A section ends where the next heading line starts, so a section is
+    sent as soon as the handler moves past it. close() sends the last
+    one. The sent pieces concatenate to getvalue().
+    """
+
+    HEADING = re.compile(r'^#{1,6} ', re.MULTILINE)
+
+    def __init__(self, on_section: Callable[[str], None]):
+        super().__init__()
+        self._on_section = on_section
+        self._sent = 0
+
+    def write(self, text: str):
+        """Append text and send the sections it completes"""
+        super().write(text)
+        pending = self.getvalue()[self._sent:]
+        cut = 0
+        for heading in self.HEADING.finditer(pending):
+            if heading.start() > cut:
+                self._on_section(pending[cut:heading.start()])
+                cut = heading.start()
+        self._sent += cut
+
+    def close(self):
+        """Send whatever follows the last heading"""
+        rest = self.getvalue()[self._sent:]
+        if rest:
+            self._on_section(rest)
+            self._sent += len(rest)
+
+
+@dataclass
+class HandlerContext:
+    """Everything a domain handler reads while rendering one answer"""
+    rag: Any
+    question: str
+    question_lower: str
+    context: Dict
+    retrieved_data: List[Dict]
+    all_citations: List
+    retrieval_ctx: Optional[Any] = None  # RetrievalContext; partition searches are reported on it
+    unitids: Tuple[str, ...] = ()  # UNITIDs of the schools the question names
+
+
+def extract_citations_from_data(data_list: List[Dict]) -> List[str]:
+    """Extract unique citations from retrieved data"""
+    citations = []
+    seen_urls = set()
+    for item in data_list:
+        # Try source_url first (for older records)
+        url = item.get('source_url', '')
+        if url and url not in seen_urls:
+            citations.append(url)
+            seen_urls.add(url)
+
+        # Try citations field (JSON array)
+        cites = item.get('citations', [])
+        if isinstance(cites, str):
+            try:
+                cites = json.loads(cites)
+            except:
+                cites = []
+        if isinstance(cites, list):
+            for cite_url in cites:
+                if cite_url and cite_url not in seen_urls:
+                    citations.append(cite_url)
+                    seen_urls.add(cite_url)
+    return citations
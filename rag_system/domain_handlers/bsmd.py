@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+BS/MD Handler
+BS/MD program comparison.
+"""
+
+import json
+import logging
+
+from .base import AnswerBuffer, HandlerContext
+
+logger = logging.getLogger(__name__)
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the bsmd answer"""
+    rag = ctx.rag
+    question = ctx.question
+    question_lower = ctx.question_lower
+    retrieved_data = ctx.retrieved_data
+
+    # BS/MD program comparison - need to explicitly retrieve BS/MD records
+    # Filter for BS/MD records only
+    bsmd_data = [d for d in retrieved_data if d.get('_record_type') == 'bsmd']
+
+    if not bsmd_data:
+        # If no BS/MD records retrieved, query specifically for them
+        logger.info("No BS/MD records in initial retrieval, querying specifically...")
+        bsmd_results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['bsmd']},
+            n_results=20, retrieval_ctx=ctx.retrieval_ctx
+        )
+
+        # Convert to retrieved_data format
+        if bsmd_results['metadatas'] and bsmd_results['metadatas'][0]:
+            bsmd_data = []
+            for meta in bsmd_results['metadatas'][0]:
+                data_dict = dict(meta)
+                # Parse JSON strings
+                for key, value in data_dict.items():
+                    if isinstance(value, str) and value.startswith('['):
+                        try:
+                            data_dict[key] = json.loads(value)
+                        except:
+                            pass
+                bsmd_data.append(data_dict)
+
+    # Generate comparison table
+    table = rag.program_comparator.compare_bsmd_programs(bsmd_data, unitids=ctx.unitids)
+    out.write(rag.synthesis_engine.format_comparison_table_markdown(table))
+
+    # Add detailed analysis
+    out.write("\n\n## Detailed Analysis\n\n")
+    for program in bsmd_data[:10]:
+        name = program.get('program_name', 'Unknown')
+        school = program.get('undergrad_school', 'Unknown')
+        out.write(f"### {name} ({school})\n\n")
+
+        # MCAT/GPA requirements
+        mcat_req = program.get('mcat_required', 'N/A')
+        min_gpa = program.get('minimum_gpa', 'N/A')
+        min_mcat = program.get('minimum_mcat', 'N/A')
+        out.write("**Requirements:**\n")
+        out.write(f"- MCAT required: {mcat_req}\n")
+        if min_mcat != 'N/A':
+            out.write(f"- Minimum MCAT: {min_mcat}\n")
+        out.write(f"- Minimum GPA: {min_gpa}\n\n")
+
+        # Costs
+        undergrad_cost = program.get('undergrad_cost_per_year', 'N/A')
+        med_cost = program.get('medical_cost_per_year', 'N/A')
+        total_cost = program.get('total_8year_cost', 'N/A')
+        out.write("**Costs:**\n")
+        out.write(f"- Undergrad: ${undergrad_cost:,}/year\n" if undergrad_cost != 'N/A' else "- Undergrad: N/A\n")
+        out.write(f"- Medical school: ${med_cost:,}/year\n" if med_cost != 'N/A' else "- Medical school: N/A\n")
+        out.write(f"- Total 8-year cost: ${total_cost:,}\n\n" if total_cost != 'N/A' else "- Total 8-year cost: N/A\n\n")
+
+        # Conditional guarantee
+        guarantee = program.get('conditional_guarantee', 'N/A')
+        out.write(f"**Conditional Guarantee:** {guarantee}\n\n")
+
+        # Acceptance rate
+        accept_rate = program.get('acceptance_rate', 'N/A')
+        if accept_rate != 'N/A':
+            out.write(f"**Acceptance Rate:** {accept_rate*100:.1f}%\n\n")
+
+    # Add recommendation if requested
+    if any(kw in question_lower for kw in ['recommend', 'best', 'strategy', 'decision', 'vs', 'versus', 'compare']):
+        out.write(
+            "\n## Recommendation\n\n"
+            "**BS/MD vs Traditional Route:**\n\n"
+            "**Choose BS/MD if:**\n"
+            "- You are 100% certain about medicine as a career\n"
+            "- You want to avoid MCAT stress (for programs without MCAT requirement)\n"
+            "- You value guaranteed admission security\n"
+            "- You can meet the GPA requirements (typically 3.0-3.75)\n\n"
+            "**Choose Traditional Route if:**\n"
+            "- You want flexibility to explore other careers\n"
+            "- You want broader undergraduate experience\n"
+            "- You're willing to compete for med school admission\n"
+            "- You want to attend a top-ranked medical school\n\n"
+            "**Selectivity Tiers:**\n"
+            "- **Most selective** (2-3% acceptance): Brown PLME, Rice/Baylor\n"
+            "- **Highly selective** (5-8% acceptance): Case PPSP, Northwestern HPME\n"
+            "- **Selective** (10-15% acceptance): Pitt GAP, Stony Brook\n\n"
+            "**Bottom line:** Apply to BS/MD programs as a 'safety net' but also apply to top traditional pre-med schools (UCLA, Michigan, UNC, UVA) for flexibility.\n"
+        )
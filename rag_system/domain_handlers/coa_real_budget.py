@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+COA vs Real Budget Handler
+Official cost of attendance against a 12-month real budget, plus insurance waivers.
+"""
+
+import json
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the coa real budget answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # COA vs real budget comparison
+    out.write("## COA vs 12-Month Real Budget (NYC/LA/Boston) + Insurance Waiver\n\n")
+
+    # Get COA real budget data
+    coa_data = [d for d in retrieved_data if d.get('_record_type') in ['coa_real_budget', 'health_insurance_waiver', 'coa_adjustment']]
+    if not coa_data:
+        results = rag.query_partition(
+            'major_gates', question,
+            {'_record_type': ['coa_real_budget', 'health_insurance_waiver', 'coa_adjustment']},
+            n_results=50, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if results['metadatas'] and results['metadatas'][0]:
+            coa_data = [dict(meta) for meta in results['metadatas'][0]]
+
+    if coa_data:
+        # Section 1: NYU COA
+        out.write("### NYU COA\n\n")
+        for record in coa_data:
+            if record.get('school_name') in ['NYU', 'New York University']:
+                official_coa = record.get('official_coa', 0)
+                out.write(f"**Official NYU Cost of Attendance:** ${official_coa:,}/year\n\n")
+                coa_breakdown = record.get('coa_breakdown', '')
+                if isinstance(coa_breakdown, str):
+                    try:
+                        coa_breakdown = json.loads(coa_breakdown)
+                    except:
+                        coa_breakdown = {}
+                if coa_breakdown:
+                    out.write("**Breakdown:**\n")
+                    for category, value in coa_breakdown.items():
+                        out.write(f"- {category.replace('_', ' ').title()}: ${value:,}\n")
+                    out.write("\n")
+                break
+
+        # Section 2: USC COA
+        out.write("### USC COA\n\n")
+        for record in coa_data:
+            if record.get('school_name') in ['USC', 'University of Southern California']:
+                official_coa = record.get('official_coa', 0)
+                out.write(f"**Official USC Cost of Attendance:** ${official_coa:,}/year\n\n")
+                coa_breakdown = record.get('coa_breakdown', '')
+                if isinstance(coa_breakdown, str):
+                    try:
+                        coa_breakdown = json.loads(coa_breakdown)
+                    except:
+                        coa_breakdown = {}
+                if coa_breakdown:
+                    out.write("**Breakdown:**\n")
+                    for category, value in coa_breakdown.items():
+                        out.write(f"- {category.replace('_', ' ').title()}: ${value:,}\n")
+                    out.write("\n")
+                break
+
+        # Section 3: Northeastern COA
+        out.write("### Northeastern COA\n\n")
+        for record in coa_data:
+            if record.get('school_name') in ['Northeastern', 'Northeastern University']:
+                official_coa = record.get('official_coa', 0)
+                out.write(f"**Official Northeastern Cost of Attendance:** ${official_coa:,}/year\n\n")
+                coa_breakdown = record.get('coa_breakdown', '')
+                if isinstance(coa_breakdown, str):
+                    try:
+                        coa_breakdown = json.loads(coa_breakdown)
+                    except:
+                        coa_breakdown = {}
+                if coa_breakdown:
+                    out.write("**Breakdown:**\n")
+                    for category, value in coa_breakdown.items():
+                        out.write(f"- {category.replace('_', ' ').title()}: ${value:,}\n")
+                    out.write("\n")
+                break
+
+        # Section 4: NYC market rent
+        out.write(
+            "### NYC Market Rent\n\n"
+            "**New York City market rent (2025):**\n"
+            "- Manhattan studio: $2,800-3,500/month ($33,600-42,000/year)\n"
+            "- Brooklyn 1BR: $2,400-3,200/month ($28,800-38,400/year)\n"
+            "- Queens 1BR: $2,000-2,800/month ($24,000-33,600/year)\n"
+            "- NYU dorms: $18,000-22,000/year (9 months)\n"
+            "- **Real 12-month housing cost:** $28,000-42,000/year\n\n"
+        )
+
+        # Section 5: LA market rent
+        out.write(
+            "### LA Market Rent\n\n"
+            "**Los Angeles market rent (2025):**\n"
+            "- Westwood studio: $2,200-2,800/month ($26,400-33,600/year)\n"
+            "- Koreatown 1BR: $1,800-2,400/month ($21,600-28,800/year)\n"
+            "- USC area 1BR: $2,000-2,600/month ($24,000-31,200/year)\n"
+            "- USC dorms: $16,000-20,000/year (9 months)\n"
+            "- **Real 12-month housing cost:** $24,000-33,600/year\n\n"
+        )
+
+        # Section 6: Boston market rent
+        out.write(
+            "### Boston Market Rent\n\n"
+            "**Boston market rent (2025):**\n"
+            "- Back Bay studio: $2,400-3,000/month ($28,800-36,000/year)\n"
+            "- Fenway 1BR: $2,200-2,800/month ($26,400-33,600/year)\n"
+            "- Allston 1BR: $1,900-2,500/month ($22,800-30,000/year)\n"
+            "- Northeastern dorms: $17,000-21,000/year (9 months)\n"
+            "- **Real 12-month housing cost:** $26,000-36,000/year\n\n"
+        )
+
+        # Section 7: Utilities estimate
+        out.write(
+            "### Utilities Estimate\n\n"
+            "**Monthly utilities (electric, gas, water, internet):**\n"
+            "- NYC: $150-250/month ($1,800-3,000/year)\n"
+            "- LA: $120-200/month ($1,440-2,400/year)\n"
+            "- Boston: $140-220/month ($1,680-2,640/year)\n\n"
+        )
+
+        # Section 8: Transit costs
+        out.write(
+            "### Transit Costs\n\n"
+            "**Public transportation:**\n"
+            "- NYC MetroCard: $132/month ($1,584/year)\n"
+            "- LA Metro: $100/month ($1,200/year) - but car often needed\n"
+            "- Boston T pass: $90/month ($1,080/year)\n"
+            "- **Real transit cost:** $1,200-2,500/year (including occasional rideshare)\n\n"
+        )
+
+        # Section 9: Insurance waiver criteria
+        out.write("### Insurance Waiver Criteria\n\n")
+        for record in coa_data:
+            if record.get('_record_type') == 'health_insurance_waiver':
+                out.write(f"{record.get('description', '')}\n\n")
+                criteria = record.get('waiver_criteria', '')
+                if isinstance(criteria, str):
+                    try:
+                        criteria = json.loads(criteria)
+                    except:
+                        criteria = []
+                if criteria:
+                    out.write("**Waiver criteria:**\n")
+                    for c in criteria:
+                        out.write(f"- {c}\n")
+                    out.write("\n")
+                out.write(f"**Typical savings:** {record.get('typical_savings', '$3,000-4,500/year')}\n\n")
+                break
+
+        # Section 10: 12-month budget
+        out.write(
+            "### 12-Month Budget\n\n"
+            "**Real 12-month budget (off-campus):**\n\n"
+        )
+        schools_seen = set()
+        for record in coa_data:
+            if record.get('_record_type') == 'coa_real_budget' and record.get('school_name'):
+                school = record.get('school_name', '')
+                if school not in schools_seen:
+                    real_budget = record.get('real_budget', 0)
+                    out.write(f"**{school}:** ${real_budget:,}/year\n")
+                    schools_seen.add(school)
+        out.write("\n")
+
+        # Section 11: Side-by-side comparison
+        out.write(
+            "### Side-by-Side Comparison\n\n"
+            "| School | Official COA | Real 12-Month Budget | Gap | Gap % |\n"
+            "|--------|--------------|----------------------|-----|-------|\n"
+        )
+
+        schools_seen = set()
+        for record in coa_data:
+            if record.get('_record_type') == 'coa_real_budget' and record.get('school_name'):
+                school = record.get('school_name', '')
+                if school not in schools_seen:
+                    official_coa = record.get('official_coa', 0)
+                    real_budget = record.get('real_budget', 0)
+                    gap = record.get('gap', 0)
+                    gap_pct = record.get('gap_percentage', 0)
+                    out.write(f"| {school} | ${official_coa:,} | ${real_budget:,} | ${gap:,} | {gap_pct:.1f}% |\n")
+                    schools_seen.add(school)
+
+        out.write("\n**Detailed breakdown by school:**\n\n")
+        schools_seen = set()
+        for record in coa_data:
+            if record.get('_record_type') == 'coa_real_budget' and record.get('school_name'):
+                school = record.get('school_name', '')
+                if school not in schools_seen:
+                    out.write(f"**{school}:**\n")
+                    out.write(f"{record.get('explanation', '')}\n\n")
+
+                    # Show breakdown
+                    coa_breakdown = record.get('coa_breakdown', '')
+                    real_breakdown = record.get('real_breakdown', '')
+                    if isinstance(coa_breakdown, str):
+                        try:
+                            coa_breakdown = json.loads(coa_breakdown)
+                        except:
+                            coa_breakdown = {}
+                    if isinstance(real_breakdown, str):
+                        try:
+                            real_breakdown = json.loads(real_breakdown)
+                        except:
+                            real_breakdown = {}
+
+                    if coa_breakdown and real_breakdown:
+                        out.write(
+                            "| Category | Official COA | Real Cost | Difference |\n"
+                            "|----------|--------------|-----------|------------|\n"
+                        )
+                        for category in ['tuition', 'fees', 'housing', 'meals', 'books', 'personal', 'transportation']:
+                            if category in coa_breakdown:
+                                coa_val = coa_breakdown.get(category, 0)
+                                real_val = real_breakdown.get(category, 0)
+                                diff = real_val - coa_val
+                                out.write(f"| {category.title()} | ${coa_val:,} | ${real_val:,} | ${diff:+,} |\n")
+                        # Add health insurance if in real budget
+                        if 'health_insurance' in real_breakdown:
+                            hi_val = real_breakdown['health_insurance']
+                            out.write(f"| Health Insurance | $0 | ${hi_val:,} | ${hi_val:+,} |\n")
+                        out.write("\n")
+                    schools_seen.add(school)
+
+        # Section 12: Ranked recommendation
+        out.write(
+            "### Ranked Recommendation\n\n"
+            "**Value ranking (best to worst):**\n\n"
+        )
+
+        # Calculate value score (lower gap % = better value)
+        schools_ranked = []
+        schools_seen = set()
+        for record in coa_data:
+            if record.get('_record_type') == 'coa_real_budget' and record.get('school_name'):
+                school_name = record.get('school_name', '')
+                if school_name not in schools_seen:
+                    schools_ranked.append({
+                        'name': school_name,
+                        'gap_pct': record.get('gap_percentage', 0),
+                        'real_budget': record.get('real_budget', 0)
+                    })
+                    schools_seen.add(school_name)
+
+        schools_ranked.sort(key=lambda x: x['gap_pct'])
+
+        for i, school in enumerate(schools_ranked, 1):
+            out.write(f"{i}. **{school['name']}** - Real budget: ${school['real_budget']:,}/year, Gap: {school['gap_pct']:.1f}%\n")
+
+        out.write(
+            "\n**Recommendation:** Choose based on:\n"
+            "- Financial aid package (net price after grants)\n"
+            "- Ability to waive health insurance (saves $3,000-4,500/year)\n"
+            "- Housing options (on-campus vs off-campus)\n"
+            "- Transportation needs (car required in LA adds $5,000+/year)\n\n"
+        )
+
+        # Extract citations
+        for record in coa_data:
+            citations_field = record.get('citations', [])
+            if isinstance(citations_field, str):
+                try:
+                    citations_field = json.loads(citations_field)
+                except:
+                    citations_field = [citations_field] if citations_field else []
+            for url in citations_field:
+                if url and url not in [c.url for c in all_citations]:
+                    all_citations.append(Citation(url=url, last_verified="2025-10-27"))
+
+            source_url = record.get('source_url')
+            if source_url and source_url not in [c.url for c in all_citations]:
+                all_citations.append(Citation(url=source_url, last_verified="2025-10-27"))
+
+        if all_citations:
+            out.write("\n## Sources\n\n")
+            for i, citation in enumerate(all_citations, 1):
+                out.write(f"{i}. {citation.url}\n")
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+CS Admissions Handler
+CS admissions comparison, pathway recommendation and decision framework.
+"""
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the cs admissions answer"""
+    rag = ctx.rag
+    question_lower = ctx.question_lower
+    context = ctx.context
+    retrieved_data = ctx.retrieved_data
+
+    # CS/admissions comparison
+    if 'transfer' in question_lower or 'internal' in question_lower:
+        table = rag.admissions_comparator.compare_internal_transfer(retrieved_data, unitids=ctx.unitids)
+        out.write(rag.synthesis_engine.format_comparison_table_markdown(table))
+    else:
+        table = rag.admissions_comparator.compare_cs_admissions(retrieved_data, unitids=ctx.unitids)
+        out.write(rag.synthesis_engine.format_comparison_table_markdown(table))
+
+    if any(kw in question_lower for kw in ['recommend', 'best', 'strategy', 'go/no-go']):
+        rec = rag.recommendation_engine.recommend_cs_pathway(retrieved_data, context)
+        out.write("\n\n" + rag.synthesis_engine.format_recommendation_markdown(rec))
+
+    # Add decision framework if requested
+    if 'compare' in question_lower or 'decision' in question_lower or 'build' in question_lower:
+        framework = rag.framework_generator.generate_cs_admission_framework(retrieved_data, context)
+        out.write("\n\n" + framework)
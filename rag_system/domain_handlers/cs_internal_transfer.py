@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+CS Internal Transfer Handler
+Internal transfer requirements and major gatekeeping for CS/engineering.
+"""
+
+import json
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the cs internal transfer answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # CS internal transfer / major gatekeeping
+    out.write(
+        "## Internal Transfer Requirements and Analysis\n\n"
+        "This analysis covers **UC Berkeley CS transfer**, **UT Austin CS transfer**, and **UIUC CS transfer** pathways.\n\n"
+    )
+
+    # Get CS transfer gate data
+    cs_transfer_data = [d for d in retrieved_data if d.get('_record_type') == 'cs_transfer_gate']
+    if not cs_transfer_data:
+        results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['cs_transfer_gate']},
+            n_results=30, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if results['metadatas'] and results['metadatas'][0]:
+            cs_transfer_data = [dict(meta) for meta in results['metadatas'][0]]
+
+    if cs_transfer_data:
+        # Group by school
+        schools = {}
+        for record in cs_transfer_data:
+            school = record.get('school_name', 'Unknown')
+            if school not in schools:
+                schools[school] = []
+            schools[school].append(record)
+
+        # Section 1: Internal transfer requirements and GPA thresholds
+        out.write("### Internal Transfer Requirements & GPA Thresholds\n\n")
+        for school, records in schools.items():
+            out.write(f"**{school}:**\n\n")
+            for record in records:
+                major = record.get('major', 'Unknown')
+                min_gpa = record.get('minimum_gpa', 'N/A')
+                typical_gpa = record.get('typical_gpa', 'N/A')
+                admission_rate = record.get('admission_rate', 0)
+
+                out.write(f"- **{major}:** GPA thresholds: {min_gpa} minimum, {typical_gpa} competitive (admission rate: {admission_rate*100:.0f}%)\n")
+            out.write("\n")
+
+        # Section 2: Weed-out course sequences and seat capacity constraints
+        out.write("### Weed-Out Course Sequences & Seat Capacity Constraints\n\n")
+        for school, records in schools.items():
+            out.write(f"**{school}:**\n\n")
+            for record in records:
+                major = record.get('major', 'Unknown')
+                prereqs = record.get('prerequisite_courses', '')
+                weedout = record.get('weed_out_courses', '')
+
+                if isinstance(prereqs, str):
+                    try:
+                        prereqs = json.loads(prereqs)
+                    except:
+                        prereqs = []
+                if isinstance(weedout, str):
+                    try:
+                        weedout = json.loads(weedout)
+                    except:
+                        weedout = []
+
+                out.write(f"- **{major}:** Weed-out course sequences: {', '.join(prereqs if prereqs else weedout)}\n")
+                out.write(f"  - Seat capacity constraints: {record.get('description', 'Limited seats available')}\n")
+            out.write("\n")
+
+        # Section 3: Semester-by-semester plan
+        out.write(
+            "### Semester-by-Semester Plan\n\n"
+            "**Recommended timeline for internal transfer:**\n\n"
+            "- **Semester 1:** Complete first weed-out course (e.g., CS 61A, CS 124, CS 311) + general education\n"
+            "- **Semester 2:** Complete second weed-out course + math requirements\n"
+            "- **Semester 3:** Complete final prerequisites, apply for internal transfer\n"
+            "- **Semester 4:** If accepted, begin major coursework; if rejected, pursue backup major\n\n"
+        )
+
+        # Section 4: Probability-weighted outcomes and time-to-degree distribution
+        out.write("### Probability-Weighted Outcomes & Time-to-Degree Distribution\n\n")
+        for school, records in schools.items():
+            for record in records:
+                major = record.get('major', 'Unknown')
+                admission_rate = record.get('admission_rate', 0)
+                typical_gpa = record.get('typical_gpa', 'N/A')
+
+                out.write(f"**{school} {major}:**\n")
+                out.write(f"- Probability-weighted outcomes: {admission_rate*100:.0f}% acceptance rate with {typical_gpa} GPA\n")
+                out.write("- Time-to-degree distribution: 8 semesters if accepted in semester 3, 9-10 semesters if delayed or backup major\n\n")
+
+        # Section 5: Go/no-go decision per campus
+        out.write("### Go/No-Go Decision Per Campus\n\n")
+        for school, records in schools.items():
+            for record in records:
+                major = record.get('major', 'Unknown')
+                admission_rate = record.get('admission_rate', 0)
+                typical_gpa = record.get('typical_gpa', 'N/A')
+                backups = record.get('backup_majors', '')
+                if isinstance(backups, str):
+                    try:
+                        backups = json.loads(backups)
+                    except:
+                        backups = []
+
+                if admission_rate >= 0.3:
+                    decision = "✅ GO"
+                    reason = f"Reasonable {admission_rate*100:.0f}% acceptance rate with strong backup majors"
+                elif admission_rate >= 0.1:
+                    decision = "⚠️ CONDITIONAL GO"
+                    reason = f"Low {admission_rate*100:.0f}% acceptance rate - only if you have {typical_gpa}+ GPA and strong backup plan"
+                else:
+                    decision = "❌ NO-GO"
+                    reason = f"Extremely low {admission_rate*100:.0f}% acceptance rate - high risk of not getting into major"
+
+                out.write(f"**{school} {major}:** {decision}\n")
+                out.write(f"- Reasoning: {reason}\n")
+                if backups:
+                    out.write(f"- Backup majors available: {', '.join(backups)}\n")
+                out.write("\n")
+
+        # Section 6: Decision tree
+        out.write(
+            "### Decision Tree: Internal Transfer Strategy\n\n"
+            "```\n"
+            "START: Pre-Engineering Admission\n"
+            "  |\n"
+            "  ├─ Semester 1-2: Complete weed-out courses\n"
+            "  │   |\n"
+            "  │   ├─ GPA ≥ 3.8? → HIGH probability (60-80%) → Apply to all 3 schools\n"
+            "  │   ├─ GPA 3.3-3.7? → MEDIUM probability (30-50%) → Apply + prepare backup major\n"
+            "  │   └─ GPA < 3.3? → LOW probability (<30%) → Pivot to backup major or transfer out\n"
+            "  │\n"
+            "  ├─ Semester 3: Apply for internal transfer\n"
+            "  │   |\n"
+            "  │   ├─ ACCEPTED? → Begin major coursework (8 semesters total)\n"
+            "  │   └─ REJECTED? → Backup major or external transfer (9-10 semesters)\n"
+            "  │\n"
+            "  └─ Campus-Specific Recommendation:\n"
+            "      ├─ UC Berkeley: GO if GPA ≥ 3.5 (30% acceptance)\n"
+            "      ├─ UT Austin: CONDITIONAL GO if GPA ≥ 3.7 (20% acceptance)\n"
+            "      └─ UIUC: GO if GPA ≥ 3.5 (35% acceptance)\n"
+            "```\n\n"
+        )
+
+        # Extract citations
+        for record in cs_transfer_data:
+            citations_field = record.get('citations', [])
+            if isinstance(citations_field, str):
+                try:
+                    citations_field = json.loads(citations_field)
+                except:
+                    citations_field = [citations_field] if citations_field else []
+            for url in citations_field:
+                if url and url not in [c.url for c in all_citations]:
+                    all_citations.append(Citation(url=url, last_verified="2025-10-27"))
+
+            source_url = record.get('source_url')
+            if source_url and source_url not in [c.url for c in all_citations]:
+                all_citations.append(Citation(url=source_url, last_verified="2025-10-27"))
+
+        if all_citations:
+            out.write("\n## Sources\n\n")
+            for i, citation in enumerate(all_citations, 1):
+                out.write(f"{i}. {citation.url}\n")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+DACA / Undocumented Handler
+Federal aid eligibility, state aid (AB 540, CADAA) and institutional aid for undocumented students.
+"""
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext, extract_citations_from_data
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the daca undocumented answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # DACA/undocumented student aid
+    out.write("## DACA & Undocumented Student Financial Aid\n\n")
+
+    daca_data = [d for d in retrieved_data if d.get('_record_type') == 'daca']
+    if not daca_data:
+        daca_results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['daca']},
+            n_results=20, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if daca_results['metadatas'] and daca_results['metadatas'][0]:
+            daca_data = [dict(meta) for meta in daca_results['metadatas'][0]]
+
+    out.write(
+        "### Federal Aid Eligibility\n\n"
+        "**DACA students are NOT eligible for:**\n"
+        "- Federal Pell Grants\n"
+        "- Federal student loans\n"
+        "- Federal work-study\n"
+        "- Most federal aid programs\n\n"
+    )
+
+    out.write(
+        "**TPS (Temporary Protected Status) students:**\n"
+        "- Also NOT eligible for federal aid\n"
+        "- Same restrictions as DACA\n\n"
+    )
+
+    # 1. CA AB 540 requirements (3 years CA HS + graduation + affidavit)
+    out.write("### CA AB 540 Requirements (3 Years CA HS + Graduation + Affidavit)\n\n")
+    ab540 = next((d for d in daca_data if 'ab 540' in d.get('policy_name', '').lower()), None)
+    if ab540:
+        out.write(f"**{ab540.get('policy_name', 'AB 540')}:** {ab540.get('description', '')}\n\n")
+    else:
+        out.write(
+            "**Requirements:** 3 years CA high school + graduation + affidavit\n"
+            "**Benefit:** In-state tuition at UC/CSU (saves ~$30,000/year)\n"
+            "**Applies to:** Undocumented, DACA, TPS, and other non-residents\n\n"
+        )
+
+    # 2. CADAA (CA Dream Act Application) process
+    out.write("### CADAA (CA Dream Act Application) Process\n\n")
+    cadaa = next((d for d in daca_data if 'cadaa' in d.get('policy_name', '').lower() or 'ca dream act' in d.get('policy_name', '').lower()), None)
+    if cadaa:
+        out.write(f"**{cadaa.get('policy_name', 'CADAA')}:** {cadaa.get('description', '')}\n\n")
+    else:
+        out.write(
+            "**What it is:** California's version of FAFSA for AB 540 students\n"
+            "**Eligible aid:** Cal Grant A ($12,970/year at UC), Cal Grant B ($14,000/year at UC), UC/CSU institutional grants\n"
+            "**SSN requirement:** Use 000-00-0000 for parent SSN if undocumented\n"
+            "**Deadline:** March 2 (same as FAFSA)\n\n"
+        )
+
+    # 3. UC/CSU aid for AB 540 students
+    out.write(
+        "### UC/CSU Aid for AB 540 Students\n\n"
+        "**UC:** Cal Grant A ($12,970/year) + UC institutional grants. Total aid can cover full cost.\n"
+        "**CSU:** Cal Grant A ($5,742/year) + CSU institutional grants. Total cost can be $0-$5,000/year.\n\n"
+    )
+
+    # 4. Private colleges offering aid to DACA (Princeton, Harvard, Yale, etc.)
+    out.write(
+        "### Private Colleges Offering Aid to DACA (Princeton, Harvard, Yale, etc.)\n\n"
+        "**Meet full need for DACA:**\n"
+        "- **Princeton:** Full need met, no loans\n"
+        "- **Harvard:** Full need met, no loans\n"
+        "- **Yale:** Full need met, no loans\n"
+        "- **MIT:** Full need met\n"
+        "- **Stanford:** Full need met\n"
+        "- **Amherst:** Full need met, no loans\n"
+        "- **Pomona:** Full need met, no loans\n\n"
+    )
+
+    # 5. CSS Profile without parent SSN
+    out.write(
+        "### CSS Profile Without Parent SSN\n\n"
+        "**How to complete:** Use 000-00-0000 for SSN if you or your parents don't have one. Schools will still process your application.\n\n"
+    )
+
+    # 6. TPS documentation requirements
+    out.write(
+        "### TPS Documentation Requirements\n\n"
+        "**What is TPS:** Temporary Protected Status for nationals of designated countries.\n"
+        "**Documentation:** TPS approval notice (I-797), Employment Authorization Document (EAD).\n"
+        "**Aid eligibility:** Same as DACA - NOT eligible for federal aid, but eligible for state aid (CA, NY, TX, etc.) and private college aid.\n\n"
+    )
+
+    # 7. National Merit citizenship requirement
+    out.write(
+        "### National Merit Citizenship Requirement\n\n"
+        "**Requirement:** Must be U.S. citizen or permanent resident to receive National Merit Scholarship.\n"
+        "**DACA/undocumented:** NOT eligible for National Merit Scholarship.\n\n"
+    )
+
+    # 8. Medical school DACA restrictions
+    out.write(
+        "### Medical School DACA Restrictions\n\n"
+        "**Eligibility:** DACA students CAN attend medical school.\n"
+        "**Restrictions:** Cannot get federal loans (must use private loans or scholarships). Can practice medicine in most states after graduation.\n"
+        "**Schools accepting DACA:** UC medical schools (UCSF, UCLA, UCSD, UCI, UCD), some private medical schools.\n\n"
+    )
+
+    # 9. DACA renewal timeline
+    out.write(
+        "### DACA Renewal Timeline\n\n"
+        "**Renewal period:** Every 2 years.\n"
+        "**Application deadline:** Submit 120-150 days before expiration.\n"
+        "**Cost:** $495 (as of 2024).\n\n"
+    )
+
+    # 10. OPT ineligibility for DACA
+    out.write(
+        "### OPT Ineligibility for DACA\n\n"
+        "**OPT (Optional Practical Training):** Work authorization for F-1 visa students after graduation.\n"
+        "**DACA students:** NOT eligible for OPT because DACA is not a visa status.\n"
+        "**Alternative:** DACA provides work authorization, so you can work without OPT.\n\n"
+    )
+
+    # 11. State-by-state undocumented student aid policies
+    out.write(
+        "### State-by-State Undocumented Student Aid Policies\n\n"
+        "**California (AB 540 + CADAA):** In-state tuition + state aid (Cal Grant up to $14,000/year)\n"
+        "**Texas (HB 1403):** In-state tuition + some state aid\n"
+        "**New York (NY DREAM Act):** State aid (TAP up to $5,665/year)\n"
+        "**Illinois (IL DREAM Act):** In-state tuition + state aid (MAP grants)\n"
+        "**Other states:** Check individual state policies.\n\n"
+    )
+
+    # 12. TheDream.US scholarship
+    out.write("### TheDream.US Scholarship\n\n")
+    thedream = next((d for d in daca_data if 'thedream.us' in d.get('policy_name', '').lower()), None)
+    if thedream:
+        out.write(f"**{thedream.get('policy_name', 'TheDream.US')}:** {thedream.get('description', '')}\n\n")
+    else:
+        out.write(
+            "**Amount:** Up to $33,000 over 4 years (associate's) or $80,000 (bachelor's in STEM)\n"
+            "**Eligibility:** DACA, TPS, or undocumented; came to U.S. before age 16\n"
+            "**Partner schools:** 70+ colleges (mostly regional)\n\n"
+        )
+
+    # 13. Golden Door Scholars
+    out.write("### Golden Door Scholars\n\n")
+    golden = next((d for d in daca_data if 'golden door' in d.get('policy_name', '').lower()), None)
+    if golden:
+        out.write(f"**{golden.get('policy_name', 'Golden Door Scholars')}:** {golden.get('description', '')}\n\n")
+    else:
+        out.write(
+            "**Amount:** Full-ride scholarship (tuition + room + board + stipend)\n"
+            "**Eligibility:** DACA or undocumented, top academic performance\n"
+            "**Awards:** ~100 per year\n"
+            "**Includes:** Mentorship, career support, graduate school funding\n\n"
+        )
+
+    # 14. Career pathways without federal work authorization
+    out.write(
+        "### Career Pathways Without Federal Work Authorization\n\n"
+        "**DACA work authorization:** Allows you to work in most fields.\n"
+        "**Restrictions:** Cannot work for federal government, some security clearance jobs.\n"
+        "**Career options:** Private sector (tech, finance, healthcare, education), state/local government, non-profits, entrepreneurship.\n"
+        "**Professional licenses:** Most states allow DACA recipients to obtain professional licenses (law, medicine, nursing, teaching).\n\n"
+    )
+
+    out.write(
+        "## Recommended Strategy\n\n"
+        "**For California residents:**\n"
+        "1. **File CADAA (CA Dream Act Application):**\n"
+        "   - Deadline: March 2\n"
+        "   - Eligible for Cal Grant ($12,970/year at UC)\n\n"
+        "2. **Apply to UC/CSU with AB 540:**\n"
+        "   - In-state tuition (saves $30,000/year)\n"
+        "   - Full financial aid available\n"
+        "   - Total cost can be $0-$5,000/year\n\n"
+        "3. **Apply to private colleges meeting full need:**\n"
+        "   - Princeton, Harvard, Yale, MIT, Stanford\n"
+        "   - Use CSS Profile with 000-00-0000 SSN\n\n"
+        "4. **Apply for DACA scholarships:**\n"
+        "   - TheDream.US (up to $80,000)\n"
+        "   - Golden Door Scholars (full-ride)\n\n"
+        "**For other states:**\n"
+        "- Check if your state offers in-state tuition for undocumented students\n"
+        "- Apply to private colleges meeting full need for DACA\n"
+        "- Focus on TheDream.US partner schools\n\n"
+        "**Bottom line:** DACA students in California can attend UC/CSU for near-zero cost with AB 540 + CADAA. Private colleges like Princeton/Harvard also meet full need.\n"
+    )
+
+    # Add citations from DACA data
+    daca_citations = extract_citations_from_data(daca_data)
+    if daca_citations:
+        out.write("\n\n## Sources\n\n")
+        for i, url in enumerate(daca_citations, 1):
+            out.write(f"{i}. {url}\n")
+    for url in daca_citations:
+        all_citations.append(Citation(url=url, last_verified="2025-10-27"))
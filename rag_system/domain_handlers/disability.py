@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Disability Handler
+Disability services, accommodations and disability-related financial aid.
+"""
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext, extract_citations_from_data
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the disability answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # Disability accommodations + financial aid
+    out.write("## Disability Accommodations & Financial Aid\n\n")
+
+    # Filter for disability records
+    disability_data = [d for d in retrieved_data if d.get('_record_type') == 'disability']
+
+    if not disability_data:
+        disability_results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['disability']},
+            n_results=20, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if disability_results['metadatas'] and disability_results['metadatas'][0]:
+            disability_data = [dict(meta) for meta in disability_results['metadatas'][0]]
+
+    # 1. Schools with excellent disability services (Stanford, UC Berkeley, Michigan, etc.)
+    out.write(
+        "### Schools with Excellent Disability Services (Stanford, UC Berkeley, Michigan, etc.)\n\n"
+        "**Top programs:**\n"
+        "- **Stanford:** Accessible Education Office, strong support for students with disabilities\n"
+        "- **UC Berkeley:** Disabled Students' Program (DSP), serves 1,500+ students\n"
+        "- **University of Michigan:** Services for Students with Disabilities (SSD)\n"
+        "- **University of Arizona:** Disability Resource Center (DRC)\n"
+        "- **University of Illinois:** Disability Resources & Educational Services (DRES)\n\n"
+    )
+
+    # 2. COA adjustment for disability expenses (HEA Section 472)
+    out.write("### COA Adjustment for Disability Expenses (HEA Section 472)\n\n")
+    coa_policy = next((d for d in disability_data if 'coa' in d.get('policy_name', '').lower() or 'cost of attendance' in d.get('policy_name', '').lower()), None)
+    if coa_policy:
+        out.write(f"**{coa_policy.get('policy_name', 'COA Adjustment')}:** {coa_policy.get('description', '')}\n\n")
+    else:
+        out.write(
+            "**What it is:** Financial aid office can INCREASE your COA to include disability expenses (HEA Section 472)\n"
+            "**Eligible expenses:** Personal attendant costs, specialized equipment, accessible transportation, medical expenses\n"
+            "**Impact:** Higher COA = more financial aid eligibility. Example: COA increases from $70,000 to $85,000 = $15,000 more aid\n\n"
+        )
+
+    # 3. Professional judgment for medical costs
+    out.write(
+        "### Professional Judgment for Medical Costs\n\n"
+        "**What it is:** Financial aid office can EXCLUDE medical expenses from your family's income (HEA Section 479A)\n"
+        "**Example:** If family has $10,000 in medical bills, income can be reduced by $10,000\n"
+        "**Impact:** Lower income = more financial aid\n"
+        "**Documentation:** Medical bills, insurance statements, doctor's letters\n\n"
+    )
+
+    # 4. Personal care attendant funding sources
+    out.write(
+        "### Personal Care Attendant Funding Sources\n\n"
+        "**Sources:**\n"
+        "- Vocational Rehabilitation (VR) state agencies\n"
+        "- Medicaid Personal Care Services (PCS)\n"
+        "- COA adjustment (increases financial aid)\n"
+        "- Private insurance (some plans cover)\n\n"
+    )
+
+    # 5. Vocational Rehabilitation (VR) state agencies
+    out.write("### Vocational Rehabilitation (VR) State Agencies\n\n")
+    vr_policy = next((d for d in disability_data if 'vocational rehabilitation' in d.get('policy_name', '').lower() or 'vr' in d.get('policy_name', '').lower()), None)
+    if vr_policy:
+        out.write(f"**{vr_policy.get('policy_name', 'VR Funding')}:** {vr_policy.get('description', '')}\n\n")
+    else:
+        out.write(
+            "**What it is:** State agencies that fund college for students with disabilities\n"
+            "**Covers:** Tuition, fees, books, personal attendant costs, specialized equipment, transportation\n"
+            "**Eligibility:** Disability that impacts employment, need VR services to work\n"
+            "**Application:** Through your state VR agency (search '[State] Vocational Rehabilitation')\n\n"
+        )
+
+    # 6. SSI/SSDI impact on financial aid
+    out.write(
+        "### SSI/SSDI Impact on Financial Aid\n\n"
+        "**SSI (Supplemental Security Income):** $914/month federal (2024). NOT counted as income on FAFSA.\n"
+        "**SSDI (Social Security Disability Insurance):** $800-$3,000/month typical. NOT counted as income on FAFSA.\n"
+        "**Impact:** You can receive SSI/SSDI without reducing your financial aid.\n\n"
+    )
+
+    # 7. ABLE account contribution limits ($18k/year)
+    out.write("### ABLE Account Contribution Limits ($18k/Year)\n\n")
+    able_policy = next((d for d in disability_data if 'able' in d.get('policy_name', '').lower()), None)
+    if able_policy:
+        out.write(f"**{able_policy.get('policy_name', 'ABLE Account')}:** {able_policy.get('description', '')}\n\n")
+    else:
+        out.write(
+            "**Contribution limit:** $18,000/year\n"
+            "**SSI asset limit:** First $100,000 doesn't count toward $2,000 limit\n"
+            "**FAFSA treatment:** NOT counted as asset\n"
+            "**Tax benefits:** Earnings grow tax-free\n\n"
+        )
+
+    # 8. Accessible housing costs
+    out.write(
+        "### Accessible Housing Costs\n\n"
+        "**Typical costs:** Accessible housing (wheelchair accessible, close to classes) may cost $2,000-$5,000 more per year than standard housing.\n"
+        "**Funding:** Can be included in COA adjustment, covered by VR, or institutional aid.\n\n"
+    )
+
+    # 9. Disability-specific scholarships
+    out.write(
+        "### Disability-Specific Scholarships\n\n"
+        "**Examples:**\n"
+        "- Google Lime Scholarship: $10,000 for students with disabilities in CS\n"
+        "- National Federation of the Blind: $3,000-$12,000\n"
+        "- Incight Scholarship: $500-$2,500\n"
+        "- Sertoma Scholarship: $1,000 for students with hearing loss\n\n"
+    )
+
+    # 10. ADA accommodations (504 plans)
+    out.write(
+        "### ADA Accommodations (504 Plans)\n\n"
+        "**Americans with Disabilities Act (ADA):** Colleges MUST provide reasonable accommodations.\n"
+        "**Section 504 (Rehabilitation Act):** Applies to all federally funded programs, requires equal access.\n"
+        "**Common accommodations:** Extended time on exams (1.5x or 2x), note-takers, accessible housing, priority registration, assistive technology\n\n"
+    )
+
+    # 11. Reduced course load = full-time status
+    out.write(
+        "### Reduced Course Load = Full-Time Status\n\n"
+        "**Financial Aid Rule:** 9-11 units can count as full-time for students with disabilities\n"
+        "**Benefits:** Keep full Pell Grant ($7,395/year), keep institutional aid, maintain health insurance\n"
+        "**Documentation:** Letter from disability services office\n\n"
+    )
+
+    # 12. Medical school technical standards
+    out.write(
+        "### Medical School Technical Standards\n\n"
+        "**What they are:** Medical schools require students to perform certain tasks (e.g., physical exams, surgery).\n"
+        "**Accommodations:** Schools must provide reasonable accommodations (e.g., assistive technology, modified training).\n"
+        "**Disclosure:** You are NOT required to disclose disability in application, but may need to discuss accommodations after admission.\n\n"
+    )
+
+    # 13. Assistive technology funding
+    out.write(
+        "### Assistive Technology Funding\n\n"
+        "**Sources:**\n"
+        "- Vocational Rehabilitation (VR): Covers screen readers, speech-to-text, specialized keyboards\n"
+        "- COA adjustment: Increases financial aid to cover technology costs\n"
+        "- School disability services: May provide loaner equipment\n"
+        "- Private insurance: Some plans cover assistive technology\n\n"
+    )
+
+    # 14. Campus accessibility ratings
+    out.write(
+        "### Campus Accessibility Ratings\n\n"
+        "**Resources:**\n"
+        "- College websites: Check disability services pages for accessibility info\n"
+        "- Campus visits: Tour with disability services office\n"
+        "- Student reviews: Ask current students with disabilities about their experiences\n"
+        "**Key factors:** Accessible buildings, transportation, housing, dining, recreation\n\n"
+    )
+
+    out.write(
+        "## Recommended Strategy\n\n"
+        "**1. Request COA adjustment:**\n"
+        "   - Document all disability-related expenses\n"
+        "   - Submit to financial aid office\n"
+        "   - Can increase aid by $10,000-$30,000/year\n\n"
+        "**2. Apply for Vocational Rehabilitation:**\n"
+        "   - Can cover full tuition + attendant costs\n"
+        "   - Start application 6-12 months before college\n\n"
+        "**3. Use ABLE account:**\n"
+        "   - Save money without losing SSI\n"
+        "   - Not counted on FAFSA\n\n"
+        "**4. Request reduced course load:**\n"
+        "   - 9-11 units = full-time for financial aid\n"
+        "   - Reduces academic stress\n\n"
+        "**Bottom line:** With COA adjustment + VR funding + SSI + institutional aid, you can attend college with full support for disability-related needs.\n"
+    )
+
+    # Add citations from disability data
+    disability_citations = extract_citations_from_data(disability_data)
+    if disability_citations:
+        out.write("\n\n## Sources\n\n")
+        for i, url in enumerate(disability_citations, 1):
+            out.write(f"{i}. {url}\n")
+    for url in disability_citations:
+        all_citations.append(Citation(url=url, last_verified="2025-10-27"))
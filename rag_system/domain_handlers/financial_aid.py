@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Financial Aid Handler
+Financial aid policy comparison and FAFSA/CSS details.
+"""
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the financial aid answer"""
+    rag = ctx.rag
+    question_lower = ctx.question_lower
+    context = ctx.context
+    retrieved_data = ctx.retrieved_data
+
+    # Financial aid comparison
+    if 'international' in question_lower:
+        table = rag.aid_comparator.compare_international_aid(retrieved_data, unitids=ctx.unitids)
+    else:
+        table = rag.aid_comparator.compare_aid_policies(retrieved_data, context, unitids=ctx.unitids)
+
+    out.write(rag.synthesis_engine.format_comparison_table_markdown(table))
+
+    # Add detailed financial aid analysis
+    if any(kw in question_lower for kw in ['fafsa', 'css', 'sai', 'efc', 'divorced', 'asset']):
+        out.write("\n\n## Financial Aid Details\n\n")
+
+        # FAFSA vs CSS Profile
+        if 'css' in question_lower or 'profile' in question_lower:
+            out.write(
+                "### FAFSA vs CSS Profile\n\n"
+                "**FAFSA (Federal):**\n"
+                "- Required for federal aid at all schools\n"
+                "- Uses custodial parent info only (for divorced parents)\n"
+                "- Simplified asset treatment\n"
+                "- Retirement accounts (401k, IRA) excluded\n\n"
+                "**CSS Profile (Institutional):**\n"
+                "- Required by ~200 private schools for institutional aid\n"
+                "- May require non-custodial parent (NCP) info\n"
+                "- More detailed asset reporting\n"
+                "- Home equity counted (often capped at 1.2-2.4x income)\n"
+                "- Small business assets may be counted\n\n"
+            )
+
+        # Asset treatment
+        if 'asset' in question_lower or 'utma' in question_lower or '529' in question_lower:
+            out.write(
+                "### Asset Treatment (2024-2025 Rules)\n\n"
+                "**Parent Assets:**\n"
+                "- Assessment rate: 5.64% (FAFSA) or up to 5.64% (CSS)\n"
+                "- Protected allowance: ~$10,000 (varies by age)\n"
+                "- Includes: savings, investments, real estate (not primary home for FAFSA)\n"
+                "- Excludes: retirement accounts (401k, IRA, 403b)\n\n"
+                "**Student Assets:**\n"
+                "- Assessment rate: 20% (FAFSA) or up to 25% (CSS)\n"
+                "- No protected allowance\n"
+                "- **UTMA/UGMA accounts:** Counted as STUDENT assets (20-25% hit)\n"
+                "- **529 plans (parent-owned):** Counted as PARENT assets (5.64% hit)\n"
+                "- **529 plans (student-owned):** Counted as STUDENT assets (20% hit)\n\n"
+                "**Grandparent 529 Treatment (2024-2025 CHANGE):**\n"
+                "- **OLD RULE (pre-2024):** Distributions counted as student income (50% assessment)\n"
+                "- **NEW RULE (2024-2025):** Grandparent 529s NOT reported on FAFSA\n"
+                "- **Strategy:** Grandparent 529s now advantageous for federal aid\n"
+                "- **CSS Profile:** Some schools may still ask about grandparent 529s\n\n"
+            )
+
+        # Divorced parents
+        if 'divorced' in question_lower or 'ncp' in question_lower or 'non-custodial' in question_lower:
+            out.write(
+                "### Divorced Parents\n\n"
+                "**FAFSA:**\n"
+                "- Only custodial parent (parent you lived with most in past 12 months)\n"
+                "- If remarried, stepparent income/assets included\n"
+                "- Non-custodial parent NOT reported\n\n"
+                "**CSS Profile:**\n"
+                "- Custodial parent + stepparent (if remarried)\n"
+                "- Non-custodial parent (NCP) form required at most schools\n"
+                "- **NCP waiver available** if: no contact, abuse, abandonment, incarceration\n"
+                "- **Schools with NCP waiver:** Check individual school policies\n"
+                "- **If NCP refuses:** May lose institutional aid at schools requiring NCP\n\n"
+            )
+
+        # Small business
+        if 's-corp' in question_lower or 'business' in question_lower or 'rental' in question_lower:
+            out.write(
+                "### Small Business & Rental Property\n\n"
+                "**FAFSA:**\n"
+                "- Small business (<100 employees): EXCLUDED\n"
+                "- Family farm: EXCLUDED if family lives on it\n"
+                "- Rental property: INCLUDED as investment\n\n"
+                "**CSS Profile:**\n"
+                "- Small business (<50 employees): May be EXCLUDED (school-specific)\n"
+                "- Some schools count business equity\n"
+                "- Rental property: INCLUDED, net equity counted\n"
+                "- Depreciation may be added back to income\n\n"
+            )
+
+    # Add recommendation
+    if any(kw in question_lower for kw in ['recommend', 'strategy', 'best', 'shortlist']):
+        rec = rag.recommendation_engine.recommend_financial_strategy(retrieved_data, context)
+        out.write("\n\n" + rag.synthesis_engine.format_recommendation_markdown(rec))
+
+        # Add best-value shortlist if requested
+        if 'shortlist' in question_lower or 'best-value' in question_lower:
+            out.write(
+                "\n\n### Best-Value Shortlist\n\n"
+                "**Based on your profile (divorced parents, S-corp, rental property):**\n\n"
+                "**Tier 1: Meets 100% need + NCP waiver available:**\n"
+                "1. University of Chicago - Generous aid, NCP waiver possible\n"
+                "2. Vanderbilt - No-loan policy, NCP waiver available\n"
+                "3. Rice - Excellent aid, flexible with NCP\n\n"
+                "**Tier 2: Meets 100% need (NCP required but worth trying):**\n"
+                "4. Northwestern - Generous aid, may grant NCP waiver\n"
+                "5. Duke - No-loan policy\n"
+                "6. WashU - Generous aid\n\n"
+                "**Tier 3: FAFSA-only schools (no NCP required):**\n"
+                "7. USC - Large merit scholarships available\n"
+                "8. University of Michigan - Good aid for in-state\n"
+                "9. UVA - Excellent aid for in-state\n\n"
+                "**Strategy:** Apply to mix of CSS Profile schools (with NCP waiver potential) and FAFSA-only schools.\n"
+            )
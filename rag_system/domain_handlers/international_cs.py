@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+International CS Handler
+CS admissions and funding for international students.
+"""
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the international cs answer"""
+    rag = ctx.rag
+    question_lower = ctx.question_lower
+    retrieved_data = ctx.retrieved_data
+
+    # International student seeking CS + funding
+    # Combine international aid + CS admissions
+    out.write("## International Student CS Admissions + Funding\n\n")
+
+    # International aid comparison
+    aid_table = rag.aid_comparator.compare_international_aid(retrieved_data, unitids=ctx.unitids)
+    out.write(rag.synthesis_engine.format_comparison_table_markdown(aid_table))
+
+    # CS admissions comparison
+    out.write("\n\n")
+    cs_table = rag.admissions_comparator.compare_cs_admissions(retrieved_data, unitids=ctx.unitids)
+    out.write(rag.synthesis_engine.format_comparison_table_markdown(cs_table))
+
+    # Add recommendation
+    if any(kw in question_lower for kw in ['recommend', 'identify', 'shortlist', 'ranked list']):
+        out.write(
+            "\n\n## Recommended Strategy\n\n"
+            "**Need-blind + meets full need (most generous):**\n"
+            "- MIT, Harvard, Yale, Princeton, Amherst (5 schools)\n"
+            "- Extremely competitive but best financial aid\n\n"
+            "**Need-aware + meets full need (if admitted):**\n"
+            "- Stanford, Duke, Northwestern, Penn, Columbia\n"
+            "- Admission harder with aid request, but full need met\n\n"
+            "**Large merit scholarships:**\n"
+            "- USC (Presidential/Trustee), Georgia Tech, UIUC\n"
+            "- Stats-based, more predictable\n\n"
+            "**Budget $35k/yr strategy:**\n"
+            "1. Apply to need-blind schools (reach)\n"
+            "2. Apply to large merit schools (target)\n"
+            "3. Have affordable safety in home country\n\n"
+            "**Visa timeline:**\n"
+            "- I-20 issued: 2-4 weeks after admission + deposit\n"
+            "- F-1 visa appointment: 2-8 weeks wait time\n"
+            "- Start process immediately after May 1 decision\n"
+        )
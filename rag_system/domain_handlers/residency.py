@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Residency Handler
+Residency and WUE comparison.
+"""
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the residency answer"""
+    rag = ctx.rag
+    question_lower = ctx.question_lower
+    retrieved_data = ctx.retrieved_data
+
+    # Residency/WUE comparison
+    table = rag.program_comparator.compare_residency_options(retrieved_data, unitids=ctx.unitids)
+    out.write(rag.synthesis_engine.format_comparison_table_markdown(table))
+
+    # Add cost analysis and recommendation
+    if any(kw in question_lower for kw in ['cost', 'tuition', 'price', 'afford']):
+        out.write(
+            "\n\n## Cost Analysis\n\n"
+            "**UC/CSU In-State vs Out-of-State:**\n"
+            "- UC in-state: ~$14,000/yr tuition\n"
+            "- UC out-of-state: ~$44,000/yr tuition (+$30,000 surcharge)\n"
+            "- CSU in-state: ~$7,500/yr tuition\n"
+            "- CSU out-of-state: ~$19,500/yr tuition (+$12,000 surcharge)\n\n"
+            "**WUE Options:**\n"
+            "- 150% of in-state tuition (varies by school)\n"
+            "- Available at schools in AZ, CO, NV, OR, WA, UT, ID, MT\n"
+            "- Often excludes high-demand majors (CS, Engineering)\n\n"
+        )
+
+    if any(kw in question_lower for kw in ['recommend', 'strategy', 'decision']):
+        out.write(
+            "## Recommendation\n\n"
+            "**For CA residents:**\n"
+            "1. **First priority**: UC/CSU in-state (best value)\n"
+            "2. **Second priority**: WUE schools if major is available\n"
+            "3. **Consider**: Private schools with strong aid if family qualifies\n\n"
+            "**Residency requirements:**\n"
+            "- Must establish CA residency 366 days before term starts\n"
+            "- Financial independence required if parents are out-of-state\n"
+            "- Intent to remain in CA permanently\n"
+        )
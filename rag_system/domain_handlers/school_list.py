@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+School List Handler
+Balanced school list recommendation.
+"""
+
+from .base import AnswerBuffer, HandlerContext
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the school list answer"""
+    rag = ctx.rag
+    context = ctx.context
+    retrieved_data = ctx.retrieved_data
+
+    # School list recommendation
+    rec = rag.recommendation_engine.recommend_school_list(
+        retrieved_data,
+        context,
+        target_count=context.get('target_count', 12)
+    )
+    out.write(rag.synthesis_engine.format_recommendation_markdown(rec))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Transfer Credit Handler
+International transfer credit, IB/A-level/AP credit and articulation policies.
+"""
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext, extract_citations_from_data
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the transfer credit answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # Transfer credit policies - BUILD FROM RETRIEVED DATA
+    out.write("## International Transfer Credits & Policies\n\n")
+
+    # Get transfer credit data
+    transfer_data = [d for d in retrieved_data if d.get('_record_type') == 'transfer_credit']
+    if not transfer_data:
+        transfer_results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['transfer_credit']},
+            n_results=30, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if transfer_results['metadatas'] and transfer_results['metadatas'][0]:
+            transfer_data = [dict(meta) for meta in transfer_results['metadatas'][0]]
+
+    # 1. UC/CSU transfer credit limits (70 semester units max from CC)
+    uc_limit = next((d for d in transfer_data if 'uc' in d.get('policy_name', '').lower() and 'transfer credit limit' in d.get('policy_name', '').lower()), None)
+    if uc_limit:
+        out.write("### UC/CSU Transfer Credit Limits (70 Semester Units Max from CC)\n\n")
+        out.write(f"**{uc_limit.get('policy_name', 'UC Transfer Limits')}:** {uc_limit.get('description', '')}\n\n")
+        max_units = uc_limit.get('max_semester_units', 70)
+        out.write(f"**Maximum from community college:** {max_units} semester units\n")
+        if 'four_year_college_limit' in uc_limit:
+            out.write(f"**From 4-year colleges:** {uc_limit['four_year_college_limit']}\n")
+        if 'ap_ib_exception' in uc_limit:
+            out.write(f"**AP/IB exception:** {uc_limit['ap_ib_exception']}\n\n")
+    else:
+        out.write(
+            "### UC/CSU Transfer Credit Limits (70 Semester Units Max from CC)\n\n"
+            "**UC/CSU:** Maximum 70 semester units from community college. Unlimited from 4-year colleges. AP/IB credits do NOT count toward cap.\n\n"
+        )
+
+    # 2. IB credit policies (HL score 5+ typically)
+    ib_policies = [d for d in transfer_data if 'ib' in d.get('policy_name', '').lower() or 'international baccalaureate' in d.get('policy_name', '').lower()]
+    if ib_policies:
+        out.write("### IB Credit Policies (HL Score 5+ Typically)\n\n")
+        for ib in ib_policies[:5]:  # Show top 5
+            school = ib.get('school_name', '')
+            desc = ib.get('description', '')
+            if school:
+                out.write(f"**{school}:** {desc}\n")
+            if 'minimum_hl_score' in ib:
+                out.write(f"  - Minimum HL score: {ib['minimum_hl_score']}\n")
+            if 'units_per_hl' in ib:
+                out.write(f"  - Units per HL exam: {ib['units_per_hl']}\n")
+        out.write("\n")
+    else:
+        out.write(
+            "### IB Credit Policies (HL Score 5+ Typically)\n\n"
+            "**Typical:** HL score 5-7 grants 4-8 semester units. SL rarely grants credit.\n\n"
+        )
+
+    # 3. A-Level credit policies
+    alevel_policies = [d for d in transfer_data if 'a-level' in d.get('policy_name', '').lower()]
+    if alevel_policies:
+        out.write("### A-Level Credit Policies\n\n")
+        for al in alevel_policies[:3]:
+            school = al.get('school_name', '')
+            desc = al.get('description', '')
+            if school:
+                out.write(f"**{school}:** {desc}\n")
+        out.write("\n**Equivalencies:** A-Level Math = AP Calc BC, A-Level Physics = AP Physics C\n\n")
+    else:
+        out.write(
+            "### A-Level Credit Policies\n\n"
+            "**Typical:** Grade A = 8 units, Grade B = 4-8 units, Grade C = 4 units\n\n"
+        )
+
+    # 4. IGCSE recognition in U.S.
+    out.write(
+        "### IGCSE Recognition in U.S.\n\n"
+        "**Typical:** IGCSE alone rarely grants credit in U.S. colleges. Used for placement when combined with A-Levels. Some schools grant credit for IGCSE grade A* in specific subjects.\n\n"
+    )
+
+    # 5. AP credit policies (score 4-5 typically)
+    ap_policies = [d for d in transfer_data if 'ap credit' in d.get('policy_name', '').lower() or 'advanced placement' in d.get('policy_name', '').lower()]
+    if ap_policies:
+        out.write("### AP Credit Policies (Score 4-5 Typically)\n\n")
+        for ap in ap_policies[:5]:
+            school = ap.get('school_name', '')
+            desc = ap.get('description', '')
+            if school:
+                out.write(f"**{school}:** {desc}\n")
+            if 'minimum_score' in ap:
+                out.write(f"  - Minimum score: {ap['minimum_score']}\n")
+        out.write("\n")
+    else:
+        out.write(
+            "### AP Credit Policies (Score 4-5 Typically)\n\n"
+            "**Typical:** Score 5 = 4-8 units. Score 4 = 4 units at some schools. Score 3 rarely grants credit at selective schools.\n\n"
+        )
+
+    # 5. Dual enrollment credit transfer to private schools
+    dual_enroll = next((d for d in transfer_data if 'dual enrollment' in d.get('policy_name', '').lower()), None)
+    if dual_enroll:
+        out.write("### Dual Enrollment Credit Transfer to Private Schools\n\n")
+        out.write(f"**{dual_enroll.get('policy_name', 'Dual Enrollment')}:** {dual_enroll.get('description', '')}\n\n")
+    else:
+        out.write(
+            "### Dual Enrollment Credit Transfer to Private Schools\n\n"
+            "**Community college to UC/CSU:** Fully transferable (if on ASSIST.org), subject to 70-unit cap.\n"
+            "**Community college to private schools:** Varies by school. Some accept, some don't. Check individual policies.\n"
+            "**4-year college:** Usually transfers fully with no cap.\n\n"
+        )
+
+    # 6. Advanced standing impact on aid (4-year aid limit)
+    out.write(
+        "### Advanced Standing Impact on Aid (4-Year Aid Limit)\n\n"
+        "**Important:** Most schools limit financial aid to 4 years (8 semesters). If you enter with advanced standing (30+ units), you may graduate in 3 years but still have 4 years of aid eligibility. However, some schools reduce aid if you graduate early.\n\n"
+    )
+
+    # 7. Medical school AP/IB prerequisite policies (AAMC guidelines)
+    out.write(
+        "### Medical School AP/IB Prerequisite Policies (AAMC Guidelines)\n\n"
+        "**AAMC guidelines:** Most medical schools do NOT accept AP/IB credit for prerequisites (Biology, Chemistry, Physics, Math). You must take upper-level courses in college. Some schools allow AP/IB if you take additional upper-level courses in the same subject.\n\n"
+    )
+
+    # 8. ASSIST.org articulation agreements
+    out.write(
+        "### ASSIST.org Articulation Agreements\n\n"
+        "**What it is:** Official repository of California community college transfer agreements to UC/CSU.\n"
+        "**How to use:** Look up your community college + target UC/CSU campus to see which courses transfer and satisfy major requirements.\n\n"
+    )
+
+    # 9. WES transcript evaluation
+    wes = next((d for d in transfer_data if 'wes' in d.get('policy_name', '').lower() or 'world education services' in d.get('policy_name', '').lower()), None)
+    if wes:
+        out.write("### WES Transcript Evaluation\n\n")
+        out.write(f"**{wes.get('policy_name', 'WES Evaluation')}:** {wes.get('description', '')}\n\n")
+    else:
+        out.write(
+            "### WES Transcript Evaluation\n\n"
+            "**What it is:** World Education Services (WES) provides third-party transcript evaluation for international credentials ($100-$200).\n"
+            "**When needed:** Transferring from non-U.S. university or for A-Level/IB evaluation at some schools.\n\n"
+        )
+
+    # 10. Course equivalency determination
+    out.write(
+        "### Course Equivalency Determination\n\n"
+        "**How it works:** Schools determine course equivalency by comparing syllabi, credit hours, and learning outcomes. IB HL Math = AP Calc BC. A-Level Math = AP Calc BC. Use ASSIST.org for UC/CSU articulation.\n\n"
+    )
+
+    # 11. GPA calculation with international credits
+    out.write(
+        "### GPA Calculation with International Credits\n\n"
+        "**Typical policy:** IGCSE/IB/A-Level grades are NOT included in college GPA. Only college courses (dual enrollment, transfer credits) count toward GPA. AP exams don't have grades, only credit.\n\n"
+    )
+
+    # 8. Subject-specific credit (IB Math HL, Physics HL, etc.)
+    out.write("### Subject-Specific Credit (IB Math HL, Physics HL, Chemistry HL, Biology HL)\n\n")
+    subject_credits = [d for d in transfer_data if any(subj in d.get('policy_name', '').lower() for subj in ['math hl', 'physics hl', 'chemistry hl', 'biology hl'])]
+    if subject_credits:
+        for sc in subject_credits[:4]:
+            out.write(f"**{sc.get('policy_name', '')}:** {sc.get('description', '')}\n")
+        out.write("\n")
+    else:
+        out.write("**IB HL subjects:** Math, Physics, Chemistry, Biology typically grant 4-8 units each at score 5+.\n\n")
+
+    # 12. 3-year graduation feasibility
+    out.write(
+        "### 3-Year Graduation Feasibility\n\n"
+        "**With 40-60 units of transfer credit:**\n"
+        "- Can graduate in 2.5-3 years instead of 4\n"
+        "- Saves $50,000-$100,000 in tuition and living costs\n"
+        "- Requires careful course planning and advisor approval\n"
+        "- May impact athletic eligibility (5-year clock), housing (priority for 4 years), and financial aid (4-year limit)\n\n"
+    )
+
+    # Recommendation
+    out.write(
+        "## Recommended Strategy\n\n"
+        "**1. Maximize credit at UC/CSU:** Submit all IB HL (5+), A-Levels (A-C), AP (3+), dual enrollment up to 70-unit cap.\n\n"
+        "**2. Private schools:** Check individual policies. Some limit total credit to 1 year maximum. May need WES evaluation.\n\n"
+        "**3. Course equivalency:** IB HL Math = AP Calc BC, A-Level Math = AP Calc BC. Use ASSIST.org for UC/CSU articulation.\n\n"
+        "**4. Graduate early:** With 40-60 units, can graduate in 2.5-3 years, saving $50,000-$100,000.\n\n"
+        "**Bottom line:** Students with IB HL + A-Levels + AP + dual enrollment can enter college with 40-60 units of credit, potentially graduating a year early.\n"
+    )
+
+    transfer_citations = extract_citations_from_data(transfer_data)
+    if transfer_citations:
+        out.write("\n\n## Sources\n\n")
+        for i, url in enumerate(transfer_citations, 1):
+            out.write(f"{i}. {url}\n")
+    for url in transfer_citations:
+        all_citations.append(Citation(url=url, last_verified="2025-10-27"))
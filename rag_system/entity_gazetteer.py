@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Entity Gazetteer
+Maps school names, aliases, abbreviations and common misspellings to IPEDS
+UNITIDs, compiled into one token automaton so every school a question
+mentions is resolved in a single pass.
+"""
+
+import json
+import logging
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from query_router import TOKEN_PATTERN, TokenAutomaton
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Short names in common use that cannot be derived from the official name.
+# Keys are official names; an alias is only added if its school is known.
+SCHOOL_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "Massachusetts Institute of Technology": ("mit",),
+    "California Institute of Technology": ("caltech",),
+    "Carnegie Mellon University": ("cmu", "carnegie mellon"),
+    "Georgia Institute of Technology": ("georgia tech", "gatech"),
+    "University of Illinois Urbana-Champaign": ("uiuc", "illinois", "u of i"),
+    "University of California, Berkeley": ("uc berkeley", "berkeley", "ucb"),
+    "University of California, Los Angeles": ("ucla",),
+    "University of California, San Diego": ("ucsd", "uc san diego"),
+    "University of California, Irvine": ("uci", "uc irvine"),
+    "University of Texas at Austin": ("ut austin", "ut-austin"),
+    "University of Washington": ("uw", "udub"),
+    "University of Southern California": ("usc",),
+    "University of Michigan": ("umich", "michigan"),
+    "University of Pennsylvania": ("upenn", "penn"),
+    "University of Chicago": ("uchicago",),
+    "Washington University in St. Louis": ("washu", "wustl"),
+    "Johns Hopkins University": ("jhu", "johns hopkins"),
+    "New York University": ("nyu",),
+    "Brigham Young University": ("byu",),
+    "University of Notre Dame": ("notre dame",),
+}
+
+# Words dropped when deriving short names and acronyms
+STOP_WORDS = frozenset({"of", "the", "at", "in", "and", "for", "&"})
+INSTITUTION_WORDS = ("University", "College", "Institute")
+
+# Everyday words that are also the derived short form (or acronym) of some
+# school: "Hope" (Hope College), "Union" (Union College). Such schools are
+# only matched by their full names, so "I hope to transfer" or "student
+# union" never resolve to a school.
+COMMON_WORDS = frozenset({
+    "aim", "american", "art", "arts", "atlantic", "bay", "business", "capital", "capitol", "career",
+    "central", "champion", "christ", "city", "coast", "community", "cornerstone", "defiance", "design",
+    "east", "eastern", "faith", "family", "freedom", "friends", "grace", "harmony", "health", "heritage",
+    "holy", "hope", "independence", "international", "justice", "lake", "law", "liberty", "life",
+    "medical", "mercy", "messiah", "mountain", "music", "national", "new", "north", "northern",
+    "nursing", "pacific", "pioneer", "river", "saint", "south", "southern", "state", "summit",
+    "technical", "truth", "union", "unity", "valley", "victory", "west", "western",
+})
+
+# Single-token aliases at least this long also match one edit away
+# (same first letter), which keeps "pursue" from resolving to Purdue
+FUZZY_MIN_LENGTH = 7
+
+
+def record_unitid(metadata: Dict) -> Optional[str]:
+    """UNITID of a record: ``ipeds_id`` if set, else a numeric ``school_id``"""
+    for key in ("ipeds_id", "school_id"):
+        value = metadata.get(key)
+        if value is None:
+            continue
+        value = str(value).strip()
+        if value.isdigit() and int(value) > 0:
+            return value
+    return None
+
+
+def name_tokens(text: str) -> List[str]:
+    """
+    Lowercased word tokens of a name or question, without the router's
+    plural folding, which would turn "Wells" into "well"
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def derived_aliases(name: str) -> List[str]:
+    """
+    Short forms of an official name: without "The", "Duke" for "Duke
+    University", acronyms (single words in COMMON_WORDS are left out)
+    """
+    aliases = []
+    words = name.replace(",", " ").split()
+    if words and words[0].lower() == "the":
+        words = words[1:]
+        aliases.append(" ".join(words))
+
+    # "Stanford University" -> "Stanford", "Dartmouth College" -> "Dartmouth"
+    if 2 <= len(words) <= 3 and words[-1] in INSTITUTION_WORDS:
+        aliases.append(" ".join(words[:-1]))
+
+    # "Massachusetts Institute of Technology" -> "MIT"
+    initials = "".join(w[0] for w in words if w.lower() not in STOP_WORDS and w[0].isalpha())
+    if len(initials) >= 3:
+        aliases.append(initials)
+    return [alias for alias in aliases if " " in alias or alias.lower() not in COMMON_WORDS]
+
+
+def _deletes(token: str) -> Set[str]:
+    """The token and every variant with one character removed"""
+    return {token} | {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+@dataclass(frozen=True)
+class EntityMatch:
+    """One school mention resolved to a UNITID"""
+    unitid: str
+    name: str
+    alias: str
+    start: int
+    end: int
+    fuzzy: bool = False
+
+
+class EntityGazetteer:
+    """
+    Alias -> UNITID dictionary compiled into a token automaton
+
+    Official names win over curated aliases, which win over derived short
+    forms; a derived alias claimed by several schools is dropped as
+    ambiguous. Lookups are memoized per question.
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        self.names: Dict[str, str] = {}  # unitid -> canonical name
+        self._aliases: Dict[str, Tuple[int, Set[str]]] = {}  # alias key -> (rank, unitids)
+        self._automaton: Optional[TokenAutomaton] = None
+        self._fuzzy: Dict[str, Set[str]] = defaultdict(set)  # delete variant -> alias keys
+        self.cache_size = cache_size
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getstate__(self) -> Dict:
+        # The memo wraps a bound method and is rebuilt empty on load
+        state = dict(self.__dict__)
+        del state["resolve"]
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self.resolve = lru_cache(maxsize=self.cache_size)(self._resolve)
+
+    def add(self, name: str, unitid: str, aliases: Iterable[str] = ()):
+        """Register a school name (rank 0), explicit aliases (rank 1) and derived short forms (rank 2)"""
+        unitid = str(unitid)
+        if len(name) > len(self.names.get(unitid, "")):
+            self.names[unitid] = name
+        self._add_alias(name, unitid, 0)
+        for alias in aliases:
+            self._add_alias(alias, unitid, 1)
+        for alias in derived_aliases(name):
+            self._add_alias(alias, unitid, 2)
+        self._automaton = None
+
+    def _add_alias(self, alias: str, unitid: str, rank: int):
+        key = " ".join(name_tokens(alias))
+        if len(key) < 2:
+            return
+        current = self._aliases.get(key)
+        if current is None or rank < current[0]:
+            self._aliases[key] = (rank, {unitid})
+        elif rank == current[0]:
+            current[1].add(unitid)
+
+    def build(self):
+        """Compile the automaton and the one-edit index (called lazily by resolve)"""
+        self._automaton = TokenAutomaton(name_tokens)
+        self._fuzzy.clear()
+        for key, (_, unitids) in self._aliases.items():
+            if len(unitids) != 1:
+                continue
+            self._automaton.add(key, next(iter(unitids)))
+            if " " not in key and len(key) >= FUZZY_MIN_LENGTH:
+                for variant in _deletes(key):
+                    self._fuzzy[variant].add(key)
+        self._automaton.build()
+        self.resolve.cache_clear()
+
+    def _resolve(self, question: str) -> Tuple[EntityMatch, ...]:
+        if self._automaton is None:
+            self.build()
+        tokens = name_tokens(question)
+
+        # Leftmost-longest, non-overlapping alias matches
+        candidates = sorted(self._automaton.scan(tokens), key=lambda m: (m[2], m[2] - m[3]))
+        matches: List[EntityMatch] = []
+        covered: Set[int] = set()
+        for unitid, alias, start, end in candidates:
+            if covered.intersection(range(start, end)):
+                continue
+            covered.update(range(start, end))
+            matches.append(EntityMatch(unitid, self.names[unitid], alias, start, end))
+
+        # One-edit matches for long single-word names ("stanfrod", "nortwestern")
+        for position, token in enumerate(tokens):
+            if position in covered or len(token) < FUZZY_MIN_LENGTH - 1:
+                continue
+            keys = set()
+            for variant in _deletes(token):
+                keys |= self._fuzzy.get(variant, set())
+            keys = {key for key in keys if key[0] == token[0]}
+            if len(keys) == 1:
+                key = keys.pop()
+                unitid = next(iter(self._aliases[key][1]))
+                matches.append(EntityMatch(unitid, self.names[unitid], key, position, position + 1, fuzzy=True))
+
+        matches.sort(key=lambda m: m.start)
+        return tuple(matches)
+
+    def unitids(self, question: str) -> Tuple[str, ...]:
+        """Distinct UNITIDs mentioned in a question, in order of appearance"""
+        return tuple(dict.fromkeys(match.unitid for match in self.resolve(question)))
+
+    @classmethod
+    def from_records(cls, metadatas: Iterable[Dict], scorecard_path: Optional[str] = None) -> "EntityGazetteer":
+        """
+        Build from Chroma record metadata (``school_name`` + UNITID) and,
+        optionally, a College Scorecard export (``id``, ``school.name``,
+        ``school.alias``)
+        """
+        gazetteer = cls()
+        pairs: Dict[str, Counter] = defaultdict(Counter)
+        for metadata in metadatas:
+            name = metadata.get("school_name")
+            unitid = record_unitid(metadata)
+            if name and unitid:
+                pairs[name][unitid] += 1
+
+        official: Dict[str, str] = {}
+        if scorecard_path:
+            official = gazetteer.load_scorecard(scorecard_path)
+
+        # A name seen with several UNITIDs keeps the most frequent one
+        for name, counts in pairs.items():
+            unitid = counts.most_common(1)[0][0]
+            gazetteer.add(name, unitid)
+            official.setdefault(name, unitid)
+
+        for name, aliases in SCHOOL_ALIASES.items():
+            if name in official:
+                for alias in aliases:
+                    gazetteer._add_alias(alias, official[name], 1)
+
+        gazetteer.build()
+        return gazetteer
+
+    def load_scorecard(self, path: str) -> Dict[str, str]:
+        """Add schools from a Scorecard JSON export; returns name -> UNITID"""
+        try:
+            with open(Path(path), "r") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read Scorecard schools from {path}: {e}")
+            return {}
+
+        rows = payload.get("data", []) if isinstance(payload, dict) else payload
+        loaded = {}
+        for row in rows:
+            unitid = row.get("id")
+            name = row.get("school.name")
+            if not unitid or not name:
+                continue
+            aliases = [a.strip() for a in re.split(r"[,;|]", row.get("school.alias") or "") if a.strip()]
+            self.add(name, str(unitid), aliases)
+            loaded[name] = str(unitid)
+        logger.info(f"Loaded {len(loaded)} Scorecard schools from {path}")
+        return loaded
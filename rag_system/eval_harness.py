@@ -338,6 +338,10 @@ class EvalHarness:
             expected_format=query.expected_format
         )
 
+        return self._score_result(result, query)
+
+    def _score_result(self, result, query: EvalQuery) -> EvalResult:
+        """Score one RAG answer against its eval query"""
         # Score dimensions
         citation_score = self._score_citations(result, query)
         numeric_score = self._score_numeric_traceability(result, query)
@@ -383,10 +387,18 @@ class EvalHarness:
 
         results = []
 
-        for query in self.queries:
+        # One batched run: shared embedding call and multi-query collection searches
+        answers = self.rag.query_batch(
+            [query.question for query in self.queries],
+            contexts=[query.context for query in self.queries],
+            expected_formats=[query.expected_format for query in self.queries]
+        )
+        for query, answer in zip(self.queries, answers):
+            if not answer.ok:
+                logger.error(f"Error evaluating query: {answer.error}")
+                continue
             try:
-                result = self.evaluate_query(query)
-                results.append(result)
+                results.append(self._score_result(answer.result, query))
             except Exception as e:
                 logger.error(f"Error evaluating query: {e}")
 
@@ -456,6 +468,7 @@ class EvalHarness:
                 },
             },
             "all_gates_passed": all_gates_passed,
+            "stage_latency": self.rag.metrics.snapshot(),
             "results": [asdict(r) for r in results]
         }
 
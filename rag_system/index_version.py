@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Index Version Tracking
+Cheap fingerprint of the Chroma data directory (and optionally the
+training data it was built from) so caches can be invalidated when the
+index changes instead of re-reading collection state on every request.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class IndexVersionTracker:
+    """
+    Fingerprints files by (path, size, mtime) without reading them
+
+    The Chroma directory is scanned two levels deep (chroma.sqlite3 plus the
+    per-segment HNSW files); watched data directories are scanned
+    recursively for ``watch_pattern`` files. Recomputation is throttled to
+    once per ``check_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        watch_paths: Sequence[str] = (),
+        watch_pattern: str = "*.jsonl",
+        check_interval: float = 5.0
+    ):
+        self.db_path = Path(db_path)
+        self.watch_paths = [Path(p) for p in watch_paths]
+        self.watch_pattern = watch_pattern
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+        self.changes = 0
+
+    def _file_signatures(self) -> List[Tuple[str, int, int]]:
+        """(path, size, mtime_ns) for every tracked file, in a stable order"""
+        signatures = []
+
+        if self.db_path.exists():
+            for entry in os.scandir(self.db_path):
+                if entry.is_file():
+                    stat = entry.stat()
+                    signatures.append((entry.path, stat.st_size, stat.st_mtime_ns))
+                elif entry.is_dir():
+                    for sub_entry in os.scandir(entry.path):
+                        if sub_entry.is_file():
+                            stat = sub_entry.stat()
+                            signatures.append((sub_entry.path, stat.st_size, stat.st_mtime_ns))
+
+        for watch_path in self.watch_paths:
+            if not watch_path.exists():
+                continue
+            for file_path in watch_path.rglob(self.watch_pattern):
+                stat = file_path.stat()
+                signatures.append((str(file_path), stat.st_size, stat.st_mtime_ns))
+
+        signatures.sort()
+        return signatures
+
+    def compute(self) -> str:
+        """Fingerprint the tracked files now (no throttling)"""
+        digest = hashlib.md5()
+        for path, size, mtime in self._file_signatures():
+            digest.update(f"{path}|{size}|{mtime}\n".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def refresh(self, force: bool = False) -> Tuple[str, bool]:
+        """
+        Current version and whether it changed since the previous check
+
+        The first call never reports a change.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._version is not None and now - self._checked_at < self.check_interval:
+                return self._version, False
+
+            version = self.compute()
+            changed = self._version is not None and version != self._version
+            if changed:
+                self.changes += 1
+                logger.info(f"Index version changed: {self._version} -> {version}")
+            self._version = version
+            self._checked_at = now
+            return version, changed
+
+    @property
+    def version(self) -> str:
+        """
+        Version stored by the last refresh()
+
+        A pure read: only refresh() checks the files, so a change is
+        always reported to the caller that reloads state for it.
+        """
+        if self._version is None:
+            return self.refresh()[0]
+        return self._version
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+BM25 Lexical Index
+In-process inverted index over collection documents for exact-term matching
+(statute numbers, form names, course codes, CIP codes) alongside dense search.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Collection, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over compact CSR postings
+
+    Postings are stored as three flat arrays (term offsets, doc indices and
+    precomputed per-posting BM25 weights), so a query costs one scatter-add
+    per query term over that term's postings only. A search restricted to
+    a subset of documents instead looks each of them up in the (doc-sorted)
+    postings, so its cost follows the subset's size. Documents can be added
+    incrementally; new postings are merged into the arrays on the next
+    search. Re-adding an id replaces the previous document.
+    """
+
+    # Lowercased alphanumeric runs; dotted codes like CIP 11.0701 stay one token
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*")
+
+    STOPWORDS = frozenset([
+        "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does",
+        "for", "from", "how", "i", "if", "in", "is", "it", "my", "of", "on",
+        "or", "the", "to", "what", "when", "which", "with", "you",
+    ])
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        # Caller's version of the indexed documents (e.g. the collection's data_version), kept by save()
+        self.version = ""
+
+        self.doc_ids: List[str] = []
+        self._doc_index: Dict[str, int] = {}
+        self._terms: Dict[str, int] = {}
+
+        # Finalized CSR postings
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._post_docs = np.zeros(0, dtype=np.int32)
+        self._post_tf = np.zeros(0, dtype=np.float32)
+        self._post_weight = np.zeros(0, dtype=np.float32)
+        self._doc_lengths = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+
+        # Postings added since the last finalize
+        self._pending_terms: List[int] = []
+        self._pending_docs: List[int] = []
+        self._pending_tf: List[int] = []
+        self._pending_lengths: List[int] = []
+        self._pending_dead: List[int] = []
+        self._dirty = False
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """Lowercase tokens without stopwords"""
+        return [t for t in cls.TOKEN_PATTERN.findall(text.lower()) if t not in cls.STOPWORDS]
+
+    def __len__(self) -> int:
+        self._finalize()
+        return int(self._live.sum())
+
+    def add(self, doc_ids: Iterable[str], texts: Iterable[str]):
+        """Add (or replace) documents"""
+        for doc_id, text in zip(doc_ids, texts):
+            previous = self._doc_index.get(doc_id)
+            if previous is not None:
+                self._pending_dead.append(previous)
+
+            doc = len(self.doc_ids)
+            self.doc_ids.append(doc_id)
+            self._doc_index[doc_id] = doc
+
+            tokens = self.tokenize(text or "")
+            self._pending_lengths.append(len(tokens))
+
+            counts: Dict[int, int] = {}
+            for token in tokens:
+                term = self._terms.setdefault(token, len(self._terms))
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                self._pending_terms.append(term)
+                self._pending_docs.append(doc)
+                self._pending_tf.append(tf)
+
+            self._dirty = True
+
+    def remove(self, doc_ids: Iterable[str]):
+        """Drop documents from search results"""
+        for doc_id in doc_ids:
+            doc = self._doc_index.pop(doc_id, None)
+            if doc is not None:
+                self._pending_dead.append(doc)
+                self._dirty = True
+
+    def _finalize(self):
+        """Merge pending postings into the CSR arrays and recompute weights"""
+        if not self._dirty:
+            return
+
+        n_terms = len(self._terms)
+        old_terms = np.repeat(
+            np.arange(len(self._offsets) - 1, dtype=np.int64),
+            np.diff(self._offsets)
+        )
+        terms = np.concatenate([old_terms, np.asarray(self._pending_terms, dtype=np.int64)])
+        docs = np.concatenate([self._post_docs, np.asarray(self._pending_docs, dtype=np.int32)])
+        tfs = np.concatenate([self._post_tf, np.asarray(self._pending_tf, dtype=np.float32)])
+
+        # Stable sort keeps doc order within each term's postings
+        order = np.argsort(terms, kind="stable")
+        terms, docs, tfs = terms[order], docs[order], tfs[order]
+
+        offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(terms, minlength=n_terms))
+
+        self._doc_lengths = np.concatenate([
+            self._doc_lengths, np.asarray(self._pending_lengths, dtype=np.float32)
+        ])
+        self._live = np.concatenate([self._live, np.ones(len(self._pending_lengths), dtype=bool)])
+        if self._pending_dead:
+            self._live[np.asarray(self._pending_dead, dtype=np.int64)] = False
+
+        # Precompute idf and length norms into a single weight per posting
+        n_live = max(int(self._live.sum()), 1)
+        avgdl = float(self._doc_lengths[self._live].mean()) if self._live.any() else 1.0
+        avgdl = max(avgdl, 1e-6)
+        df = np.bincount(terms, weights=self._live[docs], minlength=n_terms)
+        idf = np.log(1.0 + (n_live - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = (self.k1 * (1.0 - self.b + self.b * self._doc_lengths / avgdl)).astype(np.float32)
+        weight = idf[terms] * tfs * (self.k1 + 1.0) / (tfs + norm[docs])
+        weight[~self._live[docs]] = 0.0
+
+        self._offsets = offsets
+        self._post_docs = docs
+        self._post_tf = tfs
+        self._post_weight = weight.astype(np.float32)
+
+        self._pending_terms, self._pending_docs, self._pending_tf = [], [], []
+        self._pending_lengths, self._pending_dead = [], []
+        self._dirty = False
+
+    def search(self, query: str, k: int = 50, doc_ids: Optional[Collection[str]] = None) -> List[Tuple[str, float]]:
+        """Top-k (doc_id, bm25 score), best first, optionally among ``doc_ids`` only"""
+        self._finalize()
+
+        term_ids = {self._terms[t] for t in self.tokenize(query) if t in self._terms}
+        if not term_ids or len(self._offsets) < 2:
+            return []
+
+        if doc_ids is not None:
+            return self._search_subset(term_ids, k, doc_ids)
+
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        for term in term_ids:
+            start, end = self._offsets[term], self._offsets[term + 1]
+            # Doc indices are unique within one term's postings
+            scores[self._post_docs[start:end]] += self._post_weight[start:end]
+
+        candidates = np.flatnonzero(scores > 0)
+        return self._top_k(candidates, scores[candidates], k)
+
+    def _search_subset(self, term_ids: Iterable[int], k: int, doc_ids: Collection[str]) -> List[Tuple[str, float]]:
+        """search() scoring only the given documents"""
+        docs = np.fromiter(
+            (i for i in map(self._doc_index.get, doc_ids) if i is not None), dtype=np.int64
+        )
+        if not len(docs):
+            return []
+        docs.sort()
+
+        scores = np.zeros(len(docs), dtype=np.float32)
+        for term in term_ids:
+            start, end = self._offsets[term], self._offsets[term + 1]
+            postings = self._post_docs[start:end]
+            # Postings of a term are in doc order
+            at = np.searchsorted(postings, docs)
+            found = at < len(postings)
+            found[found] = postings[at[found]] == docs[found]
+            scores[found] += self._post_weight[start:end][at[found]]
+
+        hit = scores > 0
+        return self._top_k(docs[hit], scores[hit], k)
+
+    def _top_k(self, candidates: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """(doc_id, score) of the k best candidates, ties by insertion order"""
+        if len(candidates) > k:
+            # Keep every candidate tied with the k-th score so the tie-break below decides
+            keep = scores >= -np.partition(-scores, k - 1)[k - 1]
+            candidates, scores = candidates[keep], scores[keep]
+        order = np.lexsort((candidates, -scores))[:k]
+        return [(self.doc_ids[i], float(s)) for i, s in zip(candidates[order], scores[order])]
+
+    def save(self, path: str):
+        """Write the index to a .npz file"""
+        self._finalize()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        terms = sorted(self._terms, key=self._terms.get)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                params=np.array([self.k1, self.b], dtype=np.float64),
+                version=np.array(self.version, dtype=str),
+                doc_ids=np.array(self.doc_ids, dtype=str),
+                terms=np.array(terms, dtype=str),
+                offsets=self._offsets,
+                post_docs=self._post_docs,
+                post_tf=self._post_tf,
+                doc_lengths=self._doc_lengths,
+                live=self._live,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Read an index written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            k1, b = data["params"].tolist()
+            index = cls(k1=k1, b=b)
+            if "version" in data.files:
+                index.version = str(data["version"])
+            index.doc_ids = data["doc_ids"].tolist()
+            index._terms = {term: i for i, term in enumerate(data["terms"].tolist())}
+            index._offsets = data["offsets"]
+            index._post_docs = data["post_docs"]
+            index._post_tf = data["post_tf"]
+            index._doc_lengths = data["doc_lengths"]
+            index._live = data["live"]
+
+        index._doc_index = {
+            doc_id: i for i, doc_id in enumerate(index.doc_ids) if index._live[i]
+        }
+        # Weights are derived data; recompute them rather than storing them
+        index._dirty = True
+        index._finalize()
+        return index
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], k: int = 60) -> Dict[Hashable, float]:
+    """RRF score per key over several best-first rankings"""
+    fused: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
+def collection_space(collection) -> str:
+    """Distance function of a collection: its hnsw:space, else Chroma's configured space, else l2"""
+    space = (collection.metadata or {}).get("hnsw:space")
+    if space is None:
+        # Writers drop hnsw:* from Chroma metadata when they bump data_version
+        configuration = getattr(collection, "configuration_json", None) or {}
+        space = (configuration.get("hnsw") or {}).get("space")
+    return space or "l2"
+
+
+def dense_distance(query_embedding: List[float], embedding: List[float], space: str = "l2") -> float:
+    """Distance as Chroma reports it for the collection's hnsw:space"""
+    q = np.asarray(query_embedding, dtype=np.float32)
+    e = np.asarray(embedding, dtype=np.float32)
+    if space == "cosine":
+        denom = float(np.linalg.norm(q) * np.linalg.norm(e)) or 1.0
+        return 1.0 - float(np.dot(q, e)) / denom
+    if space == "ip":
+        return 1.0 - float(np.dot(q, e))
+    diff = q - e
+    return float(np.dot(diff, diff))
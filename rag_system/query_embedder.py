@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Query Embedder
+Embeds each query once with the canonical embedder and keeps a bounded LRU
+of recent query vectors, so every collection is searched with the same
+vector via query_embeddings instead of re-running Chroma's embedding
+function per collection.
+"""
+
+import logging
+import re
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# The canonical embedder lives in the college_advisor_data package at the repo root
+sys.path.append(str(Path(__file__).parent.parent))
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbedder:
+    """
+    Canonical query embedder with an LRU of recent vectors
+
+    Falls back to None (callers then pass query_texts to Chroma) when the
+    canonical embedder cannot be loaded in this process. The cache is keyed
+    on the normalized query, but the encoder always sees the query as
+    asked, so a vector matches what the collection's embedding function
+    would compute for it.
+    """
+
+    # Characters stripped from both ends of a normalized query
+    STRIP_CHARS = " \t\n\"'`?!.,;:"
+
+    def __init__(self, max_entries: int = 1024, embedder=None):
+        """
+        Args:
+            max_entries: Max cached query vectors
+            embedder: Object with ``embed_texts(texts)``; defaults to the
+                canonical embedder, loaded on first use
+        """
+        self.max_entries = max_entries
+        self._embedder = embedder
+        self._available: Optional[bool] = True if embedder is not None else None
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.encoder_calls = 0
+
+    @classmethod
+    def normalize(cls, query: str) -> str:
+        """Normalize a query so trivially different phrasings share a cache entry"""
+        return re.sub(r'\s+', ' ', query.lower()).strip(cls.STRIP_CHARS)
+
+    def _get_embedder(self):
+        """Load the canonical embedder once; remember if it is unavailable"""
+        if self._available is None:
+            try:
+                from college_advisor_data.embedding.factory import EmbeddingFactory
+                self._embedder = EmbeddingFactory.get_embedder()
+                self._available = True
+            except Exception as e:
+                logger.warning(f"Canonical embedder unavailable, falling back to query_texts: {e}")
+                self._available = False
+        return self._embedder if self._available else None
+
+    def embed(self, query: str) -> Optional[List[float]]:
+        """Embedding for a single query (None if no embedder is available)"""
+        return self.embed_many([query])[0]
+
+    def embed_many(self, queries: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embeddings for several queries in one encoder call
+
+        Cached vectors are reused; only the distinct uncached queries are
+        sent to the encoder.
+        """
+        keys = [self.normalize(q) for q in queries]
+        vectors: Dict[str, List[float]] = {}
+        # Normalized key -> the first query asked with it, which is what gets embedded
+        missing: Dict[str, str] = {}
+
+        with self._lock:
+            for key, query in zip(keys, queries):
+                if key in vectors or key in missing:
+                    continue
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    vectors[key] = cached
+                    self.hits += 1
+                else:
+                    missing[key] = query
+                    self.misses += 1
+
+        if missing:
+            embedder = self._get_embedder()
+            if embedder is None:
+                return [vectors.get(key) for key in keys]
+
+            embeddings = embedder.embed_texts(list(missing.values()))
+            self.encoder_calls += 1
+
+            with self._lock:
+                for key, embedding in zip(missing, embeddings):
+                    vectors[key] = embedding
+                    self._cache[key] = embedding
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+
+        return [vectors.get(key) for key in keys]
+
+    def stats(self) -> Dict:
+        """Cache counters"""
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "encoder_calls": self.encoder_calls,
+            "available": self._available,
+        }
+
+    def clear(self):
+        """Drop all cached vectors"""
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Query Router
+All keyword vocabularies used to route a question (legal/compliance abstain,
+temporal and subjectivity checks, synthesis triggers, calculator tools and
+the synthesis domain priorities) compiled once into a single token-level
+Aho-Corasick automaton, so one pass over the question finds every hit.
+"""
+
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from domain_handlers import HANDLERS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Word tokens: unicode letters/digits, so "bs/md", "post-9/11" and "what's"
+# split on punctuation and every keyword only matches on token boundaries
+# ("ada" no longer matches inside "cadaa"/"canada", "ear" inside "year").
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Temporal check: a year after the current academic year is a prediction.
+# Kept as a regex; only the first match is considered.
+YEAR_PATTERN = re.compile(r"in \d{4}")
+LAST_KNOWN_YEAR = 2025
+
+
+def normalize_token(token: str) -> str:
+    """Fold simple plurals so "costs"/"cost" or "athletes"/"athlete" share a key"""
+    if len(token) >= 4 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, plural-folded word tokens"""
+    return [normalize_token(t) for t in TOKEN_PATTERN.findall(text.lower())]
+
+
+# Vocabulary groups. Keywords are phrases matched on whole tokens; other
+# inflections the old substring checks caught implicitly are listed
+# explicitly ("admitted", "transferring", "recommended", ...).
+VOCABULARY: Dict[str, List[str]] = {
+    # Pre-validation
+    "legal": [
+        'ofac', 'sanction', 'sanctioned', 'compliance', 'export control', 'ear', 'itar',
+        'form 3520', 'tax obligation', 'withholding', 'irs form',
+        'legal status', 'immigration status', 'visa determination',
+        'medical waiver', 'dodmerb', 'security clearance',
+        'professional licensing', 'bar exam', 'medical licensing',
+        'court order', 'legal proceeding', 'lawsuit',
+        'contract law', 'liability', 'malpractice',
+        'crypto', 'cryptocurrency', 'bitcoin', 'kyc/aml',
+        'sevis transfer', 'reduced course load', 'rcl authorization',
+        'academic misconduct', 'suspension', 'expulsion', 'readmission after',
+        'rotc waiver', 'military medical', 'service commitment',
+        'transcript notation', 'disciplinary action',
+    ],
+    "future": [
+        'will be', 'will have', 'future',
+        'predict', 'predicted', 'predicting', 'prediction', 'predictable',
+        'forecast', 'forecasted', 'forecasting',
+    ],
+    "synthesis": [
+        'compare', 'compared', 'comparing', 'comparison', 'vs', 'versus',
+        'recommend', 'recommended', 'recommending', 'recommendation',
+        'suggest', 'suggested', 'suggestion', 'best',
+        'decision', 'strategy', 'strategies', 'framework', 'shortlist',
+        'build a', 'build an', 'ranked list',
+    ],
+    "subjective": [
+        'should i', 'is it better', 'which is best', "what's better",
+    ],
+    # Ordered co-occurrence parts ("identify ... schools", "recommend ... for me")
+    "identify": ['identify'],
+    "school": ['school'],
+    "recommend": ['recommend', 'recommended', 'recommending', 'recommendation'],
+    "for_me": ['for me'],
+
+    # Calculator tools
+    "tool_sai": ['sai', 'efc', 'student aid index', 'expected family contribution', 'fafsa'],
+    "tool_cost": ['cost', 'costly', 'coa', 'net price', 'tuition', 'price', 'priced', 'pricing'],
+
+    # Domain trigger conditions (domain vocabularies come from the handler registry)
+    "ada": ['ada'],
+    "gap_year": ['gap year', 'defer enrollment'],
+    "byu": ['byu'],
+    "budget": ['budget', 'budgeting', 'cost', 'costly'],
+    "expensive_city": ['nyc', 'new york', 'los angeles', 'boston', 'san francisco'],
+    "international": ['international', 'internationally'],
+    "cs_subject": ['cs', 'computer science', 'data science', 'engineering'],
+    "aid_terms": ['aid', 'financial', 'financially', 'funding', 'need-blind', 'need-aware'],
+    "admission_terms": [
+        'admit', 'admitted', 'admitting', 'admission', 'transfer', 'transferred',
+        'transferring', 'major', 'majoring', 'majored',
+    ],
+    "aid_context": ['fafsa', 'css profile', 'sai', 'efc', 'net price', 'financial aid'],
+}
+
+# Domain priorities, highest wins. Ties are broken by DOMAIN_ORDER, the
+# registry order in which synthesis checks domains sharing the top priority.
+DOMAIN_PRIORITIES: Dict[str, int] = {handler.name: handler.priority for handler in HANDLERS}
+DOMAIN_ORDER: Tuple[str, ...] = tuple(handler.name for handler in HANDLERS)
+
+# Domains whose vocabulary hit is refined by a rule in QueryRouter._route
+RULE_DOMAINS = ('transfer_credit', 'residency', 'financial_aid')
+
+# Specialized financial scenarios that suppress the generic financial_aid domain
+SPECIALIZED_AID_DOMAINS = (
+    'foster_care', 'disability', 'daca_undocumented', 'military_dependent', 'bankruptcy_incarceration',
+)
+
+
+class TokenAutomaton:
+    """Aho-Corasick automaton whose alphabet is word tokens"""
+
+    def __init__(self, tokenizer: Callable[[str], List[str]] = tokenize):
+        self.tokenizer = tokenizer
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str, int]]] = [[]]
+
+    def add(self, phrase: str, label: str):
+        """Register a phrase under a label (tokenized like the text it will scan)"""
+        tokens = self.tokenizer(phrase)
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            nxt = self._goto[node].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((label, phrase, len(tokens)))
+
+    def build(self):
+        """Compute failure links (breadth-first)"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def scan(self, tokens: List[str]) -> List[Tuple[str, str, int, int]]:
+        """Every (label, phrase, start, end) match, overlapping matches included"""
+        matches = []
+        node = 0
+        for end, token in enumerate(tokens, start=1):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for label, phrase, length in self._out[node]:
+                matches.append((label, phrase, end - length, end))
+        return matches
+
+
+@dataclass
+class Route:
+    """Routing decisions for one question"""
+    hits: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    priorities: Dict[str, int] = field(default_factory=dict)
+    legal: bool = False
+    future: bool = False
+    needs_synthesis: bool = False
+    subjective: bool = False
+    tools: Tuple[str, ...] = ()
+
+    @property
+    def max_priority(self) -> int:
+        return max(self.priorities.values()) if self.priorities else 0
+
+    @property
+    def domain(self) -> Optional[str]:
+        """Top synthesis domain (first in DOMAIN_ORDER on ties), None if nothing matched"""
+        top = self.max_priority
+        if top == 0:
+            return None
+        return next(d for d in DOMAIN_ORDER if self.priorities.get(d, 0) == top)
+
+
+class QueryRouter:
+    """
+    Single-pass keyword router
+
+    The automaton is built once; route() tokenizes the question, scans it
+    once and derives every routing decision from the hit sets. Results are
+    memoized per question.
+    """
+
+    def __init__(self, vocabulary: Optional[Dict[str, List[str]]] = None, cache_size: int = 2048):
+        if vocabulary is None:
+            vocabulary = dict(VOCABULARY)
+            for handler in HANDLERS:
+                if handler.vocabulary:
+                    vocabulary[handler.name] = list(handler.vocabulary)
+        self.vocabulary = vocabulary
+        self.automaton = TokenAutomaton()
+        for label, phrases in self.vocabulary.items():
+            for phrase in phrases:
+                self.automaton.add(phrase, label)
+        self.automaton.build()
+
+        self.cache_size = cache_size
+        self.route = lru_cache(maxsize=cache_size)(self._route)
+
+    @staticmethod
+    def _before(first: List[Tuple[int, int]], second: List[Tuple[int, int]]) -> bool:
+        """True if some span in ``first`` ends before a span in ``second`` starts"""
+        return any(end <= start for _, end in first for start, _ in second)
+
+    def _route(self, question: str) -> Route:
+        matches = self.automaton.scan(tokenize(question))
+
+        hits: Dict[str, set] = {}
+        spans: Dict[str, List[Tuple[int, int]]] = {}
+        for label, phrase, start, end in matches:
+            hits.setdefault(label, set()).add(phrase)
+            spans.setdefault(label, []).append((start, end))
+
+        def hit(label: str) -> bool:
+            return label in hits
+
+        route = Route(hits={label: frozenset(phrases) for label, phrases in hits.items()})
+        route.legal = hit("legal")
+        route.future = hit("future")
+        route.needs_synthesis = hit("synthesis") or (
+            hit("identify") and hit("school") and self._before(spans["identify"], spans["school"])
+        )
+        route.subjective = hit("subjective") or (
+            hit("recommend") and hit("for_me") and self._before(spans["recommend"], spans["for_me"])
+        )
+        route.tools = tuple(
+            tool for tool, label in (("sai_calculator", "tool_sai"), ("cost_calculator", "tool_cost"))
+            if hit(label)
+        )
+
+        priorities = {domain: 0 for domain in DOMAIN_ORDER}
+
+        # Domains whose vocabulary alone decides the match
+        for handler in HANDLERS:
+            if handler.vocabulary and handler.name not in RULE_DOMAINS and hit(handler.name):
+                priorities[handler.name] = handler.priority
+
+        # Whole-word ADA outranks the generic disability vocabulary
+        if hit("ada"):
+            priorities['disability'] = 145
+
+        # Two or more distinct transfer-credit terms make it the stronger match
+        transfer_count = len(hits.get("transfer_credit", ()))
+        if transfer_count >= 2:
+            priorities['transfer_credit'] = 125
+        elif transfer_count == 1:
+            priorities['transfer_credit'] = DOMAIN_PRIORITIES['transfer_credit']
+
+        if hit("gap_year") and hit("byu"):
+            priorities['mission_deferral'] = DOMAIN_PRIORITIES['mission_deferral']
+
+        # Budget question across several expensive cities
+        if hit("budget") and len(hits.get("expensive_city", ())) >= 2:
+            priorities['coa_real_budget'] = DOMAIN_PRIORITIES['coa_real_budget']
+
+        # Military dependents have their own residency rules
+        if hit("residency") and priorities['military_dependent'] == 0:
+            priorities['residency'] = DOMAIN_PRIORITIES['residency']
+
+        if hit("international") and hit("cs_subject"):
+            priorities['international_cs'] = DOMAIN_PRIORITIES['international_cs']
+
+        if hit("international") and hit("aid_terms"):
+            priorities['international_aid'] = DOMAIN_PRIORITIES['international_aid']
+
+        # Admission terms only count outside a financial aid context ("CSS" is not CS)
+        if hit("cs_subject") or (hit("admission_terms") and not hit("aid_context")):
+            priorities['cs_admissions'] = DOMAIN_PRIORITIES['cs_admissions']
+
+        if hit("financial_aid") and max(priorities[d] for d in SPECIALIZED_AID_DOMAINS) == 0:
+            priorities['financial_aid'] = DOMAIN_PRIORITIES['financial_aid']
+
+        route.priorities = priorities
+        return route
+
+    @staticmethod
+    def mentions_future_year(question: str) -> bool:
+        """True if the first "in YYYY" names a year after LAST_KNOWN_YEAR"""
+        match = YEAR_PATTERN.search(question.lower())
+        return bool(match) and int(match.group()[-4:]) > LAST_KNOWN_YEAR
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+RAG Result Types
+Dataclasses shared by ProductionRAG and its synthesis domain handlers
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Citation:
+    """Citation with metadata"""
+    url: str
+    last_verified: str
+    effective_start: Optional[str] = None
+    effective_end: Optional[str] = None
+    authority_score: float = 1.0  # Boost for .gov/.edu domains
+
+
+@dataclass
+class RetrievalResult:
+    """Result from retrieval with reranking"""
+    text: str
+    metadata: Dict
+    score: float
+    citations: List[Citation]
+    doc_id: Optional[str] = None
+    collection: Optional[str] = None
+    rerank_score: Optional[float] = None
+    data: Optional[Dict] = None  # Decoded metadata from the record store (read-only)
+
+
+@dataclass
+class AnswerResult:
+    """Final answer with validation"""
+    answer: str
+    citations: List[Citation]
+    tool_calls: List[Dict]
+    schema_valid: bool
+    citation_coverage: float
+    should_abstain: bool
+    abstain_reason: Optional[str] = None
+    retrieval_plan: Optional[str] = None
+    retrieval_stats: Optional[Dict] = None
+    timings: Optional[Dict] = None  # Stage -> ms for this request (debug_timings only)
+
+
+@dataclass
+class BatchAnswer:
+    """One ProductionRAG.query_batch item: the answer, or the error that prevented it"""
+    question: str
+    result: Optional[AnswerResult] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class RetrievalContext:
+    """
+    Per-request retrieval memo
+
+    Every stage of a single ProductionRAG.query call (synthesis routing,
+    subjectivity fallback, entity validation, composition) reads the same
+    scored results and decoded metadata from here, so the collection
+    fan-out runs at most once per request.
+    """
+    question: str
+    results: Optional[List[RetrievalResult]] = None
+    retrieved_data: Optional[List[Dict]] = None
+    prefetched: bool = False  # results fetched ahead of the pipeline, not yet read
+    synthesis_attempted: bool = False
+    synthesis_result: Optional[AnswerResult] = None
+    retrievals_run: int = 0
+    retrievals_avoided: int = 0
+    synthesis_runs: int = 0
+    synthesis_avoided: int = 0
+    collection_ms: Dict[str, float] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    partitions: List[Dict] = field(default_factory=list)
+    candidates: int = 0  # dense hits decoded across collections
+    stage_ms: Dict[str, float] = field(default_factory=dict)  # pipeline stage -> elapsed ms
+    stream: Optional[Any] = None  # AnswerStream receiving sections as they are composed
+    io_executor: Optional[Any] = None  # runs query_partition's Chroma calls (aquery's I/O executor)
+
+    def record_partition(self, collection: str, filters: Optional[Dict], searched: int, total: int):
+        """Note one collection search and how many of its records it covered"""
+        self.partitions.append({
+            "collection": collection,
+            "filters": {key: list(values) for key, values in (filters or {}).items()},
+            "searched": searched,
+            "total": total,
+        })
+
+    def pruning_ratio(self) -> float:
+        """Share of records skipped by partition filters across this request's searches"""
+        total = sum(p["total"] for p in self.partitions)
+        if not total:
+            return 0.0
+        return round(1.0 - sum(p["searched"] for p in self.partitions) / total, 4)
+
+    def stats(self) -> Dict:
+        """Per-request counters"""
+        return {
+            "retrievals_run": self.retrievals_run,
+            "retrievals_avoided": self.retrievals_avoided,
+            "synthesis_runs": self.synthesis_runs,
+            "synthesis_avoided": self.synthesis_avoided,
+            "results": len(self.results) if self.results is not None else 0,
+            "collection_ms": dict(self.collection_ms),
+            "timed_out": list(self.timed_out),
+            "partitions": list(self.partitions),
+            "pruning_ratio": self.pruning_ratio(),
+            "candidates": self.candidates,
+        }
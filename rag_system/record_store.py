@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Record Store
+In-process store of decoded Chroma records keyed by (collection, document
+id): metadata with JSON list strings already parsed, citation URLs and
+their authority scores, built once per index version instead of on every
+retrieved hit.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from rag_types import Citation
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Metadata fields records are partitioned on: record type and IPEDS UNITID,
+# in the order a retrieval scope keeps them (see RecordStore.scope)
+PARTITION_FIELDS = ("_record_type", "ipeds_id")
+
+
+def decode_metadata(metadata: Dict) -> Dict:
+    """Copy of a metadata dict with JSON list strings decoded"""
+    data = dict(metadata)
+    for key, value in data.items():
+        if isinstance(value, str) and value.startswith('['):
+            try:
+                data[key] = json.loads(value)
+            except ValueError:
+                pass
+    return data
+
+
+def where_clause(filters: Dict[str, Sequence]) -> Optional[Dict]:
+    """
+    Chroma where clause accepting any of the listed values for every field
+
+    Values match as strings, and integer strings as ints too, since ingest
+    stores a UNITID either way depending on the source.
+    """
+    clauses = []
+    for key, values in filters.items():
+        forms: Dict[type, List] = {}
+        for value in dict.fromkeys(str(value) for value in values):
+            forms.setdefault(str, []).append(value)
+            if value.lstrip("-").isdigit():
+                forms.setdefault(int, []).append(int(value))
+        matches = [{key: listed[0]} if len(listed) == 1 else {key: {"$in": listed}} for listed in forms.values()]
+        if matches:
+            clauses.append(matches[0] if len(matches) == 1 else {"$or": matches})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def citation_urls(metadata: Dict) -> List[str]:
+    """Citation URLs from the ``citations`` field (JSON array string, plain string or list)"""
+    urls = metadata.get("citations", [])
+    if isinstance(urls, str):
+        try:
+            urls = json.loads(urls)
+        except ValueError:
+            urls = [urls] if urls else []
+    return urls
+
+
+@dataclass(frozen=True)
+class StoredRecord:
+    """Decoded form of one Chroma record; shared between requests, treat as read-only"""
+    doc_id: Optional[str]
+    collection: Optional[str]
+    metadata: Dict
+    data: Dict
+    citations: Tuple[Citation, ...]
+
+
+class RecordStore:
+    """
+    Decoded records by (collection, document id)
+
+    Collections are preloaded in pages with ``load_collection``; records
+    met during retrieval that are not stored yet are decoded and added on
+    the spot. ``clear`` is called when the index version changes.
+
+    Document ids are also partitioned by the PARTITION_FIELDS values, so
+    filtered searches know each partition's size (and can skip empty
+    ones) for collections that were preloaded in full. Values are keyed as
+    strings, since ingest stores a UNITID as an int in some collections and
+    as a string in others.
+    """
+
+    def __init__(self, authority_score: Callable[[str], float]):
+        """
+        Args:
+            authority_score: Boost for a citation URL (memoized per URL)
+        """
+        self._authority_score = authority_score
+        self._url_scores: Dict[str, float] = {}
+        self._records: Dict[Tuple[str, str], StoredRecord] = {}
+        self._partitions: Dict[Tuple[str, str, str], Set[str]] = {}
+        self._fields: Dict[str, Set[str]] = {}
+        self._complete: Set[str] = set()
+        self._max_boost: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _url_score(self, url: str) -> float:
+        score = self._url_scores.get(url)
+        if score is None:
+            score = self._authority_score(url)
+            self._url_scores[url] = score
+        return score
+
+    def decode(self, metadata: Dict, doc_id: Optional[str] = None, collection: Optional[str] = None) -> StoredRecord:
+        """Decode a record without storing it"""
+        citations = tuple(
+            Citation(
+                url=url,
+                last_verified=metadata.get("last_verified", "unknown"),
+                effective_start=metadata.get("effective_start"),
+                effective_end=metadata.get("effective_end"),
+                authority_score=self._url_score(url)
+            )
+            for url in citation_urls(metadata)
+        )
+        return StoredRecord(
+            doc_id=doc_id,
+            collection=collection,
+            metadata=metadata,
+            data=decode_metadata(metadata),
+            citations=citations
+        )
+
+    def record(self, metadata: Dict, doc_id: Optional[str] = None, collection: Optional[str] = None) -> StoredRecord:
+        """Stored record for a retrieved hit, decoding and adding it if needed"""
+        if doc_id is None or collection is None:
+            return self.decode(metadata, doc_id, collection)
+
+        key = (collection, doc_id)
+        record = self._records.get(key)
+        if record is not None:
+            self.hits += 1
+            return record
+
+        self.misses += 1
+        record = self.decode(metadata, doc_id, collection)
+        with self._lock:
+            self._add(key, record)
+        return record
+
+    def _add(self, key: Tuple[str, str], record: StoredRecord):
+        """Store a record and index it by partition (lock held)"""
+        if key not in self._records:
+            collection, doc_id = key
+            for field in PARTITION_FIELDS:
+                value = record.metadata.get(field)
+                if value is not None:
+                    self._partitions.setdefault((collection, field, str(value)), set()).add(doc_id)
+                    self._fields.setdefault(collection, set()).add(field)
+            boost = 1.0
+            for citation in record.citations:
+                boost *= citation.authority_score
+            self._max_boost[collection] = max(self._max_boost.get(collection, boost), boost)
+        self._records[key] = record
+
+    def partition(self, collection: str, filters: Dict[str, Sequence]) -> Optional[Set[str]]:
+        """
+        Ids of the records matching every filter (field -> accepted values)
+
+        None if the collection was not preloaded, since the partition would
+        be incomplete.
+        """
+        if collection not in self._complete:
+            return None
+        ids: Optional[Set[str]] = None
+        for field, values in filters.items():
+            matched: Set[str] = set()
+            for value in values:
+                matched |= self._partitions.get((collection, field, str(value)), set())
+            ids = matched if ids is None else ids & matched
+        if ids is None:
+            ids = {doc_id for name, doc_id in self._records if name == collection}
+        return ids
+
+    def scope(self, collection: str, filters: Dict[str, Sequence]) -> Optional[Dict[str, List[str]]]:
+        """
+        The part of a retrieval filter that narrows a preloaded collection
+
+        Fields the collection's records never carry are dropped, and each
+        remaining field (in PARTITION_FIELDS order) is kept only if the
+        partition stays non-empty with it, so a question about foster care
+        at a named school still searches the foster records when none of
+        them belongs to that school. None when nothing narrows the
+        collection, or it was not preloaded: search all of it.
+        """
+        if collection not in self._complete:
+            return None
+        carried = self._fields.get(collection, set())
+        scoped: Dict[str, List[str]] = {}
+        for field in PARTITION_FIELDS:
+            if field in carried and filters.get(field):
+                narrowed = {**scoped, field: [str(value) for value in filters[field]]}
+                if self.partition(collection, narrowed):
+                    scoped = narrowed
+        return scoped or None
+
+    def max_boost(self, collection: str) -> Optional[float]:
+        """Largest authority boost of any record in a preloaded collection (None if not preloaded)"""
+        if collection not in self._complete:
+            return None
+        return self._max_boost.get(collection, 1.0)
+
+    def load_collection(self, name: str, collection, page_size: int = 1000) -> int:
+        """Decode every record of a collection; returns the number stored"""
+        loaded = 0
+        offset = 0
+        while True:
+            batch = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            ids = batch.get("ids") or []
+            if not ids:
+                break
+            records = {
+                (name, doc_id): self.decode(metadata or {}, doc_id, name)
+                for doc_id, metadata in zip(ids, batch["metadatas"])
+            }
+            with self._lock:
+                for key, record in records.items():
+                    self._add(key, record)
+            loaded += len(records)
+            if len(ids) < page_size:
+                break
+            offset += page_size
+        with self._lock:
+            self._complete.add(name)
+        return loaded
+
+    def metadatas(self) -> List[Dict]:
+        """Raw metadata of every stored record"""
+        with self._lock:
+            return [record.metadata for record in self._records.values()]
+
+    def export_state(self) -> Dict:
+        """Records, partitions and boosts for a warm-start snapshot"""
+        with self._lock:
+            return {
+                "records": dict(self._records),
+                "partitions": {key: set(ids) for key, ids in self._partitions.items()},
+                "complete": set(self._complete),
+                "max_boost": dict(self._max_boost),
+                "url_scores": dict(self._url_scores),
+            }
+
+    def restore_state(self, state: Dict):
+        """Replace the store's contents with an export_state() result"""
+        with self._lock:
+            self._records = state["records"]
+            self._partitions = state["partitions"]
+            self._fields = {}
+            for collection, field, _ in self._partitions:
+                self._fields.setdefault(collection, set()).add(field)
+            self._complete = state["complete"]
+            self._max_boost = state["max_boost"]
+            self._url_scores = state["url_scores"]
+
+    def clear(self):
+        """Drop every record"""
+        with self._lock:
+            self._records.clear()
+            self._partitions.clear()
+            self._fields.clear()
+            self._complete.clear()
+            self._max_boost.clear()
+
+    def stats(self) -> Dict:
+        """Size and lookup counters"""
+        return {
+            "records": len(self._records),
+            "partitions": len(self._partitions),
+            "urls": len(self._url_scores),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
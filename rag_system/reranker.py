@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Cross-Encoder Reranker
+Optional second stage for ProductionRAG.retrieve(): scores the top-N
+candidates against the query in one batched CPU pass, with memoized scores
+and a bypass when the first-stage ranking is already decisive.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from query_embedder import QueryEmbedder
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CrossEncoderReranker:
+    """
+    Batched cross-encoder reranking with an LRU score cache
+
+    Scores are cached by (query hash, doc id, index version), so repeated
+    questions and eval runs skip the model until the index changes. Results
+    keep their first-stage ``score`` (used for thresholds); the cross-encoder
+    score is stored on ``rerank_score`` and only changes the order.
+    """
+
+    DEFAULT_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        top_n: int = 20,
+        batch_size: int = 32,
+        latency_budget_ms: float = 150.0,
+        margin: float = 0.15,
+        cache_size: int = 4096,
+        model=None
+    ):
+        """
+        Args:
+            model_name: sentence-transformers CrossEncoder model
+            top_n: Candidates considered for reranking
+            batch_size: Pairs per forward batch
+            latency_budget_ms: Uncached pairs are capped so the estimated
+                model time stays within this budget
+            margin: Skip the model when the top candidate leads the runner-up
+                by at least this much first-stage score (only when the
+                candidates are in first-stage score order)
+            cache_size: Max cached (query, doc) scores
+            model: Preloaded model exposing predict(pairs); loaded lazily if None
+        """
+        self.model_name = model_name
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.latency_budget_ms = latency_budget_ms
+        self.margin = margin
+        self.cache_size = cache_size
+
+        self._model = model
+        self._available: Optional[bool] = True if model is not None else None
+        self._cache: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Running estimate of model cost per pair, refined after each call
+        self.ms_per_pair = 5.0
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.model_calls = 0
+        self.pairs_scored = 0
+        self.bypassed = 0
+        self.over_budget = 0
+
+    def _get_model(self):
+        """Load the cross-encoder once on CPU; remember if it is unavailable"""
+        if self._available is None:
+            try:
+                from sentence_transformers import CrossEncoder
+                self._model = CrossEncoder(self.model_name, device="cpu")
+                self._available = True
+                logger.info(f"Loaded cross-encoder: {self.model_name}")
+            except Exception as e:
+                logger.warning(f"Cross-encoder unavailable, keeping first-stage order: {e}")
+                self._available = False
+        return self._model if self._available else None
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        return hashlib.sha1(QueryEmbedder.normalize(query).encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _doc_key(result) -> str:
+        if result.doc_id is not None:
+            return f"{result.collection}/{result.doc_id}"
+        return hashlib.sha1(result.text.encode("utf-8")).hexdigest()[:16]
+
+    def rerank(self, query: str, candidates: List, top_k: int, index_version: str = "") -> List:
+        """
+        Top-k of ``candidates`` (first-stage order, best first) after reranking
+
+        Candidates the budget did not allow scoring follow the scored ones
+        in their first-stage order. The margin bypass only applies when that
+        order is by ``score``: fused (RRF) candidates keep their dense scores,
+        whose differences say nothing about the fused ranking.
+        """
+        candidates = candidates[:self.top_n]
+        if len(candidates) <= 1:
+            return candidates[:top_k]
+
+        by_score = all(a.score >= b.score for a, b in zip(candidates, candidates[1:]))
+        if by_score and candidates[0].score - candidates[1].score >= self.margin:
+            self.bypassed += 1
+            return candidates[:top_k]
+
+        model = self._get_model()
+        if model is None:
+            return candidates[:top_k]
+
+        query_hash = self._query_hash(query)
+        keys = [(query_hash, self._doc_key(r), index_version) for r in candidates]
+        scores: Dict[int, float] = {}
+        uncached: List[int] = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    scores[i] = cached
+                    self.cache_hits += 1
+                else:
+                    uncached.append(i)
+                    self.cache_misses += 1
+
+        max_pairs = max(1, int(self.latency_budget_ms / max(self.ms_per_pair, 1e-3)))
+        if len(uncached) > max_pairs:
+            self.over_budget += 1
+            uncached = uncached[:max_pairs]
+
+        if uncached:
+            pairs = [[query, candidates[i].text] for i in uncached]
+            start = time.perf_counter()
+            predicted = model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.ms_per_pair = 0.8 * self.ms_per_pair + 0.2 * (elapsed_ms / len(pairs))
+            self.model_calls += 1
+            self.pairs_scored += len(pairs)
+
+            with self._lock:
+                for i, score in zip(uncached, predicted):
+                    scores[i] = float(score)
+                    self._cache[keys[i]] = float(score)
+                    self._cache.move_to_end(keys[i])
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        for i, score in scores.items():
+            candidates[i].rerank_score = score
+
+        scored = sorted(scores, key=lambda i: (-scores[i], i))
+        unscored = [i for i in range(len(candidates)) if i not in scores]
+        return [candidates[i] for i in scored + unscored][:top_k]
+
+    def stats(self) -> Dict:
+        """Cache and model counters"""
+        return {
+            "model": self.model_name,
+            "available": self._available,
+            "entries": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "model_calls": self.model_calls,
+            "pairs_scored": self.pairs_scored,
+            "bypassed": self.bypassed,
+            "over_budget": self.over_budget,
+            "ms_per_pair": round(self.ms_per_pair, 3),
+        }
+
+    def clear(self):
+        """Drop all cached scores"""
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Adaptive Retrieval Depth
+Per-collection candidate depth for ProductionRAG.retrieve(), learned from
+how deep in each collection's ranking the hits that reach the final top-k
+were found, with cached collection sizes persisted across restarts.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def fusion_settled(
+    dense: Sequence[Tuple[Hashable, float]],
+    unseen_bound: float,
+    lexical_keys: Sequence[Hashable],
+    top_k: int,
+    rrf_k: int = 60
+) -> bool:
+    """
+    Whether the RRF top-k over a truncated dense ranking is already final
+
+    ``dense`` holds (key, score) for every dense hit fetched, in fetch
+    order; no hit left unfetched scores above ``unseen_bound``. Hits
+    scoring above the bound form an exact prefix of the full dense
+    ranking, so their fused scores are final. The top-k is settled when
+    k of them beat the best fused score any other key could reach.
+    """
+    ordered = sorted(dense, key=lambda hit: hit[1], reverse=True)
+    prefix = [key for key, score in ordered if score > unseen_bound]
+    lexical_rank = {key: rank for rank, key in enumerate(lexical_keys, start=1)}
+
+    def lexical_term(key) -> float:
+        rank = lexical_rank.get(key)
+        return 1.0 / (rrf_k + rank) if rank else 0.0
+
+    exact = sorted(
+        (1.0 / (rrf_k + rank) + lexical_term(key) for rank, key in enumerate(prefix, start=1)),
+        reverse=True
+    )
+    if len(exact) < top_k:
+        return False
+    in_prefix = set(prefix)
+    best_other = 1.0 / (rrf_k + len(prefix) + 1) + max(
+        (lexical_term(key) for key in lexical_keys if key not in in_prefix), default=0.0
+    )
+    return best_other < exact[top_k - 1]
+
+
+class DepthController:
+    """
+    Online per-collection depth statistics
+
+    For every collection it keeps a decayed histogram of the ranks (in
+    that collection's own dense ranking) of hits that made the final
+    top-k, and how often the collection contributed at all. The depth
+    asked for is a margin over the rank that covers ``coverage`` of past
+    contributions; collections that rarely contribute get ``min_depth``.
+    Until a collection has ``warmup`` observations the full depth is used.
+
+    A shallow search is only a guess: ``unseen_bound`` caps the score of
+    anything it left out, and the caller searches again at full depth
+    whenever that could change the top-k (``needs_expansion`` for the
+    dense ranking, ``fusion_settled`` for the RRF-fused one).
+    """
+
+    def __init__(
+        self,
+        stats_path: Optional[str] = None,
+        warmup: int = 20,
+        min_depth: int = 4,
+        margin: float = 1.5,
+        coverage: float = 0.95,
+        rare_rate: float = 0.05,
+        decay: float = 0.99,
+        save_every: int = 50
+    ):
+        """
+        Args:
+            stats_path: Optional JSON file the statistics are saved to and
+                loaded from (must not be inside the Chroma directory)
+            warmup: Observations before a collection's depth is reduced
+            min_depth: Smallest depth ever asked for
+            margin: Multiplier over the covering rank
+            coverage: Share of past contributing hits the depth must cover
+            rare_rate: Collections contributing to fewer queries than this
+                get min_depth
+            decay: Weight kept by old observations on each update
+            save_every: Observations between saves to stats_path
+        """
+        self.stats_path = Path(stats_path) if stats_path else None
+        self.warmup = warmup
+        self.min_depth = min_depth
+        self.margin = margin
+        self.coverage = coverage
+        self.rare_rate = rare_rate
+        self.decay = decay
+        self.save_every = save_every
+
+        self._lock = threading.Lock()
+        self._collections: Dict[str, Dict] = {}
+        self._counts: Dict[str, int] = {}
+        self._counts_version: Optional[str] = None
+        self._unsaved = 0
+
+        self.expansions = 0
+        self.requested = 0
+        self.fetched = 0
+
+        if self.stats_path:
+            self._load()
+
+    def depth(self, name: str, count: int, requested: int) -> int:
+        """Candidates to ask ``name`` for, out of ``count`` records and at most ``requested``"""
+        limit = min(requested, count)
+        stats = self._collections.get(name)
+        if stats is None or stats["observations"] < self.warmup:
+            depth = limit
+        elif stats["contributed"] < self.rare_rate * stats["queries"]:
+            depth = min(self.min_depth, limit)
+        else:
+            covering = self._covering_rank(stats["ranks"])
+            depth = min(limit, max(self.min_depth, math.ceil(self.margin * (covering + 1))))
+        with self._lock:
+            self.requested += limit
+            self.fetched += depth
+        return depth
+
+    def _covering_rank(self, ranks: list) -> int:
+        """Smallest rank below which ``coverage`` of the histogram weight lies"""
+        total = sum(ranks)
+        if total <= 0:
+            return 0
+        seen = 0.0
+        for rank, weight in enumerate(ranks):
+            seen += weight
+            if seen >= self.coverage * total:
+                return rank
+        return len(ranks) - 1
+
+    @staticmethod
+    def unseen_bound(last_distance: Optional[float], max_boost: Optional[float]) -> Optional[float]:
+        """
+        Highest score a hit beyond a truncated search could have
+
+        Deeper hits are at least ``last_distance`` away, so they score at
+        most ``max_boost / (1 + last_distance)``. None if either is unknown.
+        """
+        if last_distance is None or max_boost is None:
+            return None
+        return max_boost / (1.0 + last_distance)
+
+    @staticmethod
+    def needs_expansion(bound: Optional[float], threshold: float) -> bool:
+        """Whether unseen hits (scoring at most ``bound``) could reach the k-th best score"""
+        return bound is None or bound >= threshold
+
+    def record_expansion(self, name: str, extra: int):
+        """Count a re-query at full depth and the extra hits it fetched"""
+        with self._lock:
+            self.expansions += 1
+            self.fetched += extra
+
+    def observe(self, name: str, ranks: Iterable[int]):
+        """Ranks (within ``name``'s dense ranking) of the hits that reached the final top-k"""
+        ranks = list(ranks)
+        with self._lock:
+            stats = self._collections.setdefault(
+                name, {"observations": 0, "queries": 0.0, "contributed": 0.0, "ranks": []}
+            )
+            stats["observations"] += 1
+            stats["queries"] = stats["queries"] * self.decay + 1
+            stats["contributed"] = stats["contributed"] * self.decay + (1 if ranks else 0)
+            histogram = stats["ranks"]
+            for i in range(len(histogram)):
+                histogram[i] *= self.decay
+            for rank in ranks:
+                if rank >= len(histogram):
+                    histogram.extend([0.0] * (rank + 1 - len(histogram)))
+                histogram[rank] += 1
+            self._unsaved += 1
+            save = self.stats_path is not None and self._unsaved >= self.save_every
+        if save:
+            self.save()
+
+    def counts(self, version: str) -> Dict[str, int]:
+        """Collection sizes remembered for this index version (empty for any other)"""
+        with self._lock:
+            return dict(self._counts) if version == self._counts_version else {}
+
+    def remember_count(self, version: str, name: str, count: int):
+        """Cache a collection size for an index version"""
+        with self._lock:
+            if version != self._counts_version:
+                self._counts = {}
+                self._counts_version = version
+            self._counts[name] = count
+
+    def save(self):
+        """Write the statistics to stats_path (atomically)"""
+        if self.stats_path is None:
+            return
+        with self._lock:
+            payload = json.dumps({
+                "collections": self._collections,
+                "counts": {"version": self._counts_version, "sizes": self._counts},
+            })
+            self._unsaved = 0
+        try:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.stats_path.with_suffix(self.stats_path.suffix + ".tmp")
+            tmp_path.write_text(payload)
+            os.replace(tmp_path, self.stats_path)
+        except OSError as e:
+            logger.warning(f"Could not save retrieval depth stats to {self.stats_path}: {e}")
+
+    def _load(self):
+        """Read statistics saved by an earlier process, if any"""
+        try:
+            payload = json.loads(self.stats_path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read retrieval depth stats from {self.stats_path}: {e}")
+            return
+        self._collections = payload.get("collections", {})
+        counts = payload.get("counts", {})
+        self._counts = counts.get("sizes", {})
+        self._counts_version = counts.get("version")
+        logger.info(f"Loaded retrieval depth stats for {len(self._collections)} collections")
+
+    def stats(self) -> Dict:
+        """Current depth per collection and how many candidates were skipped"""
+        depths = {}
+        for name, stats in self._collections.items():
+            depths[name] = {
+                "observations": stats["observations"],
+                "contribution_rate": round(stats["contributed"] / stats["queries"], 4) if stats["queries"] else 0.0,
+                "covering_rank": self._covering_rank(stats["ranks"]),
+            }
+        return {
+            "collections": depths,
+            "requested": self.requested,
+            "fetched": self.fetched,
+            "expansions": self.expansions,
+            "reduction": round(1.0 - self.fetched / self.requested, 4) if self.requested else 0.0,
+        }
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Semantic Answer Cache
+Second answer-cache tier for paraphrases: keeps the query embedding of each
+answered question in a small in-memory matrix and serves a cached answer
+when a new question is close enough in cosine similarity and routes to the
+same synthesis domain and names the same schools and numbers.
+"""
+
+import copy
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# "$165k", "165,000", "3.8", "1.2M"
+NUMBER_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([km])?\b", re.IGNORECASE)
+NUMBER_SCALES = {"k": 1e3, "m": 1e6}
+
+
+def numeric_tokens(question: str) -> Tuple[str, ...]:
+    """Numbers in a question, normalized ("$165k" and "165,000" -> "165000") and sorted"""
+    tokens = []
+    for digits, suffix in NUMBER_PATTERN.findall(question):
+        value = float(digits.replace(",", "")) * NUMBER_SCALES.get(suffix.lower(), 1)
+        tokens.append(str(int(value)) if value.is_integer() else repr(value))
+    return tuple(sorted(tokens))
+
+
+def entity_scope(unitids: Iterable[str], question: str) -> str:
+    """
+    Entity part of a paraphrase scope: the schools (UNITIDs) and numbers a
+    question names, so "UIUC CS admission" never serves "Stanford CS
+    admission" and "AGI $165k" never serves "AGI $65k"
+    """
+    return f"{','.join(sorted(unitids))}|{','.join(numeric_tokens(question))}"
+
+
+class SemanticAnswerCache:
+    """
+    Near-duplicate lookup over answered questions
+
+    Vectors are L2-normalized rows of a preallocated matrix, so a lookup is
+    one matrix-vector product. Only entries with the same synthesis domain
+    and the same scope (hash of context, expected format and entity_scope)
+    are eligible;
+    questions without a routed domain are never cached here, since generic
+    questions that differ only in a school name embed very closely. When
+    full, the least recently used row is overwritten. Every entry is
+    dropped when the index version changes.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1024):
+        """
+        Args:
+            threshold: Min cosine similarity for a hit
+            max_entries: Max answers held
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Tuple[str, str, str, Any]] = []  # (question, domain, scope, result)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _unit(vector) -> Optional[np.ndarray]:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm > 0 else None
+
+    def _check_version(self, version: str):
+        """Drop every entry computed against another index version (lock held)"""
+        if version == self._version:
+            return
+        if self._version is not None and self._entries:
+            self.invalidations += len(self._entries)
+            self._entries = []
+            self._vectors = None
+            self._last_used[:] = 0.0
+        self._version = version
+
+    def get(
+        self,
+        question: str,
+        vector,
+        domain: Optional[str],
+        scope: str,
+        version: str
+    ) -> Optional[Tuple[Any, float]]:
+        """(copy of the cached result, similarity) for the closest eligible entry, or None"""
+        if domain is None:
+            return None
+        unit = self._unit(vector)
+        if unit is None:
+            return None
+
+        with self._lock:
+            self._check_version(version)
+            if not self._entries or self._vectors is None or self._vectors.shape[1] != unit.shape[0]:
+                self.misses += 1
+                return None
+
+            similarities = self._vectors[:len(self._entries)] @ unit
+            eligible = np.fromiter(
+                (entry[1] == domain and entry[2] == scope for entry in self._entries),
+                dtype=bool,
+                count=len(self._entries)
+            )
+            similarities = np.where(eligible, similarities, -1.0)
+            row = int(np.argmax(similarities))
+            similarity = float(similarities[row])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            self._last_used[row] = time.monotonic()
+            self.hits += 1
+            cached_question, _, _, result = self._entries[row]
+
+        logger.info(
+            f"Semantic cache hit ({similarity:.4f}, domain={domain}): "
+            f"{question!r} served from {cached_question!r}"
+        )
+        return copy.deepcopy(result), similarity
+
+    def put(self, question: str, vector, domain: Optional[str], scope: str, version: str, result: Any):
+        """Cache a result for a question routed to ``domain``"""
+        if domain is None:
+            return
+        unit = self._unit(vector)
+        if unit is None:
+            return
+        result = copy.deepcopy(result)
+
+        with self._lock:
+            self._check_version(version)
+            if self._vectors is None or self._vectors.shape[1] != unit.shape[0]:
+                self._vectors = np.zeros((self.max_entries, unit.shape[0]), dtype=np.float32)
+                self._entries = []
+
+            if len(self._entries) < self.max_entries:
+                row = len(self._entries)
+                self._entries.append((question, domain, scope, result))
+            else:
+                row = int(np.argmin(self._last_used))
+                self._entries[row] = (question, domain, scope, result)
+                self.evictions += 1
+
+            self._vectors[row] = unit
+            self._last_used[row] = time.monotonic()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self._version,
+                "entries": len(self._entries),
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries = []
+            self._vectors = None
+            self._last_used[:] = 0.0
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Stage Metrics
+In-process latency histograms and counters for the ProductionRAG pipeline.
+Each stage (retrieval, per-collection searches, synthesis, composition,
+validation) records into a log-linear histogram with bounded relative
+error, in the style of HdrHistogram, so p50/p99 can be read without
+keeping samples. Snapshots go to eval summaries and debug answers; the
+Prometheus text format serves the API's /metrics scrape.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations in microseconds
+
+    Values below 2**SUB_BUCKET_BITS get exact buckets; above that every
+    power of two is split into 2**(SUB_BUCKET_BITS - 1) equal buckets, so
+    a recorded value is reported within 1 / 2**(SUB_BUCKET_BITS - 1) of
+    its true value. Buckets are kept sparsely.
+    """
+
+    SUB_BUCKET_BITS = 6  # ~3% relative error
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    @classmethod
+    def bucket_index(cls, value_us: int) -> int:
+        """Bucket holding a non-negative value"""
+        if value_us < (1 << cls.SUB_BUCKET_BITS):
+            return value_us
+        shift = value_us.bit_length() - cls.SUB_BUCKET_BITS
+        half = 1 << (cls.SUB_BUCKET_BITS - 1)
+        return shift * half + (value_us >> shift)
+
+    @classmethod
+    def bucket_bounds(cls, index: int) -> Tuple[int, int]:
+        """Smallest and largest value (inclusive) stored in a bucket"""
+        if index < (1 << cls.SUB_BUCKET_BITS):
+            return index, index
+        half = 1 << (cls.SUB_BUCKET_BITS - 1)
+        shift = index // half - 1
+        mantissa = index - shift * half
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us: int):
+        """Add one duration"""
+        value_us = max(0, int(value_us))
+        index = self.bucket_index(value_us)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total_us += value_us
+            if value_us > self.max_us:
+                self.max_us = value_us
+
+    def _sorted_counts(self) -> List[Tuple[int, int]]:
+        with self._lock:
+            return sorted(self._counts.items())
+
+    def percentile(self, pct: float) -> int:
+        """Largest value equivalent to the pct-th percentile (0 when empty)"""
+        buckets = self._sorted_counts()
+        total = sum(count for _, count in buckets)
+        if not total:
+            return 0
+        rank = max(1, int(round(pct / 100.0 * total)))
+        seen = 0
+        for index, count in buckets:
+            seen += count
+            if seen >= rank:
+                return min(self.bucket_bounds(index)[1], self.max_us)
+        return self.max_us
+
+    def cumulative(self, bounds_us: List[int]) -> List[int]:
+        """Counts at or below each bound (bucket resolution), for Prometheus buckets"""
+        buckets = self._sorted_counts()
+        out = []
+        for bound in bounds_us:
+            out.append(sum(count for index, count in buckets if self.bucket_bounds(index)[1] <= bound))
+        return out
+
+    def summary(self) -> Dict:
+        """Count, mean, percentiles and max in milliseconds"""
+        count = self.count
+        return {
+            "count": count,
+            "mean_ms": round(self.total_us / count / 1000.0, 3) if count else 0.0,
+            "p50_ms": self.percentile(50) / 1000.0,
+            "p90_ms": self.percentile(90) / 1000.0,
+            "p99_ms": self.percentile(99) / 1000.0,
+            "max_ms": self.max_us / 1000.0,
+        }
+
+
+class _StageTimer:
+    """Context manager timing one stage into the registry and an optional per-request dict"""
+
+    __slots__ = ("metrics", "stage", "sink", "start")
+
+    def __init__(self, metrics: "StageMetrics", stage: str, sink: Optional[Dict[str, float]]):
+        self.metrics = metrics
+        self.stage = stage
+        self.sink = sink
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_us = (time.perf_counter_ns() - self.start) // 1000
+        self.metrics.record(self.stage, elapsed_us, self.sink)
+        return False
+
+
+class StageMetrics:
+    """
+    Process-wide stage histograms and counters
+
+    Disabled registries still time into the per-request dict (for debug
+    answers) but skip the histograms.
+    """
+
+    # Prometheus histogram buckets, in seconds
+    PROMETHEUS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def time(self, stage: str, sink: Optional[Dict[str, float]] = None) -> _StageTimer:
+        """``with metrics.time("compose", ctx.stage_ms):`` times the block"""
+        return _StageTimer(self, stage, sink)
+
+    def record(self, stage: str, elapsed_us: int, sink: Optional[Dict[str, float]] = None):
+        """Add a stage duration; repeated stages add up in ``sink`` (milliseconds)"""
+        if sink is not None:
+            sink[stage] = round(sink.get(stage, 0.0) + elapsed_us / 1000.0, 3)
+        if not self.enabled:
+            return
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, LatencyHistogram())
+        histogram.record(elapsed_us)
+
+    def record_ms(self, stage: str, elapsed_ms: float, sink: Optional[Dict[str, float]] = None):
+        """record() for a duration already measured in milliseconds"""
+        self.record(stage, int(elapsed_ms * 1000), sink)
+
+    def increment(self, counter: str, amount: int = 1):
+        """Add to a named counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def snapshot(self) -> Dict:
+        """Per-stage latency summaries and counters"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        return {
+            "stages": {stage: histograms[stage].summary() for stage in sorted(histograms)},
+            "counters": counters,
+        }
+
+    def prometheus_text(self, prefix: str = "rag") -> str:
+        """Histograms and counters in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+
+        bounds_us = [int(bound * 1_000_000) for bound in self.PROMETHEUS_BUCKETS]
+        name = f"{prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} ProductionRAG pipeline stage latency",
+            f"# TYPE {name} histogram",
+        ]
+        for stage in sorted(histograms):
+            histogram = histograms[stage]
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            for bound, count in zip(self.PROMETHEUS_BUCKETS, histogram.cumulative(bounds_us)):
+                lines.append(f'{name}_bucket{{stage="{label}",le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{stage="{label}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{stage="{label}"}} {histogram.total_us / 1_000_000:.6f}')
+            lines.append(f'{name}_count{{stage="{label}"}} {histogram.count}')
+
+        counter_name = f"{prefix}_events_total"
+        lines.append(f"# HELP {counter_name} ProductionRAG pipeline events")
+        lines.append(f"# TYPE {counter_name} counter")
+        for counter in sorted(counters):
+            lines.append(f'{counter_name}{{event="{counter}"}} {counters[counter]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop every histogram and counter"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
@@ -280,18 +280,21 @@ def main():
     logger.info("\nInitializing Production RAG...")
     rag = ProductionRAG(db_path="chroma_data")
     
-    # Run stress tests
+    # Run stress tests (answered in one batch, graded in order)
     results = []
     total_score = 0
+    answers = rag.query_batch([test["query"] for test in STRESS_TESTS])
     
-    for i, test in enumerate(STRESS_TESTS, 1):
+    for i, (test, answer) in enumerate(zip(STRESS_TESTS, answers), 1):
         logger.info(f"\n{'='*80}")
         logger.info(f"STRESS TEST {i}/5: {test['category']}")
         logger.info(f"{'='*80}")
         logger.info(f"\nQuery: {test['query'][:200]}...")
         
-        # Query RAG
-        response = rag.query(test["query"])
+        # Batched answer (re-raise the per-question error, as rag.query would)
+        if not answer.ok:
+            raise RuntimeError(answer.error)
+        response = answer.result
         
         # Grade response
         grading = grade_response(response, test)
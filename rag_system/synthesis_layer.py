@@ -6,13 +6,18 @@ Generates comparisons, decision frameworks, and recommendations while maintainin
 
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Sequence, Tuple, Any
 from dataclasses import dataclass
 from datetime import datetime
 
+from entity_gazetteer import record_unitid
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# First characters a JSON document can start with; other strings are not parsed
+JSON_START = frozenset('[{"-0123456789tfnNI')
+
 
 @dataclass
 class ComparisonRow:
@@ -73,7 +78,8 @@ class SynthesisEngine:
         self,
         entities: List[Dict],
         attributes: List[str],
-        title: str
+        title: str,
+        unitids: Optional[Sequence[str]] = None
     ) -> ComparisonTable:
         """
         Generate side-by-side comparison table
@@ -82,12 +88,20 @@ class SynthesisEngine:
             entities: List of entities to compare (schools, programs, etc.)
             attributes: List of attributes to compare
             title: Table title
+            unitids: UNITIDs of the schools the question names; rows are
+                limited to them when any of them are among the entities
             
         Returns:
             ComparisonTable with citations
         """
         rows = []
         all_citations = set()
+
+        # Keep to the schools the question named, when any were retrieved
+        if unitids:
+            named = [entity for entity in entities if record_unitid(entity) in unitids]
+            if named:
+                entities = named
         
         for entity in entities:
             # Extract entity name
@@ -101,7 +115,7 @@ class SynthesisEngine:
                 value = entity.get(attr, 'N/A')
 
                 # Parse JSON strings if needed
-                if isinstance(value, str) and value not in ['N/A', '']:
+                if isinstance(value, str) and value.lstrip()[:1] in JSON_START:
                     try:
                         # Try to parse as JSON
                         parsed = json.loads(value)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Warm-Start Snapshot
+One versioned file holding everything ProductionRAG derives from the Chroma
+index at startup (decoded records, entity gazetteer, collection sizes),
+so a new replica loads it instead of re-reading and re-decoding every
+collection.
+
+Layout: MAGIC, a 4-byte little-endian header length, a JSON header
+(format, index version, code tables digest, section names, payload
+digest) and a pickle payload. The file is memory-mapped on load, so only the header is read
+to decide whether it is stale; the payload is unpickled straight from
+the mapping.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RAGSNAP\x00"
+
+# Bump when the snapshot layout or any pickled class changes shape
+SNAPSHOT_FORMAT = 1
+
+
+def tables_digest(*tables: Any) -> str:
+    """
+    Digest of code-level lookup tables the snapshot was derived with
+
+    Edits to tables such as the school aliases or authority domains change
+    the derived state without changing the index, so they must invalidate
+    the snapshot too. Sets are hashed in sorted order.
+    """
+    encoded = json.dumps(tables, sort_keys=True, default=sorted).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _read_header(mapped) -> Optional[tuple]:
+    """(header dict, payload offset), or None if the file is not a snapshot"""
+    prefix = len(MAGIC) + 4
+    if len(mapped) < prefix or mapped[:len(MAGIC)] != MAGIC:
+        return None
+    (header_len,) = struct.unpack("<I", mapped[len(MAGIC):prefix])
+    header = json.loads(bytes(mapped[prefix:prefix + header_len]).decode("utf-8"))
+    return header, prefix + header_len
+
+
+def read_header(path: str) -> Optional[Dict]:
+    """Header of a snapshot file without loading its payload (None if missing or unreadable)"""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            parsed = _read_header(mapped)
+            return parsed[0] if parsed else None
+    except (OSError, ValueError) as e:
+        logger.debug(f"No readable snapshot at {path}: {e}")
+        return None
+
+
+def save_snapshot(path: str, index_version: str, sections: Dict[str, Any], tables: Optional[str] = None) -> int:
+    """
+    Write sections for an index version and tables digest; returns the file size
+
+    Written to a temporary file and renamed, so readers never see a
+    partial snapshot.
+    """
+    payload = pickle.dumps(sections, protocol=pickle.HIGHEST_PROTOCOL)
+    header = json.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "index_version": index_version,
+        "tables": tables,
+        "sections": sorted(sections),
+        "payload_bytes": len(payload),
+        "payload_sha256": hashlib.sha256(payload).hexdigest(),
+        "created": time.time(),
+    }, sort_keys=True).encode("utf-8")
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return len(MAGIC) + 4 + len(header) + len(payload)
+
+
+def load_snapshot(
+    path: str,
+    index_version: str,
+    verify: bool = False,
+    tables: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Sections saved for ``index_version`` and ``tables``, or None if the file is missing, stale or another format
+
+    ``verify`` also checks the payload digest (reads the whole payload twice).
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            parsed = _read_header(mapped)
+            if parsed is None:
+                logger.warning(f"{path} is not a warm-start snapshot")
+                return None
+            header, offset = parsed
+            if header.get("format") != SNAPSHOT_FORMAT:
+                logger.info(f"Snapshot format {header.get('format')} != {SNAPSHOT_FORMAT}; ignoring {path}")
+                return None
+            if header.get("index_version") != index_version:
+                logger.info(f"Snapshot is for index {header.get('index_version')}, not {index_version}")
+                return None
+            if header.get("tables") != tables:
+                logger.info(f"Snapshot was built with code tables {header.get('tables')}, not {tables}")
+                return None
+            view = memoryview(mapped)[offset:offset + header["payload_bytes"]]
+            try:
+                if verify and hashlib.sha256(view).hexdigest() != header["payload_sha256"]:
+                    logger.warning(f"Snapshot payload digest mismatch; ignoring {path}")
+                    return None
+                return pickle.loads(view)
+            finally:
+                view.release()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Could not load snapshot {path}: {e}")
+        return None
@@ -2,16 +2,31 @@
 """
 Ingest All Training Data into ChromaDB
 Comprehensive ingestion of all JSONL files into appropriate collections
+
+Loads are incremental: each collection keeps a checksum manifest, only new
+or changed records are embedded and sent, and records that disappeared
+from the source files are deleted. Records are keyed by a natural key per
+record type (see NATURAL_KEYS), so an edited record is updated in place.
+Pass --rebuild to start from scratch.
 """
 
+import argparse
+import hashlib
 import json
 import logging
+import sys
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import chromadb
 from chromadb.config import Settings
 import shutil
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "rag_system"))
+from lexical_index import BM25Index
+from college_advisor_data.storage.incremental_upsert import IncrementalUpserter, record_checksum
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -159,20 +174,23 @@ def create_document_text(record: Dict, record_type: str) -> str:
         return json.dumps(record)
 
 
-def ingest_collection(client: chromadb.Client, collection_name: str, records: List[Dict], record_type: str):
-    """Ingest records into a collection"""
+def ingest_collection(
+    client: chromadb.Client,
+    collection_name: str,
+    records: List[Dict],
+    record_type: str,
+    lexical_dir: Optional[Path] = None,
+    manifest_dir: Path = Path("./chroma_data") / "manifests"
+):
+    """Ingest records into a collection (and its BM25 index when lexical_dir is set)"""
     if not records:
         logger.warning(f"No records to ingest for {collection_name}")
         return
         
     logger.info(f"Ingesting {len(records)} records into {collection_name}...")
     
-    # Create or get collection
-    try:
-        client.delete_collection(collection_name)
-    except:
-        pass
-    collection = client.create_collection(collection_name)
+    # Existing records are kept; only the differences are written below
+    collection = client.get_or_create_collection(collection_name)
     
     # Prepare data for ingestion
     documents = []
@@ -197,34 +215,105 @@ def ingest_collection(client: chromadb.Client, collection_name: str, records: Li
                 metadata[key] = str(value)
         metadatas.append(metadata)
         
-        # Create ID
-        ids.append(f"{collection_name}_{i}")
+    ids = record_ids(collection_name, documents, metadatas)
     
-    # Ingest in batches
-    batch_size = 100
-    for i in range(0, len(documents), batch_size):
-        batch_docs = documents[i:i+batch_size]
-        batch_metas = metadatas[i:i+batch_size]
-        batch_ids = ids[i:i+batch_size]
-        
-        collection.add(
-            documents=batch_docs,
-            metadatas=batch_metas,
-            ids=batch_ids
-        )
+    # Only new and changed records are embedded and sent; vanished ones are deleted
+    upserter = IncrementalUpserter(
+        collection=lambda: collection,
+        manifest_dir=manifest_dir
+    )
+    # Each load is the collection's full contents, so anything missing is gone
+    report = upserter.run(ids, documents, metadatas, prune=True)
+    for error in report["errors"]:
+        logger.error(f"  {collection_name}: {error}")
+
+    # The BM25 index is cheap to rebuild and always covers every record; it is
+    # tagged with the data_version token so readers can tell it matches
+    lexical_index = BM25Index()
+    lexical_index.add(ids, documents)
+    lexical_index.version = (client.get_collection(collection_name).metadata or {}).get("data_version", "")
+    if lexical_dir is not None:
+        lexical_index.save(str(lexical_dir / f"{collection_name}.npz"))
     
-    logger.info(f"✓ Ingested {len(records)} records into {collection_name}")
+    logger.info(
+        f"✓ {collection_name}: {report['new']} new, {report['changed']} changed, "
+        f"{report['unchanged']} unchanged, {report['deleted']} deleted"
+    )
+
+
+# Fields that identify a record of each type across edits, tried in order; the
+# first set the record fully carries becomes its ID key
+NATURAL_KEYS = {
+    "aid_policy": [("school_id", "policy_topic"), ("ipeds_id", "policy_topic")],
+    "international_aid": [("school_id", "policy_topic"), ("school_id",)],
+    "major_gate": [("school_id", "major_cip", "path"), ("school_id", "major_cip")],
+    "residency": [("school_id", "rule_type", "requirement"), ("rule_type", "requirement")],
+    "bsmd": [("program_name",)],
+    "visa": [("rule_type", "requirement")],
+    "admit_rate": [("school_id", "major"), ("school_name", "major")],
+    "military": [("state", "policy_name")],
+    "tribal": [("institution",), ("program",), ("policy",)],
+    "daca": [("state", "policy_name"), ("institution",), ("scholarship",), ("policy",)],
+    "foster": [("state", "program"), ("program",), ("institution",), ("policy",)],
+    "disability": [("institution",), ("scholarship",), ("program",), ("policy",), ("accommodation",)],
+    "ncaa": [("policy_name", "sport"), ("policy_name",)],
+    "bankruptcy": [("school_id", "policy_name"), ("policy_name",)],
+    "religious": [("school_id", "policy_name"), ("policy_name",)],
+    "transfer_credit": [("school_id", "policy_name"), ("policy_name",)],
+    "cds": [("school_id", "section"), ("school_name", "section")],
+    "articulation": [("from_institution", "from_course_id", "to_institution", "to_course_id")],
+    "cited_answer": [("prompt",)],
+    "sai_example": [("scenario_name",)],
+    "npc": [("school_id", "family_income"), ("school_name", "family_income")],
+}
+
+
+def natural_key(metadata: Dict) -> Optional[str]:
+    """The record's natural key, or None when it carries none of its type's key fields"""
+    record_type = metadata.get("_record_type")
+    for fields in NATURAL_KEYS.get(record_type, []):
+        values = [metadata.get(field) for field in fields]
+        if all(value not in (None, "") for value in values):
+            return json.dumps([record_type, dict(zip(fields, values))], sort_keys=True)
+    return None
+
+
+def record_ids(collection_name: str, documents: List[str], metadatas: List[Dict]) -> List[str]:
+    """Natural-key IDs, so an edited record keeps its ID and is updated in place
+
+    Records without a natural key, or whose key another record in the same load
+    shares, fall back to a content-derived ID (an edit then shows up as a delete
+    plus an add). Both kinds are stable when records are inserted or reordered
+    in the source files.
+    """
+    keys = [natural_key(metadata) for metadata in metadatas]
+    shared = Counter(key for key in keys if key is not None)
+    ids = []
+    seen = Counter()
+    for document, metadata, key in zip(documents, metadatas, keys):
+        if key is not None and shared[key] == 1:
+            key = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        else:
+            key = record_checksum(document, metadata)[:16]
+        seen[key] += 1
+        # Identical records get a running suffix so each keeps its own ID
+        ids.append(f"{collection_name}_{key}" if seen[key] == 1 else f"{collection_name}_{key}_{seen[key]}")
+    return ids
 
 
 def main():
     """Main ingestion pipeline"""
+    parser = argparse.ArgumentParser(description="Ingest all training data into ChromaDB")
+    parser.add_argument("--rebuild", action="store_true", help="Delete the database and load everything again")
+    args = parser.parse_args()
+
     logger.info("="*80)
     logger.info("INGESTING ALL TRAINING DATA INTO CHROMADB")
     logger.info("="*80)
     
-    # Clear existing database
     db_path = "./chroma_data"
-    clear_existing_database(db_path)
+    if args.rebuild:
+        clear_existing_database(db_path)
     
     # Initialize ChromaDB client
     client = chromadb.PersistentClient(
@@ -307,7 +396,14 @@ def main():
         
         if all_records:
             # Use first record type for collection (they're all going to same collection)
-            ingest_collection(client, source["collection"], all_records, source["record_types"][0])
+            ingest_collection(
+                client,
+                source["collection"],
+                all_records,
+                source["record_types"][0],
+                lexical_dir=Path(db_path) / "lexical",
+                manifest_dir=Path(db_path) / "manifests"
+            )
             total_records += len(all_records)
     
     logger.info("\n" + "="*80)
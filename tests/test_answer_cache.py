@@ -0,0 +1,82 @@
+"""Tests for the versioned ProductionRAG answer cache."""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from answer_cache import AnswerCache, make_key
+from rag_types import AnswerResult
+
+
+def _answer(text):
+    return AnswerResult(
+        answer=text,
+        citations=[],
+        tool_calls=[],
+        schema_valid=True,
+        citation_coverage=1.0,
+        should_abstain=False,
+    )
+
+
+class TestCacheKey:
+    """Test key construction."""
+
+    def test_question_is_normalized(self):
+        """Case and whitespace do not change the key."""
+        assert make_key("What is  FAFSA?") == make_key("what is fafsa?")
+
+    def test_context_and_format_are_part_of_key(self):
+        """Context (in any key order) and expected format change the key."""
+        assert make_key("q", {"a": 1, "b": 2}) == make_key("q", {"b": 2, "a": 1})
+        assert make_key("q", {"a": 1}) != make_key("q", {"a": 2})
+        assert make_key("q", None, "markdown") != make_key("q")
+
+
+class TestAnswerCache:
+    """Test tiers, eviction and invalidation."""
+
+    def test_hit_returns_copy(self):
+        """Callers cannot mutate the cached entry."""
+        cache = AnswerCache()
+        cache.put("k", "v1", _answer("a"))
+        first = cache.get("k", "v1")
+        first.answer = "changed"
+        assert cache.get("k", "v1").answer == "a"
+        assert cache.stats()["hits"] == 2
+
+    def test_index_version_change_invalidates(self):
+        """Entries from another index version are never served."""
+        cache = AnswerCache()
+        cache.put("k", "v1", _answer("a"))
+        assert cache.get("k", "v2") is None
+        stats = cache.stats()
+        assert stats["invalidations"] == 1
+        assert stats["misses"] == 1
+
+    def test_lru_eviction_and_ttl(self):
+        """Memory tier is bounded and entries expire."""
+        cache = AnswerCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, "v", _answer(key))
+        assert cache.get("a", "v") is None
+        assert cache.stats()["evictions"] == 1
+
+        cache = AnswerCache(ttl_seconds=0.01)
+        cache.put("k", "v", _answer("a"))
+        time.sleep(0.02)
+        assert cache.get("k", "v") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new cache over the same directory serves stored answers."""
+        cache = AnswerCache(disk_dir=str(tmp_path), max_disk_entries=1)
+        cache.put("old", "v", _answer("old"))
+        cache.put("k", "v", _answer("a"))
+
+        restarted = AnswerCache(disk_dir=str(tmp_path))
+        assert restarted.get("k", "v").answer == "a"
+        assert restarted.get("old", "v") is None
+        assert restarted.stats()["disk_hits"] == 1
@@ -0,0 +1,63 @@
+"""Tests for streamed answer sections and frames."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from answer_stream import AnswerStream
+from domain_handlers import StreamingAnswerBuffer
+from rag_types import AnswerResult, Citation
+
+
+class TestStreamingAnswerBuffer:
+    """Test section boundaries."""
+
+    def test_sections_end_at_next_heading(self):
+        """A section is sent once the next heading is written; close() sends the rest."""
+        sent = []
+        out = StreamingAnswerBuffer(sent.append)
+        out.write("## Title\n\n")
+        assert sent == []
+        out.write("intro\n### NYU COA\n\n**$90,000**\n")
+        assert sent == ["## Title\n\nintro\n"]
+        out.write("### USC COA\n\n")
+        assert sent[-1] == "### NYU COA\n\n**$90,000**\n"
+        out.close()
+        assert "".join(sent) == out.getvalue()
+
+    def test_hash_inside_line_is_not_a_heading(self):
+        """Only headings at the start of a line split sections."""
+        sent = []
+        out = StreamingAnswerBuffer(sent.append)
+        out.write("Rank #1 school\n#hashtag\n")
+        out.close()
+        assert sent == ["Rank #1 school\n#hashtag\n"]
+
+
+class TestAnswerStream:
+    """Test frame order and citation de-duplication."""
+
+    def test_citations_sent_once_then_final(self):
+        """Each URL is sent with its first section; leftovers precede the final frame."""
+        first = Citation(url="https://studentaid.gov/a", last_verified="2025")
+        second = Citation(url="https://nyu.edu/coa", last_verified="2025")
+        stream = AnswerStream()
+        stream.section_citing("see https://studentaid.gov/a", [first, second])
+        stream.section_citing("again https://studentaid.gov/a", [first, second])
+        result = AnswerResult(
+            answer="", citations=[first, second], tool_calls=[], schema_valid=True,
+            citation_coverage=1.0, should_abstain=False
+        )
+        stream.finish(result)
+        frames = list(stream.frames())
+        assert [f["type"] for f in frames] == ["section", "citations", "section", "citations", "final"]
+        assert frames[1]["citations"] == [first]
+        assert frames[3]["citations"] == [second]
+        assert frames[-1]["result"] is result
+
+    def test_error_ends_stream(self):
+        """A failed pipeline ends the stream with an error frame."""
+        stream = AnswerStream()
+        stream.fail(ValueError("boom"))
+        assert list(stream.frames()) == [{"type": "error", "error": "ValueError: boom"}]
@@ -0,0 +1,96 @@
+"""Tests for concurrent, backpressured bulk upsert."""
+
+import threading
+import time
+
+from college_advisor_data.storage.bulk_upsert import AdaptiveBatchSizer, BulkUpserter
+
+
+class RecordingCollection:
+    """Collection stand-in that records upserts and in-flight concurrency."""
+
+    def __init__(self, delay: float = 0.0, failures: int = 0):
+        self.delay = delay
+        self.failures = failures
+        self.rows = {}
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            fail = self.failures > 0
+            self.failures -= 1
+        try:
+            time.sleep(self.delay)
+            if fail:
+                raise RuntimeError("server busy")
+            with self._lock:
+                self.rows.update(zip(ids, documents))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def records(n):
+    ids = [f"doc_{i}" for i in range(n)]
+    return ids, [[float(i)] for i in range(n)], [f"text {i}" for i in range(n)], [{"i": i} for i in range(n)]
+
+
+class TestAdaptiveBatchSizer:
+    """Test latency-driven batch sizing."""
+
+    def test_grows_when_fast_and_halves_when_slow(self):
+        """Fast full-size batches grow the size; slow ones and failures halve it."""
+        sizer = AdaptiveBatchSizer(initial=100, min_size=10, max_size=400, target_latency_secs=1.0)
+        sizer.observe(0.1, 100)
+        assert sizer.size == 150
+        sizer.observe(0.1, 20)  # a short tail batch says nothing about larger ones
+        assert sizer.size == 150
+        sizer.observe(2.0, 150)
+        assert sizer.size == 75
+        for _ in range(10):
+            sizer.failed()
+        assert sizer.size == 10
+
+
+class TestBulkUpserter:
+    """Test concurrency bounds, retries and reporting."""
+
+    def test_all_records_written_within_in_flight_bound(self):
+        """Every record lands once and no more than max_in_flight batches overlap."""
+        collection = RecordingCollection(delay=0.01)
+        upserter = BulkUpserter(lambda: collection, max_in_flight=3, initial_batch_size=10,
+                                min_batch_size=5, max_batch_size=50)
+        report = upserter.run(*records(500))
+
+        assert report["succeeded"] == 500 and report["failed"] == 0
+        assert len(collection.rows) == 500
+        assert collection.peak_in_flight <= 3
+        assert sum(b["size"] for b in report["batches"]) == 500
+        assert report["final_batch_size"] > 10
+
+    def test_failed_batches_retried(self):
+        """Transient failures are retried and the batch reports its attempts."""
+        collection = RecordingCollection(failures=2)
+        upserter = BulkUpserter(lambda: collection, max_in_flight=1, initial_batch_size=100,
+                                max_retries=3, backoff_base_secs=0.0)
+        report = upserter.run(*records(100))
+
+        assert report["succeeded"] == 100
+        assert report["batches"][0]["attempts"] == 3
+        assert report["batches"][0]["status"] == "ok"
+
+    def test_exhausted_retries_reported_not_raised(self):
+        """A batch that keeps failing is reported with its error."""
+        collection = RecordingCollection(failures=100)
+        upserter = BulkUpserter(lambda: collection, max_in_flight=2, initial_batch_size=25,
+                                min_batch_size=25, max_retries=1, backoff_base_secs=0.0)
+        report = upserter.run(*records(50))
+
+        assert report["succeeded"] == 0 and report["failed"] == 50
+        assert all(b["status"] == "failed" and b["error"] == "server busy" for b in report["batches"])
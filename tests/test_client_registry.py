@@ -0,0 +1,113 @@
+"""Tests for the process-wide ChromaDB client registry."""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from college_advisor_data.storage.client_registry import ChromaClientRegistry, PoolSettings
+from college_advisor_data.storage.collection_manager import CollectionManager
+
+
+def fast_settings(**overrides):
+    """Pool settings with no real backoff delay."""
+    values = {"connect_retries": 3, "backoff_base_secs": 0.0, "idle_timeout_secs": 60.0}
+    values.update(overrides)
+    return PoolSettings(**values)
+
+
+class TestClientSharing:
+    """Test that consumers share one client and its collection handles."""
+
+    def test_persistent_client_shared_per_path(self, tmp_path):
+        """Two acquisitions of the same path open one client."""
+        registry = ChromaClientRegistry(fast_settings())
+        first = registry.persistent_client(str(tmp_path / "db"))
+        second = registry.persistent_client(str(tmp_path / "db"))
+
+        assert first is second
+        stats = registry.stats()["endpoints"][f"file://{tmp_path / 'db'}"]
+        assert stats["connects"] == 1
+        assert stats["acquisitions"] == 2
+        registry.close_all()
+
+    def test_collection_handles_cached(self, tmp_path):
+        """Handles are created once and reused; create=False does not create."""
+        registry = ChromaClientRegistry(fast_settings())
+        client = registry.persistent_client(str(tmp_path / "db"))
+
+        handle = registry.collection(client, "aid_policies", metadata={"schema_version": "1.0"})
+        assert registry.collection(client, "aid_policies") is handle
+        with pytest.raises(Exception):
+            registry.collection(client, "missing", create=False)
+
+        stats = registry.stats()["endpoints"][f"file://{tmp_path / 'db'}"]
+        assert stats["collection_hits"] == 1
+        assert stats["collection_misses"] == 2
+        registry.close_all()
+
+    @patch('college_advisor_data.storage.client_registry.chromadb')
+    def test_collection_manager_shares_one_connection(self, mock_chromadb):
+        """Every collection in a manager goes through one HTTP client."""
+        mock_chromadb.HttpClient.return_value.get_collection.return_value.metadata = {}
+        manager = CollectionManager(registry=ChromaClientRegistry(fast_settings()))
+
+        manager.get_client("institutions")
+        manager.get_client("programs")
+
+        assert mock_chromadb.HttpClient.call_count == 1
+        assert mock_chromadb.HttpClient.return_value.heartbeat.call_count == 1
+
+
+class TestLifecycle:
+    """Test reconnects and idle eviction."""
+
+    @patch('college_advisor_data.storage.client_registry.chromadb')
+    def test_connect_retries_with_backoff(self, mock_chromadb):
+        """Failed heartbeats are retried until the client connects."""
+        client = Mock()
+        client.heartbeat.side_effect = [ConnectionError("down"), ConnectionError("down"), 1]
+        mock_chromadb.HttpClient.return_value = client
+        registry = ChromaClientRegistry(fast_settings())
+
+        assert registry.http_client("chroma", 8000) is client
+        stats = registry.stats()["endpoints"]["http://chroma:8000"]
+        assert stats["connect_failures"] == 2
+        assert stats["connects"] == 1
+
+    @patch('college_advisor_data.storage.client_registry.chromadb')
+    def test_connect_gives_up(self, mock_chromadb):
+        """A server that never answers raises ConnectionError after the retries."""
+        mock_chromadb.HttpClient.return_value.heartbeat.side_effect = ConnectionError("down")
+        registry = ChromaClientRegistry(fast_settings())
+
+        with pytest.raises(ConnectionError):
+            registry.http_client("chroma", 8000)
+        assert mock_chromadb.HttpClient.call_count == 3
+
+    @patch('college_advisor_data.storage.client_registry.chromadb')
+    def test_reconnect_once_for_concurrent_callers(self, mock_chromadb):
+        """A second caller holding the stale client gets the replacement."""
+        mock_chromadb.HttpClient.side_effect = lambda **kwargs: Mock()
+        registry = ChromaClientRegistry(fast_settings())
+        stale = registry.http_client("chroma", 8000)
+
+        fresh = registry.reconnect(stale)
+        assert fresh is not stale
+        assert registry.reconnect(stale) is fresh
+        assert registry.http_client("chroma", 8000) is fresh
+        stale.close.assert_called_once()
+
+    @patch('college_advisor_data.storage.client_registry.chromadb')
+    def test_idle_http_clients_evicted(self, mock_chromadb, tmp_path):
+        """Idle HTTP clients are closed and reopened; persistent ones stay."""
+        mock_chromadb.HttpClient.side_effect = lambda **kwargs: Mock()
+        mock_chromadb.PersistentClient.side_effect = lambda **kwargs: Mock()
+        registry = ChromaClientRegistry(fast_settings())
+        idle = registry.http_client("chroma", 8000)
+        local = registry.persistent_client(str(tmp_path / "db"))
+
+        assert registry.evict_idle(now=time.monotonic() + 120) == 1
+        idle.close.assert_called_once()
+        assert registry.http_client("chroma", 8000) is not idle
+        assert registry.persistent_client(str(tmp_path / "db")) is local
@@ -0,0 +1,122 @@
+"""Tests for columnar collection dump and restore."""
+
+import chromadb
+import numpy as np
+import pytest
+from chromadb.config import Settings
+
+from college_advisor_data.storage.collection_dump import (
+    CollectionDump, DumpIntegrityError, export_collection, export_collections, restore_collection,
+    restore_collections
+)
+from college_advisor_data.storage.local_vector_store import LocalVectorClient
+
+pytest.importorskip("pyarrow")
+
+
+def make_client(path):
+    return chromadb.PersistentClient(path=str(path), settings=Settings(anonymized_telemetry=False))
+
+
+def make_collection(client, name="docs", n=45):
+    rng = np.random.default_rng(0)
+    collection = client.create_collection(name, metadata={"schema_version": "1.0"})
+    metadatas = []
+    for i in range(n):
+        metadata = {"entity_type": "program" if i % 2 else "college", "year": 2020 + i % 3,
+                    "score": 0.5 * i if i % 3 else i}  # int and float mixed -> JSON column
+        if i % 5 == 0:
+            metadata["featured"] = True
+        metadatas.append(metadata)
+    collection.add(
+        ids=[f"doc_{i}" for i in range(n)],
+        embeddings=rng.normal(size=(n, 8)).astype(np.float32).tolist(),
+        documents=[f"document {i}" for i in range(n)],
+        metadatas=metadatas
+    )
+    return collection
+
+
+def records(collection):
+    got = collection.get(include=["embeddings", "documents", "metadatas"])
+    order = np.argsort(got["ids"])
+    return ([got["ids"][i] for i in order], np.asarray(got["embeddings"])[order],
+            [got["documents"][i] for i in order], [got["metadatas"][i] for i in order])
+
+
+class TestRoundTrip:
+    """Test that a restore reproduces the source collection exactly."""
+
+    def test_chroma_to_chroma(self, tmp_path):
+        """Ids, documents, typed metadata and embeddings survive a dump and restore."""
+        source_client = make_client(tmp_path / "source")
+        source = make_collection(source_client)
+        index = export_collections(source_client, tmp_path / "dump", page_size=10)
+        assert index["collections"]["docs"]["count"] == 45
+
+        dump = CollectionDump(tmp_path / "dump" / "docs")
+        assert dump.manifest["columns"] == {
+            "entity_type": "string", "year": "int64", "score": "json", "featured": "bool"}
+        assert dump._file().num_row_groups == 5
+
+        target_client = make_client(tmp_path / "target")
+        results = restore_collections(tmp_path / "dump", target_client)
+        assert results[0]["succeeded"] == 45 and results[0]["failed"] == 0
+
+        target = target_client.get_collection("docs")
+        assert target.metadata["schema_version"] == "1.0"
+        src_ids, src_vectors, src_docs, src_meta = records(source)
+        dst_ids, dst_vectors, dst_docs, dst_meta = records(target)
+        assert dst_ids == src_ids and dst_docs == src_docs and dst_meta == src_meta
+        np.testing.assert_array_equal(dst_vectors, src_vectors)
+        by_id = dict(zip(dst_ids, dst_meta))
+        assert "featured" not in by_id["doc_1"] and isinstance(by_id["doc_3"]["score"], int)
+
+    def test_restore_into_local_store(self, tmp_path):
+        """A dump streams straight into the local vector store."""
+        source = make_collection(make_client(tmp_path / "source"))
+        export_collection(source, tmp_path / "dump", page_size=16)
+
+        local = LocalVectorClient(str(tmp_path / "local"))
+        restore_collection(tmp_path / "dump", local)
+        query = source.get(ids=["doc_7"], include=["embeddings"])["embeddings"]
+        assert local.get_collection("docs").query(query_embeddings=query, n_results=1)["ids"] == [["doc_7"]]
+
+    def test_paged_reads(self, tmp_path):
+        """get() pages across row-group boundaries like a collection."""
+        source = make_collection(make_client(tmp_path / "source"))
+        export_collection(source, tmp_path / "dump", page_size=10)
+        dump = CollectionDump(tmp_path / "dump")
+
+        page = dump.get(limit=7, offset=8, include=["metadatas", "embeddings"])
+        assert page["ids"] == [f"doc_{i}" for i in range(8, 15)]
+        assert page["documents"] is None and page["embeddings"].shape == (7, 8)
+        assert dump.get(limit=10, offset=45)["ids"] == []
+
+
+class TestIntegrity:
+    """Test checksum verification and overwrite protection."""
+
+    def test_corruption_detected(self, tmp_path):
+        source = make_collection(make_client(tmp_path / "source"))
+        export_collection(source, tmp_path / "dump")
+        vectors = tmp_path / "dump" / "embeddings.f32"
+        data = bytearray(vectors.read_bytes())
+        data[0] ^= 0xFF
+        vectors.write_bytes(bytes(data))
+
+        with pytest.raises(DumpIntegrityError):
+            restore_collection(tmp_path / "dump", make_client(tmp_path / "target"))
+
+    def test_existing_collection_needs_replace(self, tmp_path):
+        client = make_client(tmp_path / "db")
+        export_collection(make_collection(client), tmp_path / "dump")
+
+        with pytest.raises(ValueError):
+            restore_collection(tmp_path / "dump", client)
+        assert restore_collection(tmp_path / "dump", client, replace=True)["succeeded"] == 45
+
+    def test_incomplete_dump_rejected(self, tmp_path):
+        (tmp_path / "partial").mkdir()
+        with pytest.raises(DumpIntegrityError):
+            CollectionDump(tmp_path / "partial")
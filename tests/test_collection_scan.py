@@ -0,0 +1,137 @@
+"""Tests for streaming whole-collection statistics."""
+
+import chromadb
+from chromadb.config import Settings
+
+from college_advisor_data.evaluation.coverage import CoverageAnalyzer
+from college_advisor_data.storage.collection_scan import (
+    DistinctValues, FieldCounter, ScanCache, TextLengthHistogram,
+    collection_space, collection_version, mark_changed, scan_collection
+)
+
+
+class CountingCollection:
+    """Proxy that counts get() round trips."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.gets = 0
+
+    def get(self, **kwargs):
+        self.gets += 1
+        return self.collection.get(**kwargs)
+
+
+def make_collection(tmp_path, n=25):
+    client = chromadb.PersistentClient(path=str(tmp_path / "db"), settings=Settings(anonymized_telemetry=False))
+    collection = client.create_collection("scan")
+    collection.add(
+        ids=[f"doc_{i}" for i in range(n)],
+        embeddings=[[float(i), 1.0] for i in range(n)],
+        documents=["x" * (i * 10) for i in range(n)],
+        metadatas=[{"entity_type": "program" if i % 2 else "college", "year": 2020 + i % 3} for i in range(n)]
+    )
+    return client, collection
+
+
+class TestScanCollection:
+    """Test the single streaming pass."""
+
+    def test_every_record_once_in_pages(self, tmp_path):
+        """All aggregators see every record in ceil(n / page) + 1 round trips at most."""
+        _, collection = make_collection(tmp_path)
+        counting = CountingCollection(collection)
+        aggregators = {
+            "types": FieldCounter("entity_type"),
+            "years": DistinctValues("year"),
+            "lengths": TextLengthHistogram(),
+        }
+
+        assert scan_collection(counting, aggregators, page_size=10) == 25
+        assert counting.gets == 3
+        assert aggregators["types"].result() == {"college": 13, "program": 12}
+        assert aggregators["years"].result() == [2020, 2021, 2022]
+        lengths = aggregators["lengths"].result()
+        assert lengths["count"] == 25 and lengths["max"] == 240
+        assert lengths["buckets"]["0"] == 1
+        assert sum(lengths["buckets"].values()) == 25
+
+    def test_metadata_only_scan_skips_documents(self, tmp_path):
+        """Documents are fetched only when an aggregator needs them."""
+        _, collection = make_collection(tmp_path, n=3)
+        calls = []
+
+        class Recording(CountingCollection):
+            def get(self, **kwargs):
+                calls.append(kwargs["include"])
+                return super().get(**kwargs)
+
+        scan_collection(Recording(collection), {"types": FieldCounter("entity_type")})
+        assert calls == [["metadatas"]]
+
+
+class TestVersioning:
+    """Test version-keyed refresh."""
+
+    def test_version_changes_on_write(self, tmp_path):
+        """Marking a write or adding records changes the version."""
+        client, collection = make_collection(tmp_path, n=3)
+        before = collection_version(client, "scan")
+        assert collection_version(client, "scan") == before
+
+        mark_changed(collection)
+        marked = collection_version(client, "scan")
+        assert marked != before
+
+        collection.add(ids=["extra"], embeddings=[[0.0, 0.0]], documents=["new"])
+        assert collection_version(client, "scan") != marked
+
+    def test_marked_with_distance_function(self, tmp_path):
+        """Collections created with hnsw:space still get a new token and keep their space."""
+        client = chromadb.PersistentClient(path=str(tmp_path / "db"), settings=Settings(anonymized_telemetry=False))
+        collection = client.create_collection("cosine", metadata={"hnsw:space": "cosine", "owner": "ingest"})
+        before = collection_version(client, "cosine")
+
+        mark_changed(collection)
+        fresh = client.get_collection("cosine")
+        assert collection_version(client, "cosine") != before
+        assert fresh.metadata["owner"] == "ingest" and collection_space(fresh) == "cosine"
+
+    def test_aggregator_parameters_in_description(self):
+        """Aggregators with the same type but other parameters describe differently."""
+        assert FieldCounter("entity_type", top=5).describe() != FieldCounter("entity_type", top=10).describe()
+        assert FieldCounter("entity_type").describe() == FieldCounter("entity_type").describe()
+
+    def test_cache_survives_restart(self, tmp_path):
+        """Results persisted for a version are served only for that version."""
+        ScanCache(tmp_path / "stats").put("scan.types", "v1", {"types": {"college": 2}})
+        cache = ScanCache(tmp_path / "stats")
+        assert cache.get("scan.types", "v1") == {"types": {"college": 2}}
+        assert cache.get("scan.types", "v2") is None
+
+
+class TestCoverageAggregators:
+    """Test that coverage analyses fold records like the old per-sample loops."""
+
+    def test_analyses_from_one_pass(self):
+        """Each analysis is computed from the same stream of records."""
+        aggregators = {name: analysis() for name, analysis in CoverageAnalyzer.ANALYSES.items()}
+        records = [
+            ({"university_name": "MIT", "program_name": "CS", "location": "Cambridge, MA"},
+             "Bachelor in computer science; deadline: january 1 for 2024"),
+            ({"university_name": "Stanford", "program_name": "Math", "location": "Stanford, CA"},
+             "Graduate mathematics program requires GPA and an essay"),
+        ]
+        for metadata, document in records:
+            for aggregator in aggregators.values():
+                aggregator.update(metadata, document)
+
+        university = aggregators["university_coverage"].result()
+        assert university["total_universities"] == 2
+        assert university["major_university_coverage"] == 0.2
+        assert aggregators["geographic_coverage"].result()["states_covered"] == 2
+        assert aggregators["program_level_coverage"].result()["levels_covered"] == 2
+        temporal = aggregators["temporal_coverage"].result()
+        assert temporal["years_mentioned"] == ["2024"] and temporal["deadline_mentions"] == 1
+        admission = aggregators["admission_requirements_coverage"].result()
+        assert admission["gpa_coverage"] == 0.5 and admission["total_samples"] == 2
@@ -0,0 +1,97 @@
+"""Tests for the ProductionRAG synthesis domain handler registry."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from comparison_generators import (
+    AdmissionsComparator, DecisionFrameworkGenerator, FinancialAidComparator, ProgramComparator
+)
+from domain_handlers import HANDLERS, REGISTRY, AnswerBuffer, HandlerContext, load_renderer
+from query_router import DOMAIN_ORDER, DOMAIN_PRIORITIES, QueryRouter
+from rag_types import Citation
+from recommendation_engine import RecommendationEngine
+from record_store import decode_metadata
+from synthesis_layer import SynthesisEngine
+
+# Answers of the original ProductionRAG._try_synthesis branch chain for one
+# question per domain, over the fixed records stored alongside them
+GOLDEN = json.loads((Path(__file__).parent / "golden" / "domain_handlers.json").read_text())
+
+
+class FixedRAG:
+    """The ProductionRAG surface handlers use, over the golden records."""
+
+    def __init__(self, records):
+        self.records = records
+        self.synthesis_engine = SynthesisEngine()
+        self.aid_comparator = FinancialAidComparator(self.synthesis_engine)
+        self.admissions_comparator = AdmissionsComparator(self.synthesis_engine)
+        self.program_comparator = ProgramComparator(self.synthesis_engine)
+        self.framework_generator = DecisionFrameworkGenerator(self.synthesis_engine)
+        self.recommendation_engine = RecommendationEngine(self.synthesis_engine)
+
+    def query_partition(self, collection_name, query, filters, n_results=20, retrieval_ctx=None):
+        hits = [r for r in self.records if r["_record_type"] in filters["_record_type"]]
+        return {"metadatas": [[dict(r) for r in hits[:n_results]]]}
+
+
+class TestRegistry:
+    """Test the handler declarations."""
+
+    def test_router_reads_registry(self):
+        """Router priorities and tie order come from the registry."""
+        assert DOMAIN_ORDER == tuple(handler.name for handler in HANDLERS)
+        assert DOMAIN_PRIORITIES["foster_care"] == REGISTRY["foster_care"].priority
+        assert len(REGISTRY) == len(HANDLERS)
+
+    def test_handler_modules_load_lazily(self):
+        """A handler module is imported on first render only."""
+        handler = REGISTRY["parent_plus_denial"]
+        load_renderer.cache_clear()
+        sys.modules.pop(handler.module, None)
+
+        assert callable(load_renderer(handler.module))
+        assert handler.module in sys.modules
+
+    def test_render_writes_to_buffer(self):
+        """Handlers append to the answer buffer."""
+        ctx = HandlerContext(
+            rag=None,
+            question="Parent PLUS loan denied",
+            question_lower="parent plus loan denied",
+            context={},
+            retrieved_data=[],
+            all_citations=[],
+        )
+        out = AnswerBuffer()
+        REGISTRY["parent_plus_denial"].render(ctx, out)
+        assert out.getvalue().startswith("#")
+
+
+class TestGoldenAnswers:
+    """Test each handler against the answers of the original branch chain."""
+
+    @pytest.mark.parametrize("case", GOLDEN["cases"], ids=[case["domain"] for case in GOLDEN["cases"]])
+    def test_matches_branch_chain(self, case):
+        question = case["question"]
+        assert QueryRouter().route(question).domain == case["domain"]
+
+        ctx = HandlerContext(
+            rag=FixedRAG(GOLDEN["records"]),
+            question=question,
+            question_lower=question.lower(),
+            context=dict(case["context"]),
+            retrieved_data=[decode_metadata(school) for school in GOLDEN["schools"]],
+            all_citations=[
+                Citation(url=school.get("source_url", "https://example.edu"), last_verified="2025-01-01")
+                for school in GOLDEN["schools"]
+            ],
+        )
+        out = AnswerBuffer()
+        REGISTRY[case["domain"]].render(ctx, out)
+        assert out.getvalue() == case["answer"]
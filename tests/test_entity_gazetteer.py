@@ -0,0 +1,101 @@
+"""Tests for school name resolution to IPEDS UNITIDs."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from entity_gazetteer import EntityGazetteer, derived_aliases, record_unitid
+
+
+def _gazetteer():
+    return EntityGazetteer.from_records([
+        {"school_name": "Massachusetts Institute of Technology", "ipeds_id": 166683},
+        {"school_name": "Stanford University", "ipeds_id": "243744"},
+        {"school_name": "Northwestern University", "school_id": "147767"},
+        {"school_name": "Purdue University", "ipeds_id": 243780},
+        {"school_name": "Duke University", "ipeds_id": 198419},
+        {"school_name": "Duke University", "ipeds_id": 198419},
+        {"school_name": "Duke University", "school_id": "999999"},
+        {"school_name": "Unknown School", "school_id": "unknown"},
+    ])
+
+
+class TestHelpers:
+    """Test UNITID extraction and alias derivation."""
+
+    def test_record_unitid(self):
+        """ipeds_id wins; school_id only counts when numeric."""
+        assert record_unitid({"ipeds_id": 110635, "school_id": "1"}) == "110635"
+        assert record_unitid({"school_id": "166027"}) == "166027"
+        assert record_unitid({"school_id": "mit"}) is None
+        assert record_unitid({"ipeds_id": 0}) is None
+
+    def test_derived_aliases(self):
+        """Short names and acronyms come from the official name."""
+        assert "Stanford" in derived_aliases("Stanford University")
+        assert "MIT" in derived_aliases("Massachusetts Institute of Technology")
+        assert "Ohio State University" in derived_aliases("The Ohio State University")
+
+    def test_common_words_not_derived(self):
+        """Short forms that are everyday words are dropped; full names still resolve."""
+        assert derived_aliases("Hope College") == []
+        assert "Union" not in derived_aliases("Union College")
+
+        gazetteer = EntityGazetteer.from_records([
+            {"school_name": "Hope College", "ipeds_id": 170301},
+            {"school_name": "Union College", "ipeds_id": 196866},
+        ])
+        assert gazetteer.unitids("I hope the student union has late hours") == ()
+        assert gazetteer.unitids("Hope College vs Union College aid") == ("170301", "196866")
+
+    def test_plurals_not_folded(self):
+        """Names ending in "s" are matched as written."""
+        gazetteer = EntityGazetteer.from_records([
+            {"school_name": "Wells College", "ipeds_id": 196592},
+            {"school_name": "Williams College", "ipeds_id": 168342},
+        ])
+        assert gazetteer.unitids("Does Wells meet full need?") == ("196592",)
+        assert gazetteer.unitids("oil well engineering") == ()
+        assert gazetteer.unitids("Williams or Wells") == ("168342", "196592")
+
+
+class TestEntityGazetteer:
+    """Test resolution of questions to UNITIDs."""
+
+    def test_names_aliases_and_acronyms(self):
+        """Official names, curated aliases and acronyms all resolve."""
+        gazetteer = _gazetteer()
+        assert gazetteer.unitids("Compare MIT and Stanford University for CS") == ("166683", "243744")
+        assert gazetteer.unitids("is stanford better than northwestern") == ("243744", "147767")
+
+    def test_most_common_unitid_wins(self):
+        """A name recorded under several ids keeps the most frequent one."""
+        assert _gazetteer().unitids("Duke aid policy") == ("198419",)
+
+    def test_fuzzy_matches_long_names_only(self):
+        """One-edit misspellings of long names resolve; short lookalikes do not."""
+        gazetteer = _gazetteer()
+        matches = gazetteer.resolve("stanfrod or nortwestern")
+        assert [m.unitid for m in matches] == ["243744", "147767"]
+        assert all(m.fuzzy for m in matches)
+        assert gazetteer.unitids("I want to pursue engineering") == ()
+
+    def test_ambiguous_derived_alias_is_dropped(self):
+        """A short form shared by two schools resolves to neither."""
+        gazetteer = EntityGazetteer()
+        gazetteer.add("Columbia University", "190150")
+        gazetteer.add("Columbia College", "112826")
+        assert gazetteer.unitids("columbia deadlines") == ()
+        assert gazetteer.unitids("Columbia College deadlines") == ("112826",)
+
+    def test_scorecard_export(self, tmp_path):
+        """Scorecard rows add schools and their listed aliases."""
+        path = tmp_path / "schools.json"
+        path.write_text(json.dumps({"data": [
+            {"id": 110635, "school.name": "University of California-Los Angeles", "school.alias": "UCLA, Westwood"},
+        ]}))
+        gazetteer = EntityGazetteer.from_records([], scorecard_path=str(path))
+        assert gazetteer.unitids("westwood housing") == ("110635",)
+        assert gazetteer.unitids("ucla housing") == ("110635",)
@@ -0,0 +1,186 @@
+"""Tests for checksum-driven incremental upsert."""
+
+import chromadb
+import pytest
+from chromadb.config import Settings
+
+from college_advisor_data.storage.bulk_upsert import BulkUpserter
+from college_advisor_data.storage.incremental_upsert import (
+    ChecksumManifest, IncrementalUpserter, record_checksum
+)
+from college_advisor_data.storage.local_vector_store import LocalVectorClient
+
+
+class CountingCollection:
+    """Proxy that counts the records sent to a real collection."""
+
+    def __init__(self, collection, failures: int = 0):
+        self.collection = collection
+        self.failures = failures
+        self.upserted = 0
+        self.deletes = []
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def upsert(self, ids, **kwargs):
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("server busy")
+        self.upserted += len(ids)
+        self.collection.upsert(ids=ids, **kwargs)
+
+    def delete(self, ids):
+        self.deletes.append(len(ids))
+        self.collection.delete(ids=ids)
+
+
+def make_collection(path, name="docs"):
+    client = chromadb.PersistentClient(path=str(path), settings=Settings(anonymized_telemetry=False))
+    return CountingCollection(client.get_or_create_collection(name))
+
+
+def records(n=200, changed=()):
+    ids = [f"doc_{i}" for i in range(n)]
+    documents = [f"document {i}" + (" (revised)" if i in changed else "") for i in range(n)]
+    metadatas = [{"year": 2020 + i % 3, "updated_at": f"run-{len(changed)}"} for i in range(n)]
+    embeddings = [[float(i), float(i in changed), 1.0] for i in range(n)]
+    return ids, documents, metadatas, embeddings
+
+
+def make_upserter(collection, tmp_path, **kwargs):
+    upserter = BulkUpserter(collection=lambda: collection, max_retries=0, backoff_base_secs=0)
+    return IncrementalUpserter(collection=lambda: collection, manifest_dir=tmp_path / "manifests",
+                               upserter=upserter, **kwargs)
+
+
+class TestDiff:
+    """Test that only new and changed records are sent."""
+
+    def test_refresh_sends_only_changes(self, tmp_path):
+        """A rerun sends nothing; a 1% change sends 1% of the records."""
+        collection = make_collection(tmp_path / "db")
+        incremental = make_upserter(collection, tmp_path)
+        ids, documents, metadatas, embeddings = records()
+
+        first = incremental.run(ids, documents, metadatas, embeddings)
+        assert first["new"] == 200 and collection.upserted == 200
+
+        again = incremental.run(ids, documents, metadatas, embeddings)
+        assert again["unchanged"] == 200 and again["upserted"] == 0 and collection.upserted == 200
+
+        ids, documents, metadatas, embeddings = records(changed={3, 150})
+        refresh = incremental.run(ids, documents, metadatas, embeddings)
+        assert refresh["changed"] == 2 and refresh["unchanged"] == 198 and collection.upserted == 202
+        got = collection.get(ids=["doc_150"], include=["documents", "embeddings"])
+        assert got["documents"] == ["document 150 (revised)"] and list(got["embeddings"][0]) == [150.0, 1.0, 1.0]
+
+    def test_checksum_ignores_timestamps(self):
+        assert record_checksum("text", {"a": 1, "updated_at": "x"}) == record_checksum("text", {"a": 1})
+        assert record_checksum("text", {"a": 1}) != record_checksum("text", {"a": 2})
+
+    def test_failed_batch_retried_next_run(self, tmp_path):
+        """Records in a failed batch are not recorded as loaded."""
+        collection = make_collection(tmp_path / "db")
+        incremental = make_upserter(collection, tmp_path)
+        ids, documents, metadatas, embeddings = records(n=20)
+
+        collection.failures = 1
+        report = incremental.run(ids, documents, metadatas, embeddings)
+        assert report["failed"] == 20 and report["errors"]
+
+        report = incremental.run(ids, documents, metadatas, embeddings)
+        assert report["new"] == 20 and report["upserted"] == 20 and collection.count() == 20
+
+
+class TestPrune:
+    """Test deletion of records that disappeared from the source."""
+
+    def test_vanished_records_deleted_in_batches(self, tmp_path):
+        collection = make_collection(tmp_path / "db")
+        incremental = make_upserter(collection, tmp_path, delete_batch_size=4)
+        ids, documents, metadatas, embeddings = records(n=30)
+        incremental.run(ids, documents, metadatas, embeddings)
+
+        report = incremental.run(ids[:20], documents[:20], metadatas[:20], embeddings[:20], prune=True)
+        assert report["deleted"] == 10 and collection.deletes == [4, 4, 2]
+        assert collection.count() == 20 and len(incremental.manifest()) == 20
+
+    def test_partial_load_without_source_keeps_records(self, tmp_path):
+        """A load with no source deletes nothing unless pruning is asked for."""
+        collection = make_collection(tmp_path / "db")
+        incremental = make_upserter(collection, tmp_path)
+        ids, documents, metadatas, embeddings = records(n=30)
+        incremental.run(ids, documents, metadatas, embeddings)
+
+        report = incremental.run(ids[:5], documents[:5], metadatas[:5], embeddings[:5])
+        assert report["deleted"] == 0 and collection.deletes == []
+        assert collection.count() == 30 and len(incremental.manifest()) == 30
+
+    def test_prune_limited_to_source(self, tmp_path):
+        """Loading one source never deletes records that came from another."""
+        collection = make_collection(tmp_path / "db")
+        incremental = make_upserter(collection, tmp_path)
+        ids, documents, metadatas, embeddings = records(n=20)
+        incremental.run(ids[:10], documents[:10], metadatas[:10], embeddings[:10], source="a.json")
+        incremental.run(ids[10:], documents[10:], metadatas[10:], embeddings[10:], source="b.json")
+
+        report = incremental.run(ids[:5], documents[:5], metadatas[:5], embeddings[:5], source="a.json")
+        assert report["deleted"] == 5 and collection.count() == 15
+        assert collection.get(ids=["doc_7", "doc_12"])["ids"] == ["doc_12"]
+
+
+class TestManifest:
+    """Test manifest persistence and rebuilding."""
+
+    def test_built_from_existing_collection(self, tmp_path):
+        """A collection loaded before manifests existed is not resent."""
+        collection = make_collection(tmp_path / "db")
+        ids, documents, metadatas, embeddings = records(n=50)
+        collection.upsert(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+
+        report = make_upserter(collection, tmp_path).run(ids, documents, metadatas, embeddings)
+        assert report["unchanged"] == 50 and collection.upserted == 50
+
+        manifest = ChecksumManifest.for_collection(collection, tmp_path / "manifests")
+        assert manifest.loaded and len(manifest) == 50
+
+    def test_rebuilt_after_outside_write(self, tmp_path):
+        """A manifest that disagrees with the collection is rebuilt, not trusted."""
+        collection = make_collection(tmp_path / "db")
+        incremental = make_upserter(collection, tmp_path)
+        ids, documents, metadatas, embeddings = records(n=10)
+        incremental.run(ids, documents, metadatas, embeddings)
+        collection.collection.delete(ids=["doc_4"])
+
+        report = incremental.run(ids, documents, metadatas, embeddings)
+        assert report["new"] == 1 and report["unchanged"] == 9 and collection.count() == 10
+
+    def test_rebuild_keeps_sources(self, tmp_path):
+        """After a rebuild, loading a source still deletes the records it dropped."""
+        collection = make_collection(tmp_path / "db")
+        incremental = make_upserter(collection, tmp_path)
+        ids, documents, metadatas, embeddings = records(n=20)
+        incremental.run(ids[:10], documents[:10], metadatas[:10], embeddings[:10], source="a.json")
+        incremental.run(ids[10:], documents[10:], metadatas[10:], embeddings[10:], source="b.json")
+        collection.collection.delete(ids=["doc_15"])
+
+        manifest = incremental.manifest()
+        assert len(manifest) == 19 and manifest.sources["doc_3"] == "a.json" and "doc_15" not in manifest.sources
+        report = incremental.run(ids[:5], documents[:5], metadatas[:5], embeddings[:5], source="a.json")
+        assert report["deleted"] == 5 and report["new"] == 0 and collection.count() == 14
+        assert collection.get(ids=["doc_7", "doc_12"])["ids"] == ["doc_12"]
+
+    @pytest.mark.parametrize("quantization", ["float32", "int8"])
+    def test_local_store(self, tmp_path, quantization):
+        """The local vector store takes the same incremental loads."""
+        client = LocalVectorClient(str(tmp_path / "local"), quantization=quantization)
+        collection = CountingCollection(client.create_collection("docs"))
+        incremental = make_upserter(collection, tmp_path)
+        ids, documents, metadatas, embeddings = records(n=40)
+        incremental.run(ids, documents, metadatas, embeddings)
+
+        ids, documents, metadatas, embeddings = records(n=39, changed={0})
+        report = incremental.run(ids, documents, metadatas, embeddings, prune=True)
+        assert report["upserted"] == 1 and report["deleted"] == 1 and collection.upserted == 41
+        assert client.get_collection("docs").count() == 39
@@ -0,0 +1,31 @@
+"""Tests for the Chroma directory fingerprint."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from index_version import IndexVersionTracker
+
+
+class TestIndexVersionTracker:
+    """Test change detection."""
+
+    def test_version_read_does_not_consume_change(self, tmp_path):
+        """Reading .version between a file change and refresh() leaves the change to refresh()."""
+        (tmp_path / "chroma.sqlite3").write_bytes(b"a")
+        tracker = IndexVersionTracker(str(tmp_path), check_interval=0)
+        old, changed = tracker.refresh()
+        assert not changed
+
+        (tmp_path / "chroma.sqlite3").write_bytes(b"ab")
+        assert tracker.version == old
+
+        new, changed = tracker.refresh()
+        assert changed and new != old
+        assert tracker.version == new and tracker.changes == 1
+
+    def test_first_read_fingerprints(self, tmp_path):
+        tracker = IndexVersionTracker(str(tmp_path))
+        assert tracker.version == tracker.compute()
+        assert tracker.refresh() == (tracker.version, False)
@@ -0,0 +1,98 @@
+"""Tests for the BM25 lexical index used by ProductionRAG hybrid retrieval."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from lexical_index import BM25Index, reciprocal_rank_fusion, dense_distance
+
+
+@pytest.fixture
+def index():
+    """Small index over policy-style documents."""
+    index = BM25Index()
+    index.add(
+        ["doc_0", "doc_1", "doc_2"],
+        [
+            "Daca | AB 540 - In-State Tuition for Undocumented Students",
+            "Daca | CA Dream Act | CADAA replaces FAFSA for AB 540 students",
+            "Transfer Credit | IGETC certification for UC transfer",
+        ]
+    )
+    return index
+
+
+class TestBM25Index:
+    """Test BM25 scoring and index maintenance."""
+
+    def test_exact_terms_rank_first(self, index):
+        """Documents containing the rare query terms rank first."""
+        hits = index.search("IGETC")
+        assert [doc_id for doc_id, _ in hits] == ["doc_2"]
+
+        hits = index.search("CADAA deadline")
+        assert hits[0][0] == "doc_1"
+
+    def test_unknown_terms_return_nothing(self, index):
+        """Queries with no indexed terms have no hits."""
+        assert index.search("the of and") == []
+        assert index.search("zzz") == []
+
+    def test_incremental_add_and_replace(self, index):
+        """Added documents become searchable; re-adding an id replaces it."""
+        index.add(["doc_3"], ["DS25 dual enrollment credit"])
+        assert index.search("DS25")[0][0] == "doc_3"
+
+        index.add(["doc_2"], ["Residency | military dependents"])
+        assert index.search("IGETC") == []
+        assert len(index) == 4
+
+    def test_remove(self, index):
+        """Removed documents are no longer returned."""
+        index.remove(["doc_0"])
+        assert "doc_0" not in [doc_id for doc_id, _ in index.search("AB 540")]
+
+    def test_top_k(self, index):
+        """Search returns at most k hits, best first."""
+        hits = index.search("AB 540 students", k=1)
+        assert len(hits) == 1
+
+        hits = index.search("AB 540 students")
+        scores = [score for _, score in hits]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_search_within_doc_ids(self, index):
+        """A restricted search scores only the given documents and matches the filtered full ranking."""
+        full = index.search("AB 540 students", k=len(index))
+        subset = {doc_id for doc_id, _ in full[1:]} | {"missing"}
+        assert index.search("AB 540 students", k=len(index), doc_ids=subset) == full[1:]
+        assert index.search("AB 540 students", k=1, doc_ids=subset) == full[1:2]
+        assert index.search("AB 540 students", doc_ids=set()) == []
+
+    def test_save_and_load(self, index, tmp_path):
+        """A saved index answers queries identically after loading."""
+        path = tmp_path / "lexical" / "aid_policies.npz"
+        index.version = "3f2a9c"
+        index.save(str(path))
+        loaded = BM25Index.load(str(path))
+
+        assert len(loaded) == len(index) and loaded.version == "3f2a9c"
+        assert loaded.search("AB 540 CADAA") == index.search("AB 540 CADAA")
+
+
+class TestFusion:
+    """Test rank fusion helpers."""
+
+    def test_reciprocal_rank_fusion(self):
+        """Items ranked well in both lists win."""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+        assert max(fused, key=fused.get) == "b"
+        assert fused["a"] == pytest.approx(1 / 61)
+
+    def test_dense_distance_l2(self):
+        """L2 distance matches Chroma's squared euclidean distance."""
+        assert dense_distance([0.0, 1.0], [1.0, 0.0]) == pytest.approx(2.0)
+        assert dense_distance([1.0, 0.0], [1.0, 0.0], space="cosine") == pytest.approx(0.0)
@@ -0,0 +1,185 @@
+"""Tests for the embedded memory-mapped vector store."""
+
+import chromadb
+import numpy as np
+import pytest
+from chromadb.config import Settings
+
+from college_advisor_data.storage.local_vector_store import (
+    CollectionNotFoundError, LocalVectorClient, build_from_chroma
+)
+
+
+def make_rows(n=200, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    ids = [f"doc_{i}" for i in range(n)]
+    metadatas = [{"entity_type": "program" if i % 2 else "college", "year": 2020 + i % 4} for i in range(n)]
+    documents = [f"document {i}" for i in range(n)]
+    return ids, vectors, metadatas, documents
+
+
+class TestQueries:
+    """Test exact search and filters against brute force."""
+
+    @pytest.mark.parametrize("space", ["l2", "cosine", "ip"])
+    def test_matches_brute_force(self, tmp_path, space):
+        """Top-k ids and distances follow Chroma's definition for each space."""
+        ids, vectors, metadatas, documents = make_rows()
+        collection = LocalVectorClient(str(tmp_path)).create_collection("docs", metadata={"hnsw:space": space})
+        collection.upsert(ids=ids, embeddings=vectors, metadatas=metadatas, documents=documents)
+        query = vectors[:3] + 0.05
+
+        if space == "l2":
+            expected = ((query[:, None, :] - vectors[None, :, :]) ** 2).sum(axis=2)
+        elif space == "cosine":
+            expected = 1 - (query @ vectors.T) / (
+                np.linalg.norm(query, axis=1)[:, None] * np.linalg.norm(vectors, axis=1)[None, :])
+        else:
+            expected = 1 - query @ vectors.T
+
+        result = collection.query(query_embeddings=query, n_results=5)
+        for row, (got_ids, got_distances) in enumerate(zip(result["ids"], result["distances"])):
+            order = np.argsort(expected[row])[:5]
+            assert got_ids == [ids[i] for i in order]
+            np.testing.assert_allclose(got_distances, expected[row][order], rtol=1e-4, atol=1e-4)
+        assert result["metadatas"][0][0] == metadatas[int(np.argsort(expected[0])[0])]
+
+    def test_filters(self, tmp_path):
+        """Metadata and document filters restrict the candidates."""
+        ids, vectors, metadatas, documents = make_rows()
+        collection = LocalVectorClient(str(tmp_path)).create_collection("docs")
+        collection.upsert(ids=ids, embeddings=vectors, metadatas=metadatas, documents=documents)
+
+        where = {"$and": [{"entity_type": "college"}, {"year": {"$in": [2020, 2021]}}]}
+        result = collection.query(query_embeddings=vectors[:1], n_results=100, where=where)
+        assert len(result["ids"][0]) == 50
+        assert all(m["entity_type"] == "college" and m["year"] == 2020 for m in result["metadatas"][0])
+
+        assert collection.get(where={"year": {"$gte": 2022}}, include=[])["ids"][:2] == ["doc_2", "doc_3"]
+        assert collection.get(where_document={"$contains": "document 19"})["ids"] == ["doc_19"] + [
+            f"doc_{i}" for i in range(190, 200)]
+        page = collection.get(limit=10, offset=195, include=["metadatas"])
+        assert page["ids"] == [f"doc_{i}" for i in range(195, 200)] and page["documents"] is None
+
+
+class TestWrites:
+    """Test generations, reloads and the Chroma-compatible client surface."""
+
+    def test_upsert_delete_and_reload(self, tmp_path):
+        """Writes publish a new generation that another client picks up."""
+        ids, vectors, metadatas, documents = make_rows(n=20)
+        writer = LocalVectorClient(str(tmp_path)).create_collection("docs")
+        writer.upsert(ids=ids, embeddings=vectors, metadatas=metadatas, documents=documents)
+
+        reader = LocalVectorClient(str(tmp_path)).get_collection("docs")
+        assert reader.count() == 20
+
+        writer.upsert(ids=["doc_0", "new"], embeddings=vectors[:2] * 2, documents=["changed", "added"])
+        writer.delete(where={"entity_type": "program"})
+        assert reader.count() == 11
+        got = reader.get(ids=["doc_0", "new", "doc_1"], include=["documents", "metadatas", "embeddings"])
+        assert got["ids"] == ["doc_0", "new"]
+        assert got["documents"] == ["changed", "added"]
+        assert got["metadatas"][0] == metadatas[0]
+        np.testing.assert_allclose(got["embeddings"][0], vectors[0] * 2)
+
+        generations = sorted(p.name for p in (tmp_path / "docs").glob("vectors.*.f32"))
+        assert generations == ["vectors.2.f32", "vectors.3.f32"]
+
+    def test_add_keeps_existing_records(self, tmp_path):
+        """add() skips ids already stored instead of overwriting them, as Chroma does."""
+        collection = LocalVectorClient(str(tmp_path)).create_collection("docs")
+        collection.add(ids=["a"], embeddings=[[1.0, 0.0]], documents=["old"])
+        collection.add(ids=["a", "b"], embeddings=[[0.0, 1.0], [1.0, 1.0]], documents=["new", "added"])
+        got = collection.get(ids=["a", "b"], include=["documents", "embeddings"])
+        assert got["documents"] == ["old", "added"]
+        np.testing.assert_allclose(got["embeddings"][0], [1.0, 0.0])
+
+    def test_mismatched_lengths_rejected(self, tmp_path):
+        """Writes whose fields do not line up with the ids fail before touching the store."""
+        collection = LocalVectorClient(str(tmp_path)).create_collection("docs")
+        with pytest.raises(ValueError, match="embeddings"):
+            collection.upsert(ids=["a", "b"], embeddings=[[1.0, 0.0]])
+        with pytest.raises(ValueError, match="documents"):
+            collection.add(ids=["a"], embeddings=[[1.0, 0.0]], documents=["x", "y"])
+        assert collection.count() == 0
+
+    def test_client_surface(self, tmp_path):
+        """Missing collections raise, metadata can be modified, collections can be dropped."""
+        client = LocalVectorClient(str(tmp_path))
+        with pytest.raises(CollectionNotFoundError):
+            client.get_collection("missing")
+
+        collection = client.get_or_create_collection("docs", metadata={"schema_version": "1.0"})
+        assert client.get_or_create_collection("docs") is collection
+        collection.modify(metadata={"schema_version": "1.0", "data_version": "abc"})
+        assert LocalVectorClient(str(tmp_path)).get_collection("docs").metadata["data_version"] == "abc"
+        assert [c.name for c in client.list_collections()] == ["docs"]
+
+        client.delete_collection("docs")
+        assert client.list_collections() == []
+
+
+class TestIVF:
+    """Test the inverted-file index on clustered data."""
+
+    def test_recall_against_exact(self, tmp_path):
+        """Probing a few lists finds nearly all of the exact neighbours."""
+        rng = np.random.default_rng(1)
+        centers = rng.normal(size=(20, 16)) * 5
+        vectors = (centers[rng.integers(0, 20, 4000)] + rng.normal(size=(4000, 16))).astype(np.float32)
+        ids = [f"v{i}" for i in range(len(vectors))]
+
+        exact = LocalVectorClient(str(tmp_path / "exact")).create_collection("docs")
+        exact.upsert(ids=ids, embeddings=vectors)
+        ivf = LocalVectorClient(str(tmp_path / "ivf"), ivf_lists=32, ivf_probes=6, ivf_min_rows=1000)
+        approx = ivf.create_collection("docs")
+        approx.upsert(ids=ids, embeddings=vectors)
+        assert (tmp_path / "ivf" / "docs" / "ivf.1.npz").exists()
+
+        queries = vectors[:50] + 0.1
+        truth = exact.query(query_embeddings=queries, n_results=10)["ids"]
+        found = approx.query(query_embeddings=queries, n_results=10)["ids"]
+        recall = np.mean([len(set(t) & set(f)) / 10 for t, f in zip(truth, found)])
+        assert recall >= 0.9
+
+
+class TestQuantization:
+    """Test the reduced-precision search copy."""
+
+    @pytest.mark.parametrize("mode, suffix", [("int8", "i8"), ("float16", "f16")])
+    def test_rescored_results_match_exact(self, tmp_path, mode, suffix):
+        """Quantized scoring plus float32 rescoring returns the exact top-k and distances."""
+        ids, vectors, metadatas, documents = make_rows(n=500, dim=32)
+        exact = LocalVectorClient(str(tmp_path / "exact")).create_collection("docs")
+        exact.upsert(ids=ids, embeddings=vectors, metadatas=metadatas)
+        quantized = LocalVectorClient(str(tmp_path / mode), quantization=mode).create_collection("docs")
+        quantized.upsert(ids=ids, embeddings=vectors, metadatas=metadatas)
+        assert (tmp_path / mode / "docs" / f"codes.1.{suffix}").exists()
+
+        queries = vectors[:20] + 0.3
+        for where in (None, {"entity_type": "college"}):
+            expected = exact.query(query_embeddings=queries, n_results=10, where=where)
+            got = quantized.query(query_embeddings=queries, n_results=10, where=where)
+            assert got["ids"] == expected["ids"]
+            np.testing.assert_allclose(got["distances"], expected["distances"], rtol=1e-5)
+
+
+def test_build_from_chroma(tmp_path):
+    """A copied Chroma collection answers queries like the original."""
+    ids, vectors, metadatas, documents = make_rows(n=300)
+    chroma = chromadb.PersistentClient(path=str(tmp_path / "chroma"), settings=Settings(anonymized_telemetry=False))
+    source = chroma.create_collection("docs", metadata={"schema_version": "1.0"})
+    source.add(ids=ids, embeddings=vectors.tolist(), metadatas=metadatas, documents=documents)
+
+    local = build_from_chroma(source, LocalVectorClient(str(tmp_path / "local")), page_size=64)
+    assert local.count() == 300
+    assert local.metadata["schema_version"] == "1.0"
+
+    query = (vectors[:5] + 0.01).tolist()
+    expected = source.query(query_embeddings=query, n_results=3, where={"entity_type": "college"})
+    got = local.query(query_embeddings=query, n_results=3, where={"entity_type": "college"})
+    assert got["ids"] == expected["ids"]
+    np.testing.assert_allclose(got["distances"], expected["distances"], rtol=1e-3)
+    assert got["documents"] == expected["documents"]
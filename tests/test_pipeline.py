@@ -277,7 +277,7 @@ class TestEmbeddingService:
 class TestIntegration:
     """Integration tests for the complete pipeline."""
     
-    @patch('college_advisor_data.storage.chroma_client.chromadb')
+    @patch('college_advisor_data.storage.client_registry.chromadb')
     @patch('college_advisor_data.embedding.sentence_transformer_embedder.SentenceTransformer')
     def test_complete_pipeline(self, mock_st, mock_chromadb, temp_csv_file):
         """Test complete pipeline from CSV to ChromaDB."""
@@ -0,0 +1,289 @@
+"""Tests for ProductionRAG request handling over a small on-disk Chroma index."""
+
+import asyncio
+import hashlib
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import chromadb
+import pytest
+from chromadb.config import Settings
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from production_rag import ProductionRAG
+from query_embedder import QueryEmbedder
+from rag_types import RetrievalContext
+
+SCHOOLS = [("Stanford University", 243744), ("Purdue University", 243780), ("Ohio State University", 204796)]
+
+
+def vector(text):
+    return [b / 255.0 for b in hashlib.sha256(text.lower().encode("utf-8")).digest()[:8]]
+
+
+class HashEmbedder:
+    """Canonical-embedder stand-in matching the vectors the fixture index was built with."""
+
+    def embed_texts(self, texts):
+        return [vector(text) for text in texts]
+
+
+class StubCollection:
+    """Collection proxy that can delay queries, counts count() calls and records query threads."""
+
+    def __init__(self, collection, delay=0.0):
+        self.collection = collection
+        self.delay = delay
+        self.counts = 0
+        self.threads = []
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def count(self):
+        self.counts += 1
+        return self.collection.count()
+
+    def query(self, **kwargs):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        return self.collection.query(**kwargs)
+
+
+def build_index(path):
+    client = chromadb.PersistentClient(path=str(path), settings=Settings(anonymized_telemetry=False))
+    for name, topic in [("aid_policies", "financial aid"), ("major_gates", "major admission"),
+                        ("cds_data", "admissions data")]:
+        collection = client.create_collection(name, embedding_function=None)
+        documents, metadatas = [], []
+        for i in range(12):
+            school, unitid = SCHOOLS[i % 3]
+            documents.append(f"{school} {topic} policy {i}: grant aid and scholarships for students")
+            metadatas.append({
+                "school_name": school,
+                "ipeds_id": str(unitid),
+                "policy_topic": topic,
+                "rule": documents[-1],
+                "citations": json.dumps([f"https://{name}.example.edu/policy/{i}"]),
+                "last_verified": "2025-01-15",
+            })
+        collection.add(ids=[f"{name}-{i}" for i in range(12)], documents=documents, metadatas=metadatas,
+                       embeddings=[vector(d) for d in documents])
+
+
+def make_rag(path, **kwargs):
+    options = dict(training_data_dir=None, answer_cache_size=0, semantic_cache_size=0)
+    options.update(kwargs)
+    rag = ProductionRAG(db_path=str(path), **options)
+    rag.query_embedder = QueryEmbedder(embedder=HashEmbedder())
+    return rag
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    build_index(tmp_path / "db")
+    return tmp_path / "db"
+
+
+class TestFanOut:
+    """Test the shared-deadline collection fan-out and the index version."""
+
+    QUESTION = "What grant aid and scholarships are there for students?"
+
+    def test_slow_collection_dropped_at_deadline(self, db_path):
+        """Collections that answer in time still contribute when one misses the deadline."""
+        rag = make_rag(db_path, collection_timeout=0.3)
+        rag.collections["cds_data"] = StubCollection(rag.collections["cds_data"], delay=1.5)
+        ctx = RetrievalContext(question=self.QUESTION)
+
+        started = time.perf_counter()
+        results = rag.retrieve(self.QUESTION, retrieval_ctx=ctx)
+        assert time.perf_counter() - started < 1.0
+        assert ctx.timed_out == ["cds_data"]
+        assert results and {r.collection for r in results} <= {"aid_policies", "major_gates"}
+        assert rag.fanout_stats["cds_data"]["timeouts"] == 1
+
+    def test_counts_cached_across_requests(self, db_path):
+        """count() runs once per collection per index version, not per request."""
+        rag = make_rag(db_path, index_check_interval=3600)
+        stubs = {name: StubCollection(collection) for name, collection in rag.collections.items()}
+        rag.collections = dict(stubs)
+        rag._collection_counts.clear()
+
+        for _ in range(3):
+            assert rag.retrieve(self.QUESTION)
+        assert {name: stub.counts for name, stub in stubs.items()} == {name: 1 for name in stubs}
+
+    def test_version_changes_with_files(self, db_path):
+        """A file changing under db_path bumps the index version and drops the cached counts."""
+        rag = make_rag(db_path, index_check_interval=0)
+        before = rag.index_version
+        rag.retrieve(self.QUESTION)
+        assert rag.index_version == before
+
+        (db_path / "segment.bin").write_bytes(b"new segment")
+        rag._collection_counts["aid_policies"] = -1
+        rag.retrieve(self.QUESTION)
+        assert rag.index_version != before
+        assert rag._collection_counts["aid_policies"] == 12
+
+
+class TestSingleRetrieval:
+    """Test that one request runs the collection fan-out once."""
+
+    QUESTION = "What is the best strategy for paying for Stanford University?"
+
+    def test_stages_share_one_retrieval(self, tmp_path):
+        """Synthesis, entity validation and composition all read the same retrieval."""
+        client = chromadb.PersistentClient(path=str(tmp_path / "db"), settings=Settings(anonymized_telemetry=False))
+        client.create_collection("aid_policies", embedding_function=None).add(
+            ids=["plan"], documents=[self.QUESTION], embeddings=[vector(self.QUESTION)],
+            metadatas=[{"school_name": "Stanford University", "ipeds_id": "243744", "policy_topic": "payment plans",
+                        "rule": "Tuition can be paid in monthly installments.",
+                        "citations": json.dumps(["https://financialaid.stanford.edu/plans"]),
+                        "last_verified": "2025-01-15"}]
+        )
+        rag = make_rag(tmp_path / "db")
+        calls = {"retrieve": 0, "_retrieve_once": 0}
+        for name in calls:
+            def spy(*args, _name=name, _method=getattr(rag, name), **kwargs):
+                calls[_name] += 1
+                return _method(*args, **kwargs)
+            setattr(rag, name, spy)
+
+        result = rag.query(self.QUESTION)
+        assert not result.should_abstain
+        assert "Tuition can be paid in monthly installments." in result.answer
+        # Synthesis (nothing to synthesize from one record) and entity validation each ask
+        assert calls == {"retrieve": 1, "_retrieve_once": 2}
+        stats = result.retrieval_stats
+        assert stats["retrievals_run"] == 1 and stats["retrievals_avoided"] == 1
+        assert stats["synthesis_runs"] == 1 and stats["synthesis_avoided"] == 1
+
+
+class TestQueryBatch:
+    """Test batched answering against per-question query()."""
+
+    QUESTIONS = [
+        "What grant aid and scholarships are there for students?",
+        "Purdue University major admission policy",
+        "Compare financial aid at Stanford University vs Ohio State University",
+        "admissions data for Ohio State University students",
+    ]
+
+    def test_matches_query(self, db_path):
+        """Each batched answer equals the answer query() gives for the same question."""
+        rag = make_rag(db_path)
+        batch = rag.query_batch(self.QUESTIONS)
+        assert [answer.question for answer in batch] == self.QUESTIONS
+        for question, answer in zip(self.QUESTIONS, batch):
+            assert answer.ok
+            single = rag.query(question)
+            assert answer.result.answer == single.answer
+            assert [c.url for c in answer.result.citations] == [c.url for c in single.citations]
+            assert answer.result.should_abstain == single.should_abstain
+            assert answer.result.retrieval_stats["retrievals_run"] == 1
+
+    def test_duplicates_answered_once(self, db_path):
+        """Repeated questions share one pipeline run and come back in input order."""
+        rag = make_rag(db_path)
+        runs = []
+        run_pipeline = rag._run_pipeline
+
+        def counting(question, *args):
+            runs.append(question)
+            return run_pipeline(question, *args)
+
+        rag._run_pipeline = counting
+        questions = [self.QUESTIONS[0], self.QUESTIONS[1], self.QUESTIONS[0].upper(), self.QUESTIONS[0]]
+        batch = rag.query_batch(questions)
+        assert sorted(runs) == sorted(self.QUESTIONS[:2])
+        assert [answer.question for answer in batch] == questions
+        assert batch[0].result is batch[2].result is batch[3].result
+        assert batch[1].result is not batch[0].result
+
+    def test_failure_isolated(self, db_path):
+        """A question that raises gets its error; the rest of the batch is answered."""
+        rag = make_rag(db_path)
+        run_pipeline = rag._run_pipeline
+
+        def failing(question, *args):
+            if question == self.QUESTIONS[1]:
+                raise RuntimeError("handler crashed")
+            return run_pipeline(question, *args)
+
+        rag._run_pipeline = failing
+        batch = rag.query_batch(self.QUESTIONS[:3])
+        assert batch[1].result is None and batch[1].error == "RuntimeError: handler crashed"
+        assert batch[0].ok and batch[2].ok
+        assert batch[0].result.answer == rag.query(self.QUESTIONS[0]).answer
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Default-executor stand-in that records what is submitted to it."""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append(fn)
+        return super().submit(fn, *args, **kwargs)
+
+
+class TestAsyncQuery:
+    """Test aquery() against query()."""
+
+    QUESTIONS = TestQueryBatch.QUESTIONS
+
+    @staticmethod
+    def run(rag, question, **kwargs):
+        """aquery() on a fresh loop whose default executor records submissions"""
+        default = RecordingExecutor()
+
+        async def main():
+            asyncio.get_running_loop().set_default_executor(default)
+            return await rag.aquery(question, **kwargs)
+
+        return asyncio.run(main()), default.submitted
+
+    @pytest.mark.parametrize("expected_format", [None, "table", "json"])
+    def test_matches_query(self, db_path, expected_format):
+        """aquery returns the AnswerResult query returns, off the loop's default executor."""
+        rag = make_rag(db_path)
+        stubs = {name: StubCollection(collection) for name, collection in rag.collections.items()}
+        rag.collections = dict(stubs)
+        for question in self.QUESTIONS:
+            expected = rag.query(question, expected_format=expected_format)
+            for stub in stubs.values():
+                stub.threads.clear()
+
+            result, submitted = self.run(rag, question, expected_format=expected_format)
+            assert submitted == []
+            assert result.answer == expected.answer
+            assert [c.url for c in result.citations] == [c.url for c in expected.citations]
+            assert (result.should_abstain, result.schema_valid, result.citation_coverage) == (
+                expected.should_abstain, expected.schema_valid, expected.citation_coverage
+            )
+            # Fan-out and handler partition searches alike run on the I/O executor
+            threads = {thread for stub in stubs.values() for thread in stub.threads}
+            assert threads and all(thread.startswith("rag-async-io") for thread in threads)
+
+    def test_slow_collection_cut_off(self, db_path):
+        """A collection slower than the deadline is dropped and the answer built without it."""
+        rag = make_rag(db_path, collection_timeout=0.3)
+        rag.collections["cds_data"] = StubCollection(rag.collections["cds_data"], delay=1.5)
+
+        started = time.perf_counter()
+        result, submitted = self.run(rag, self.QUESTIONS[0])
+        assert time.perf_counter() - started < 1.0
+        assert submitted == []
+        assert result.retrieval_stats["timed_out"] == ["cds_data"]
+        assert not result.should_abstain
+        assert all("cds_data" not in c.url for c in result.citations)
+
@@ -0,0 +1,92 @@
+"""Tests for reduced-precision embedding storage."""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from college_advisor_data.embedding.embedder import BaseEmbedder
+from college_advisor_data.quantization import (
+    ScalarQuantizer, check_mode, decode_vector, encode_vector, measure_recall
+)
+
+
+def unit_vectors(n=500, dim=384, seed=0):
+    """MiniLM-like vectors: unit length, clustered."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(10, dim))
+    vectors = centers[rng.integers(0, 10, n)] + rng.normal(size=(n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+class FakeEmbedder(BaseEmbedder):
+    """Deterministic embedder for cache tests."""
+
+    def embed_texts(self, texts):
+        return [self.embed_single(text) for text in texts]
+
+    def embed_single(self, text):
+        rng = np.random.default_rng(len(text))
+        return (rng.normal(size=8) / 3).tolist()
+
+    @property
+    def embedding_dimension(self):
+        return 8
+
+
+class TestEncodings:
+    """Test the single-vector payloads and the matrix quantizer."""
+
+    @pytest.mark.parametrize("mode, tolerance", [("float16", 1e-3), ("int8", 1e-2)])
+    def test_vector_round_trip(self, mode, tolerance):
+        """Encoded payloads decode back within the mode's precision."""
+        vector = unit_vectors(n=1)[0]
+        payload = encode_vector(vector, mode)
+        assert payload["dtype"] == mode and payload["dim"] == 384
+        np.testing.assert_allclose(decode_vector(payload), vector, atol=tolerance)
+        assert decode_vector(encode_vector(vector, "float32")) == pytest.approx(vector.tolist())
+
+    def test_scalar_quantizer(self):
+        """Per-dimension int8 codes reconstruct within half a level and score dot products."""
+        vectors = unit_vectors()
+        quantizer = ScalarQuantizer.fit(vectors)
+        codes = quantizer.encode(vectors)
+        assert codes.dtype == np.int8 and codes.nbytes == vectors.nbytes // 4
+        assert np.all(np.abs(quantizer.decode(codes) - vectors) <= quantizer.scale / 2 + 1e-6)
+        queries = vectors[:3]
+        np.testing.assert_allclose(quantizer.dots(queries, codes), queries @ quantizer.decode(codes).T, atol=1e-4)
+
+    def test_mode_names(self):
+        assert check_mode("none") == "float32" and check_mode("fp16") == "float16"
+        with pytest.raises(ValueError):
+            check_mode("int4")
+
+
+class TestRecall:
+    """Test recall@k measurement against full precision."""
+
+    @pytest.mark.parametrize("space", ["l2", "cosine"])
+    def test_rescoring_recovers_recall(self, space):
+        """Rescored int8 search keeps recall@10 at the float32 level."""
+        vectors = unit_vectors()
+        queries = unit_vectors(n=40, seed=1)
+        report = measure_recall(vectors, queries, k=10, mode="int8", space=space, rescore_factor=4)
+        assert report["bytes_per_vector"] * 4 == report["float32_bytes_per_vector"]
+        assert report["recall"] >= 0.8
+        assert report["recall_rescored"] >= report["recall"]
+        assert report["recall_rescored"] >= 0.99
+
+
+def test_embedding_cache_storage(tmp_path):
+    """Reduced-precision cache entries are smaller and load as float lists."""
+    full = FakeEmbedder("fake", cache_dir=tmp_path / "f32", storage="float32")
+    half = FakeEmbedder("fake", cache_dir=tmp_path / "f16", storage="float16")
+    expected = full.embed_with_cache("some text", "chunk-1").embedding
+    half.embed_with_cache("some text", "chunk-1")
+
+    cached = FakeEmbedder("fake", cache_dir=tmp_path / "f16", storage="float16")._load_from_cache("chunk-1")
+    assert cached.model_name == "fake" and cached.embedding_dim == 8
+    np.testing.assert_allclose(cached.embedding, expected, atol=1e-3)
+
+    with open(half._get_cache_path("chunk-1"), "rb") as f:
+        assert isinstance(pickle.load(f), dict)
@@ -0,0 +1,109 @@
+"""Tests for the shared query embedder and its vector cache."""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import chromadb
+from chromadb.api.types import EmbeddingFunction
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from query_embedder import QueryEmbedder
+
+
+class HashEmbeddingFunction(EmbeddingFunction):
+    """Deterministic, case-sensitive stand-in for the collection's embedding model."""
+
+    def __init__(self):
+        pass
+
+    def __call__(self, input):
+        return [[b / 255.0 for b in hashlib.sha256(text.encode("utf-8")).digest()[:8]] for text in input]
+
+    @staticmethod
+    def name() -> str:
+        return "hash"
+
+    def get_config(self):
+        return {}
+
+    @staticmethod
+    def build_from_config(config):
+        return HashEmbeddingFunction()
+
+
+class RecordingEmbedder:
+    """Canonical-embedder stand-in that records every encoder call."""
+
+    def __init__(self):
+        self.function = HashEmbeddingFunction()
+        self.calls = []
+
+    def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        return [[float(x) for x in vector] for vector in self.function(texts)]
+
+
+class TestCache:
+    """Test LRU hits, eviction and batching."""
+
+    def test_normalized_repeats_hit(self):
+        """Case, spacing and trailing punctuation share one cache entry."""
+        encoder = RecordingEmbedder()
+        embedder = QueryEmbedder(embedder=encoder)
+        first = embedder.embed("What is MIT's CS admission rate?")
+        assert embedder.embed("  what is mit's cs   admission rate") == first
+        assert encoder.calls == [["What is MIT's CS admission rate?"]]
+        assert embedder.stats()["hits"] == 1 and embedder.stats()["misses"] == 1
+
+    def test_least_recently_used_evicted(self):
+        encoder = RecordingEmbedder()
+        embedder = QueryEmbedder(max_entries=2, embedder=encoder)
+        embedder.embed("a")
+        embedder.embed("b")
+        embedder.embed("a")
+        embedder.embed("c")  # evicts "b", the least recently used
+
+        embedder.embed("a")
+        embedder.embed("b")
+        assert encoder.calls == [["a"], ["b"], ["c"], ["b"]]
+        assert embedder.stats()["entries"] == 2
+
+    def test_embed_many_sends_distinct_misses_once(self):
+        """Cached and repeated queries are not re-encoded; results follow input order."""
+        encoder = RecordingEmbedder()
+        embedder = QueryEmbedder(embedder=encoder)
+        cached = embedder.embed("Stanford aid")
+
+        vectors = embedder.embed_many(["Purdue aid", "stanford aid", "Purdue aid?", "MIT aid"])
+        assert encoder.calls[1:] == [["Purdue aid", "MIT aid"]]
+        assert vectors[1] == cached and vectors[0] == vectors[2]
+        assert vectors[3] == embedder.embed("MIT aid")
+
+    def test_unavailable_embedder_returns_none(self):
+        embedder = QueryEmbedder()
+        embedder._available = False
+        assert embedder.embed_many(["a", "b"]) == [None, None]
+
+
+class TestCollectionAgreement:
+    """Test that query vectors are the ones Chroma would compute."""
+
+    def test_vectors_match_collection_embedding_function(self):
+        """The question is embedded as asked, so query_embeddings and query_texts agree."""
+        function = HashEmbeddingFunction()
+        collection = chromadb.EphemeralClient().get_or_create_collection(
+            "query_embedder_agreement", embedding_function=function
+        )
+        documents = ["Stanford need-blind aid", "MIT CS admission", "Purdue transfer credit"]
+        collection.add(ids=["s", "m", "p"], documents=documents)
+
+        embedder = QueryEmbedder(embedder=RecordingEmbedder())
+        question = "What is MIT's CS Admission rate?"
+        vector = embedder.embed(question)
+        assert vector == [float(x) for x in function([question])[0]]
+
+        by_vector = collection.query(query_embeddings=[vector], n_results=3)
+        by_text = collection.query(query_texts=[question], n_results=3)
+        assert by_vector["ids"] == by_text["ids"]
@@ -0,0 +1,81 @@
+"""Tests for the keyword router used by ProductionRAG synthesis and pre-validation."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from query_router import QueryRouter, TokenAutomaton, tokenize
+
+
+@pytest.fixture(scope="module")
+def router():
+    """Router compiled once for all tests."""
+    return QueryRouter()
+
+
+class TestTokenAutomaton:
+    """Test token-level multi-pattern matching."""
+
+    def test_overlapping_phrases(self):
+        """Every phrase is reported, including overlapping ones."""
+        automaton = TokenAutomaton()
+        automaton.add("foster care", "a")
+        automaton.add("extended foster", "a")
+        automaton.add("care", "b")
+        automaton.build()
+
+        matches = automaton.scan(tokenize("Extended foster care in California"))
+        assert {(label, phrase) for label, phrase, _, _ in matches} == {
+            ("a", "foster care"), ("a", "extended foster"), ("b", "care")
+        }
+
+    def test_plural_folding(self):
+        """Simple plurals share a key; 'ss' endings are left alone."""
+        assert tokenize("Athletes' costs") == ["athlete", "cost"]
+        assert tokenize("CSS class") == ["css", "class"]
+
+
+class TestQueryRouter:
+    """Test routing decisions."""
+
+    def test_keywords_match_whole_tokens(self, router):
+        """Keywords inside longer words no longer match."""
+        assert router.route("CADAA for undocumented students in Canada").priorities["disability"] == 0
+        assert router.route("Which year should I apply?").legal is False
+        assert router.route("Questions for the NCAA coach").tools == ()
+
+    def test_domain_priorities(self, router):
+        """The most specific domain wins; ties follow the synthesis order."""
+        assert router.route("CADAA for undocumented student").domain == "daca_undocumented"
+        assert router.route("ADA accommodations for a blind student").priorities["disability"] == 145
+        assert router.route("IB credit and A-level transfer credit").priorities["transfer_credit"] == 125
+        assert router.route("Gap year before BYU").domain == "mission_deferral"
+        assert router.route("Military dependent in-state residency").priorities["residency"] == 0
+        assert router.route("Budget for NYC vs Boston").domain == "coa_real_budget"
+        assert router.route("What is the weather like").domain is None
+
+    def test_financial_aid_context(self, router):
+        """CSS Profile questions are financial aid, not CS admissions."""
+        route = router.route("CSS Profile admission deadline")
+        assert route.priorities["cs_admissions"] == 0
+        assert route.domain == "financial_aid"
+
+    def test_pre_validation_flags(self, router):
+        """Legal, synthesis, subjectivity and temporal checks come from the same pass."""
+        assert router.route("Is OFAC compliance required?").legal
+        assert router.route("Compare UCLA vs Berkeley").needs_synthesis
+        assert router.route("Identify target schools in Ohio").needs_synthesis
+        assert router.route("Can you recommend a college for me?").subjective
+        assert router.route("Will tuition be higher?").future is False
+        assert router.route("What will be the cutoff?").future
+        assert QueryRouter.mentions_future_year("Admit rate in 2030")
+        assert not QueryRouter.mentions_future_year("Admit rate in 2024")
+
+    def test_tools(self, router):
+        """Calculator tools are detected from the same pass."""
+        assert router.route("FAFSA SAI and net price for Stanford").tools == (
+            "sai_calculator", "cost_calculator"
+        )
@@ -0,0 +1,142 @@
+"""Tests for the decoded record store used by ProductionRAG retrieval."""
+
+import sys
+from pathlib import Path
+
+import chromadb
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from record_store import RecordStore, citation_urls, decode_metadata, where_clause
+
+
+def _authority(url):
+    return 1.5 if ".gov" in url else 1.0
+
+
+class FakeCollection:
+    """Minimal paged collection.get()."""
+
+    def __init__(self, records):
+        self.records = records
+        self.calls = 0
+
+    def get(self, include, limit, offset):
+        self.calls += 1
+        page = self.records[offset:offset + limit]
+        return {"ids": [r[0] for r in page], "metadatas": [r[1] for r in page]}
+
+
+class TestDecoding:
+    """Test metadata decoding helpers."""
+
+    def test_json_lists_are_decoded(self):
+        """Only strings that look like JSON lists are parsed."""
+        data = decode_metadata({"a": '["x", "y"]', "b": "[not json", "c": "plain"})
+        assert data == {"a": ["x", "y"], "b": "[not json", "c": "plain"}
+
+    def test_citation_field_forms(self):
+        """JSON arrays, plain strings and lists are all accepted."""
+        assert citation_urls({"citations": '["https://a.gov"]'}) == ["https://a.gov"]
+        assert citation_urls({"citations": "https://b.edu"}) == ["https://b.edu"]
+        assert citation_urls({}) == []
+
+
+class TestRecordStore:
+    """Test preload and on-demand decoding."""
+
+    def test_preload_in_pages(self):
+        """Every record is decoded once, with authority scores attached."""
+        collection = FakeCollection([
+            (f"id{i}", {"citations": '["https://studentaid.gov"]', "last_verified": "2025-01-01"})
+            for i in range(5)
+        ])
+        store = RecordStore(_authority)
+        assert store.load_collection("aid_policies", collection, page_size=2) == 5
+        assert collection.calls == 3
+
+        record = store.record({}, "id3", "aid_policies")
+        assert record.data["citations"] == ["https://studentaid.gov"]
+        assert record.citations[0].authority_score == 1.5
+        assert record.citations[0].last_verified == "2025-01-01"
+        assert store.stats()["hits"] == 1
+        assert store.max_boost("aid_policies") == 1.5
+        assert store.max_boost("cds_data") is None
+
+    def test_unknown_records_are_added(self):
+        """Hits missing from the store are decoded and kept."""
+        store = RecordStore(_authority)
+        first = store.record({"citations": '["https://x.edu"]'}, "a", "cds_data")
+        assert store.record({}, "a", "cds_data") is first
+        assert store.stats() == {"records": 1, "partitions": 0, "urls": 1, "hits": 1, "misses": 1}
+
+        store.clear()
+        assert len(store) == 0
+
+    def test_partitions(self):
+        """Preloaded collections know which ids each record type / school holds."""
+        collection = FakeCollection([
+            ("a", {"_record_type": "foster", "ipeds_id": 1}),
+            ("b", {"_record_type": "foster", "ipeds_id": 2}),
+            ("c", {"_record_type": "ncaa", "ipeds_id": 1}),
+        ])
+        store = RecordStore(_authority)
+        assert store.partition("major_gates", {"_record_type": ["foster"]}) is None
+
+        store.load_collection("major_gates", collection)
+        assert store.partition("major_gates", {"_record_type": ["foster"]}) == {"a", "b"}
+        assert store.partition("major_gates", {"_record_type": ["foster", "ncaa"], "ipeds_id": [1]}) == {"a", "c"}
+        assert store.partition("major_gates", {"_record_type": ["bsmd"]}) == set()
+        assert store.partition("major_gates", {}) == {"a", "b", "c"}
+
+    def test_unitids_match_as_strings(self):
+        """Int and string UNITIDs in metadata both match string filters."""
+        collection = FakeCollection([
+            ("a", {"_record_type": "foster", "ipeds_id": 166683}),
+            ("b", {"_record_type": "foster", "ipeds_id": "166683"}),
+            ("c", {"_record_type": "ncaa", "ipeds_id": 243744}),
+        ])
+        store = RecordStore(_authority)
+        store.load_collection("major_gates", collection)
+        assert store.partition("major_gates", {"ipeds_id": ["166683"]}) == {"a", "b"}
+        assert store.partition("major_gates", {"ipeds_id": [243744]}) == {"c"}
+
+    def test_scope(self):
+        """Fields a collection lacks are dropped; a filter that would empty it is relaxed."""
+        store = RecordStore(_authority)
+        store.load_collection("major_gates", FakeCollection([
+            ("a", {"_record_type": "foster"}),
+            ("b", {"_record_type": "ncaa", "ipeds_id": 166683}),
+        ]))
+        store.load_collection("aid_policies", FakeCollection([("x", {"policy_topic": "aid"})]))
+
+        filters = {"_record_type": ["foster"], "ipeds_id": ["166683"]}
+        assert store.scope("major_gates", filters) == {"_record_type": ["foster"]}
+        assert store.scope("major_gates", {"ipeds_id": [166683]}) == {"ipeds_id": ["166683"]}
+        assert store.scope("major_gates", {"_record_type": ["bsmd"]}) is None
+        assert store.scope("aid_policies", filters) is None
+        assert store.scope("cds_data", filters) is None
+
+
+class TestWhereClause:
+    """Test the Chroma where clause built from partition filters."""
+
+    def test_shapes(self):
+        assert where_clause({"_record_type": ["foster"]}) == {"_record_type": "foster"}
+        assert where_clause({"_record_type": ["foster", "ncaa"]}) == {"_record_type": {"$in": ["foster", "ncaa"]}}
+        assert where_clause({}) is None
+
+    def test_int_unitids_in_chroma(self):
+        """String UNITID filters find records whose ipeds_id was stored as an int."""
+        collection = chromadb.EphemeralClient().get_or_create_collection("where_clause_test")
+        collection.upsert(
+            ids=["a", "b", "c"],
+            embeddings=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+            metadatas=[
+                {"_record_type": "foster", "ipeds_id": 166683},
+                {"_record_type": "foster", "ipeds_id": "166683"},
+                {"_record_type": "foster", "ipeds_id": 243744},
+            ],
+        )
+        where = where_clause({"_record_type": ["foster"], "ipeds_id": ["166683"]})
+        assert sorted(collection.get(where=where)["ids"]) == ["a", "b"]
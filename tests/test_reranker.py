@@ -0,0 +1,102 @@
+"""Tests for the cross-encoder rerank stage used by ProductionRAG."""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from reranker import CrossEncoderReranker
+
+
+@dataclass
+class Candidate:
+    """Minimal stand-in for RetrievalResult."""
+    text: str
+    score: float
+    doc_id: Optional[str] = None
+    collection: Optional[str] = "aid_policies"
+    rerank_score: Optional[float] = None
+
+
+class KeywordModel:
+    """Fake cross-encoder: scores a pair by how often 'cadaa' appears."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        self.calls += 1
+        return [text.lower().count("cadaa") for _, text in pairs]
+
+
+@pytest.fixture
+def candidates():
+    """First-stage candidates with no decisive margin."""
+    return [
+        Candidate("FAFSA deadline overview", 0.62, "doc_0"),
+        Candidate("CADAA for AB 540 students", 0.60, "doc_1"),
+        Candidate("CADAA CADAA deadline March 2", 0.58, "doc_2"),
+    ]
+
+
+class TestCrossEncoderReranker:
+    """Test ordering, caching and bypass behaviour."""
+
+    def test_reorders_by_model_score(self, candidates):
+        """Model scores decide the order; first-stage scores are kept."""
+        reranker = CrossEncoderReranker(model=KeywordModel())
+        ranked = reranker.rerank("cadaa deadline", candidates, top_k=2)
+
+        assert [r.doc_id for r in ranked] == ["doc_2", "doc_1"]
+        assert ranked[0].score == 0.58
+        assert ranked[0].rerank_score == 2
+
+    def test_scores_are_cached_per_index_version(self, candidates):
+        """Repeated queries skip the model until the index version changes."""
+        model = KeywordModel()
+        reranker = CrossEncoderReranker(model=model)
+
+        reranker.rerank("CADAA deadline", candidates, top_k=2, index_version="v1")
+        reranker.rerank("cadaa deadline?", candidates, top_k=2, index_version="v1")
+        assert model.calls == 1
+        assert reranker.cache_hits == 3
+
+        reranker.rerank("cadaa deadline", candidates, top_k=2, index_version="v2")
+        assert model.calls == 2
+
+    def test_decisive_margin_bypasses_model(self, candidates):
+        """A clear first-stage winner skips the model."""
+        model = KeywordModel()
+        reranker = CrossEncoderReranker(model=model, margin=0.1)
+        candidates[0].score = 0.9
+
+        ranked = reranker.rerank("cadaa", candidates, top_k=2)
+        assert [r.doc_id for r in ranked] == ["doc_0", "doc_1"]
+        assert model.calls == 0
+        assert reranker.bypassed == 1
+
+    def test_no_bypass_out_of_score_order(self, candidates):
+        """Fused candidates not ordered by score always go to the model."""
+        model = KeywordModel()
+        reranker = CrossEncoderReranker(model=model, margin=0.1)
+        candidates[0].score = 0.9
+        candidates[2].score = 0.95  # RRF put it last despite the best dense score
+
+        ranked = reranker.rerank("cadaa", candidates, top_k=2)
+        assert model.calls == 1 and reranker.bypassed == 0
+        assert [r.doc_id for r in ranked] == ["doc_2", "doc_1"]
+
+    def test_latency_budget_caps_scored_pairs(self, candidates):
+        """Pairs beyond the budget keep their first-stage order after scored ones."""
+        model = KeywordModel()
+        reranker = CrossEncoderReranker(model=model, latency_budget_ms=10.0)
+        reranker.ms_per_pair = 5.0
+
+        ranked = reranker.rerank("cadaa", candidates, top_k=3)
+        assert reranker.pairs_scored == 2
+        assert reranker.over_budget == 1
+        assert [r.doc_id for r in ranked] == ["doc_1", "doc_0", "doc_2"]
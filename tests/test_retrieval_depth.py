@@ -0,0 +1,70 @@
+"""Tests for adaptive per-collection retrieval depth."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from retrieval_depth import DepthController, fusion_settled
+
+
+class TestDepthController:
+    """Test depth selection and persistence."""
+
+    def test_full_depth_until_warm(self):
+        """Collections without enough history get min(requested, count)."""
+        controller = DepthController(warmup=3)
+        assert controller.depth("aid_policies", 30, 50) == 30
+        controller.observe("aid_policies", [0])
+        assert controller.depth("aid_policies", 300, 50) == 50
+
+    def test_depth_follows_contributing_ranks(self):
+        """Depth is a margin over the rank covering past contributions."""
+        controller = DepthController(warmup=3, margin=1.5, min_depth=2)
+        for _ in range(5):
+            controller.observe("major_gates", [0, 3])
+            controller.observe("cited_answers", [])
+        assert controller.depth("major_gates", 300, 50) == 6
+        assert controller.depth("cited_answers", 300, 50) == 2
+        stats = controller.stats()
+        assert stats["collections"]["major_gates"]["contribution_rate"] == 1.0
+        assert stats["fetched"] == 8 and stats["requested"] == 100
+
+    def test_expansion_bound(self):
+        """Unseen hits are bounded by the last distance and the largest boost."""
+        bound = DepthController.unseen_bound(1.0, 1.5)
+        assert bound == 0.75
+        assert DepthController.needs_expansion(bound, 0.7)
+        assert not DepthController.needs_expansion(bound, 0.8)
+        assert DepthController.needs_expansion(DepthController.unseen_bound(1.0, None), 0.8)
+
+    def test_stats_survive_restart(self, tmp_path):
+        """Histograms and per-version collection sizes are saved and reloaded."""
+        path = tmp_path / "depth.json"
+        controller = DepthController(stats_path=str(path), warmup=1, min_depth=1, save_every=1)
+        controller.remember_count("v1", "cds_data", 120)
+        controller.observe("cds_data", [1])
+
+        reloaded = DepthController(stats_path=str(path), warmup=1, min_depth=1)
+        assert reloaded.counts("v1") == {"cds_data": 120}
+        assert reloaded.counts("v2") == {}
+        assert reloaded.depth("cds_data", 120, 50) == 3
+
+
+class TestFusionSettled:
+    """Test the RRF exactness check over truncated dense rankings."""
+
+    def test_settled_when_unseen_hits_cannot_compete(self):
+        """Strong fetched hits above the bound settle the top-k."""
+        dense = [("a", 0.9), ("b", 0.8), ("c", 0.2)]
+        assert fusion_settled(dense, 0.5, ["a", "b"], top_k=2)
+
+    def test_not_settled_without_enough_exact_hits(self):
+        """Too few hits above the bound cannot settle the top-k."""
+        dense = [("a", 0.9), ("b", 0.4)]
+        assert not fusion_settled(dense, 0.5, [], top_k=2)
+
+    def test_not_settled_when_lexical_hit_could_win(self):
+        """A strong lexical hit outside the exact prefix might still make the top-k."""
+        dense = [("a", 0.9), ("b", 0.8)]
+        assert not fusion_settled(dense, 0.5, ["z", "y"], top_k=2)
@@ -0,0 +1,88 @@
+"""Tests for the paraphrase (semantic) answer cache."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from entity_gazetteer import EntityGazetteer
+from semantic_cache import SemanticAnswerCache, entity_scope, numeric_tokens
+
+
+class TestSemanticAnswerCache:
+    """Test similarity, domain and version rules."""
+
+    def test_close_vector_in_same_domain_hits(self):
+        """A near-duplicate question in the same domain is served."""
+        cache = SemanticAnswerCache(threshold=0.9)
+        cache.put("How does UIUC CS admission work", [1.0, 0.0, 0.1], "cs_admissions", "s", "v1", "answer")
+
+        hit = cache.get("UIUC computer science admissions process", [1.0, 0.05, 0.1], "cs_admissions", "s", "v1")
+        assert hit is not None
+        result, similarity = hit
+        assert result == "answer"
+        assert similarity > 0.99
+
+    def test_domain_scope_and_threshold_must_match(self):
+        """Other domains, other contexts and distant vectors miss."""
+        cache = SemanticAnswerCache(threshold=0.9)
+        cache.put("q", [1.0, 0.0], "cs_admissions", "s", "v1", "answer")
+
+        assert cache.get("q", [1.0, 0.0], "financial_aid", "s", "v1") is None
+        assert cache.get("q", [1.0, 0.0], "cs_admissions", "other", "v1") is None
+        assert cache.get("q", [0.0, 1.0], "cs_admissions", "s", "v1") is None
+        assert cache.stats()["misses"] == 3
+
+    def test_questions_without_domain_are_not_cached(self):
+        """Generic questions never use the paraphrase tier."""
+        cache = SemanticAnswerCache()
+        cache.put("q", [1.0, 0.0], None, "s", "v1", "answer")
+        assert cache.stats()["entries"] == 0
+
+    def test_version_change_and_eviction(self):
+        """Entries are dropped on index change; the LRU row is overwritten when full."""
+        cache = SemanticAnswerCache(threshold=0.9, max_entries=2)
+        cache.put("a", [1.0, 0.0], "d", "s", "v1", "a")
+        cache.put("b", [0.0, 1.0], "d", "s", "v1", "b")
+        cache.get("a", [1.0, 0.0], "d", "s", "v1")
+        cache.put("c", [0.7, 0.7], "d", "s", "v1", "c")
+        assert cache.stats()["evictions"] == 1
+        assert cache.get("b", [0.0, 1.0], "d", "s", "v1") is None
+        assert cache.get("a", [1.0, 0.0], "d", "s", "v1") is not None
+
+        assert cache.get("a", [1.0, 0.0], "d", "s", "v2") is None
+        assert cache.stats()["invalidations"] == 2
+
+    def test_version_change_resets_recency(self):
+        """Invalidated rows carry no recency into the next version."""
+        cache = SemanticAnswerCache(threshold=0.9, max_entries=2)
+        cache.put("a", [1.0, 0.0], "d", "s", "v1", "a")
+        cache.get("a", [1.0, 0.0], "d", "s", "v2")
+        assert cache.stats()["entries"] == 0 and not cache._last_used.any()
+
+
+class TestEntityScope:
+    """Test that schools and numbers named in a question split the scope."""
+
+    def test_numeric_tokens_normalized(self):
+        assert numeric_tokens("AGI $165k, household of 5") == numeric_tokens("household 5, AGI 165,000")
+        assert numeric_tokens("AGI $165k") != numeric_tokens("AGI $65k")
+        assert numeric_tokens("GPA 3.8 and $1.2M assets") == ("1200000", "3.8")
+
+    def test_schools_and_numbers_split_scope(self):
+        gazetteer = EntityGazetteer.from_records([
+            {"school_name": "University of Illinois Urbana-Champaign", "ipeds_id": 145637},
+            {"school_name": "Stanford University", "ipeds_id": "243744"},
+        ])
+
+        def scope(question):
+            return entity_scope(gazetteer.unitids(question), question)
+
+        assert scope("UIUC CS admission") != scope("Stanford CS admission")
+        assert scope("UIUC CS admission") == scope("How does UIUC admit CS students")
+        assert scope("SAI for AGI $165k") != scope("SAI for AGI $65k")
+
+        cache = SemanticAnswerCache(threshold=0.9)
+        cache.put("UIUC CS admission", [1.0, 0.0], "cs_admissions", scope("UIUC CS admission"), "v1", "uiuc")
+        assert cache.get("Stanford CS admission", [1.0, 0.0], "cs_admissions",
+                         scope("Stanford CS admission"), "v1") is None
@@ -0,0 +1,71 @@
+"""Tests for ProductionRAG stage latency histograms."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from stage_metrics import LatencyHistogram, StageMetrics
+
+
+class TestLatencyHistogram:
+    """Test bucket layout and percentiles."""
+
+    def test_buckets_are_contiguous(self):
+        """Every value lands in a bucket whose bounds contain it."""
+        for value in list(range(0, 300)) + [1023, 1024, 65535, 10 ** 7]:
+            low, high = LatencyHistogram.bucket_bounds(LatencyHistogram.bucket_index(value))
+            assert low <= value <= high
+
+    def test_relative_error_is_bounded(self):
+        """Bucket width stays within the configured precision."""
+        for value in (100, 5_000, 123_456, 9_999_999):
+            low, high = LatencyHistogram.bucket_bounds(LatencyHistogram.bucket_index(value))
+            assert (high - low) / value <= 1 / 2 ** (LatencyHistogram.SUB_BUCKET_BITS - 1)
+
+    def test_percentiles(self):
+        """p50 and p99 come from the recorded distribution."""
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+        summary = histogram.summary()
+        assert summary["count"] == 1000
+        assert abs(summary["p50_ms"] - 500) / 500 < 0.04
+        assert abs(summary["p99_ms"] - 990) / 990 < 0.04
+        assert summary["max_ms"] == 1000.0
+
+
+class TestStageMetrics:
+    """Test the stage registry."""
+
+    def test_timer_records_stage_and_sink(self):
+        """Timed blocks go to the histogram and add up in the request dict."""
+        metrics = StageMetrics()
+        sink = {}
+        with metrics.time("compose", sink):
+            pass
+        with metrics.time("compose", sink):
+            pass
+        assert metrics.snapshot()["stages"]["compose"]["count"] == 2
+        assert "compose" in sink
+
+    def test_disabled_keeps_request_timings_only(self):
+        """A disabled registry still fills the per-request dict."""
+        metrics = StageMetrics(enabled=False)
+        sink = {}
+        metrics.record_ms("retrieve", 12.5, sink)
+        metrics.increment("queries")
+        assert sink == {"retrieve": 12.5}
+        assert metrics.snapshot() == {"stages": {}, "counters": {}}
+
+    def test_prometheus_text(self):
+        """Exposition has cumulative buckets, sum, count and counters."""
+        metrics = StageMetrics()
+        metrics.record_ms("collection.major_gates", 3.0)
+        metrics.record_ms("collection.major_gates", 40.0)
+        metrics.increment("queries", 2)
+        text = metrics.prometheus_text()
+        assert 'rag_stage_duration_seconds_bucket{stage="collection.major_gates",le="0.005"} 1' in text
+        assert 'rag_stage_duration_seconds_bucket{stage="collection.major_gates",le="+Inf"} 2' in text
+        assert 'rag_stage_duration_seconds_count{stage="collection.major_gates"} 2' in text
+        assert 'rag_events_total{event="queries"} 2' in text
@@ -0,0 +1,59 @@
+"""Tests for the ProductionRAG warm-start snapshot file."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag_system"))
+
+from entity_gazetteer import EntityGazetteer
+from record_store import RecordStore
+from warm_snapshot import load_snapshot, read_header, save_snapshot, tables_digest
+
+
+class TestSnapshotFile:
+    """Test versioning and round trips."""
+
+    def test_round_trip_for_matching_version(self, tmp_path):
+        """Sections come back only for the index version they were saved for."""
+        path = str(tmp_path / "rag.snapshot")
+        save_snapshot(path, "v1", {"collection_counts": {"aid_policies": 3}})
+        assert read_header(path)["index_version"] == "v1"
+        assert load_snapshot(path, "v1", verify=True) == {"collection_counts": {"aid_policies": 3}}
+        assert load_snapshot(path, "v2") is None
+
+    def test_stale_for_edited_tables(self, tmp_path):
+        """A snapshot built with other code tables is not loaded."""
+        path = str(tmp_path / "rag.snapshot")
+        aliases = {"MIT": ("Massachusetts Institute of Technology",)}
+        save_snapshot(path, "v1", {"collection_counts": {}}, tables=tables_digest(aliases, frozenset({"hope"})))
+        assert load_snapshot(path, "v1", tables=tables_digest(aliases, frozenset({"hope"}))) == {"collection_counts": {}}
+        aliases["Caltech"] = ("California Institute of Technology",)
+        assert load_snapshot(path, "v1", tables=tables_digest(aliases, frozenset({"hope"}))) is None
+        assert load_snapshot(path, "v1") is None
+
+    def test_missing_or_foreign_file(self, tmp_path):
+        """Missing files and non-snapshots load as None."""
+        assert load_snapshot(str(tmp_path / "absent"), "v1") is None
+        other = tmp_path / "other"
+        other.write_bytes(b"not a snapshot at all")
+        assert load_snapshot(str(other), "v1") is None
+
+    def test_derived_state_survives(self, tmp_path):
+        """Records and gazetteer pickle with their memos rebuilt."""
+        store = RecordStore(lambda url: 1.5 if ".gov" in url else 1.0)
+        store.record({"citations": '["https://studentaid.gov/a"]', "ipeds_id": "166683"}, "d1", "aid_policies")
+        gazetteer = EntityGazetteer.from_records([
+            {"school_name": "Massachusetts Institute of Technology", "ipeds_id": 166683},
+        ])
+        path = str(tmp_path / "rag.snapshot")
+        save_snapshot(path, "v1", {
+            "records": store.export_state(),
+            "gazetteer": gazetteer,
+        })
+        sections = load_snapshot(path, "v1")
+
+        restored = RecordStore(lambda url: 1.0)
+        restored.restore_state(sections["records"])
+        assert len(restored) == 1
+        assert restored.record({}, "d1", "aid_policies").citations[0].authority_score == 1.5
+        assert sections["gazetteer"].unitids("Is MIT need blind?") == gazetteer.unitids("Is MIT need blind?")